@@ -12,8 +12,11 @@ from division_utils import generer_division_simple, generer_division_reste  # 
 # ✅ REFACTORED Phase 2: Import from core package
 from core import AdaptiveSystem, SkillTracker, SessionManager, DataManager, exercise_generator
 
-# ✅ Phase 6.1.4: Import TransformativeFeedback for pedagogical feedback
-from core.pedagogy.feedback_engine import TransformativeFeedback
+# ✅ Phase 6.1.4: Shared TransformativeFeedback for pedagogical feedback
+from core.pedagogy.registry import get_feedback_engine
+
+# ✅ Pools d'exercices pré-générés (remplis en arrière-plan)
+from core.exercise_pool import get_exercise_pool
 
 from monnaie_utils import (  # ← NOUVEAU MODULE
     generer_calcul_rendu,
@@ -56,15 +59,25 @@ def init_session_state():
         'memory_incorrect_pair': None,
         'active_category': "Exercice",
         'transformative_feedback': None,  # ✅ Phase 6.1.4: Store detailed feedback
-        'exercise_start_time': None  # ✅ Track exercise time
+        'exercise_start_time': None,  # ✅ Track exercise time
+        'rng': None  # Générateur aléatoire de la session (voir ci-dessous)
     }
     for k, v in cles.items():
         if k not in st.session_state:
             st.session_state[k] = v
 
-    # ✅ Phase 6.1.4: Initialize FeedbackEngine (singleton)
-    if 'feedback_engine' not in st.session_state:
-        st.session_state.feedback_engine = TransformativeFeedback()
+    # Un random.Random par session: aucune génération ne touche l'état global
+    if st.session_state.rng is None:
+        st.session_state.rng = exercise_generator.rng_session()
+
+    # ✅ Phase 6.1.4: FeedbackEngine partagé par processus (préchargé, aucune copie par session)
+    get_feedback_engine()
+
+    # Explications pré-calculées (scripts/compile_explications.py), si présentes
+    exercise_generator.preparer_explications()
+
+    # ✅ Pools d'exercices du niveau courant remplis en arrière-plan
+    get_exercise_pool().warm([st.session_state.niveau])
 
 # =============== PROFIL: Auto-save ===============
 # ✅ REFACTORED: calculer_progression and auto_save_profil moved to utilisateur.py
@@ -226,8 +239,8 @@ def main():
     st.title(f"🎓 {__title__} - Le Calcul Mental sans Pression")
     st.caption(f"Version {__version__}")
 
-    # Daily challenge
-    exercise_generator.generer_daily_challenge()
+    # Daily challenge (calculé une fois par jour et par processus)
+    st.session_state.daily_challenge['challenge'] = exercise_generator.generer_daily_challenge()
     if st.session_state.daily_challenge['challenge']:
         challenge = st.session_state.daily_challenge['challenge']
         st.markdown(f'<div class="daily-challenge-box">', unsafe_allow_html=True)
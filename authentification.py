@@ -7,6 +7,7 @@ import os
 import random
 import string
 from datetime import datetime
+from core.exercise_history import profil_serialisable
 from core.security import (
     hash_pin,
     authenticate_user,
@@ -404,8 +405,8 @@ def sauvegarder_profil_utilisateur(prenom, profil):
         return False
 
     # Mettre à jour juste profil (PIN reste inchangé!)
-    compte['profil'] = profil
-    compte['profil']['date_derniere_session'] = str(datetime.now())
+    profil['date_derniere_session'] = str(datetime.now())
+    compte['profil'] = profil_serialisable(profil)
 
     return _save_user(cle, compte)
 
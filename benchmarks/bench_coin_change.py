@@ -0,0 +1,81 @@
+"""
+Benchmark de la table de rendu optimal (monnaie_utils)
+
+Compare, sur tous les montants de 0 à MONTANT_MAX_TABLE:
+- l'algorithme glouton historique (calcul à chaque appel)
+- calculer_pieces_optimales (lecture dans la table)
+Mesure aussi la construction de la table, sa taille et une requête
+« toutes les décompositions avec au plus k pièces ».
+
+Usage:
+    python benchmarks/bench_coin_change.py [--repeat 20] [--max-pieces 6]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from monnaie_utils import (  # noqa: E402
+    MONTANT_MAX_TABLE,
+    PIECES_BILLETS,
+    calculer_pieces_optimales,
+    decompositions,
+    table_pieces,
+)
+
+
+def glouton(montant_centimes: int):
+    """Implémentation d'origine (référence « avant »)"""
+    resultat = []
+    reste = montant_centimes
+    for valeur, nom in PIECES_BILLETS:
+        if reste >= valeur:
+            quantite = reste // valeur
+            resultat.append((valeur, nom, quantite))
+            reste = reste % valeur
+    return resultat
+
+
+def par_appel_us(fonction, montants, repeat: int) -> float:
+    """Latence moyenne par appel (µs), meilleur passage sur `repeat`"""
+    meilleur = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for montant in montants:
+            fonction(montant)
+        meilleur = min(meilleur, time.perf_counter() - start)
+    return meilleur / len(montants) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-pieces", type=int, default=6)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = table_pieces.__wrapped__()
+    build_ms = (time.perf_counter() - start) * 1000
+    table_pieces()
+
+    montants = list(range(MONTANT_MAX_TABLE + 1))
+    avant = par_appel_us(glouton, montants, args.repeat)
+    apres = par_appel_us(calculer_pieces_optimales, montants, args.repeat)
+
+    start = time.perf_counter()
+    nb = sum(sum(1 for _ in decompositions(m, args.max_pieces)) for m in range(0, 1001, 10))
+    requete_ms = (time.perf_counter() - start) * 1000
+
+    print(f"🧮 Table 0-{MONTANT_MAX_TABLE} centimes: {build_ms:.1f} ms, {table.nbytes} octets")
+    print(f"{'méthode':<12} {'µs/appel':>10}")
+    print(f"{'glouton':<12} {avant:>10.2f}")
+    print(f"{'table':<12} {apres:>10.2f}")
+    print(f"🔎 Décompositions ≤ {args.max_pieces} pièces, 101 montants (0-10€): "
+          f"{nb} résultats en {requete_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Microbenchmark ErrorAnalyzer.analyze_error_type
+
+Compare la latence par appel entre:
+- le scan linéaire historique (toutes catégories × toutes erreurs du domaine)
+- le chemin indexé par (domaine, niveau)
+- analyze_error_type complet (signatures de réponses fausses puis index)
+- analyze_batch sur un historique synthétique (débit en lignes/s)
+
+Usage:
+    python benchmarks/bench_error_analyzer.py [--iterations 20000] [--batch-size 100000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pedagogy.error_analyzer import ErrorAnalyzer, MATCH_THRESHOLD  # noqa: E402
+
+
+# Échantillon représentatif de réponses fausses (type, opération, niveau, réponse, attendu)
+SAMPLE_ERRORS: List[Tuple[Dict[str, Any], Any, Any]] = [
+    ({"type": "addition", "operation": "27 + 48", "difficulty": "CE1"}, 65, 75),
+    ({"type": "addition", "operation": "7 + 8", "difficulty": "CE1"}, 14, 15),
+    ({"type": "subtraction", "operation": "52 - 27", "difficulty": "CE2"}, 35, 25),
+    ({"type": "multiplication", "operation": "7 × 8", "difficulty": "CE2"}, 54, 56),
+    ({"type": "division", "operation": "42 ÷ 6", "difficulty": "CM1"}, 6, 7),
+    ({"type": "fractions", "operation": "1/2 + 1/3", "difficulty": "CM1"}, "2/5", "5/6"),
+    ({"type": "decimals", "operation": "2,5 + 1,75", "difficulty": "CM2"}, "3,80", "4,25"),
+    ({"type": "mesures", "operation": "3 m en cm", "difficulty": "CM1"}, 30, 300),
+]
+
+
+def linear_scan(analyzer: ErrorAnalyzer, exercise: Dict[str, Any], response: Any, expected: Any):
+    """Reproduction du scan linéaire d'origine (référence « avant »)"""
+    difficulty = exercise.get("difficulty", "CE2")
+    response_val = analyzer._parse_number(response)
+    expected_val = analyzer._parse_number(expected)
+    difference = None
+    if response_val is not None and expected_val is not None:
+        difference = abs(response_val - expected_val)
+
+    candidates = []
+    for category_name, category_data in analyzer.error_catalog["error_categories"].items():
+        if "errors" not in category_data:
+            continue
+        domain = analyzer._map_exercise_type_to_domain(exercise.get("type", "unknown"))
+        if domain in category_data["errors"]:
+            for error_def in category_data["errors"][domain]:
+                score = analyzer._calculate_match_score(
+                    error_def, exercise, response, expected, difference
+                )
+                if score > MATCH_THRESHOLD:
+                    candidates.append({"category": category_name, "error": error_def, "score": score})
+
+    if candidates:
+        best_match = max(candidates, key=lambda x: x["score"])
+        return analyzer._build_result_from_match(best_match, difficulty)
+    return analyzer._create_generic_calculation_error(response, expected, difficulty)
+
+
+def indexed_scan(analyzer: ErrorAnalyzer, exercise: Dict[str, Any], response: Any, expected: Any):
+    """Chemin indexé seul, sans les signatures de réponses fausses"""
+    difficulty = exercise.get("difficulty", "CE2")
+    response_val = analyzer._parse_number(response)
+    expected_val = analyzer._parse_number(expected)
+    difference = None
+    if response_val is not None and expected_val is not None:
+        difference = abs(response_val - expected_val)
+
+    best_match = analyzer._match_candidates(
+        exercise.get("type", "unknown"), exercise, difficulty, difference
+    )
+    if best_match is not None:
+        return analyzer._build_result_from_match(best_match, difficulty)
+    return analyzer._create_generic_calculation_error(response, expected, difficulty)
+
+
+def time_per_call(func, iterations: int) -> float:
+    """Retourne la latence moyenne par appel en microsecondes"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        exercise, response, expected = SAMPLE_ERRORS[i % len(SAMPLE_ERRORS)]
+        func(exercise, response, expected)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def synthetic_history(size: int, seed: int = 0):
+    """Historique de réponses fausses aléatoires (CE1-CM2, 4 opérations)"""
+    rng = random.Random(seed)
+    operators = {"addition": "+", "subtraction": "-", "multiplication": "×", "division": "÷"}
+    exercises, responses, expected = [], [], []
+    for _ in range(size):
+        ex_type = rng.choice(list(operators))
+        a, b = rng.randint(10, 200), rng.randint(1, 15)
+        op = operators[ex_type]
+        exp = {"+": a + b, "-": a - b, "×": a * b, "÷": a // b}[op]
+        exercises.append({
+            "type": ex_type,
+            "operation": f"{a} {op} {b}",
+            "difficulty": rng.choice(["CE1", "CE2", "CM1", "CM2"])
+        })
+        responses.append(exp + rng.choice([-10, -1, 1, 2, 7, 10]))
+        expected.append(exp)
+    return exercises, responses, expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=100000)
+    args = parser.parse_args()
+
+    analyzer = ErrorAnalyzer()
+
+    # Vérifier l'équivalence des deux chemins avant de mesurer
+    for exercise, response, expected in SAMPLE_ERRORS:
+        before = linear_scan(analyzer, exercise, response, expected)
+        after = indexed_scan(analyzer, exercise, response, expected)
+        assert before.to_dict() == after.to_dict(), exercise
+
+    before_us = time_per_call(
+        lambda e, r, x: linear_scan(analyzer, e, r, x), args.iterations
+    )
+    after_us = time_per_call(
+        lambda e, r, x: indexed_scan(analyzer, e, r, x), args.iterations
+    )
+    full_us = time_per_call(analyzer.analyze_error_type, args.iterations)
+
+    print(f"Taxonomie: {analyzer.taxonomy_path}")
+    print(f"Itérations: {args.iterations}")
+    print(f"Avant (scan linéaire): {before_us:8.2f} µs/appel")
+    print(f"Après (index):         {after_us:8.2f} µs/appel")
+    print(f"Accélération:          {before_us / after_us:8.2f}x")
+    print(f"analyze_error_type:    {full_us:8.2f} µs/appel (signatures + index)")
+
+    if args.batch_size:
+        exercises, responses, expected = synthetic_history(args.batch_size)
+        start = time.perf_counter()
+        analyzer.analyze_batch(exercises, responses, expected)
+        elapsed = time.perf_counter() - start
+        print(f"analyze_batch:         {args.batch_size} lignes en {elapsed:.2f} s "
+              f"({args.batch_size / elapsed:,.0f} lignes/s, "
+              f"~{1_000_000 / (args.batch_size / elapsed) / 60:.1f} min pour 1M)")
+
+
+if __name__ == "__main__":
+    main()
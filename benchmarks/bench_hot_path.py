@@ -0,0 +1,364 @@
+"""
+Benchmark latence: chemin « Valider » d'un exercice (hot path)
+
+Rejoue sans navigateur ce que fait _callback_validation_exercice quand un
+élève valide sa réponse, étape par étape:
+- check:          type d'exercice, validation, dict exercice pour le feedback
+- skill_tracker:  SkillTracker.record_exercise
+- feedback:       TransformativeFeedback complet (6 couches, synchrone)
+- verdict:        TransformativeFeedback en mode différé (délai avant le ✅/❌)
+- auto_save:      auto_save_profil (cache JSON + écriture disque périodique)
+- badges:         verifier_badges
+- total:          check + skill_tracker + verdict + auto_save + badges
+
+Les profils synthétiques ont des historiques de tailles variables. Pour
+chaque taille: p50/p95/p99 par étape (ms) et débit par cœur (validations
+par seconde de temps CPU).
+
+Les résultats peuvent être enregistrés comme baseline JSON puis comparés
+d'une exécution à l'autre.
+
+Usage:
+    python benchmarks/bench_hot_path.py [--iterations 300] [--history-sizes 0 100 1000 5000]
+    python benchmarks/bench_hot_path.py --save-baseline
+    python benchmarks/bench_hot_path.py --tolerance 0.25 --fail-on-regression
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import streamlit as st  # noqa: E402
+import streamlit.logger  # noqa: E402
+
+# Mode « bare » Streamlit: st.session_state fonctionne sans serveur
+streamlit.logger.set_log_level("error")
+
+import utilisateur  # noqa: E402
+from core import SkillTracker, exercise_generator, exercise_history  # noqa: E402
+from core.pedagogy.registry import get_feedback_engine  # noqa: E402
+from core.skill_state import etat_competences  # noqa: E402
+from ui.exercise_sections import verifier_badges  # noqa: E402
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "hot_path.json"
+
+STAGES = ("check", "skill_tracker", "feedback", "verdict", "auto_save", "badges", "total")
+
+# Étapes additionnées dans « total » (feedback complet exclu: remplacé par verdict)
+TOTAL_STAGES = ("check", "skill_tracker", "verdict", "auto_save", "badges")
+
+PERCENTILES = (50, 95, 99)
+
+GENERATORS = (
+    ("addition", exercise_generator.generer_addition),
+    ("soustraction", exercise_generator.generer_soustraction),
+    ("multiplication", exercise_generator.generer_tables),
+    ("division", exercise_generator.generer_division),
+)
+
+NIVEAUX = ("CE1", "CE2", "CM1", "CM2")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentile par rang le plus proche (valeurs déjà triées)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def synthetic_profile(history_size: int, rng: random.Random) -> Dict[str, Any]:
+    """Profil élève avec `history_size` exercices dans l'historique"""
+    profil = utilisateur.profil_par_defaut()
+    start = datetime(2025, 9, 1)
+    types = [name for name, _ in GENERATORS]
+    history = []
+    for i in range(history_size):
+        history.append({
+            'type': rng.choice(types),
+            'correct': rng.random() < 0.7,
+            'difficulty': rng.randint(1, 5),
+            'timestamp': (start + timedelta(minutes=i)).isoformat(),
+            'time_taken': rng.randint(3, 60)
+        })
+    reussis = sum(1 for h in history if h['correct'])
+    profil.update({
+        "niveau": rng.choice(NIVEAUX),
+        "points": reussis * 10,
+        "exercices_reussis": reussis,
+        "exercices_totaux": history_size,
+        "exercise_history": history
+    })
+    return profil
+
+
+def reset_session(nom: str, profil: Dict[str, Any]) -> None:
+    """Prépare st.session_state comme après connexion de l'élève"""
+    st.session_state.utilisateur = nom
+    st.session_state.profil = profil
+    st.session_state.niveau = profil["niveau"]
+    st.session_state.points = profil["points"]
+    st.session_state.badges = list(profil["badges"])
+    st.session_state.streak = {'current': 0, 'max': 0}
+    st.session_state.stats_par_niveau = {n: {'correct': 0, 'total': 0} for n in NIVEAUX}
+
+
+def build_exercise(rng: random.Random, niveau: str):
+    """Exercice généré et réponse de l'élève (70% correctes)"""
+    _, generate = rng.choice(GENERATORS)
+    ex = generate(niveau)
+    if rng.random() < 0.7:
+        reponse = ex['reponse']
+    else:
+        reponse = ex['reponse'] + rng.choice([-10, -1, 1, 10])
+    return ex, reponse
+
+
+def check_answer(ex: Dict[str, Any], reponse: Any):
+    """Étape « check » telle que dans _callback_validation_exercice"""
+    question = ex['question']
+    if "+" in question:
+        exercice_type = "addition"
+    elif "-" in question:
+        exercice_type = "subtraction"
+    elif "×" in question:
+        exercice_type = "multiplication"
+    elif "÷" in question:
+        exercice_type = "division"
+    else:
+        exercice_type = "autre"
+
+    correct = (reponse == ex['reponse'])
+
+    exercise_dict = {
+        "type": exercice_type,
+        "operation": question,
+        "difficulty": st.session_state.niveau,
+        "expected_answer": ex['reponse']
+    }
+    parts = question.replace('×', ' ').replace('+', ' ').replace('-', ' ').replace('÷', ' ').split()
+    if len(parts) >= 2:
+        try:
+            exercise_dict["operand1"] = int(parts[0])
+            exercise_dict["operand2"] = int(parts[1])
+        except ValueError:
+            pass
+    return exercice_type, correct, exercise_dict
+
+
+def timed(samples: Dict[str, List[float]], stage: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Exécute fn et ajoute sa durée (ms) aux échantillons de l'étape"""
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    samples[stage].append((time.perf_counter() - start) * 1000)
+    return value
+
+
+def run_history_size(history_size: int, iterations: int, seed: int) -> Dict[str, Any]:
+    """Rejoue `iterations` validations pour une taille d'historique"""
+    rng = random.Random(seed)
+    random.seed(seed)
+    engine = get_feedback_engine()
+    template = synthetic_profile(history_size, rng)
+    # Régime établi: historique compact et état des compétences construits
+    # une fois au chargement du profil (100 derniers exercices gardés)
+    etat_competences(SkillTracker(template).profil)
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    cpu_seconds = 0.0
+
+    for _ in range(iterations):
+        # Profil frais à chaque itération (l'historique garde sa taille)
+        profil = copy.deepcopy(template)
+        reset_session(f"bench_{history_size}", profil)
+        ex, reponse = build_exercise(rng, profil["niveau"])
+        user_history = {
+            "success_rate": profil["exercices_reussis"] / max(1, profil["exercices_totaux"]),
+            "exercises_completed": profil["exercices_totaux"],
+            "current_streak": 0
+        }
+
+        cpu_start = time.process_time()
+        exercice_type, correct, exercise_dict = timed(samples, "check", check_answer, ex, reponse)
+
+        timed(
+            samples, "skill_tracker",
+            lambda: SkillTracker(st.session_state.profil).record_exercise(exercice_type, correct, difficulty=3)
+        )
+
+        result = timed(
+            samples, "verdict", engine.process_exercise_response,
+            exercise=exercise_dict, response=reponse, expected=ex['reponse'],
+            user_id=st.session_state.utilisateur, user_history=user_history,
+            time_taken_seconds=rng.randint(3, 60), deferred=True
+        )
+
+        st.session_state.stats_par_niveau[st.session_state.niveau]['total'] += 1
+        if correct:
+            st.session_state.stats_par_niveau[st.session_state.niveau]['correct'] += 1
+            st.session_state.points += 10
+
+        timed(samples, "auto_save", utilisateur.auto_save_profil, correct)
+        nouveaux = timed(samples, "badges", verifier_badges, st.session_state.points, st.session_state.badges)
+        st.session_state.badges.extend(nouveaux)
+        cpu_seconds += time.process_time() - cpu_start
+
+        # Couches différées terminées hors mesure (pas de concurrence avec l'itération suivante)
+        result.wait(timeout=5)
+
+        # Feedback complet synchrone, pour référence (hors total)
+        timed(
+            samples, "feedback", engine.process_exercise_response,
+            exercise=exercise_dict, response=reponse, expected=ex['reponse'],
+            user_id=st.session_state.utilisateur, user_history=user_history,
+            time_taken_seconds=None
+        )
+
+        samples["total"].append(sum(samples[stage][-1] for stage in TOTAL_STAGES))
+
+    stages = {}
+    for stage, values in samples.items():
+        values.sort()
+        stages[stage] = {f"p{pct}": round(percentile(values, pct), 4) for pct in PERCENTILES}
+        stages[stage]["mean"] = round(sum(values) / len(values), 4) if values else 0.0
+
+    return {
+        "history_size": history_size,
+        "iterations": iterations,
+        "stages_ms": stages,
+        "throughput_per_core": round(iterations / cpu_seconds, 1) if cpu_seconds else 0.0
+    }
+
+
+def run(history_sizes: List[int], iterations: int, seed: int) -> Dict[str, Any]:
+    """Exécute le benchmark complet dans un répertoire temporaire"""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Fichier utilisateurs isolé: ne touche jamais utilisateurs.json
+        original_file = utilisateur.FICHIER_UTILISATEURS
+        utilisateur.FICHIER_UTILISATEURS = os.path.join(tmp, "utilisateurs.json")
+        # Archives d'historique isolées elles aussi
+        original_archive_dir = exercise_history.HISTORY_ARCHIVE_DIR
+        exercise_history.HISTORY_ARCHIVE_DIR = os.path.join(tmp, "historique")
+        try:
+            # Quelques autres élèves dans le fichier, comme en classe
+            rng = random.Random(seed)
+            cache = utilisateur._get_user_cache()
+            cache["data"] = {f"eleve_{i}": synthetic_profile(100, rng) for i in range(25)}
+            cache["loaded"] = True
+
+            results = [run_history_size(size, iterations, seed + size) for size in history_sizes]
+        finally:
+            utilisateur.FICHIER_UTILISATEURS = original_file
+            exercise_history.HISTORY_ARCHIVE_DIR = original_archive_dir
+            utilisateur._get_user_cache.clear()
+            get_feedback_engine().shutdown()
+
+    return {
+        "benchmark": "hot_path",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "seed": seed,
+        "results": results
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Liste les régressions (p50/p95 au-delà de la tolérance) vs baseline"""
+    regressions = []
+    previous = {r["history_size"]: r for r in baseline.get("results", [])}
+    for result in report["results"]:
+        old = previous.get(result["history_size"])
+        if old is None:
+            continue
+        for stage, stats in result["stages_ms"].items():
+            old_stats = old["stages_ms"].get(stage)
+            if not old_stats:
+                continue
+            for key in ("p50", "p95"):
+                before, after = old_stats[key], stats[key]
+                if before > 0 and after > before * (1 + tolerance):
+                    regressions.append(
+                        f"historique={result['history_size']} {stage} {key}: "
+                        f"{before:.3f} → {after:.3f} ms (+{(after / before - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    previous = {r["history_size"]: r for r in (baseline or {}).get("results", [])}
+    for result in report["results"]:
+        size = result["history_size"]
+        print(f"\n📊 Historique {size} exercices ({result['iterations']} validations)")
+        print(f"   {'étape':<14} {'p50':>9} {'p95':>9} {'p99':>9}   (ms)")
+        for stage in STAGES:
+            stats = result["stages_ms"][stage]
+            line = f"   {stage:<14} {stats['p50']:>9.3f} {stats['p95']:>9.3f} {stats['p99']:>9.3f}"
+            old = previous.get(size, {}).get("stages_ms", {}).get(stage)
+            if old and old["p50"] > 0:
+                line += f"   p50 {(stats['p50'] / old['p50'] - 1) * 100:+.0f}% vs baseline"
+            print(line)
+        print(f"   ⚡ Débit: {result['throughput_per_core']:.0f} validations/s par cœur")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--history-sizes", type=int, nargs="+", default=[0, 100, 1000, 5000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Enregistre les résultats comme nouvelle baseline")
+    parser.add_argument("--output", type=Path, help="Écrit aussi le rapport JSON ici")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Hausse relative tolérée de p50/p95 avant régression")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    print("⏱️  Benchmark chemin « Valider »")
+    report = run(args.history_sizes, args.iterations, args.seed)
+
+    baseline = None
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    print_report(report, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Rapport: {args.output}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Baseline enregistrée: {args.baseline}")
+        return
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} régression(s) (tolérance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   - {line}")
+            if args.fail_on_regression:
+                sys.exit(1)
+        else:
+            print(f"\n✅ Aucune régression vs {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark mémoire: moteur de feedback par session vs partagé
+
+Ouvre N sessions simulées (dict imitant st.session_state) et mesure la
+mémoire résidente (RSS) et les allocations Python selon trois modes:
+- legacy:  une taxonomie parsée + un TransformativeFeedback par session
+- session: un TransformativeFeedback par session (taxonomie déjà partagée)
+- shared:  registre processus (get_feedback_engine), une seule instance
+
+Chaque mode tourne dans un sous-processus pour des mesures RSS indépendantes.
+
+Usage:
+    python benchmarks/bench_session_memory.py [--sessions 300]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+MODES = ("legacy", "session", "shared")
+
+
+def rss_kib() -> int:
+    """Mémoire résidente du processus courant en KiB (Linux /proc, sinon ru_maxrss)"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_mode(mode: str, sessions: int) -> dict:
+    """Ouvre `sessions` sessions simulées et retourne les mesures"""
+    from core.pedagogy.feedback_engine import TransformativeFeedback
+    from core.pedagogy.registry import get_feedback_engine
+    from core.pedagogy.taxonomy_snapshot import clear_loaded_taxonomies
+
+    rss_before = rss_kib()
+    tracemalloc.start()
+
+    opened = []
+    for i in range(sessions):
+        if mode == "legacy":
+            clear_loaded_taxonomies()
+            engine = TransformativeFeedback()
+        elif mode == "session":
+            engine = TransformativeFeedback()
+        else:
+            engine = get_feedback_engine()
+        opened.append({"utilisateur": f"eleve_{i}", "niveau": "CE2", "feedback_engine": engine})
+
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "engines": len({id(s["feedback_engine"]) for s in opened}),
+        "rss_delta_kib": rss_kib() - rss_before,
+        "python_alloc_kib": traced // 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=300)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.sessions)))
+        return
+
+    print(f"Sessions simulées: {args.sessions}")
+    print(f"{'mode':<8} {'moteurs':>8} {'RSS Δ (KiB)':>12} {'alloc Python (KiB)':>20}")
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--sessions", str(args.sessions), "--mode", mode],
+            check=True, capture_output=True, text=True, env=dict(os.environ)
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:<8} {result['engines']:>8} {result['rss_delta_kib']:>12} "
+              f"{result['python_alloc_kib']:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark du calcul des compétences d'une classe / école (core.skill_matrix)
+
+Compare, sur des historiques synthétiques (n élèves × k exercices):
+- AdaptiveSystem.get_skill_levels élève par élève (boucle Python)
+- matrice_competences sur les tableaux à plat (calcul vectorisé)
+La boucle Python est mesurée sur un échantillon puis extrapolée.
+
+Usage:
+    python benchmarks/bench_skill_matrix.py [--eleves 10000] [--exercices 100]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.adaptive_system import SKILL_TYPES, AdaptiveSystem  # noqa: E402
+from core.skill_matrix import historiques_en_tableaux, matrice_competences, secondes  # noqa: E402
+
+
+def tableaux_synthetiques(n_eleves: int, n_exercices: int, seed: int = 0):
+    """Tableaux à plat: n_exercices par élève sur les 60 derniers jours"""
+    rng = np.random.default_rng(seed)
+    n = n_eleves * n_exercices
+    maintenant = secondes()
+    instants = np.sort(rng.uniform(maintenant - 60 * 86400, maintenant, (n_eleves, n_exercices)), axis=1)
+    return (
+        np.repeat(np.arange(n_eleves), n_exercices),
+        rng.integers(0, len(SKILL_TYPES), n),
+        rng.random(n) < 0.65,
+        rng.integers(1, 11, n).astype(np.float64),
+        instants.ravel(),
+    )
+
+
+def historiques(tableaux, n_eleves: int, n_exercices: int):
+    """Mêmes données au format profil['exercise_history']"""
+    eleves, types, correct, difficulte, instants = tableaux
+    epoch = datetime(1970, 1, 1)
+    resultat = [[] for _ in range(n_eleves)]
+    for i in range(n_eleves * n_exercices):
+        resultat[eleves[i]].append({
+            'type': SKILL_TYPES[types[i]],
+            'correct': bool(correct[i]),
+            'difficulty': int(difficulte[i]),
+            'timestamp': (epoch + timedelta(seconds=float(instants[i]))).isoformat(),
+        })
+    return resultat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--eleves", type=int, default=10000)
+    parser.add_argument("--exercices", type=int, default=100)
+    parser.add_argument("--echantillon", type=int, default=500, help="élèves mesurés pour la boucle Python")
+    args = parser.parse_args()
+
+    tableaux = tableaux_synthetiques(args.eleves, args.exercices)
+
+    start = time.perf_counter()
+    niveaux = matrice_competences(*tableaux, n_eleves=args.eleves)
+    vectorise_s = time.perf_counter() - start
+
+    echantillon = historiques(tableaux, min(args.echantillon, args.eleves), args.exercices)
+    adaptive = AdaptiveSystem()
+    start = time.perf_counter()
+    for historique in echantillon:
+        adaptive.get_skill_levels(historique)
+    boucle_s = (time.perf_counter() - start) / len(echantillon) * args.eleves
+
+    # Contrôle: mêmes niveaux arrondis sur l'échantillon
+    verif = historiques_en_tableaux(echantillon)
+    ecarts = np.abs(np.round(matrice_competences(*verif, n_eleves=len(echantillon)), 2)
+                    - np.round(niveaux[:len(echantillon)], 2)).max()
+
+    print(f"👥 {args.eleves} élèves × {args.exercices} exercices ({len(SKILL_TYPES)} types)")
+    print(f"{'méthode':<22} {'secondes':>10}")
+    print(f"{'boucle Python (extrap.)':<22} {boucle_s:>10.2f}")
+    print(f"{'matrice_competences':<22} {vectorise_s:>10.3f}")
+    print(f"✅ Écart max sur l'échantillon: {ecarts:.2f}")
+
+
+if __name__ == "__main__":
+    main()
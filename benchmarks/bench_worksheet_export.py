@@ -0,0 +1,57 @@
+"""
+Benchmark de l'export de fiches (core/worksheet_export.py)
+
+Mesure le débit (exercices/s) et le pic d'allocation Python pour des
+packs de taille croissante, écrits dans une sortie nulle: le pic doit
+rester stable quand N augmente (export en flux).
+
+Usage:
+    python benchmarks/bench_worksheet_export.py [--sizes 500 5000 50000]
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.worksheet_export import exporter_csv, exporter_html, types_fiche  # noqa: E402
+
+
+class SortieNulle:
+    """Sortie texte qui ignore tout (mesure sans coût d'écriture)"""
+
+    def write(self, texte: str) -> int:
+        return len(texte)
+
+
+def mesurer(exporter, kinds, niveau: str, n: int) -> dict:
+    """Exporte n exercices et retourne débit + pic d'allocation"""
+    tracemalloc.start()
+    stats = exporter(SortieNulle(), kinds, niveau, n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {**stats, 'peak_kib': peak // 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 5000, 50000])
+    parser.add_argument("--niveau", default="CM1")
+    args = parser.parse_args()
+
+    formats = {
+        "csv": (exporter_csv, ["addition", "soustraction", "tables", "division"]),
+        "html": (exporter_html, list(types_fiche())),
+    }
+
+    print(f"{'format':<6} {'N':>8} {'ex/s':>10} {'pic (KiB)':>10}")
+    for nom, (exporter, kinds) in formats.items():
+        for n in args.sizes:
+            result = mesurer(exporter, kinds, args.niveau, n)
+            print(f"{nom:<6} {n:>8} {result['exercices_par_seconde']:>10.0f} {result['peak_kib']:>10}")
+
+
+if __name__ == "__main__":
+    main()
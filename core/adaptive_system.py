@@ -7,6 +7,9 @@ import random
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 
+# ✅ Mêmes types que le SkillTracker pour la cohérence
+SKILL_TYPES = ['addition', 'soustraction', 'multiplication', 'division', 'probleme', 'fractions', 'géométrie', 'décimaux', 'proportionnalite', 'mesures', 'monnaie']
+
 class AdaptiveSystem:
     """
     Gère l'adaptation de difficulté et recommandations d'exercices
@@ -26,6 +29,7 @@ class AdaptiveSystem:
         
         Args:
             exercise_history: Liste exercices [{type, correct, difficulty, timestamp}]
+                ou HistoriqueExercices
             exercise_type: Filtrer par type (ex: "addition"), None = tous
         
         Returns:
@@ -36,14 +40,21 @@ class AdaptiveSystem:
                 'trend': str                # 'improving', 'stable', 'declining'
             }
         """
-        # Filtrer par type si spécifié
-        if exercise_type:
-            history = [ex for ex in exercise_history if ex.get('type') == exercise_type]
-        else:
-            history = exercise_history
+        from core.exercise_history import HistoriqueExercices
         
-        # Prendre 10 derniers
-        recent = history[-10:] if len(history) > 10 else history
+        if isinstance(exercise_history, HistoriqueExercices):
+            # Historique compact : seuls les 10 derniers sont convertis en dicts
+            # (archive lue depuis la fin si la fenêtre récente n'en a pas assez)
+            recent = exercise_history.derniers(10, exercise_type or None)
+        else:
+            # Filtrer par type si spécifié
+            if exercise_type:
+                history = [ex for ex in exercise_history if ex.get('type') == exercise_type]
+            else:
+                history = exercise_history
+            
+            # Prendre 10 derniers
+            recent = history[-10:] if len(history) > 10 else history
         
         if not recent:
             return {
@@ -138,11 +149,9 @@ class AdaptiveSystem:
         Returns:
             {'addition': 0.65, 'soustraction': 0.42, ...}
         """
-        # ✅ Utiliser les types définis dans le SkillTracker pour la cohérence
-        exercise_types = ['addition', 'soustraction', 'multiplication', 'division', 'probleme', 'fractions', 'géométrie', 'décimaux', 'proportionnalite', 'mesures', 'monnaie']
         skill_levels = {}
         
-        for ex_type in exercise_types:
+        for ex_type in SKILL_TYPES:
             type_history = [ex for ex in exercise_history if ex.get('type') == ex_type]
             
             if not type_history:
@@ -176,6 +185,22 @@ class AdaptiveSystem:
         
         return skill_levels
     
+    def get_profile_skill_levels(self, profil: Dict) -> Dict[str, float]:
+        """
+        Même résultat que get_skill_levels(profil['exercise_history']),
+        depuis l'état incrémental du profil (profil['skill_state'])
+        
+        Pas de re-scan de l'historique ni d'analyse de dates : seuls les
+        types dont un résultat a changé d'âge (en jours) sont recalculés.
+        L'état est créé depuis l'historique au premier appel.
+        
+        Returns:
+            {'addition': 0.65, 'soustraction': 0.42, ...}
+        """
+        from core.skill_state import etat_competences
+        
+        return etat_competences(profil, self.decay_days).niveaux(SKILL_TYPES)
+    
     def recommend_exercise_type(self, skill_levels: Dict[str, float]) -> Tuple[str, str]:
         """
         Recommande type d'exercice optimal
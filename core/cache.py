@@ -0,0 +1,115 @@
+"""
+LRU Cache - Cache borné thread-safe avec statistiques
+Utilisable hors Streamlit (moteurs partagés entre sessions, exports, tests)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Cache LRU borné, thread-safe, avec compteurs de hits/misses.
+
+    Exemple:
+        cache = LRUCache(maxsize=1024)
+        result = cache.get_or_compute(key, lambda: calcul_couteux())
+        cache.stats()  # {'size': 1, 'maxsize': 1024, 'hits': 0, ...}
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Args:
+            maxsize: Nombre maximal d'entrées (0 désactive le cache)
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize doit être >= 0")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retourne la valeur en cache (et la marque récente), sinon default"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Ajoute une entrée, en évinçant la moins récente si plein"""
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Retourne la valeur en cache ou la calcule et la stocke.
+
+        Le calcul se fait hors verrou: deux threads peuvent calculer la même
+        clé en parallèle, le dernier résultat écrit est conservé.
+        """
+        missing = _MISSING
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Vide le cache et remet les compteurs à zéro"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques pour monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+_MISSING = object()
+
+
+def make_key(*parts: Any) -> Optional[Hashable]:
+    """
+    Construit une clé de cache à partir de valeurs quelconques.
+
+    Les valeurs sont étiquetées par leur type (65 et 65.0 donnent des clés
+    différentes); retourne None si une valeur n'est pas hashable.
+    """
+    key = tuple((type(part).__name__, part) for part in parts)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
@@ -1,33 +1,110 @@
 """
 Exercise Generator - Générateur d'exercices MathCopain
 Centralise toute la logique de génération d'exercices
+
+Chaque générateur accepte un `rng` (random.Random, ou Generator NumPy pour
+generer_batch) pour ne jamais toucher à l'état global du module random:
+une instance par session (rng_session), une instance déterministe par
+jour (rng_du_jour). Sans rng, le module random global est utilisé.
 """
 
+import gzip
+import json
+import os
 import random
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
 from datetime import date
-from typing import Dict, Any, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .cache import LRUCache, make_key
+from .operand_catalog import get_catalogue
+
+
+# =============== PLAGES PAR NIVEAU ===============
+# Bornes incluses ((a_min, a_max), (b_min, b_max)); niveau inconnu → CM2.
+# Partagées par les générateurs unitaires et generer_batch.
+
+PLAGES_ADDITION = {
+    "CE1": ((1, 10), (1, 10)),
+    "CE2": ((10, 50), (10, 50)),
+    "CM1": ((50, 100), (50, 100)),
+    "CM2": ((100, 200), (100, 200)),
+}
+
+PLAGES_SOUSTRACTION = {
+    "CE1": ((10, 20), (1, 10)),
+    "CE2": ((50, 100), (10, 50)),
+    "CM1": ((100, 500), (50, 100)),
+    "CM2": ((500, 1000), (100, 500)),
+}
+
+PLAGES_TABLES = {
+    "CE1": ((2, 5), (1, 10)),
+    "CE2": ((2, 9), (1, 10)),
+    "CM1": ((1, 12), (1, 12)),
+    "CM2": ((1, 15), (1, 15)),
+}
+
+# Division: (proba sans reste, (quotient, diviseur) sans reste,
+#            (diviseur, quotient) avec reste); CE1 → tables
+PLAGES_DIVISION = {
+    "CE2": (1.0, ((2, 9), (2, 5)), None),
+    "CM1": (0.7, ((3, 12), (2, 9)), ((3, 7), (3, 9))),
+    "CM2": (0.5, ((5, 15), (3, 12)), ((4, 9), (4, 12))),
+}
+
+
+def _plages(table: Dict[str, Any], niveau: str) -> Any:
+    """Plages du niveau (CM2 par défaut, comme les générateurs d'origine)"""
+    return table.get(niveau, table["CM2"])
+
+
+# =============== GÉNÉRATEURS ALÉATOIRES ===============
+
+def rng_session(graine: Optional[Any] = None) -> random.Random:
+    """
+    Générateur aléatoire propre à une session.
+
+    Args:
+        graine: Graine optionnelle (rejeu déterministe en test de charge)
+    """
+    return random.Random(graine)
+
+
+def rng_du_jour(jour: Optional[date] = None) -> random.Random:
+    """Générateur déterministe du jour (même séquence pour tous ce jour-là)"""
+    return random.Random(str(jour or date.today()))
+
+
+def _rng(rng: Optional[random.Random]) -> Any:
+    """rng fourni, sinon le module random global"""
+    return random if rng is None else rng
 
 
 # =============== EXERCICES DE BASE ===============
 
-def generer_addition(niveau: str) -> Dict[str, Any]:
+def generer_addition(niveau: str, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Génère exercice d'addition selon niveau.
 
     Args:
         niveau: CE1, CE2, CM1, ou CM2
+        rng: random.Random de la session (optionnel)
 
     Returns:
         Dict avec 'question' et 'reponse'
     """
-    if niveau == "CE1":
-        a, b = random.randint(1, 10), random.randint(1, 10)
-    elif niveau == "CE2":
-        a, b = random.randint(10, 50), random.randint(10, 50)
-    elif niveau == "CM1":
-        a, b = random.randint(50, 100), random.randint(50, 100)
-    else:  # CM2
-        a, b = random.randint(100, 200), random.randint(100, 200)
+    rng = _rng(rng)
+
+    (a_min, a_max), (b_min, b_max) = _plages(PLAGES_ADDITION, niveau)
+    a, b = rng.randint(a_min, a_max), rng.randint(b_min, b_max)
 
     return {
         'question': f"{a} + {b}",
@@ -35,24 +112,21 @@ def generer_addition(niveau: str) -> Dict[str, Any]:
     }
 
 
-def generer_soustraction(niveau: str) -> Dict[str, Any]:
+def generer_soustraction(niveau: str, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Génère exercice de soustraction selon niveau.
 
     Args:
         niveau: CE1, CE2, CM1, ou CM2
+        rng: random.Random de la session (optionnel)
 
     Returns:
         Dict avec 'question' et 'reponse'
     """
-    if niveau == "CE1":
-        a, b = random.randint(10, 20), random.randint(1, 10)
-    elif niveau == "CE2":
-        a, b = random.randint(50, 100), random.randint(10, 50)
-    elif niveau == "CM1":
-        a, b = random.randint(100, 500), random.randint(50, 100)
-    else:  # CM2
-        a, b = random.randint(500, 1000), random.randint(100, 500)
+    rng = _rng(rng)
+
+    (a_min, a_max), (b_min, b_max) = _plages(PLAGES_SOUSTRACTION, niveau)
+    a, b = rng.randint(a_min, a_max), rng.randint(b_min, b_max)
 
     return {
         'question': f"{a} - {b}",
@@ -60,24 +134,21 @@ def generer_soustraction(niveau: str) -> Dict[str, Any]:
     }
 
 
-def generer_tables(niveau: str) -> Dict[str, Any]:
+def generer_tables(niveau: str, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Génère exercice de multiplication (tables) selon niveau.
 
     Args:
         niveau: CE1, CE2, CM1, ou CM2
+        rng: random.Random de la session (optionnel)
 
     Returns:
         Dict avec 'question' et 'reponse'
     """
-    if niveau == "CE1":
-        table, mult = random.randint(2, 5), random.randint(1, 10)
-    elif niveau == "CE2":
-        table, mult = random.randint(2, 9), random.randint(1, 10)
-    elif niveau == "CM1":
-        table, mult = random.randint(1, 12), random.randint(1, 12)
-    else:  # CM2
-        table, mult = random.randint(1, 15), random.randint(1, 15)
+    rng = _rng(rng)
+
+    (t_min, t_max), (m_min, m_max) = _plages(PLAGES_TABLES, niveau)
+    table, mult = rng.randint(t_min, t_max), rng.randint(m_min, m_max)
 
     return {
         'question': f"{table} × {mult}",
@@ -85,69 +156,174 @@ def generer_tables(niveau: str) -> Dict[str, Any]:
     }
 
 
-def generer_division(niveau: str) -> Dict[str, Any]:
+def generer_division(niveau: str, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Génère exercice de division selon niveau.
 
     Args:
         niveau: CE1, CE2, CM1, ou CM2
+        rng: random.Random de la session (optionnel)
 
     Returns:
         Dict avec 'question', 'reponse', et 'reste'
     """
+    rng = _rng(rng)
+
     if niveau == "CE1":
         # CE1 : pas encore de divisions, fallback sur tables
-        return generer_tables(niveau)
-
-    elif niveau == "CE2":
-        # CE2 : divisions simples (quotient exact)
-        quotient = random.randint(2, 9)
-        diviseur = random.randint(2, 5)
-        dividende = quotient * diviseur
-
-    elif niveau == "CM1":
-        # CM1 : divisions plus grandes, avec ou sans reste
-        if random.random() < 0.7:  # 70% sans reste
-            quotient = random.randint(3, 12)
-            diviseur = random.randint(2, 9)
-            dividende = quotient * diviseur
-        else:  # 30% avec reste
-            diviseur = random.randint(3, 7)
-            quotient = random.randint(3, 9)
-            reste = random.randint(1, diviseur - 1)
-            dividende = (quotient * diviseur) + reste
+        return generer_tables(niveau, rng)
 
-    else:  # CM2
-        # CM2 : divisions complexes, souvent avec reste
-        if random.random() < 0.5:  # 50% sans reste
-            quotient = random.randint(5, 15)
-            diviseur = random.randint(3, 12)
-            dividende = quotient * diviseur
-        else:  # 50% avec reste
-            diviseur = random.randint(4, 9)
-            quotient = random.randint(4, 12)
-            reste = random.randint(1, diviseur - 1)
-            dividende = (quotient * diviseur) + reste
+    # CE2 : quotient exact; CM1 : 70% sans reste; CM2 : 50% sans reste
+    # Strate tirée selon ces proportions, puis division uniforme dans la strate
+    p_exacte, _, plages_reste = _plages(PLAGES_DIVISION, niveau)
+    strate = 0 if plages_reste is None or rng.random() < p_exacte else 1
+    tirage = get_catalogue("division", niveau).tirer(rng, strate)
 
     return {
-        'question': f"{dividende} ÷ {diviseur}",
-        'reponse': dividende // diviseur,
-        'reste': dividende % diviseur
+        'question': f"{tirage['dividende']} ÷ {tirage['diviseur']}",
+        'reponse': tirage['quotient'],
+        'reste': tirage['reste']
     }
 
 
+# =============== GÉNÉRATION PAR LOTS ===============
+
+@dataclass(frozen=True, eq=False)
+class ExerciceBatch:
+    """
+    Lot d'exercices en colonnes (tableaux NumPy)
+
+    Les dicts au format des générateurs unitaires ({'question', 'reponse'}
+    et 'reste' pour la division) ne sont construits qu'à l'accès:
+    batch[i], itération, ou batch[debut:fin] pour un sous-lot.
+    """
+    kind: str
+    symbole: str
+    a: np.ndarray
+    b: np.ndarray
+    reponses: np.ndarray
+    restes: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.a)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], "ExerciceBatch"]:
+        if isinstance(index, slice):
+            return ExerciceBatch(
+                kind=self.kind,
+                symbole=self.symbole,
+                a=self.a[index],
+                b=self.b[index],
+                reponses=self.reponses[index],
+                restes=None if self.restes is None else self.restes[index]
+            )
+
+        a, b = int(self.a[index]), int(self.b[index])
+        exercice = {
+            'question': f"{a} {self.symbole} {b}",
+            'reponse': int(self.reponses[index])
+        }
+        if self.restes is not None:
+            exercice['reste'] = int(self.restes[index])
+        return exercice
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _tirer(rng: np.random.Generator, plage: Tuple[int, int], n: int) -> np.ndarray:
+    """n entiers uniformes dans la plage (bornes incluses)"""
+    return rng.integers(plage[0], plage[1], size=n, endpoint=True)
+
+
+def _batch_operation(
+    kind: str,
+    symbole: str,
+    plages: Tuple[Tuple[int, int], Tuple[int, int]],
+    n: int,
+    rng: np.random.Generator
+) -> ExerciceBatch:
+    a = _tirer(rng, plages[0], n)
+    b = _tirer(rng, plages[1], n)
+    reponses = {"+": a + b, "-": a - b, "×": a * b}[symbole]
+    return ExerciceBatch(kind=kind, symbole=symbole, a=a, b=b, reponses=reponses)
+
+
+def _batch_division(niveau: str, n: int, rng: np.random.Generator) -> ExerciceBatch:
+    p_exacte, _, plages_reste = _plages(PLAGES_DIVISION, niveau)
+    if plages_reste is None:
+        strates = np.zeros(n, dtype=np.intp)
+    else:
+        strates = (rng.random(n) >= p_exacte).astype(np.intp)
+    tirage = get_catalogue("division", niveau).tirer_lot(rng, n, strates)
+
+    return ExerciceBatch(
+        kind="division",
+        symbole="÷",
+        a=tirage['dividende'].astype(np.int64),
+        b=tirage['diviseur'].astype(np.int64),
+        reponses=tirage['quotient'].astype(np.int64),
+        restes=tirage['reste'].astype(np.int64)
+    )
+
+
+def generer_batch(
+    kind: str,
+    niveau: str,
+    n: int,
+    rng: Union[np.random.Generator, int, None] = None
+) -> ExerciceBatch:
+    """
+    Génère n exercices d'un coup (fiches, pools d'échauffement, simulation).
+
+    Mêmes plages et mêmes distributions que les générateurs unitaires, mais
+    tirées avec un Generator NumPy.
+
+    Args:
+        kind: addition, soustraction, tables (ou multiplication), division
+        niveau: CE1, CE2, CM1, ou CM2
+        n: Nombre d'exercices
+        rng: Generator NumPy, graine entière, ou None (aléatoire)
+
+    Returns:
+        ExerciceBatch (colonnes a, b, reponses, restes)
+
+    Raises:
+        ValueError: Si kind est inconnu ou n négatif
+    """
+    if n < 0:
+        raise ValueError("n doit être >= 0")
+    rng = np.random.default_rng(rng)
+
+    if kind == "addition":
+        return _batch_operation(kind, "+", _plages(PLAGES_ADDITION, niveau), n, rng)
+    elif kind == "soustraction":
+        return _batch_operation(kind, "-", _plages(PLAGES_SOUSTRACTION, niveau), n, rng)
+    elif kind in ("tables", "multiplication") or (kind == "division" and niveau == "CE1"):
+        # CE1 : pas encore de divisions, fallback sur tables
+        return _batch_operation("tables", "×", _plages(PLAGES_TABLES, niveau), n, rng)
+    elif kind == "division":
+        return _batch_division(niveau, n, rng)
+
+    raise ValueError(f"Type d'exercice inconnu: {kind}")
+
+
 # =============== EXERCICES AVANCÉS ===============
 
-def generer_probleme(niveau: str) -> Dict[str, Any]:
+def generer_probleme(niveau: str, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Génère problème mathématique contextuel.
 
     Args:
         niveau: CE1, CE2, CM1, ou CM2
+        rng: random.Random de la session (optionnel)
 
     Returns:
         Dict avec 'question' et 'reponse'
     """
+    rng = _rng(rng)
+
     contextes = [
         ("Marie a {a} billes. Son ami lui en donne {b}.", "Combien a-t-elle ?", "addition"),
         ("Théo a {a} euros. Il achète quelque chose qui coûte {b} euros.", "Combien lui reste-t-il ?", "soustraction"),
@@ -155,7 +331,7 @@ def generer_probleme(niveau: str) -> Dict[str, Any]:
         ("On partage {a} bonbons entre {b} enfants.", "Combien chacun a ?", "division")
     ]
 
-    contexte_base, question, operation = random.choice(contextes)
+    contexte_base, question, operation = rng.choice(contextes)
 
     # Paramètres selon niveau: (a_min, a_max, b_min, b_max)
     params = {
@@ -165,7 +341,7 @@ def generer_probleme(niveau: str) -> Dict[str, Any]:
     }
     a1, a2, b1, b2 = params.get(niveau, (100, 500, 20, 100))
 
-    a, b = random.randint(a1, a2), random.randint(b1, b2)
+    a, b = rng.randint(a1, a2), rng.randint(b1, b2)
     contexte = contexte_base.format(a=a, b=b)
 
     # Calculer réponse selon opération
@@ -186,23 +362,26 @@ def generer_probleme(niveau: str) -> Dict[str, Any]:
     }
 
 
-def generer_droite_numerique(niveau: str) -> Dict[str, Any]:
+def generer_droite_numerique(niveau: str, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Génère exercice de droite numérique (estimation).
 
     Args:
         niveau: CE1, CE2, CM1, ou CM2
+        rng: random.Random de la session (optionnel)
 
     Returns:
         Dict avec 'nombre', 'min', 'max'
     """
+    rng = _rng(rng)
+
     max_val = {
         "CE1": 100,
         "CE2": 1000,
         "CM1": 10000
     }.get(niveau, 100000)
 
-    nombre = random.randint(0, max_val)
+    nombre = rng.randint(0, max_val)
 
     return {
         'nombre': nombre,
@@ -233,16 +412,19 @@ def calculer_score_droite(reponse: int, correct: int) -> Tuple[int, str]:
         return 0, f"Trop loin (distance: {distance})"
 
 
-def generer_memory_emoji(niveau: str) -> Dict[str, Any]:
+def generer_memory_emoji(niveau: str, rng: Optional[random.Random] = None) -> Dict[str, Any]:
     """
     Génère jeu de memory avec emojis.
 
     Args:
         niveau: CE1, CE2, CM1, ou CM2
+        rng: random.Random de la session (optionnel)
 
     Returns:
         Dict avec 'cards', 'revealed', 'matched'
     """
+    rng = _rng(rng)
+
     emojis = [
         '🍎', '🐶', '🎨', '🌟', '🎭', '🎸',
         '🚀', '🏆', '🎮', '🍕', '🐱', '⚽',
@@ -261,7 +443,7 @@ def generer_memory_emoji(niveau: str) -> Dict[str, Any]:
 
     # Dupliquer et mélanger
     cards = paires + paires
-    random.shuffle(cards)
+    rng.shuffle(cards)
 
     return {
         'cards': cards,
@@ -270,50 +452,104 @@ def generer_memory_emoji(niveau: str) -> Dict[str, Any]:
     }
 
 
-def generer_daily_challenge() -> Dict[str, Any]:
+DAILY_CHALLENGES = (
+    {
+        'type': 'addition',
+        'objectif': 5,
+        'text': 'Enchaîne 5 bonnes réponses en Addition'
+    },
+    {
+        'type': 'soustraction',
+        'objectif': 5,
+        'text': 'Enchaîne 5 bonnes réponses en Soustraction'
+    },
+    {
+        'type': 'tables',
+        'objectif': 5,
+        'text': 'Enchaîne 5 bonnes réponses aux Tables'
+    },
+    {
+        'type': 'droite',
+        'objectif': 3,
+        'text': 'Fais 3 bonnes estimations à la Droite'
+    }
+)
+
+
+@lru_cache(maxsize=8)
+def _daily_challenge(jour: str) -> Dict[str, Any]:
+    """Défi du jour, calculé une seule fois par jour et par processus"""
+    return rng_du_jour(date.fromisoformat(jour)).choice(DAILY_CHALLENGES)
+
+
+def generer_daily_challenge(jour: Optional[date] = None) -> Dict[str, Any]:
     """
     Génère défi du jour (même défi pour tous le même jour).
 
+    Utilise un générateur dédié au jour: l'état global de random n'est
+    plus réinitialisé (aucune interférence entre sessions).
+
+    Args:
+        jour: Date du défi (défaut: aujourd'hui)
+
     Returns:
         Dict avec 'type', 'objectif', 'text'
     """
-    today = str(date.today())
-
-    # Seed avec date pour avoir même défi chaque jour
-    random.seed(today)
-
-    challenges = [
-        {
-            'type': 'addition',
-            'objectif': 5,
-            'text': 'Enchaîne 5 bonnes réponses en Addition'
-        },
-        {
-            'type': 'soustraction',
-            'objectif': 5,
-            'text': 'Enchaîne 5 bonnes réponses en Soustraction'
-        },
-        {
-            'type': 'tables',
-            'objectif': 5,
-            'text': 'Enchaîne 5 bonnes réponses aux Tables'
-        },
-        {
-            'type': 'droite',
-            'objectif': 3,
-            'text': 'Fais 3 bonnes estimations à la Droite'
-        }
-    ]
+    return dict(_daily_challenge(str(jour or date.today())))
+
 
-    challenge = random.choice(challenges)
+# =============== EXPLICATIONS PÉDAGOGIQUES ===============
 
-    # Reset seed pour ne pas affecter autres générations
-    random.seed()
+# Explications mémoïsées par (type, opérandes, réponse correcte): l'espace
+# des questions CE1-CM2 est fini. Une table pré-calculée hors ligne
+# (scripts/compile_explications.py) peut être chargée au démarrage.
+# Pas de gabarits pré-compilés: le texte dépend des opérandes (décomposition,
+# retenues, restes), c'est donc le texte produit qui est mis en cache.
+# Table en JSON compressé (pas de pickle: le chemin est configurable).
+EXPLICATION_CACHE_SIZE = int(os.getenv('EXPLICATION_CACHE_SIZE', '4096'))
+EXPLICATIONS_TABLE_PATH = Path(os.getenv(
+    'EXPLICATIONS_TABLE_PATH',
+    str(Path(__file__).parent.parent / "data" / "explications.table.json.gz")
+))
 
-    return challenge
+# Version du format de la table (incrémenter si les explications changent)
+EXPLICATIONS_FORMAT_VERSION = 2
 
+_SYMBOLES_EXPLICATION = {
+    "addition": "+",
+    "soustraction": "-",
+    "multiplication": "×",
+    "division": "÷",
+}
+
+_QUESTION_RE = re.compile(r"^\s*(\d+)\s*([+\-×÷])\s*(\d+)\s*$")
+
+_explication_cache = LRUCache(maxsize=EXPLICATION_CACHE_SIZE)
+
+# (type, a, b) -> explication pour la réponse correcte canonique
+_table_explications: Dict[Tuple[str, int, int], str] = {}
+_table_tentee = False
+_table_lock = threading.Lock()
+
+
+def _operandes(exercice_type: str, question: str) -> Optional[Tuple[int, int]]:
+    """Opérandes de la question, None si elle n'a pas la forme « a op b »"""
+    match = _QUESTION_RE.match(question) if isinstance(question, str) else None
+    if match is None or match.group(2) != _SYMBOLES_EXPLICATION[exercice_type]:
+        return None
+    return int(match.group(1)), int(match.group(3))
+
+
+def _reponse_canonique(exercice_type: str, a: int, b: int) -> int:
+    """Réponse correcte attendue pour les opérandes (quotient pour la division)"""
+    if exercice_type == "addition":
+        return a + b
+    if exercice_type == "soustraction":
+        return a - b
+    if exercice_type == "multiplication":
+        return a * b
+    return a // b
 
-# =============== EXPLICATIONS PÉDAGOGIQUES ===============
 
 def generer_explication(
     exercice_type: str,
@@ -324,6 +560,9 @@ def generer_explication(
     """
     Génère explication pédagogique selon type d'exercice et erreur.
 
+    Résultat mémoïsé par (type, question normalisée, réponse correcte);
+    la table hors ligne est consultée en premier si elle est chargée.
+
     Args:
         exercice_type: Type exercice (addition, soustraction, multiplication, division)
         question: Question posée (ex: "5 + 3")
@@ -333,6 +572,179 @@ def generer_explication(
     Returns:
         Texte markdown avec explication détaillée
     """
+    if exercice_type not in _SYMBOLES_EXPLICATION:
+        return "Regarde bien le calcul et réessaye!"
+
+    operandes = _operandes(exercice_type, question)
+    if operandes is None:
+        # Question hors format: calcul direct, sans cache
+        return _expliquer(exercice_type, question, reponse_correcte)
+
+    a, b = operandes
+    if exercice_type == "division":
+        if b == 0:
+            return _expliquer(exercice_type, question, reponse_correcte)
+        # La réponse n'intervient pas dans l'explication de la division
+        reponse_correcte = None
+
+    if reponse_correcte is None or (
+        type(reponse_correcte) is int
+        and reponse_correcte == _reponse_canonique(exercice_type, a, b)
+    ):
+        texte = _table_explications.get((exercice_type, a, b))
+        if texte is not None:
+            return texte
+
+    key = make_key(exercice_type, a, b, reponse_correcte)
+    if key is None:
+        return _expliquer(exercice_type, question, reponse_correcte)
+
+    symbole = _SYMBOLES_EXPLICATION[exercice_type]
+    return _explication_cache.get_or_compute(
+        key,
+        lambda: _expliquer(exercice_type, f"{a} {symbole} {b}", reponse_correcte)
+    )
+
+
+def get_explication_stats() -> Dict[str, Any]:
+    """Statistiques du cache d'explications et de la table hors ligne"""
+    return dict(_explication_cache.stats(), table_size=len(_table_explications))
+
+
+def vider_cache_explications() -> None:
+    """Vide le cache d'explications (la table chargée est conservée)"""
+    _explication_cache.clear()
+
+
+def espace_explications(niveaux: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, int, int]]:
+    """
+    Énumère les (type, a, b) que les générateurs peuvent produire
+
+    Args:
+        niveaux: Niveaux à couvrir (défaut: CE1 à CM2)
+    """
+    niveaux = list(niveaux or PLAGES_ADDITION)
+
+    def plages_uniques(table):
+        # CE1 n'a pas de division (repli sur les tables)
+        return list(dict.fromkeys(table[niveau] for niveau in niveaux if niveau in table))
+
+    for exercice_type, table in (
+        ("addition", PLAGES_ADDITION),
+        ("soustraction", PLAGES_SOUSTRACTION),
+        ("multiplication", PLAGES_TABLES),
+    ):
+        for (a_min, a_max), (b_min, b_max) in plages_uniques(table):
+            for a in range(a_min, a_max + 1):
+                for b in range(b_min, b_max + 1):
+                    yield exercice_type, a, b
+
+    for _, (plage_q, plage_d), plages_reste in plages_uniques(PLAGES_DIVISION):
+        for q in range(plage_q[0], plage_q[1] + 1):
+            for d in range(plage_d[0], plage_d[1] + 1):
+                yield "division", q * d, d
+        if plages_reste is not None:
+            (d_min, d_max), (q_min, q_max) = plages_reste
+            for d in range(d_min, d_max + 1):
+                for q in range(q_min, q_max + 1):
+                    for reste in range(1, d):
+                        yield "division", q * d + reste, d
+
+
+def construire_table_explications(
+    niveaux: Optional[Iterable[str]] = None
+) -> Dict[Tuple[str, int, int], str]:
+    """Pré-calcule les explications de tout l'espace des questions (hors ligne)"""
+    table = {}
+    for exercice_type, a, b in espace_explications(niveaux):
+        key = (exercice_type, a, b)
+        if key not in table:
+            symbole = _SYMBOLES_EXPLICATION[exercice_type]
+            reponse = None if exercice_type == "division" else _reponse_canonique(exercice_type, a, b)
+            table[key] = _expliquer(exercice_type, f"{a} {symbole} {b}", reponse)
+    return table
+
+
+def ecrire_table_explications(
+    table: Dict[Tuple[str, int, int], str],
+    path: Optional[Path] = None
+) -> Path:
+    """
+    Écrit la table compressée (gzip + JSON) de façon atomique
+
+    Format: {"format_version": 2, "explications": {type: [[a, b, texte], ...]}}
+    """
+    path = Path(path or EXPLICATIONS_TABLE_PATH)
+    par_type: Dict[str, List[List[Any]]] = {}
+    for (exercice_type, a, b), texte in table.items():
+        par_type.setdefault(exercice_type, []).append([a, b, texte])
+
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(json.dumps(
+                {'format_version': EXPLICATIONS_FORMAT_VERSION, 'explications': par_type},
+                ensure_ascii=False, separators=(",", ":")
+            ).encode('utf-8'))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return path
+
+
+def charger_table_explications(path: Optional[Path] = None) -> int:
+    """
+    Charge la table pré-calculée (à appeler au démarrage)
+
+    Une table absente, illisible ou d'une autre version est ignorée:
+    les explications sont alors calculées à la demande.
+
+    Returns:
+        Nombre d'explications chargées
+    """
+    global _table_explications
+    try:
+        with gzip.open(Path(path or EXPLICATIONS_TABLE_PATH), 'rt', encoding='utf-8') as f:
+            data = json.loads(f.read())
+        if data.get('format_version') != EXPLICATIONS_FORMAT_VERSION:
+            return 0
+        table = {
+            (exercice_type, a, b): texte
+            for exercice_type, lignes in data['explications'].items()
+            for a, b, texte in lignes
+        }
+    except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError):
+        return 0
+
+    with _table_lock:
+        _table_explications = table
+    return len(_table_explications)
+
+
+def preparer_explications() -> None:
+    """Charge la table pré-calculée une seule fois par processus"""
+    global _table_tentee
+    if _table_tentee:
+        return
+    with _table_lock:
+        if _table_tentee:
+            return
+        _table_tentee = True
+    charger_table_explications()
+
+
+def decharger_table_explications() -> None:
+    """Oublie la table chargée (tests)"""
+    global _table_explications, _table_tentee
+    with _table_lock:
+        _table_explications = {}
+        _table_tentee = False
+
+
+def _expliquer(exercice_type: str, question: str, reponse_correcte: Any) -> str:
+    """Explication calculée sans cache"""
     if exercice_type == "addition":
         return _expliquer_addition(question, reponse_correcte)
     elif exercice_type == "soustraction":
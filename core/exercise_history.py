@@ -0,0 +1,406 @@
+"""
+Exercise History - Historique d'exercices compact (tampon circulaire)
+Remplace la liste de dicts profil['exercise_history']
+
+Colonnes parallèles NumPy de capacité fixe (HISTORIQUE_MAX): code du
+type, réussite, difficulté, instant (µs, cf. skill_state.microsecondes)
+et temps de réponse. Chaque élément est écrit deux fois (en i et en
+i + capacité): les derniers éléments sont toujours contigus, colonnes()
+renvoie des vues sans copie et ajouter() est en O(1), sans recopie de
+liste au-delà de 100 exercices.
+
+Au-delà de la capacité, l'exercice écrasé part dans une archive
+(ArchiveHistorique): journal JSON Lines par élève, en ajout seul, dans
+HISTORY_ARCHIVE_DIR. La fenêtre récente reste dans le profil (mémoire
+constante par session), l'historique complet est conservé. tout() et
+derniers() lisent les deux niveaux à la demande, l'archive en flux.
+
+Chaque exercice est numéroté (compteur 'sequence' sauvé avec le
+profil, numéro 'seq' écrit dans l'archive). L'archive est écrite avant
+la sauvegarde du profil: après un arrêt brutal ou une session non
+sauvée, le profil rechargé réarchiverait les mêmes exercices. Ceux dont
+le numéro est déjà dans l'archive sont ignorés.
+
+Compatibilité: l'historique se lit comme l'ancienne liste (len, index,
+tranches, itération) et produit les mêmes dicts {type, correct,
+difficulty, timestamp, time_taken}. depuis() lit l'ancien format (liste
+de dicts) comme le format compact de to_dict().
+
+Exemple:
+    historique = historique_exercices(profil)
+    historique.ajouter("addition", True, difficulty=3)
+    historique[-1]['timestamp']         # '2026-03-15T14:30:12.345678'
+    historique.colonnes().correct       # vue NumPy, ordre chronologique
+"""
+
+import base64
+import json
+import math
+import os
+import uuid
+from collections import deque
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from .skill_state import HISTORIQUE_MAX, Moment, microsecondes
+
+HISTORY_FORMAT = 'anneau'
+HISTORY_VERSION = 1
+
+# Journaux des exercices sortis de la fenêtre récente ('' = pas d'archive)
+HISTORY_ARCHIVE_DIR = os.getenv('HISTORY_ARCHIVE_DIR', './data/historique')
+
+# Taille des blocs lus depuis la fin du journal
+_BLOC_LECTURE = 1 << 16
+
+_EPOCH = np.datetime64('1970-01-01T00:00:00', 'us')
+
+# Colonnes: nom → dtype (ordre de sérialisation)
+_COLONNES = {
+    'type': np.int16,
+    'correct': np.bool_,
+    'difficulty': np.int16,
+    'instant': np.int64,
+    'time_taken': np.float64,   # NaN: non renseigné
+}
+
+
+class Colonnes(NamedTuple):
+    """Vues en lecture seule, de la plus ancienne à la plus récente"""
+    type: np.ndarray
+    correct: np.ndarray
+    difficulty: np.ndarray
+    instant: np.ndarray
+    time_taken: np.ndarray
+
+
+class ArchiveHistorique:
+    """
+    Journal des exercices anciens d'un élève (une ligne JSON par exercice)
+
+    Ajout seul; lecture en flux, du plus ancien au plus récent (__iter__)
+    ou depuis la fin (inverse), sans charger le fichier en mémoire.
+    """
+
+    def __init__(self, chemin: Union[str, Path]):
+        self.chemin = Path(chemin)
+        self._dossier_cree = False
+
+    def ajouter(self, enregistrement: Dict[str, Any], sequence: Optional[int] = None) -> None:
+        """Ajoute une ligne (un seul write() en O_APPEND: pas d'entrelacement)"""
+        if not self._dossier_cree:
+            self.chemin.parent.mkdir(parents=True, exist_ok=True)
+            self._dossier_cree = True
+        if sequence is not None:
+            enregistrement = {**enregistrement, 'seq': sequence}
+        ligne = (json.dumps(enregistrement, ensure_ascii=False) + '\n').encode('utf-8')
+        fd = os.open(self.chemin, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, ligne)
+        finally:
+            os.close(fd)
+
+    def derniere_sequence(self) -> int:
+        """Numéro du dernier exercice archivé (0: archive vide ou sans numéros)"""
+        for enregistrement in self._inverse():
+            return enregistrement.get('seq', 0)
+        return 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        try:
+            f = open(self.chemin, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for ligne in f:
+                enregistrement = self._lire(ligne)
+                if enregistrement is not None:
+                    enregistrement.pop('seq', None)
+                    yield enregistrement
+
+    def inverse(self) -> Iterator[Dict[str, Any]]:
+        """Du plus récent au plus ancien (blocs lus depuis la fin)"""
+        for enregistrement in self._inverse():
+            enregistrement.pop('seq', None)
+            yield enregistrement
+
+    def _inverse(self) -> Iterator[Dict[str, Any]]:
+        try:
+            f = open(self.chemin, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            position = f.seek(0, os.SEEK_END)
+            reste = b''
+            while position > 0:
+                taille = min(_BLOC_LECTURE, position)
+                position -= taille
+                f.seek(position)
+                lignes = (f.read(taille) + reste).split(b'\n')
+                reste = lignes[0]
+                for ligne in reversed(lignes[1:]):
+                    enregistrement = self._lire(ligne)
+                    if enregistrement is not None:
+                        yield enregistrement
+            enregistrement = self._lire(reste)
+            if enregistrement is not None:
+                yield enregistrement
+
+    @staticmethod
+    def _lire(ligne: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        # Ligne vide ou tronquée (écriture interrompue): ignorée
+        try:
+            return json.loads(ligne) if ligne.strip() else None
+        except ValueError:
+            return None
+
+
+class HistoriqueExercices:
+    """Derniers exercices d'un élève (capacité fixe, plus ancien archivé ou écrasé)"""
+
+    def __init__(self, capacite: int = HISTORIQUE_MAX, archive: Optional[ArchiveHistorique] = None):
+        self.capacite = capacite
+        self.archive = archive
+        self.types: List[str] = []          # code → nom du type
+        self._codes: Dict[str, int] = {}
+        self._colonnes = {nom: np.zeros(2 * capacite, dtype=dtype) for nom, dtype in _COLONNES.items()}
+        self._fin = 0                       # position d'écriture (modulo capacite)
+        self._n = 0
+        self._sequence = 0                  # exercices ajoutés depuis le début
+        self._archive_jusqua: Optional[int] = None  # dernier numéro archivé (lu au besoin)
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def ajouter(
+        self,
+        exercise_type: str,
+        correct: bool,
+        difficulty: int = 3,
+        moment: Moment = None,
+        time_taken: Optional[float] = None
+    ) -> None:
+        """Ajoute un exercice (O(1)), le plus ancien est écrasé si plein"""
+        code = self._codes.get(exercise_type)
+        if code is None:
+            code = len(self.types)
+            self.types.append(exercise_type)
+            self._codes[exercise_type] = code
+
+        i = self._fin
+        if self._n == self.capacite and self.archive is not None:
+            # Case i: le plus ancien, sur le point d'être écrasé
+            numero = self._sequence - self.capacite + 1
+            if self._archive_jusqua is None:
+                self._archive_jusqua = self.archive.derniere_sequence()
+            if numero > self._archive_jusqua:
+                # Sinon déjà archivé par une session non sauvegardée
+                self.archive.ajouter(self._enregistrement(Colonnes(*self._colonnes.values()), i), numero)
+                self._archive_jusqua = numero
+        valeurs = (code, bool(correct), difficulty, microsecondes(moment),
+                   np.nan if time_taken is None else time_taken)
+        for colonne, valeur in zip(self._colonnes.values(), valeurs):
+            colonne[i] = colonne[i + self.capacite] = valeur
+
+        self._fin = (i + 1) % self.capacite
+        self._n = min(self._n + 1, self.capacite)
+        self._sequence += 1
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def colonnes(self) -> Colonnes:
+        """Vues sans copie sur les exercices, ordre chronologique"""
+        debut = (self._fin - self._n) % self.capacite
+        vues = []
+        for colonne in self._colonnes.values():
+            vue = colonne[debut:debut + self._n]
+            vue.flags.writeable = False
+            vues.append(vue)
+        return Colonnes(*vues)
+
+    def code(self, exercise_type: str) -> Optional[int]:
+        """Code du type dans colonnes().type (None si jamais pratiqué)"""
+        return self._codes.get(exercise_type)
+
+    def derniers(self, n: int, exercise_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        n derniers exercices (d'un type), seuls ceux-là sont convertis en
+        dicts. L'archive n'est lue (depuis la fin) que si la fenêtre
+        récente n'en contient pas assez.
+        """
+        if n <= 0:
+            return []
+        colonnes = self.colonnes()
+        if exercise_type is None:
+            indices = range(max(self._n - n, 0), self._n)
+        else:
+            code = self._codes.get(exercise_type)
+            indices = [] if code is None else np.flatnonzero(colonnes.type == code)[-n:]
+        recents = [self._enregistrement(colonnes, int(i)) for i in indices]
+
+        manquants = n - len(recents)
+        if manquants > 0 and self.archive is not None:
+            anciens = deque()
+            for ex in self.archive.inverse():
+                if exercise_type is None or ex.get('type') == exercise_type:
+                    anciens.appendleft(ex)
+                    if len(anciens) == manquants:
+                        break
+            recents[:0] = anciens
+        return recents
+
+    def tout(self) -> Iterator[Dict[str, Any]]:
+        """Historique complet, archive puis fenêtre récente (lecture en flux)"""
+        if self.archive is None:
+            return iter(self)
+        return chain(self.archive, self)
+
+    def _enregistrement(self, colonnes: Colonnes, i: int) -> Dict[str, Any]:
+        time_taken = float(colonnes.time_taken[i])
+        return {
+            'type': self.types[colonnes.type[i]],
+            'correct': bool(colonnes.correct[i]),
+            'difficulty': int(colonnes.difficulty[i]),
+            'timestamp': (_EPOCH + np.timedelta64(int(colonnes.instant[i]), 'us')).item().isoformat(),
+            'time_taken': None if math.isnan(time_taken) else time_taken,
+        }
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        colonnes = self.colonnes()
+        for i in range(self._n):
+            yield self._enregistrement(colonnes, i)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        colonnes = self.colonnes()
+        if isinstance(index, slice):
+            return [self._enregistrement(colonnes, i) for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("Index hors de l'historique")
+        return self._enregistrement(colonnes, index)
+
+    def __eq__(self, autre: object) -> bool:
+        if isinstance(autre, HistoriqueExercices):
+            autre = list(autre)
+        if isinstance(autre, list):
+            return list(self) == autre
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"HistoriqueExercices({self._n}/{self.capacite})"
+
+    # ------------------------------------------------------------------
+    # Sérialisation
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Forme compacte JSON: colonnes en base64 (little-endian)"""
+        colonnes = self.colonnes()
+        return {
+            'format': HISTORY_FORMAT,
+            'version': HISTORY_VERSION,
+            'capacite': self.capacite,
+            'sequence': self._sequence,
+            'types': list(self.types),
+            'colonnes': {
+                nom: base64.b64encode(vue.astype(vue.dtype.newbyteorder('<'), copy=False).tobytes()).decode('ascii')
+                for nom, vue in zip(_COLONNES, colonnes)
+            },
+        }
+
+    @classmethod
+    def depuis(
+        cls,
+        donnees: Union[None, List[Dict[str, Any]], Dict[str, Any], "HistoriqueExercices"],
+        capacite: int = HISTORIQUE_MAX,
+        archive: Optional[ArchiveHistorique] = None
+    ) -> "HistoriqueExercices":
+        """
+        Historique depuis le format compact ou l'ancienne liste de dicts
+        (au-delà de la capacité, les plus anciens vont dans l'archive)
+
+        Raises:
+            ValueError: Si le format compact est inconnu ou incohérent
+        """
+        if isinstance(donnees, HistoriqueExercices):
+            return donnees
+        historique = cls(capacite, archive)
+        if not donnees:
+            return historique
+
+        if isinstance(donnees, dict):
+            if donnees.get('format') != HISTORY_FORMAT or donnees.get('version') != HISTORY_VERSION:
+                raise ValueError("Format d'historique inconnu")
+            historique.types = list(donnees['types'])
+            historique._codes = {nom: code for code, nom in enumerate(historique.types)}
+            colonnes = [
+                np.frombuffer(base64.b64decode(donnees['colonnes'][nom]), dtype=np.dtype(dtype).newbyteorder('<'))
+                for nom, dtype in _COLONNES.items()
+            ]
+            n = len(colonnes[0])
+            if any(len(colonne) != n for colonne in colonnes):
+                raise ValueError("Colonnes d'historique de longueurs différentes")
+            n = min(n, capacite)
+            for colonne, valeurs in zip(historique._colonnes.values(), colonnes):
+                colonne[:n] = colonne[capacite:capacite + n] = valeurs[len(valeurs) - n:]
+            historique._n = n
+            historique._fin = n % capacite
+            historique._sequence = max(int(donnees.get('sequence', len(colonnes[0]))), n)
+            return historique
+
+        # Ancien format: liste de dicts
+        maintenant = datetime.now()
+        for ex in donnees:
+            historique.ajouter(
+                ex.get('type'), ex.get('correct'), ex.get('difficulty', 3),
+                ex.get('timestamp') or maintenant, ex.get('time_taken')
+            )
+        return historique
+
+
+def archive_profil(profil: Dict[str, Any], archive_dir: Optional[str] = None) -> Optional[ArchiveHistorique]:
+    """
+    Archive du profil, identifiée par profil['history_archive'] (créé au
+    premier appel). None si l'archivage est désactivé.
+    """
+    archive_dir = HISTORY_ARCHIVE_DIR if archive_dir is None else archive_dir
+    if not archive_dir:
+        return None
+    identifiant = profil.setdefault('history_archive', uuid.uuid4().hex)
+    return ArchiveHistorique(Path(archive_dir) / f"{identifiant}.jsonl")
+
+
+def historique_exercices(profil: Dict[str, Any], archive_dir: Optional[str] = None) -> HistoriqueExercices:
+    """
+    Historique du profil, converti sur place si stocké en liste de dicts
+    ou sous forme compacte (profil chargé depuis le disque), avec son
+    archive (HISTORY_ARCHIVE_DIR par défaut)
+    """
+    historique = profil.get('exercise_history')
+    if not isinstance(historique, HistoriqueExercices):
+        historique = HistoriqueExercices.depuis(historique, archive=archive_profil(profil, archive_dir))
+        profil['exercise_history'] = historique
+    elif historique.archive is None:
+        historique.archive = archive_profil(profil, archive_dir)
+    return historique
+
+
+def profil_serialisable(profil: Dict[str, Any]) -> Dict[str, Any]:
+    """Copie superficielle du profil prête pour JSON (historique compact)"""
+    historique = profil.get('exercise_history')
+    if not isinstance(historique, HistoriqueExercices):
+        return profil
+    copie = dict(profil)
+    copie['exercise_history'] = historique.to_dict()
+    return copie
@@ -0,0 +1,371 @@
+"""
+Exercise Pool - Pools d'exercices pré-générés par (type, niveau)
+Les callbacks « exercice suivant » prennent un exercice prêt en O(1);
+un thread de fond remet chaque pool à niveau sous le seuil de remplissage.
+
+Exemple:
+    pool = get_exercise_pool()
+    st.session_state.exercice_courant = pool.pop("addition", "CE2")
+    pool.stats()  # hits, underruns (pool vide → génération synchrone), ...
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from . import exercise_generator
+
+
+# Taille de chaque pool et seuil sous lequel un remplissage est demandé
+POOL_SIZE = int(os.getenv('EXERCISE_POOL_SIZE', '32'))
+POOL_REFILL_THRESHOLD = int(os.getenv('EXERCISE_POOL_REFILL_THRESHOLD', '8'))
+
+# (niveau, n) -> n exercices
+BatchGenerator = Callable[[str, int], Iterable[Any]]
+
+PoolKey = Tuple[str, str]
+
+# Générateurs aléatoires propres à chaque thread (aucun état global partagé)
+_thread_rngs = threading.local()
+
+
+def _thread_random() -> random.Random:
+    """random.Random du thread courant"""
+    rng = getattr(_thread_rngs, "random", None)
+    if rng is None:
+        rng = _thread_rngs.random = exercise_generator.rng_session()
+    return rng
+
+
+def _thread_numpy() -> np.random.Generator:
+    """Generator NumPy du thread courant"""
+    rng = getattr(_thread_rngs, "numpy", None)
+    if rng is None:
+        rng = _thread_rngs.numpy = np.random.default_rng()
+    return rng
+
+
+def batch_from_scalar(generate: Callable[[str], Any]) -> BatchGenerator:
+    """
+    Adapte un générateur unitaire generer_x(niveau) en générateur par lots
+
+    Un tirage qui lève une exception est ignoré pour ne pas perdre tout le
+    lot; l'exception n'est propagée que si aucun exercice n'a été produit.
+    """
+    def generate_batch(niveau: str, n: int) -> List[Any]:
+        exercices = []
+        error: Optional[Exception] = None
+        for _ in range(n):
+            try:
+                exercices.append(generate(niveau))
+            except Exception as e:
+                error = e
+        if not exercices and error is not None:
+            raise error
+        return exercices
+    return generate_batch
+
+
+def _batch_kind(kind: str) -> BatchGenerator:
+    """Générateur vectorisé (generer_batch) pour les 4 opérations de base"""
+    def generate_batch(niveau: str, n: int) -> Iterable[Any]:
+        return exercise_generator.generer_batch(kind, niveau, n, rng=_thread_numpy())
+    return generate_batch
+
+
+def _with_thread_random(generate: Callable[..., Any]) -> Callable[[str], Any]:
+    """Générateur unitaire appelé avec le random.Random du thread courant"""
+    def generate_one(niveau: str) -> Any:
+        return generate(niveau, rng=_thread_random())
+    return generate_one
+
+
+def default_generators() -> Dict[str, BatchGenerator]:
+    """
+    Générateurs enregistrés par défaut, par type d'exercice
+
+    Les modules de domaine (décimaux, mesures, ...) sont importés ici
+    pour que `core` reste importable sans eux.
+    """
+    import decimaux_utils
+    import mesures_utils
+    import monnaie_utils
+    import proportionnalite_utils
+
+    generators: Dict[str, BatchGenerator] = {
+        kind: _batch_kind(kind)
+        for kind in ("addition", "soustraction", "tables", "division")
+    }
+    generators["probleme"] = batch_from_scalar(
+        _with_thread_random(exercise_generator.generer_probleme)
+    )
+    generators["droite_numerique"] = batch_from_scalar(
+        _with_thread_random(exercise_generator.generer_droite_numerique)
+    )
+
+    domain_generators = {
+        decimaux_utils: (
+            "droite_decimale", "comparaison_decimaux", "addition_decimaux",
+            "soustraction_decimaux", "multiplication_par_10_100", "fraction_vers_decimal"
+        ),
+        mesures_utils: (
+            "conversion_longueur", "conversion_masse", "conversion_capacite", "probleme_duree"
+        ),
+        proportionnalite_utils: (
+            "tableau_proportionnalite", "regle_de_trois", "pourcentage_simple",
+            "echelle", "vitesse"
+        ),
+        monnaie_utils: (
+            "calcul_rendu", "composition_monnaie", "probleme_realiste"
+        ),
+    }
+    for module, kinds in domain_generators.items():
+        for kind in kinds:
+            generators[kind] = batch_from_scalar(getattr(module, f"generer_{kind}"))
+    return generators
+
+
+class ExercisePool:
+    """
+    Pools d'exercices par (type, niveau), remplis en arrière-plan.
+
+    Chaque pool est un tampon circulaire (deque bornée): pop() en O(1).
+    Quand un pool passe sous `refill_threshold`, le thread de fond le
+    remplit jusqu'à `pool_size`. Un pool vide n'est jamais bloquant:
+    l'exercice est généré immédiatement et compté comme underrun.
+    """
+
+    def __init__(
+        self,
+        generators: Optional[Dict[str, BatchGenerator]] = None,
+        pool_size: Optional[int] = None,
+        refill_threshold: Optional[int] = None,
+        autostart: bool = True
+    ):
+        """
+        Args:
+            generators: type -> générateur par lots (défaut: default_generators())
+            pool_size: Capacité de chaque pool (défaut: POOL_SIZE)
+            refill_threshold: Remplissage demandé à partir de ce niveau
+                (défaut: POOL_REFILL_THRESHOLD)
+            autostart: Démarre le thread de fond immédiatement
+
+        Raises:
+            ValueError: Si les tailles sont incohérentes
+        """
+        self.pool_size = POOL_SIZE if pool_size is None else pool_size
+        self.refill_threshold = POOL_REFILL_THRESHOLD if refill_threshold is None else refill_threshold
+        if self.pool_size < 1:
+            raise ValueError("pool_size doit être >= 1")
+        if not 0 <= self.refill_threshold < self.pool_size:
+            raise ValueError("refill_threshold doit être dans [0, pool_size[")
+
+        self._generators = dict(default_generators() if generators is None else generators)
+        self._pools: Dict[PoolKey, Deque[Any]] = {}
+        self._stats: Dict[PoolKey, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+        # File des pools à remplir (dédupliquée par _pending)
+        self._requests: "queue.Queue[Optional[PoolKey]]" = queue.Queue()
+        self._pending: Set[PoolKey] = set()
+        self._worker: Optional[threading.Thread] = None
+
+        if autostart:
+            self.start()
+
+    # ----- API -----
+
+    def register(self, kind: str, generator: BatchGenerator) -> None:
+        """Enregistre (ou remplace) le générateur d'un type d'exercice"""
+        with self._lock:
+            self._generators[kind] = generator
+            for key in [k for k in self._pools if k[0] == kind]:
+                self._pools[key].clear()
+
+    def kinds(self) -> List[str]:
+        """Types d'exercices disponibles"""
+        return sorted(self._generators)
+
+    def pop(self, kind: str, niveau: str) -> Any:
+        """
+        Retourne le prochain exercice du pool (type, niveau)
+
+        Raises:
+            ValueError: Si le type d'exercice est inconnu
+        """
+        key = (kind, niveau)
+        pool = self._get_pool(key)
+        try:
+            exercice = pool.popleft()
+            self._count(key, "hits")
+        except IndexError:
+            # Pool vide: génération synchrone, comme sans pool
+            self._count(key, "underruns")
+            exercice = next(iter(self._generators[kind](niveau, 1)))
+
+        if len(pool) <= self.refill_threshold:
+            self._request_refill(key)
+        return exercice
+
+    def prefill(self, kind: str, niveau: str) -> None:
+        """Remplit le pool (type, niveau) immédiatement, dans le thread appelant"""
+        self._fill(kind, niveau)
+
+    def warm(self, niveaux: Iterable[str], kinds: Optional[Iterable[str]] = None) -> None:
+        """Demande le remplissage en arrière-plan des pools sous le seuil"""
+        for niveau in niveaux:
+            for kind in (self.kinds() if kinds is None else kinds):
+                if len(self._get_pool((kind, niveau))) <= self.refill_threshold:
+                    self._request_refill((kind, niveau))
+
+    def size(self, kind: str, niveau: str) -> int:
+        """Nombre d'exercices prêts dans le pool"""
+        pool = self._pools.get((kind, niveau))
+        return len(pool) if pool is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Métriques pour monitoring
+
+        Returns:
+            {'pools': {'addition/CE2': {size, hits, underruns, refills,
+            generated, errors, refill_ms}}, 'hits': ..., 'underruns': ...,
+            'underrun_rate': ...}
+        """
+        with self._lock:
+            pools = {
+                f"{kind}/{niveau}": dict(stats, size=len(self._pools[(kind, niveau)]))
+                for (kind, niveau), stats in self._stats.items()
+            }
+        hits = sum(p["hits"] for p in pools.values())
+        underruns = sum(p["underruns"] for p in pools.values())
+        return {
+            "pool_size": self.pool_size,
+            "refill_threshold": self.refill_threshold,
+            "pools": pools,
+            "hits": hits,
+            "underruns": underruns,
+            "underrun_rate": underruns / (hits + underruns) if hits + underruns else 0.0
+        }
+
+    # ----- Thread de fond -----
+
+    def start(self) -> None:
+        """Démarre le thread de remplissage (sans effet s'il tourne déjà)"""
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="exercise-pool", daemon=True
+            )
+            self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête le thread de remplissage (les pools restent utilisables)"""
+        worker = self._worker
+        if worker is None:
+            return
+        self._requests.put(None)
+        worker.join(timeout)
+        with self._lock:
+            self._worker = None
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Attend que toutes les demandes de remplissage soient traitées"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+
+    def _run(self) -> None:
+        while True:
+            key = self._requests.get()
+            if key is None:
+                return
+            try:
+                self._fill(*key)
+            except Exception:
+                # Un générateur défaillant ne doit pas arrêter le thread;
+                # pop() retombera sur la génération synchrone
+                self._count(key, "errors")
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+    # ----- Interne -----
+
+    def _get_pool(self, key: PoolKey) -> Deque[Any]:
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+        if key[0] not in self._generators:
+            raise ValueError(f"Type d'exercice inconnu: {key[0]}")
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = deque(maxlen=self.pool_size)
+                self._stats[key] = {
+                    "hits": 0, "underruns": 0, "refills": 0,
+                    "generated": 0, "errors": 0, "refill_ms": 0.0
+                }
+            return self._pools[key]
+
+    def _count(self, key: PoolKey, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self._stats[key][counter] += amount
+
+    def _request_refill(self, key: PoolKey) -> None:
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._requests.put(key)
+
+    def _fill(self, kind: str, niveau: str) -> None:
+        key = (kind, niveau)
+        pool = self._get_pool(key)
+        missing = self.pool_size - len(pool)
+        if missing <= 0:
+            return
+
+        start = time.perf_counter()
+        exercices = list(self._generators[kind](niveau, missing))
+        pool.extend(exercices)
+
+        with self._lock:
+            stats = self._stats[key]
+            stats["refills"] += 1
+            stats["generated"] += len(exercices)
+            stats["refill_ms"] += (time.perf_counter() - start) * 1000
+
+
+_pool_lock = threading.Lock()
+_exercise_pool: Optional[ExercisePool] = None
+
+
+def get_exercise_pool() -> ExercisePool:
+    """Retourne le pool partagé par processus (créé et démarré au premier appel)"""
+    global _exercise_pool
+    if _exercise_pool is None:
+        with _pool_lock:
+            if _exercise_pool is None:
+                _exercise_pool = ExercisePool()
+    return _exercise_pool
+
+
+def reset_exercise_pool() -> None:
+    """Arrête et oublie le pool partagé (tests)"""
+    global _exercise_pool
+    with _pool_lock:
+        pool, _exercise_pool = _exercise_pool, None
+    if pool is not None:
+        pool.stop(timeout=1)
@@ -0,0 +1,292 @@
+"""
+Exercise Sampler - Tirage sans répétition récente, par élève
+Évite de reposer « 7 × 8 » trois fois de suite.
+
+Les exercices de base (addition, soustraction, tables, division) sont
+tirés par index dans un espace d'opérandes énuméré: paires (a, b) des
+plages de core.exercise_generator décodées en O(1), strates du
+catalogue de divisions (core.operand_catalog).
+Un tirage déjà vu parmi les K dernières questions de l'élève est
+rejeté puis retiré au plus SAMPLER_MAX_TIRAGES fois; ensuite on sonde
+les index voisins (au plus K + 1), donc jamais de boucle non bornée:
+O(1) en moyenne, O(K) au pire quand la fenêtre couvre presque l'espace.
+
+Mémoire bornée: K empreintes 64 bits par élève (~100 octets chacune
+avec l'index de recherche), au plus SAMPLER_MAX_STUDENTS élèves
+(les moins récents sont oubliés). Défauts: 20 × 10 000 → ~20 Mo max.
+
+Exemple:
+    sampler = get_exercise_sampler()
+    exercice = sampler.tirer("alice", "tables", "CE2", rng=st.session_state.rng)
+"""
+
+import hashlib
+import os
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .cache import LRUCache
+from .exercise_generator import (
+    PLAGES_ADDITION,
+    PLAGES_DIVISION,
+    PLAGES_SOUSTRACTION,
+    PLAGES_TABLES,
+    _plages,
+    _rng,
+)
+from .operand_catalog import CatalogueOperandes, get_catalogue
+
+
+# Fenêtre de récence (K dernières questions) et nombre d'élèves suivis
+SAMPLER_RECENCY = int(os.getenv('SAMPLER_RECENCY', '20'))
+SAMPLER_MAX_STUDENTS = int(os.getenv('SAMPLER_MAX_STUDENTS', '10000'))
+
+# Tirages aléatoires avant de sonder les index voisins
+SAMPLER_MAX_TIRAGES = 4
+
+
+# =============== ESPACES D'OPÉRANDES ===============
+
+@dataclass(frozen=True)
+class EspaceProduit:
+    """Toutes les paires (a, b) des plages: index → exercice en O(1)"""
+    symbole: str
+    plage_a: Tuple[int, int]
+    plage_b: Tuple[int, int]
+
+    def __len__(self) -> int:
+        return (self.plage_a[1] - self.plage_a[0] + 1) * (self.plage_b[1] - self.plage_b[0] + 1)
+
+    def exercice(self, index: int) -> Dict[str, Any]:
+        largeur = self.plage_b[1] - self.plage_b[0] + 1
+        a = self.plage_a[0] + index // largeur
+        b = self.plage_b[0] + index % largeur
+        reponse = a + b if self.symbole == "+" else a - b if self.symbole == "-" else a * b
+        return {'question': f"{a} {self.symbole} {b}", 'reponse': reponse}
+
+
+@dataclass(frozen=True)
+class EspaceDivision:
+    """Une strate du catalogue de divisions (sans reste / avec reste)"""
+    catalogue: CatalogueOperandes
+    strate: int
+
+    def __len__(self) -> int:
+        debut, fin = self.catalogue.plage(self.strate)
+        return fin - debut
+
+    def exercice(self, index: int) -> Dict[str, Any]:
+        tirage = self.catalogue.ligne(self.catalogue.plage(self.strate)[0] + index)
+        return {
+            'question': f"{tirage['dividende']} ÷ {tirage['diviseur']}",
+            'reponse': tirage['quotient'],
+            'reste': tirage['reste']
+        }
+
+
+@lru_cache(maxsize=None)
+def espace_operandes(kind: str, niveau: str) -> Tuple[Tuple[float, Any], ...]:
+    """
+    Espace énuméré d'un type d'exercice et d'un niveau
+
+    Returns:
+        ((probabilité, espace), ...): branches tirées avec les mêmes
+        proportions que les générateurs unitaires (division avec/sans reste)
+
+    Raises:
+        ValueError: Si le type n'est pas énumérable
+    """
+    if kind == "division" and niveau == "CE1":
+        # Comme generer_division: pas de division en CE1
+        kind = "tables"
+
+    if kind in ("addition", "soustraction", "tables"):
+        symbole, table = {
+            "addition": ("+", PLAGES_ADDITION),
+            "soustraction": ("-", PLAGES_SOUSTRACTION),
+            "tables": ("×", PLAGES_TABLES),
+        }[kind]
+        plage_a, plage_b = _plages(table, niveau)
+        return ((1.0, EspaceProduit(symbole, plage_a, plage_b)),)
+
+    if kind == "division":
+        p_exacte, _, plages_reste = _plages(PLAGES_DIVISION, niveau)
+        catalogue = get_catalogue("division", niveau)
+        exactes = EspaceDivision(catalogue, 0)
+        if plages_reste is None:
+            return ((1.0, exactes),)
+        return ((p_exacte, exactes), (1.0 - p_exacte, EspaceDivision(catalogue, 1)))
+
+    raise ValueError(f"Type d'exercice non énumérable: {kind}")
+
+
+def empreinte(question: str) -> int:
+    """Empreinte 64 bits stable d'une question"""
+    return int.from_bytes(hashlib.blake2b(question.encode(), digest_size=8).digest(), 'little')
+
+
+# =============== RÉCENCE PAR ÉLÈVE ===============
+
+class FiltreRecence:
+    """
+    Les K dernières empreintes d'un élève: test et ajout en O(1).
+
+    Tampon circulaire (deque bornée) + compteur par empreinte pour
+    qu'une question reposée après éviction reste correctement suivie.
+    Le verrou (réentrant) est aussi tenu par ExerciseSampler.tirer()
+    pendant tout le tirage de l'élève.
+    """
+
+    def __init__(self, taille: int):
+        self.taille = taille
+        self._ordre: Deque[int] = deque()
+        self._compte: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, valeur: int) -> bool:
+        return valeur in self._compte
+
+    def __len__(self) -> int:
+        return len(self._ordre)
+
+    def ajouter(self, valeur: int) -> None:
+        """Ajoute une empreinte, en oubliant la plus ancienne si plein"""
+        if self.taille == 0:
+            return
+        with self._lock:
+            self._ordre.append(valeur)
+            self._compte[valeur] = self._compte.get(valeur, 0) + 1
+            if len(self._ordre) > self.taille:
+                ancienne = self._ordre.popleft()
+                if self._compte[ancienne] == 1:
+                    del self._compte[ancienne]
+                else:
+                    self._compte[ancienne] -= 1
+
+
+class ExerciseSampler:
+    """
+    Tirage d'exercices évitant les K dernières questions de chaque élève.
+
+    Thread-safe: un verrou par élève couvre tout le tirage (deux
+    sessions du même élève ne tirent pas la même question); le verrou
+    du sampler ne protège que le cache LRU des filtres et les compteurs.
+    """
+
+    def __init__(self, recence: Optional[int] = None, max_eleves: Optional[int] = None):
+        """
+        Args:
+            recence: Taille K de la fenêtre (défaut: SAMPLER_RECENCY)
+            max_eleves: Élèves suivis avant éviction LRU (défaut: SAMPLER_MAX_STUDENTS)
+        """
+        self.recence = SAMPLER_RECENCY if recence is None else recence
+        if self.recence < 0:
+            raise ValueError("recence doit être >= 0")
+        self._filtres = LRUCache(maxsize=SAMPLER_MAX_STUDENTS if max_eleves is None else max_eleves)
+        self._lock = threading.Lock()
+        self.rejets = 0
+        self.sondages = 0
+
+    def filtre(self, user_id: str) -> FiltreRecence:
+        """Filtre de récence de l'élève (créé au premier tirage)"""
+        filtre = self._filtres.get(user_id)
+        if filtre is None:
+            with self._lock:
+                filtre = self._filtres.get(user_id)
+                if filtre is None:
+                    filtre = FiltreRecence(self.recence)
+                    self._filtres.put(user_id, filtre)
+        return filtre
+
+    def tirer(
+        self,
+        user_id: str,
+        kind: str,
+        niveau: str,
+        rng: Optional[random.Random] = None
+    ) -> Dict[str, Any]:
+        """
+        Tire un exercice absent des K dernières questions de l'élève
+
+        Au plus SAMPLER_MAX_TIRAGES nouveaux tirages puis K + 1 index
+        voisins sondés. Si l'espace est plus petit que la fenêtre, une
+        répétition est inévitable: le dernier tirage est servi tel quel.
+
+        Raises:
+            ValueError: Si le type n'est pas énumérable
+        """
+        rng = _rng(rng)
+        branches = espace_operandes(kind, niveau)
+        espace = branches[0][1]
+        if len(branches) > 1:
+            seuil = rng.random()
+            for probabilite, espace in branches:
+                if seuil < probabilite:
+                    break
+                seuil -= probabilite
+
+        filtre = self.filtre(user_id)
+        taille = len(espace)
+        rejets = sondages = 0
+        with filtre._lock:
+            index = rng.randrange(taille)
+            exercice = espace.exercice(index)
+            cle = empreinte(exercice['question'])
+
+            while cle in filtre and rejets < SAMPLER_MAX_TIRAGES:
+                rejets += 1
+                index = rng.randrange(taille)
+                exercice = espace.exercice(index)
+                cle = empreinte(exercice['question'])
+
+            if cle in filtre:
+                # Sondage des voisins: au plus K + 1 index pour en trouver un libre
+                for pas in range(1, min(taille, len(filtre) + 2)):
+                    sondages += 1
+                    candidat = espace.exercice((index + pas) % taille)
+                    candidat_cle = empreinte(candidat['question'])
+                    if candidat_cle not in filtre:
+                        exercice, cle = candidat, candidat_cle
+                        break
+
+            filtre.ajouter(cle)
+
+        if rejets or sondages:
+            with self._lock:
+                self.rejets += rejets
+                self.sondages += sondages
+        return exercice
+
+    def stats(self) -> Dict[str, Any]:
+        """Métriques pour monitoring"""
+        return {
+            'recence': self.recence,
+            'eleves': len(self._filtres),
+            'rejets': self.rejets,
+            'sondages': self.sondages,
+        }
+
+
+_sampler_lock = threading.Lock()
+_exercise_sampler: Optional[ExerciseSampler] = None
+
+
+def get_exercise_sampler() -> ExerciseSampler:
+    """Retourne le sampler partagé par processus (créé au premier appel)"""
+    global _exercise_sampler
+    if _exercise_sampler is None:
+        with _sampler_lock:
+            if _exercise_sampler is None:
+                _exercise_sampler = ExerciseSampler()
+    return _exercise_sampler
+
+
+def reset_exercise_sampler() -> None:
+    """Oublie le sampler partagé (tests)"""
+    global _exercise_sampler
+    with _sampler_lock:
+        _exercise_sampler = None
@@ -0,0 +1,347 @@
+"""
+Operand Catalog - Espaces d'opérandes énumérés par générateur et niveau
+Chaque catalogue contient tous les tuples d'opérandes valides d'un
+générateur, en colonnes NumPy compactes (plus petit entier signé qui
+convient), triés par difficulté.
+
+Un tirage est un seul index (aucun rejet); une strate de difficulté est
+une plage contiguë d'index. L'espace complet est dénombrable (analytics).
+Les catalogues sont construits au premier usage puis gardés pour le
+processus; stats_catalogues() rapporte la mémoire occupée.
+
+Exemple:
+    catalogue = get_catalogue("division", "CM1")
+    len(catalogue), catalogue.effectifs()    # 220, [80, 140]
+    catalogue.tirer(rng, strate=1)           # {'dividende': 23, 'diviseur': 4, ...}
+"""
+
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class CatalogueOperandes:
+    """
+    Tous les tuples d'opérandes d'un générateur à un niveau
+
+    Les lignes sont triées par strate de difficulté: la strate k occupe
+    les index bornes[k] <= i < bornes[k + 1].
+    """
+    generateur: str
+    niveau: Optional[str]
+    colonnes: Dict[str, np.ndarray]
+    bornes: Tuple[int, ...]
+
+    def __len__(self) -> int:
+        return self.bornes[-1]
+
+    @property
+    def nb_strates(self) -> int:
+        return len(self.bornes) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire des colonnes (octets)"""
+        return sum(colonne.nbytes for colonne in self.colonnes.values())
+
+    def effectifs(self) -> List[int]:
+        """Nombre de tuples par strate"""
+        return [fin - debut for debut, fin in zip(self.bornes, self.bornes[1:])]
+
+    def ligne(self, index: int) -> Dict[str, int]:
+        """Tuple d'opérandes à l'index donné"""
+        return {nom: int(colonne[index]) for nom, colonne in self.colonnes.items()}
+
+    def plage(self, strate: Optional[int] = None) -> Tuple[int, int]:
+        """Index [début, fin[ d'une strate (tout le catalogue si None)"""
+        if strate is None:
+            return 0, len(self)
+        return self.bornes[strate], self.bornes[strate + 1]
+
+    def tirer(self, rng: Optional[random.Random] = None, strate: Optional[int] = None) -> Dict[str, int]:
+        """
+        Tuple uniforme dans le catalogue ou dans une strate
+
+        Raises:
+            ValueError: Si la strate est vide
+        """
+        debut, fin = self.plage(strate)
+        return self.ligne((rng or random).randrange(debut, fin))
+
+    def tirer_lot(
+        self,
+        rng: np.random.Generator,
+        n: int,
+        strates: Optional[np.ndarray] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        n tuples en colonnes (strate imposée par tirage si `strates` est donné)
+
+        Les colonnes gardent leur type compact: convertir avant de calculer.
+        """
+        if strates is None:
+            index = rng.integers(0, len(self), size=n)
+        else:
+            bornes = np.asarray(self.bornes)
+            index = rng.integers(bornes[strates], bornes[strates + 1])
+        return {nom: colonne[index] for nom, colonne in self.colonnes.items()}
+
+
+def construire_catalogue(
+    generateur: str,
+    niveau: Optional[str],
+    noms: Sequence[str],
+    lignes: Iterable[Tuple[int, ...]],
+    difficulte: Callable[[Tuple[int, ...]], int]
+) -> CatalogueOperandes:
+    """
+    Catalogue à partir des tuples énumérés
+
+    Args:
+        noms: Noms des colonnes, dans l'ordre des tuples
+        lignes: Tous les tuples valides (doublons interdits)
+        difficulte: tuple -> strate (0 = plus facile, strates contiguës)
+    """
+    lignes = sorted(lignes, key=difficulte)
+    strates = [difficulte(ligne) for ligne in lignes]
+    nb_strates = (max(strates) + 1) if strates else 1
+    bornes = [0] * (nb_strates + 1)
+    for strate in strates:
+        bornes[strate + 1] += 1
+    for k in range(nb_strates):
+        bornes[k + 1] += bornes[k]
+
+    valeurs = np.array(lignes, dtype=np.int64).reshape(len(lignes), len(noms))
+    colonnes = {nom: _compacter(valeurs[:, j]) for j, nom in enumerate(noms)}
+    for colonne in colonnes.values():
+        colonne.setflags(write=False)
+    return CatalogueOperandes(generateur, niveau, colonnes, tuple(bornes))
+
+
+def _compacter(valeurs: np.ndarray) -> np.ndarray:
+    """Plus petit type entier signé contenant toutes les valeurs"""
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if valeurs.size == 0 or (valeurs.min() >= info.min and valeurs.max() <= info.max):
+            return valeurs.astype(dtype)
+    return valeurs
+
+
+# =============== CATALOGUES DES GÉNÉRATEURS ===============
+# Les modules de domaine sont importés à la construction (cf. exercise_pool).
+
+def _catalogue_division(niveau: str) -> CatalogueOperandes:
+    """core.exercise_generator.generer_division: strate 0 sans reste, 1 avec reste"""
+    from .exercise_generator import PLAGES_DIVISION, _plages
+
+    _, (plage_q, plage_d), plages_reste = _plages(PLAGES_DIVISION, niveau)
+    lignes = [
+        (q * d, d, q, 0)
+        for q in range(plage_q[0], plage_q[1] + 1)
+        for d in range(plage_d[0], plage_d[1] + 1)
+    ]
+    if plages_reste is not None:
+        lignes += _lignes_division_reste(*plages_reste)
+    return construire_catalogue(
+        "division", niveau, ("dividende", "diviseur", "quotient", "reste"),
+        lignes, lambda ligne: int(ligne[3] > 0)
+    )
+
+
+def _lignes_division_reste(plage_d: Tuple[int, int], plage_q: Tuple[int, int]) -> List[Tuple[int, ...]]:
+    return [
+        (q * d + r, d, q, r)
+        for d in range(plage_d[0], plage_d[1] + 1)
+        for q in range(plage_q[0], plage_q[1] + 1)
+        for r in range(1, d)
+    ]
+
+
+def _catalogue_division_simple(niveau: str) -> CatalogueOperandes:
+    """division_utils.generer_division_simple: strate 0 diviseur <= 5, 1 sinon"""
+    from division_utils import PLAGES_DIVISION_SIMPLE
+
+    plage_q, plage_d = PLAGES_DIVISION_SIMPLE.get(niveau, PLAGES_DIVISION_SIMPLE["CM2"])
+    lignes = [
+        (q * d, d, q, 0)
+        for q in range(plage_q[0], plage_q[1] + 1)
+        for d in range(plage_d[0], plage_d[1] + 1)
+    ]
+    return construire_catalogue(
+        "division_simple", niveau, ("dividende", "diviseur", "quotient", "reste"),
+        lignes, lambda ligne: int(ligne[1] > 5)
+    )
+
+
+def _catalogue_division_reste(niveau: str) -> CatalogueOperandes:
+    """division_utils.generer_division_reste: strate 0 diviseur <= 5, 1 sinon"""
+    from division_utils import PLAGES_DIVISION_RESTE
+
+    plages = PLAGES_DIVISION_RESTE.get(niveau, PLAGES_DIVISION_RESTE["CM2"])
+    return construire_catalogue(
+        "division_reste", niveau, ("dividende", "diviseur", "quotient", "reste"),
+        _lignes_division_reste(*plages), lambda ligne: int(ligne[1] > 5)
+    )
+
+
+def _catalogue_calcul_rendu(niveau: str) -> CatalogueOperandes:
+    """
+    monnaie_utils.generer_calcul_rendu: (article, prix en centimes)
+    Une strate par article: article tiré d'abord, puis le prix (comme
+    avant le catalogue); le billet est choisi ensuite (billets_rendu).
+    """
+    from monnaie_utils import CONTEXTES_ACHATS, prix_rendu
+
+    articles = CONTEXTES_ACHATS.get(niveau, CONTEXTES_ACHATS["CE2"])
+    lignes = [
+        (article, prix)
+        for article, (_, plage_prix) in enumerate(articles)
+        for prix in prix_rendu(niveau, plage_prix)
+    ]
+    return construire_catalogue(
+        "calcul_rendu", niveau, ("article", "prix"),
+        lignes, lambda ligne: ligne[0]
+    )
+
+
+def _catalogue_composition_monnaie(niveau: str) -> CatalogueOperandes:
+    """monnaie_utils.generer_composition_monnaie: strate 0 euros entiers, 1 avec centimes"""
+    from monnaie_utils import montants_composition
+
+    return construire_catalogue(
+        "composition_monnaie", niveau, ("montant",),
+        [(montant,) for montant in montants_composition(niveau)],
+        lambda ligne: int(ligne[0] % 100 != 0)
+    )
+
+
+def _catalogue_pourcentage_simple(niveau: Optional[str]) -> CatalogueOperandes:
+    """proportionnalite_utils.generer_pourcentage_simple: une strate par pourcentage"""
+    from proportionnalite_utils import NOMBRES_POURCENTAGE, NB_CONTEXTES_POURCENTAGE
+
+    ordre = {50: 0, 10: 1, 25: 2, 75: 3}  # du plus facile au plus difficile
+    return construire_catalogue(
+        "pourcentage_simple", None, ("pourcentage", "nombre", "contexte"),
+        [
+            (pourcent, nombre, contexte)
+            for pourcent, nombres in NOMBRES_POURCENTAGE.items()
+            for nombre in nombres
+            for contexte in range(NB_CONTEXTES_POURCENTAGE)
+        ],
+        lambda ligne: ordre[ligne[0]]
+    )
+
+
+def _catalogue_echelle(niveau: Optional[str]) -> CatalogueOperandes:
+    """proportionnalite_utils.generer_echelle: une strate par échelle (1/10 → 1/10000)"""
+    from proportionnalite_utils import DISTANCES_PLAN, ECHELLES
+
+    return construire_catalogue(
+        "echelle", None, ("echelle", "distance_plan", "sens"),
+        [
+            (echelle, distance, sens)
+            for echelle in range(len(ECHELLES))
+            for distance in DISTANCES_PLAN
+            for sens in (0, 1)
+        ],
+        lambda ligne: ligne[0]
+    )
+
+
+def _catalogue_vitesse(niveau: Optional[str]) -> CatalogueOperandes:
+    """proportionnalite_utils.generer_vitesse: strate 0 distance, 1 temps"""
+    from proportionnalite_utils import DUREES_TRAJET, VITESSES
+
+    return construire_catalogue(
+        "vitesse", None, ("vitesse", "temps", "type"),
+        [
+            (vitesse, temps, type_q)
+            for vitesse in range(len(VITESSES))
+            for temps in DUREES_TRAJET
+            for type_q in (0, 1)
+        ],
+        lambda ligne: ligne[2]
+    )
+
+
+# générateur -> (constructeur, dépend du niveau)
+CATALOGUES: Dict[str, Tuple[Callable[[Optional[str]], CatalogueOperandes], bool]] = {
+    "division": (_catalogue_division, True),
+    "division_simple": (_catalogue_division_simple, True),
+    "division_reste": (_catalogue_division_reste, True),
+    "calcul_rendu": (_catalogue_calcul_rendu, True),
+    "composition_monnaie": (_catalogue_composition_monnaie, True),
+    "pourcentage_simple": (_catalogue_pourcentage_simple, False),
+    "echelle": (_catalogue_echelle, False),
+    "vitesse": (_catalogue_vitesse, False),
+}
+
+NIVEAUX = ("CE1", "CE2", "CM1", "CM2")
+
+_catalogues: Dict[Tuple[str, Optional[str]], CatalogueOperandes] = {}
+_catalogues_lock = threading.Lock()
+
+
+def get_catalogue(generateur: str, niveau: Optional[str] = None) -> CatalogueOperandes:
+    """
+    Catalogue du générateur pour le niveau (construit au premier appel)
+
+    Raises:
+        ValueError: Si le générateur n'a pas de catalogue
+    """
+    try:
+        constructeur, par_niveau = CATALOGUES[generateur]
+    except KeyError:
+        raise ValueError(f"Aucun catalogue pour le générateur: {generateur}") from None
+    key = (generateur, niveau if par_niveau else None)
+
+    catalogue = _catalogues.get(key)
+    if catalogue is None:
+        with _catalogues_lock:
+            catalogue = _catalogues.get(key)
+            if catalogue is None:
+                catalogue = _catalogues[key] = constructeur(key[1])
+    return catalogue
+
+
+def construire_catalogues(niveaux: Iterable[str] = NIVEAUX) -> None:
+    """Construit tous les catalogues à l'avance (démarrage, analytics)"""
+    niveaux = list(niveaux)
+    for generateur, (_, par_niveau) in CATALOGUES.items():
+        for niveau in (niveaux if par_niveau else [None]):
+            get_catalogue(generateur, niveau)
+
+
+def stats_catalogues() -> Dict[str, Any]:
+    """
+    Taille et mémoire des catalogues construits
+
+    Returns:
+        {'catalogues': {'division/CM1': {'tuples', 'strates', 'octets'}},
+        'tuples': ..., 'octets': ...}
+    """
+    with _catalogues_lock:
+        catalogues = dict(_catalogues)
+    details = {
+        f"{generateur}/{niveau}" if niveau else generateur: {
+            'tuples': len(catalogue),
+            'strates': catalogue.effectifs(),
+            'octets': catalogue.nbytes,
+        }
+        for (generateur, niveau), catalogue in catalogues.items()
+    }
+    return {
+        'catalogues': details,
+        'tuples': sum(d['tuples'] for d in details.values()),
+        'octets': sum(d['octets'] for d in details.values()),
+    }
+
+
+def reset_catalogues() -> None:
+    """Oublie les catalogues construits (tests)"""
+    with _catalogues_lock:
+        _catalogues.clear()
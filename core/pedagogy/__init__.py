@@ -4,5 +4,6 @@ Contient les outils d'analyse d'erreurs et de feedback intelligent
 """
 
 from .error_analyzer import ErrorAnalyzer
+from .registry import get_error_analyzer, get_feedback_engine
 
-__all__ = ['ErrorAnalyzer']
+__all__ = ['ErrorAnalyzer', 'get_error_analyzer', 'get_feedback_engine']
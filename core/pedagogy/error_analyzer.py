@@ -6,13 +6,28 @@ Basé sur la recherche de Hattie 2008 (effet-taille feedback: 0.79)
 Transforme erreurs → insights pédagogiques actionnables
 """
 
-import json
 import os
 import re
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Tuple
 from pathlib import Path
 import numpy as np
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
+
+from core.cache import LRUCache, make_key
+
+from .error_signatures import answer_key, compute_signatures, match_signature, parse_operation
+from .taxonomy_snapshot import (
+    AGE_BONUS,
+    MATCH_THRESHOLD,
+    PATTERN_BONUS,
+    CompiledTaxonomy,
+    IndexedError,
+    load_compiled_taxonomy,
+)
+
+
+# Taille des caches LRU (analyses et feedbacks), 0 pour désactiver
+ANALYZER_CACHE_SIZE = int(os.getenv('ANALYZER_CACHE_SIZE', '2048'))
 
 
 @dataclass
@@ -49,12 +64,21 @@ class ErrorAnalyzer:
     Basé sur catalogue de 500+ erreurs pré-cataloguées
     """
 
-    def __init__(self, taxonomy_path: Optional[str] = None):
+    def __init__(
+        self,
+        taxonomy_path: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+        cache_size: Optional[int] = None
+    ):
         """
         Initialise l'analyseur d'erreurs
 
         Args:
             taxonomy_path: Chemin vers error_taxonomy.json (optionnel)
+            snapshot_path: Chemin du snapshot pré-compilé (optionnel,
+                par défaut à côté du JSON)
+            cache_size: Taille des caches LRU d'analyses et de feedbacks
+                (défaut: ANALYZER_CACHE_SIZE, 0 pour désactiver)
         """
         if taxonomy_path is None:
             # Chemin par défaut relatif à ce fichier
@@ -62,34 +86,63 @@ class ErrorAnalyzer:
             taxonomy_path = current_dir / "data" / "error_taxonomy.json"
 
         self.taxonomy_path = Path(taxonomy_path)
-        self.error_catalog = self._load_catalog()
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.taxonomy = self._load_taxonomy()
+        self.error_catalog = self.taxonomy.catalog
+        self.domain_index = self.taxonomy.domain_index
+        self.errors_by_id = self.taxonomy.errors_by_id
+        self.candidate_index = self.taxonomy.candidate_index
         self.detection_patterns = self.error_catalog.get("detection_patterns", {})
         self.remediation_strategies = self.error_catalog.get("remediation_strategies", {})
 
-    def _load_catalog(self) -> Dict[str, Any]:
+        if cache_size is None:
+            cache_size = ANALYZER_CACHE_SIZE
+        self._analysis_cache = LRUCache(cache_size)
+        self._feedback_cache = LRUCache(cache_size)
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistiques des caches (hits, misses, taux) pour monitoring"""
+        return {
+            "analysis": self._analysis_cache.stats(),
+            "feedback": self._feedback_cache.stats()
+        }
+
+    def clear_caches(self) -> None:
+        """Vide les caches d'analyses et de feedbacks"""
+        self._analysis_cache.clear()
+        self._feedback_cache.clear()
+
+    def _load_taxonomy(self) -> CompiledTaxonomy:
         """
-        Charge le catalogue d'erreurs depuis error_taxonomy.json
+        Charge la taxonomie compilée (snapshot) ou la compile depuis le JSON
+
+        Le JSON n'est parsé et validé que si le snapshot est absent ou
+        obsolète (mtime/hash du JSON modifiés).
 
         Returns:
-            Dictionnaire contenant toute la taxonomie
+            CompiledTaxonomy avec catalogue et index
 
         Raises:
             FileNotFoundError: Si le fichier n'existe pas
-            json.JSONDecodeError: Si le JSON est invalide
+            ValueError: Si le JSON ou la structure du catalogue est invalide
         """
-        if not self.taxonomy_path.exists():
-            raise FileNotFoundError(
-                f"Catalogue d'erreurs non trouvé: {self.taxonomy_path}"
-            )
+        return load_compiled_taxonomy(self.taxonomy_path, self.snapshot_path)
 
-        with open(self.taxonomy_path, 'r', encoding='utf-8') as f:
-            catalog = json.load(f)
+    def _load_catalog(self) -> Dict[str, Any]:
+        """
+        Charge le catalogue d'erreurs depuis error_taxonomy.json
 
-        # Validation basique
-        if "error_categories" not in catalog:
-            raise ValueError("Format de catalogue invalide: 'error_categories' manquant")
+        Returns:
+            Dictionnaire contenant toute la taxonomie
+        """
+        return self._load_taxonomy().catalog
 
-        return catalog
+    def _get_candidates(self, domain: str, difficulty: Any) -> List[Tuple[IndexedError, float]]:
+        """Retourne les candidats pertinents pour un domaine et un niveau"""
+        candidates = self.candidate_index.get((domain, difficulty))
+        if candidates is None:
+            candidates = self.candidate_index.get((domain, None), [])
+        return candidates
 
     def analyze_error_type(
         self,
@@ -113,7 +166,35 @@ class ErrorAnalyzer:
 
         Returns:
             ErrorAnalysisResult avec tous les détails de l'analyse
+
+        Les résultats sont mis en cache (LRU) par
+        (type, opération, niveau, contexte, réponse, attendu).
         """
+        key = make_key(
+            exercise.get("type", "unknown"),
+            exercise.get("operation", ""),
+            exercise.get("difficulty", "CE2"),
+            exercise.get("context", ""),
+            response,
+            expected
+        )
+        if key is None:
+            return self._analyze_error_type_uncached(exercise, response, expected)
+
+        result = self._analysis_cache.get_or_compute(
+            key,
+            lambda: self._analyze_error_type_uncached(exercise, response, expected)
+        )
+        # Copie: l'appelant peut compléter le résultat (root_cause, ...)
+        return replace(result)
+
+    def _analyze_error_type_uncached(
+        self,
+        exercise: Dict[str, Any],
+        response: Any,
+        expected: Any
+    ) -> ErrorAnalysisResult:
+        """Analyse complète sans cache (cf. analyze_error_type)"""
         # Extraire type d'exercice
         exercise_type = exercise.get("type", "unknown")
         operation = exercise.get("operation", "")
@@ -128,42 +209,253 @@ class ErrorAnalyzer:
         if response_val is not None and expected_val is not None:
             difference = abs(response_val - expected_val)
 
-        # Chercher patterns dans toutes les catégories
+        # Signature de réponse fausse connue (ex: retenue ignorée)
+        if difference:
+            signature_match = self._match_signature(operation, response_val)
+            if signature_match is not None:
+                return self._build_result_from_match(signature_match, difficulty)
+
+        best_match = self._match_candidates(exercise_type, exercise, difficulty, difference)
+        if best_match is not None:
+            return self._build_result_from_match(best_match, difficulty)
+
+        # Fallback: erreur de calcul générique
+        return self._create_generic_calculation_error(response, expected, difficulty)
+
+    def _match_signature(
+        self,
+        operation: str,
+        response_val: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Cherche la réponse de l'élève parmi les signatures de misconceptions
+
+        Returns:
+            Match {category, error, score} ou None si aucune signature
+            (ou si l'ID n'existe pas dans la taxonomie chargée)
+        """
+        error_id = match_signature(operation, response_val)
+        entry = self.errors_by_id.get(error_id) if error_id else None
+        if entry is None:
+            return None
+        return {
+            "category": entry.category,
+            "error": entry.error_def,
+            "score": entry.confidence
+        }
+
+    def _match_candidates(
+        self,
+        exercise_type: str,
+        exercise: Dict[str, Any],
+        difficulty: Any,
+        difference: Optional[float]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Score les candidats indexés pour (domaine, niveau)
+
+        Returns:
+            Meilleur match {category, error, score} ou None sous le seuil
+        """
+        domain = self._map_exercise_type_to_domain(exercise_type)
+        operation_lower = exercise.get("operation", "").lower()
+        context_lower = exercise.get("context", "").lower()
         candidates = []
 
-        for category_name, category_data in self.error_catalog["error_categories"].items():
-            if "errors" not in category_data:
-                continue
+        for entry, age_bonus in self._get_candidates(domain, difficulty):
+            match_score = self._score_indexed_error(
+                entry,
+                age_bonus,
+                operation_lower,
+                context_lower,
+                difference
+            )
 
-            # Chercher dans le bon domaine mathématique
-            domain = self._map_exercise_type_to_domain(exercise_type)
-            if domain in category_data["errors"]:
-                errors_list = category_data["errors"][domain]
-
-                for error_def in errors_list:
-                    # Calculer score de match
-                    match_score = self._calculate_match_score(
-                        error_def,
-                        exercise,
-                        response,
-                        expected,
-                        difference
-                    )
-
-                    if match_score > 0.3:  # Seuil minimum
-                        candidates.append({
-                            "category": category_name,
-                            "error": error_def,
-                            "score": match_score
-                        })
+            if match_score > MATCH_THRESHOLD:
+                candidates.append({
+                    "category": entry.category,
+                    "error": entry.error_def,
+                    "score": match_score
+                })
 
         # Sélectionner meilleur candidat
         if candidates:
-            best_match = max(candidates, key=lambda x: x["score"])
-            return self._build_result_from_match(best_match, difficulty)
+            return max(candidates, key=lambda x: x["score"])
+        return None
 
-        # Fallback: erreur de calcul générique
-        return self._create_generic_calculation_error(response, expected, difficulty)
+    def analyze_batch(
+        self,
+        exercises: Sequence[Dict[str, Any]],
+        responses: Sequence[Any],
+        expected: Sequence[Any],
+        response_ids: Optional[Sequence[int]] = None,
+        session: Any = None
+    ) -> List[ErrorAnalysisResult]:
+        """
+        Analyse un lot de réponses (rejeu d'historique après mise à jour
+        de la taxonomie)
+
+        Même résultat que analyze_error_type ligne par ligne, mais:
+        - réponses et écarts calculés en tableaux NumPy
+        - signatures mémoïsées par opération distincte
+        - lignes groupées par (domaine, niveau), scores calculés en matrice
+
+        Args:
+            exercises: Exercices (même format que analyze_error_type)
+            responses: Réponses des élèves
+            expected: Réponses attendues
+            response_ids: IDs ExerciseResponse correspondants (optionnel)
+            session: Session SQLAlchemy; avec response_ids, écrit error_type
+                en une seule mise à jour groupée (sans commit)
+
+        Returns:
+            Liste d'ErrorAnalysisResult dans l'ordre des entrées
+        """
+        count = len(exercises)
+        if len(responses) != count or len(expected) != count:
+            raise ValueError("exercises, responses et expected doivent avoir la même longueur")
+        if response_ids is not None and len(response_ids) != count:
+            raise ValueError("response_ids doit avoir la même longueur que exercises")
+
+        response_vals = self._parse_numbers(responses)
+        expected_vals = self._parse_numbers(expected)
+        differences = np.abs(response_vals - expected_vals)
+        has_difference = np.isfinite(differences) & (differences != 0)
+
+        matches: List[Optional[Dict[str, Any]]] = [None] * count
+        pending_groups: Dict[Tuple[str, Any], List[int]] = {}
+        signature_tables: Dict[Any, Any] = {}
+
+        for row, exercise in enumerate(exercises):
+            if has_difference[row]:
+                # Table de signatures résolue une fois par opération du lot
+                operation = exercise.get("operation", "")
+                if operation not in signature_tables:
+                    parsed = parse_operation(operation)
+                    signature_tables[operation] = compute_signatures(*parsed) if parsed else None
+                table = signature_tables[operation]
+
+                error_id = table.get(answer_key(response_vals[row])) if table else None
+                entry = self.errors_by_id.get(error_id) if error_id else None
+                if entry is not None:
+                    matches[row] = {
+                        "category": entry.category,
+                        "error": entry.error_def,
+                        "score": entry.confidence
+                    }
+                    continue
+
+            domain = self._map_exercise_type_to_domain(exercise.get("type", "unknown"))
+            group_key = (domain, exercise.get("difficulty", "CE2"))
+            pending_groups.setdefault(group_key, []).append(row)
+
+        for (domain, difficulty), rows in pending_groups.items():
+            candidates = self._get_candidates(domain, difficulty)
+            if not candidates:
+                continue
+            group_matches = self._score_group(
+                candidates,
+                [exercises[row] for row in rows],
+                differences[rows]
+            )
+            for row, match in zip(rows, group_matches):
+                matches[row] = match
+
+        results = []
+        for row, match in enumerate(matches):
+            difficulty = exercises[row].get("difficulty", "CE2")
+            if match is not None:
+                results.append(self._build_result_from_match(match, difficulty))
+            else:
+                results.append(self._create_generic_calculation_error(
+                    responses[row], expected[row], difficulty
+                ))
+
+        if session is not None and response_ids is not None:
+            self._write_error_types(session, response_ids, results)
+
+        return results
+
+    def _parse_numbers(self, values: Sequence[Any]) -> np.ndarray:
+        """Parse une séquence de valeurs en tableau float (NaN si invalide)"""
+        parsed = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            number = self._parse_number(value)
+            parsed[i] = np.nan if number is None else number
+        return parsed
+
+    def _score_group(
+        self,
+        candidates: List[Tuple[IndexedError, float]],
+        exercises: List[Dict[str, Any]],
+        differences: np.ndarray
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Score en matrice (lignes × candidats) un groupe de même (domaine, niveau)
+
+        Returns:
+            Meilleur match par ligne, None sous le seuil
+        """
+        age_bonus = np.array([bonus for _, bonus in candidates])
+        confidence = np.array([entry.confidence for entry, _ in candidates])
+        is_calculation = np.array([entry.is_calculation for entry, _ in candidates])
+
+        # Bonus de pattern: une seule évaluation par texte (opération, contexte) distinct
+        texts: Dict[Tuple[str, str], int] = {}
+        text_rows = np.empty(len(exercises), dtype=np.intp)
+        for i, exercise in enumerate(exercises):
+            key = (exercise.get("operation", "").lower(), exercise.get("context", "").lower())
+            text_rows[i] = texts.setdefault(key, len(texts))
+
+        pattern_hits = np.zeros((len(texts), len(candidates)))
+        for (operation_lower, context_lower), t in texts.items():
+            for k, (entry, _) in enumerate(candidates):
+                if entry.pattern in operation_lower or entry.pattern in context_lower:
+                    pattern_hits[t, k] = PATTERN_BONUS
+
+        # Bonus d'écart (cf. _score_indexed_error)
+        diff = differences[:, None]
+        valid = np.isfinite(diff) & (diff > 0)
+        difference_bonus = np.where(
+            valid & is_calculation & (diff <= 5), 0.3,
+            np.where(valid & ~is_calculation & (diff > 5), 0.2, 0.0)
+        )
+
+        scores = np.minimum((age_bonus + pattern_hits[text_rows] + difference_bonus) * confidence, 1.0)
+        scores = np.where(scores > MATCH_THRESHOLD, scores, -1.0)
+        best = np.argmax(scores, axis=1)
+        best_scores = scores[np.arange(len(exercises)), best]
+
+        group_matches: List[Optional[Dict[str, Any]]] = []
+        for k, score in zip(best, best_scores):
+            if score < 0:
+                group_matches.append(None)
+            else:
+                entry = candidates[k][0]
+                group_matches.append({
+                    "category": entry.category,
+                    "error": entry.error_def,
+                    "score": float(score)
+                })
+        return group_matches
+
+    def _write_error_types(
+        self,
+        session: Any,
+        response_ids: Sequence[int],
+        results: List[ErrorAnalysisResult]
+    ) -> None:
+        """Écrit error_type (ID d'erreur) dans exercise_responses en une requête groupée"""
+        from sqlalchemy import update
+        from database.models import ExerciseResponse
+
+        session.execute(
+            update(ExerciseResponse),
+            [
+                {"id": int(response_id), "error_type": result.error_id or result.error_type}
+                for response_id, result in zip(response_ids, results)
+            ]
+        )
 
     def identify_misconception(self, error_type: str, error_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -183,16 +475,10 @@ class ErrorAnalyzer:
             }
         """
         if error_id:
-            # Recherche par ID spécifique
+            # Recherche par ID spécifique (index ID -> entrée)
             error_details = self._find_error_by_id(error_id)
             if error_details:
-                return {
-                    "misconception": error_details.get("misconception", ""),
-                    "common_reasons": [error_details.get("pattern", "")],
-                    "examples": error_details.get("examples", []),
-                    "severity": error_details.get("severity", 3),
-                    "prerequisites": error_details.get("prerequisites", [])
-                }
+                return self._misconception_from_error_def(error_details)
 
         # Recherche par catégorie
         if error_type in self.error_catalog.get("error_categories", {}):
@@ -213,6 +499,49 @@ class ErrorAnalyzer:
             "prerequisites": []
         }
 
+    def identify_misconceptions(self, error_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Résout une liste d'IDs d'erreurs en une passe (rendu de rapports)
+
+        Args:
+            error_ids: IDs d'erreurs stockés (ex: ExerciseResponse.error_type),
+                doublons autorisés. Un ID absent de la taxonomie est traité
+                comme un nom de catégorie ("Conceptual", ...).
+
+        Returns:
+            Dict ID -> détails de misconception (même format que
+            identify_misconception, avec la catégorie en plus), dans
+            l'ordre de première apparition
+        """
+        resolved: Dict[str, Dict[str, Any]] = {}
+
+        for error_id in error_ids:
+            if error_id in resolved:
+                continue
+
+            entry = self.errors_by_id.get(error_id)
+            if entry is not None:
+                details = self._misconception_from_error_def(entry.error_def)
+                details["category"] = entry.category
+            else:
+                details = self.identify_misconception(error_id)
+                details["category"] = (
+                    error_id if error_id in self.error_catalog["error_categories"] else None
+                )
+            resolved[error_id] = details
+
+        return resolved
+
+    def _misconception_from_error_def(self, error_def: Dict[str, Any]) -> Dict[str, Any]:
+        """Détails de misconception pour une définition d'erreur"""
+        return {
+            "misconception": error_def.get("misconception", ""),
+            "common_reasons": [error_def.get("pattern", "")],
+            "examples": error_def.get("examples", []),
+            "severity": error_def.get("severity", 3),
+            "prerequisites": error_def.get("prerequisites", [])
+        }
+
     def root_cause_analysis(self, error_details: ErrorAnalysisResult) -> Dict[str, Any]:
         """
         Analyse la cause racine d'une erreur
@@ -329,7 +658,7 @@ class ErrorAnalyzer:
         # Vérifier âge approprié
         difficulty = exercise.get("difficulty", "CE2")
         if difficulty in error_def.get("common_ages", []):
-            score += 0.3
+            score += AGE_BONUS
 
         # Vérifier pattern dans operation
         pattern = error_def.get("pattern", "")
@@ -337,7 +666,7 @@ class ErrorAnalyzer:
         context = exercise.get("context", "")
 
         if pattern.lower() in operation.lower() or pattern.lower() in context.lower():
-            score += 0.4
+            score += PATTERN_BONUS
 
         # Score basé sur différence si erreur de calcul
         if difference is not None and difference > 0:
@@ -354,6 +683,33 @@ class ErrorAnalyzer:
 
         return min(score, 1.0)
 
+    def _score_indexed_error(
+        self,
+        entry: IndexedError,
+        age_bonus: float,
+        operation_lower: str,
+        context_lower: str,
+        difference: Optional[float]
+    ) -> float:
+        """
+        Équivalent de _calculate_match_score sur une entrée pré-extraite
+
+        Returns:
+            Score entre 0.0 et 1.0
+        """
+        score = age_bonus
+
+        if entry.pattern in operation_lower or entry.pattern in context_lower:
+            score += PATTERN_BONUS
+
+        if difference is not None and difference > 0:
+            if entry.is_calculation and difference <= 5:
+                score += 0.3
+            elif not entry.is_calculation and difference > 5:
+                score += 0.2
+
+        return min(score * entry.confidence, 1.0)
+
     def _build_result_from_match(self, match: Dict[str, Any], difficulty: str) -> ErrorAnalysisResult:
         """Construit ErrorAnalysisResult depuis un match"""
         error_def = match["error"]
@@ -404,17 +760,9 @@ class ErrorAnalyzer:
         )
 
     def _find_error_by_id(self, error_id: str) -> Optional[Dict[str, Any]]:
-        """Recherche une erreur par son ID"""
-        for category_name, category_data in self.error_catalog.get("error_categories", {}).items():
-            if "errors" not in category_data:
-                continue
-
-            for domain, errors_list in category_data["errors"].items():
-                for error_def in errors_list:
-                    if error_def.get("id") == error_id:
-                        return error_def
-
-        return None
+        """Recherche une erreur par son ID (O(1) via l'index)"""
+        entry = self.errors_by_id.get(error_id)
+        return entry.error_def if entry is not None else None
 
     def _estimate_remediation_time(self, severity: int, error_type: str) -> str:
         """Estime le temps de remédiation nécessaire"""
@@ -511,30 +859,68 @@ class ErrorAnalyzer:
             # Fallback si pas de templates
             return self._generate_generic_feedback(error_analysis, student_name)
 
-        # Choisir un template (premier par défaut, ou aléatoire pour variété)
+        # Variantes rendues (une par template) en cache; seul le tirage
+        # aléatoire reste hors cache pour préserver la variété
+        key = self._feedback_cache_key(templates, error_analysis.severity, student_name, context)
+        if key is None:
+            variants = self._render_feedback_variants(templates, error_analysis.severity, student_name, context)
+        else:
+            variants = self._feedback_cache.get_or_compute(
+                key,
+                lambda: self._render_feedback_variants(
+                    templates, error_analysis.severity, student_name, context
+                )
+            )
+
+        # Choisir une variante (première par défaut, ou aléatoire pour variété)
         import random
-        template = random.choice(templates) if len(templates) > 1 else templates[0]
+        return random.choice(variants) if len(variants) > 1 else variants[0]
 
+    def _feedback_cache_key(
+        self,
+        templates: List[str],
+        severity: int,
+        student_name: Optional[str],
+        context: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple]:
+        """Clé de cache du feedback, None si le contexte n'est pas hashable"""
+        try:
+            context_key = frozenset(context.items()) if context else None
+        except TypeError:
+            return None
+        return make_key(tuple(templates), severity, student_name, context_key)
+
+    def _render_feedback_variants(
+        self,
+        templates: List[str],
+        severity: int,
+        student_name: Optional[str],
+        context: Optional[Dict[str, Any]]
+    ) -> Tuple[str, ...]:
+        """Rend le feedback complet pour chaque template"""
         # Personnaliser avec nom si fourni
         if student_name:
             greeting = f"{student_name}, "
         else:
             greeting = ""
 
-        # Remplacer variables dans template si contexte fourni
-        feedback = template
-        if context:
-            try:
-                # Tentative de formatage avec contexte
-                feedback = template.format(**context)
-            except (KeyError, ValueError):
-                # Si formatage échoue, garder template original
-                pass
-
         # Ajouter encouragement selon sévérité
-        encouragement = self._get_encouragement(error_analysis.severity)
-
-        return f"{greeting}{feedback}\n\n{encouragement}"
+        encouragement = self._get_encouragement(severity)
+
+        variants = []
+        for template in templates:
+            # Remplacer variables dans template si contexte fourni
+            feedback = template
+            if context:
+                try:
+                    # Tentative de formatage avec contexte
+                    feedback = template.format(**context)
+                except (KeyError, ValueError):
+                    # Si formatage échoue, garder template original
+                    pass
+            variants.append(f"{greeting}{feedback}\n\n{encouragement}")
+
+        return tuple(variants)
 
     def _generate_generic_feedback(
         self,
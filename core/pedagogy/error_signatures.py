@@ -0,0 +1,267 @@
+"""
+ErrorSignatures - Signatures de réponses fausses pour l'arithmétique
+Phase 6.1 - MathCopain v6.4
+
+Pour une opération comme "27 + 48", calcule à l'avance la réponse que
+produirait chaque misconception connue (retenue ignorée → 65, chiffres
+inversés → 57, multiplication au lieu d'addition → 1296, ...). La réponse
+de l'élève est ensuite classée par une simple recherche dans un dict.
+
+Les réponses candidates sont calculées colonne par colonne avec NumPy
+(chiffres en tableaux) et mémoïsées par opération.
+"""
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+# Opérandes entiers positifs, opérateur +, -, ×, ÷ (et variantes ASCII)
+_OPERATION_RE = re.compile(r'^\s*(\d{1,9})\s*([+\-−×xX*÷:/])\s*(\d{1,9})\s*(?:=.*)?$')
+
+_OPERATORS = {
+    '+': '+',
+    '-': '-', '−': '-',
+    '×': '×', 'x': '×', 'X': '×', '*': '×',
+    '÷': '÷', ':': '÷', '/': '÷',
+}
+
+# Nombre de décimales pour comparer réponses et signatures
+_KEY_PRECISION = 6
+
+# Taille du cache des signatures (une entrée par opération distincte)
+SIGNATURE_CACHE_SIZE = 4096
+
+
+def parse_operation(operation: str) -> Optional[Tuple[int, str, int]]:
+    """
+    Extrait (a, opérateur, b) d'une opération entière simple
+
+    Args:
+        operation: Texte de l'opération ("27 + 48", "7 × 8", "42 ÷ 6")
+
+    Returns:
+        Tuple (a, op, b) avec op dans {'+', '-', '×', '÷'}, ou None
+    """
+    if not isinstance(operation, str):
+        return None
+    match = _OPERATION_RE.match(operation)
+    if match is None:
+        return None
+    return int(match.group(1)), _OPERATORS[match.group(2)], int(match.group(3))
+
+
+def answer_key(value: float) -> float:
+    """Normalise une réponse pour la recherche (65.0 et 65 → même clé)"""
+    return round(float(value), _KEY_PRECISION)
+
+
+def _digits(value: int, width: int) -> np.ndarray:
+    """Chiffres d'un entier, unités en premier, complétés à `width`"""
+    return (value // 10 ** np.arange(width, dtype=np.int64)) % 10
+
+
+def _from_digits(digits: np.ndarray) -> int:
+    """Recompose un entier depuis ses chiffres (unités en premier)"""
+    return int(digits @ (10 ** np.arange(len(digits), dtype=np.int64)))
+
+
+def _reversed_digits(value: int) -> Optional[int]:
+    """Chiffres inversés (75 → 57), None si un seul chiffre ou palindrome"""
+    if value < 10:
+        return None
+    reversed_value = int(str(value)[::-1])
+    return reversed_value if reversed_value != value else None
+
+
+def _trailing_zeros(value: int) -> int:
+    """Nombre de zéros finaux (200 → 2)"""
+    count = 0
+    while value and value % 10 == 0:
+        value //= 10
+        count += 1
+    return count
+
+
+def _addition_signatures(a: int, b: int) -> List[Tuple[str, Any]]:
+    width = max(len(str(a)), len(str(b)))
+    da, db = _digits(a, width), _digits(b, width)
+    column_sums = da + db
+    signatures = [
+        # Retenue ignorée: chaque colonne modulo 10 (27+48 → 65)
+        ("ADD_CONC_003", _from_digits(column_sums % 10)),
+        # Addition au lieu de multiplication (7+8 → 56)
+        ("ADD_CONC_002", a * b),
+    ]
+
+    # Sommes de colonnes juxtaposées de gauche à droite (34+28 → 512)
+    if width > 1 and np.any(column_sums >= 10):
+        signatures.append(
+            ("ADD_CONC_004", int("".join(str(s) for s in column_sums[::-1])))
+        )
+
+    # Retenue comptée deux fois (57+68 → 135)
+    carry = 0
+    doubled = np.zeros(width + 1, dtype=np.int64)
+    for i in range(width):
+        total = column_sums[i] + 2 * carry
+        doubled[i], carry = total % 10, total // 10
+    doubled[width] = carry
+    signatures.append(("ADD_PROC_003", _from_digits(doubled)))
+
+    # Chiffres additionnés sans tenir compte de la position (200+30 → 500)
+    za, zb = _trailing_zeros(a), _trailing_zeros(b)
+    if a and b and za != zb:
+        signatures.append(
+            ("ADD_CONC_005", (a // 10 ** za + b // 10 ** zb) * 10 ** max(za, zb))
+        )
+
+    # Nombres mal alignés en colonne (234+56 → 234+560)
+    la, lb = len(str(a)), len(str(b))
+    if la != lb:
+        shift = 10 ** abs(la - lb)
+        signatures.append(("ADD_PROC_002", a + b * shift if la > lb else a * shift + b))
+
+    return signatures
+
+
+def _subtraction_signatures(a: int, b: int) -> List[Tuple[str, Any]]:
+    width = max(len(str(a)), len(str(b)))
+    da, db = _digits(a, width), _digits(b, width)
+    signatures = [
+        # Addition au lieu de soustraction (10-3 → 13)
+        ("SUB_CONC_003", a + b),
+        # Petit chiffre toujours soustrait du grand (52-27 → 35)
+        ("SUB_CONC_001", _from_digits(np.abs(da - db))),
+        # Emprunt sans diminuer la dizaine (41-28 → 23)
+        ("SUB_PROC_002", _from_digits(np.where(da < db, da + 10 - db, da - db))),
+        # Opérandes inversés (43-28 → -15)
+        ("SUB_PROC_003", b - a),
+    ]
+    if b == 0:
+        # Soustraire 0 modifie le nombre (15-0 → 14)
+        signatures.append(("SUB_CONC_004", a - 1))
+    return signatures
+
+
+def _multiplication_signatures(a: int, b: int) -> List[Tuple[str, Any]]:
+    signatures = []
+    if b == 0 or a == 0:
+        # Multiplier par 0 rend le nombre (5×0 → 5)
+        signatures.append(("MULT_CONC_002", a or b))
+    # Addition au lieu de multiplication (4×3 → 7)
+    signatures.append(("MULT_CONC_001", a + b))
+
+    # Produits partiels sans retenue, multiplicateur à un chiffre (7×8 → 6)
+    big, small = (a, b) if a >= b else (b, a)
+    if small < 10:
+        width = len(str(big))
+        signatures.append(
+            ("MULT_PROC_002", _from_digits((_digits(big, width) * small) % 10))
+        )
+    else:
+        # Décalage oublié: produits partiels additionnés sans ×10 (23×45 → 207)
+        partials = a * _digits(b, len(str(b)))
+        signatures.append(("MULT_PROC_001", int(partials.sum())))
+
+    # Confusion avec un produit voisin dans les tables (7×8 → 49, 63, 48, 64)
+    neighbours = np.array([a * (b - 1), a * (b + 1), (a - 1) * b, (a + 1) * b])
+    signatures.extend(("MULT_PROC_003", int(v)) for v in neighbours)
+    return signatures
+
+
+def _division_signatures(a: int, b: int) -> List[Tuple[str, Any]]:
+    if b == 0:
+        return []
+    quotient = a // b
+    signatures = [
+        # Soustraction au lieu de division (12÷3 → 9)
+        ("DIV_CONC_004", a - b),
+    ]
+    if a % b:
+        # Reste ignoré quand un quotient décimal est attendu (13÷4 → 3)
+        signatures.append(("DIV_CONC_002", quotient))
+    if b == 1:
+        # Diviser par 1 change le nombre (8÷1 → 4 ou 0)
+        signatures.extend([("DIV_CONC_005", a / 2), ("DIV_CONC_005", 0)])
+    if a:
+        # Diviseur et dividende inversés (12÷3 → 0,25)
+        signatures.append(("DIV_CONC_001", b / a))
+
+    # Quotient mal estimé (42÷7 → 5 ou 7)
+    signatures.extend(("DIV_PROC_001", q) for q in np.array([quotient - 1, quotient + 1]))
+    return signatures
+
+
+_SIGNATURE_BUILDERS = {
+    '+': (_addition_signatures, lambda a, b: a + b),
+    '-': (_subtraction_signatures, lambda a, b: a - b),
+    '×': (_multiplication_signatures, lambda a, b: a * b),
+    '÷': (_division_signatures, lambda a, b: a / b if b else None),
+}
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE_SIZE)
+def compute_signatures(a: int, op: str, b: int) -> Mapping[float, str]:
+    """
+    Réponses produites par chaque misconception pour a op b
+
+    Les signatures sont listées par ordre de priorité: en cas de collision,
+    la première l'emporte. Les valeurs égales au résultat correct sont
+    exclues, de même que les confusions génériques (chiffres inversés,
+    écart de 1 ou 10) déjà couvertes par une signature spécifique.
+
+    Returns:
+        Mapping en lecture seule réponse → ID d'erreur
+    """
+    builder, exact = _SIGNATURE_BUILDERS[op]
+    correct = exact(a, b)
+    quotient = a // b if op == '÷' and b else None
+
+    signatures = builder(a, b)
+
+    # Confusions génériques, en dernier recours
+    reference = quotient if quotient is not None else correct
+    if reference is not None and float(reference).is_integer():
+        reference = int(reference)
+        reversed_value = _reversed_digits(reference)
+        if reversed_value is not None:
+            signatures.append(("CALC_003", reversed_value))
+        signatures.extend(
+            ("CALC_001", int(v)) for v in reference + np.array([-1, 1, -10, 10])
+        )
+
+    values = np.array([float(v) for _, v in signatures])
+    ids = [error_id for error_id, _ in signatures]
+    if correct is not None:
+        keep = np.abs(values - correct) > 10 ** -_KEY_PRECISION
+    else:
+        keep = np.ones(len(values), dtype=bool)
+
+    table = {}
+    for error_id, value, kept in zip(ids, values, keep):
+        if kept:
+            table.setdefault(answer_key(value), error_id)
+    return MappingProxyType(table)
+
+
+def match_signature(operation: str, answer: Optional[float]) -> Optional[str]:
+    """
+    Identifie la misconception qui explique une réponse fausse
+
+    Args:
+        operation: Texte de l'opération ("27 + 48")
+        answer: Réponse de l'élève déjà convertie en nombre
+
+    Returns:
+        ID d'erreur (ex: "ADD_CONC_003") ou None si aucune signature
+    """
+    if answer is None:
+        return None
+    parsed = parse_operation(operation)
+    if parsed is None:
+        return None
+    return compute_signatures(*parsed).get(answer_key(answer))
@@ -4,18 +4,31 @@ Phase 6.1.3 - MathCopain v6.4
 
 Basé sur Hattie 2008 - Feedback avec effet-taille 0.79
 Génère feedback multi-couches structuré et personnalisé
+
+Mode différé (deferred=True): la réaction immédiate, l'encouragement et
+l'action suivante sont retournés tout de suite; explication, stratégie et
+remédiation sont calculées sur un pool de threads borné et remplies dans
+le même objet résultat (pending passe à False, wait() débloque).
 """
 
 import json
+import os
 import random
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from pathlib import Path
 
 from .error_analyzer import ErrorAnalyzer, ErrorAnalysisResult
 
 
+# Threads du pool pour les couches différées
+FEEDBACK_WORKERS = int(os.getenv('FEEDBACK_WORKERS', '2'))
+
+
 @dataclass
 class TransformativeFeedbackResult:
     """Résultat de feedback transformatif multi-couches"""
@@ -43,10 +56,28 @@ class TransformativeFeedbackResult:
     confidence: float = 0.0
     timestamp: str = ""
 
+    # Couches 2-4 encore en cours de calcul (mode différé)
+    pending: bool = False
+
+    # Durée de calcul par couche, en millisecondes
+    layer_timings: Dict[str, float] = field(default_factory=dict)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convertit en dictionnaire"""
         return asdict(self)
 
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend la fin des couches différées
+
+        Returns:
+            True si toutes les couches sont remplies, False si délai expiré
+        """
+        done = getattr(self, "_done", None)
+        if done is None:
+            return not self.pending
+        return done.wait(timeout)
+
 
 class RemediationRecommender:
     """Recommande exercices de remédiation adaptés"""
@@ -131,36 +162,49 @@ class TransformativeFeedback:
     - Analyse d'erreur (ErrorAnalyzer)
     - Historique de l'élève
     - Contexte pédagogique
-    """
 
-    def __init__(self):
-        self.error_analyzer = ErrorAnalyzer()
-        self.remediation_recommender = RemediationRecommender()
+    Sans état par élève: une instance peut être partagée entre sessions
+    (voir core.pedagogy.registry.get_feedback_engine).
+    """
 
-        # Messages immédiats pré-définis
-        self.immediate_success = [
+    def __init__(
+        self,
+        error_analyzer: Optional[ErrorAnalyzer] = None,
+        remediation_recommender: Optional[RemediationRecommender] = None,
+        max_workers: Optional[int] = None
+    ):
+        self.error_analyzer = error_analyzer or ErrorAnalyzer()
+        self.remediation_recommender = remediation_recommender or RemediationRecommender()
+
+        # Pool des couches différées, créé au premier appel deferred=True
+        self.max_workers = max_workers or FEEDBACK_WORKERS
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # Messages immédiats pré-définis (tuples: partagés en lecture seule)
+        self.immediate_success = (
             "✅ Exact!",
             "✅ Parfait!",
             "✅ Bravo!",
             "✅ C'est ça!",
             "✅ Très bien!"
-        ]
+        )
 
-        self.immediate_close = [
+        self.immediate_close = (
             "❌ C'est presque ça!",
             "❌ Tu y es presque!",
             "❌ Pas tout à fait!",
             "❌ Presque correct!",
             "❌ Tu chauffes!"
-        ]
+        )
 
-        self.immediate_wrong = [
+        self.immediate_wrong = (
             "❌ Pas exactement",
             "❌ Vérifions ensemble",
             "❌ Essayons autrement",
             "❌ Reprenons",
             "❌ Regardons ça"
-        ]
+        )
 
     def process_exercise_response(
         self,
@@ -169,7 +213,8 @@ class TransformativeFeedback:
         expected: Any,
         user_id: str,
         user_history: Optional[Dict[str, Any]] = None,
-        time_taken_seconds: Optional[int] = None
+        time_taken_seconds: Optional[int] = None,
+        deferred: bool = False
     ) -> TransformativeFeedbackResult:
         """
         Traite une réponse d'exercice et génère feedback multi-couches
@@ -181,23 +226,34 @@ class TransformativeFeedback:
             user_id: ID de l'utilisateur
             user_history: Historique optionnel (stats, progression, etc.)
             time_taken_seconds: Temps pris pour répondre
+            deferred: Si True, retourne dès la couche immédiate prête;
+                explication, stratégie et remédiation arrivent en
+                arrière-plan (voir TransformativeFeedbackResult.wait)
 
         Returns:
             TransformativeFeedbackResult avec feedback complet
+            (ou partiel avec pending=True en mode différé)
         """
+        timings: Dict[str, float] = {}
+
         # Déterminer si réponse correcte
-        is_correct = self._check_answer(response, expected)
+        is_correct = self._timed(timings, "check", self._check_answer, response, expected)
 
         if is_correct:
             return self._generate_success_feedback(
                 exercise,
                 user_id,
                 user_history,
-                time_taken_seconds
+                time_taken_seconds,
+                timings=timings,
+                deferred=deferred
             )
         else:
             # Analyser l'erreur
-            error_analysis = self.error_analyzer.analyze_error_type(
+            error_analysis = self._timed(
+                timings,
+                "analysis",
+                self.error_analyzer.analyze_error_type,
                 exercise,
                 response,
                 expected
@@ -209,8 +265,94 @@ class TransformativeFeedback:
                 response,
                 expected,
                 user_id,
-                user_history
+                user_history,
+                timings=timings,
+                deferred=deferred
+            )
+
+    @staticmethod
+    def _timed(
+        timings: Dict[str, float],
+        layer: str,
+        build: Callable[..., Any],
+        *args: Any
+    ) -> Any:
+        """Exécute build(*args) et enregistre sa durée (ms) sous `layer`"""
+        start = time.perf_counter()
+        value = build(*args)
+        timings[layer] = (time.perf_counter() - start) * 1000
+        return value
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Pool borné des couches différées (partagé par toutes les sessions)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="feedback"
+                    )
+        return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête le pool des couches différées"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _fill_deep_layers(
+        self,
+        result: TransformativeFeedbackResult,
+        layers: Dict[str, Callable[[], Any]],
+        fallback_explanation: str,
+        deferred: bool
+    ) -> TransformativeFeedbackResult:
+        """
+        Remplit les couches coûteuses du résultat
+
+        En mode différé, le calcul est soumis au pool et le résultat est
+        retourné immédiatement avec pending=True.
+        """
+        if not deferred:
+            self._compute_layers(result, layers)
+            return result
+
+        result.pending = True
+        result._done = threading.Event()
+        try:
+            self._get_executor().submit(
+                self._compute_deferred_layers, result, layers, fallback_explanation
             )
+        except RuntimeError:
+            # Pool arrêté (fin de processus): calcul synchrone
+            self._compute_deferred_layers(result, layers, fallback_explanation)
+        return result
+
+    def _compute_layers(
+        self,
+        result: TransformativeFeedbackResult,
+        layers: Dict[str, Callable[[], Any]]
+    ) -> None:
+        """Calcule chaque couche et l'affecte au résultat (chronométrée)"""
+        for layer, build in layers.items():
+            setattr(result, layer, self._timed(result.layer_timings, layer, build))
+
+    def _compute_deferred_layers(
+        self,
+        result: TransformativeFeedbackResult,
+        layers: Dict[str, Callable[[], Any]],
+        fallback_explanation: str
+    ) -> None:
+        """Tâche du pool: ne laisse jamais un résultat bloqué en pending"""
+        try:
+            self._compute_layers(result, layers)
+        except Exception:
+            if not result.explanation:
+                result.explanation = fallback_explanation
+        finally:
+            result.pending = False
+            result._done.set()
 
     def _check_answer(self, response: Any, expected: Any) -> bool:
         """Vérifie si la réponse est correcte"""
@@ -260,41 +402,56 @@ class TransformativeFeedback:
         exercise: Dict[str, Any],
         user_id: str,
         user_history: Optional[Dict[str, Any]],
-        time_taken_seconds: Optional[int]
+        time_taken_seconds: Optional[int],
+        timings: Optional[Dict[str, float]] = None,
+        deferred: bool = False
     ) -> TransformativeFeedbackResult:
         """Génère feedback pour réponse correcte"""
+        timings = {} if timings is None else timings
 
         # Couche 1: Immédiat
-        immediate = random.choice(self.immediate_success)
-
-        # Couche 2: Reconnaissance spécifique
-        explanation = self._build_success_explanation(exercise, time_taken_seconds)
-
-        # Couche 3: Insight (optionnel)
-        strategy = self._build_success_insight(exercise, time_taken_seconds)
+        immediate = self._timed(timings, "immediate", random.choice, self.immediate_success)
 
         # Couche 5: Encouragement personnalisé
-        encouragement = self._build_success_encouragement(
+        encouragement = self._timed(
+            timings,
+            "encouragement",
+            self._build_success_encouragement,
             user_id,
             user_history,
             exercise
         )
 
         # Couche 6: Prochaine action
-        next_action = self._determine_next_action_success(exercise, user_history)
+        next_action = self._timed(
+            timings,
+            "next_action",
+            self._determine_next_action_success,
+            exercise,
+            user_history
+        )
 
-        return TransformativeFeedbackResult(
+        result = TransformativeFeedbackResult(
             immediate=immediate,
-            explanation=explanation,
-            strategy=strategy,
+            explanation="",
+            strategy=None,
             remediation=None,
             encouragement=encouragement,
             next_action=next_action,
             is_correct=True,
             confidence=1.0,
-            timestamp=datetime.now().isoformat()
+            timestamp=datetime.now().isoformat(),
+            layer_timings=timings
         )
 
+        # Couche 2: Reconnaissance spécifique / Couche 3: Insight
+        layers = {
+            "explanation": lambda: self._build_success_explanation(exercise, time_taken_seconds),
+            "strategy": lambda: self._build_success_insight(exercise, time_taken_seconds)
+        }
+        fallback = f"Tu as bien résolu {exercise.get('operation', 'cet exercice')}!"
+        return self._fill_deep_layers(result, layers, fallback, deferred)
+
     def _generate_failure_feedback(
         self,
         error_analysis: ErrorAnalysisResult,
@@ -302,62 +459,66 @@ class TransformativeFeedback:
         response: Any,
         expected: Any,
         user_id: str,
-        user_history: Optional[Dict[str, Any]]
+        user_history: Optional[Dict[str, Any]],
+        timings: Optional[Dict[str, float]] = None,
+        deferred: bool = False
     ) -> TransformativeFeedbackResult:
         """Génère feedback constructif pour erreur"""
+        timings = {} if timings is None else timings
 
         # Déterminer gravité
         severity = error_analysis.severity
         confidence = error_analysis.confidence
 
         # Couche 1: Immédiat
-        if severity <= 2:
-            immediate = random.choice(self.immediate_close)
-        else:
-            immediate = random.choice(self.immediate_wrong)
-
-        # Couche 2: Explication de l'erreur
-        explanation = self._build_error_explanation(
-            error_analysis,
-            exercise,
-            response,
-            expected
-        )
-
-        # Couche 3: Stratégie alternative
-        strategy = self._build_alternative_strategy(
-            error_analysis,
-            exercise
-        )
-
-        # Couche 4: Remédiation
-        remediation = self.remediation_recommender.recommend_exercise(
-            error_analysis,
-            exercise.get("difficulty", "CE2")
-        )
+        immediate_messages = self.immediate_close if severity <= 2 else self.immediate_wrong
+        immediate = self._timed(timings, "immediate", random.choice, immediate_messages)
 
         # Couche 5: Encouragement
-        encouragement = self._build_failure_encouragement(
+        encouragement = self._timed(
+            timings,
+            "encouragement",
+            self._build_failure_encouragement,
             error_analysis,
             user_id,
             user_history
         )
 
         # Couche 6: Prochaine action
-        next_action = self._determine_next_action_failure(error_analysis)
+        next_action = self._timed(
+            timings,
+            "next_action",
+            self._determine_next_action_failure,
+            error_analysis
+        )
 
-        return TransformativeFeedbackResult(
+        result = TransformativeFeedbackResult(
             immediate=immediate,
-            explanation=explanation,
-            strategy=strategy,
-            remediation=remediation,
+            explanation="",
+            strategy=None,
+            remediation=None,
             encouragement=encouragement,
             next_action=next_action,
             is_correct=False,
             confidence=confidence,
-            timestamp=datetime.now().isoformat()
+            timestamp=datetime.now().isoformat(),
+            layer_timings=timings
         )
 
+        # Couche 2: Explication / Couche 3: Stratégie / Couche 4: Remédiation
+        layers = {
+            "explanation": lambda: self._build_error_explanation(
+                error_analysis, exercise, response, expected
+            ),
+            "strategy": lambda: self._build_alternative_strategy(error_analysis, exercise),
+            "remediation": lambda: self.remediation_recommender.recommend_exercise(
+                error_analysis, exercise.get("difficulty", "CE2")
+            )
+        }
+        operation = exercise.get("operation", "l'exercice")
+        fallback = f"Pour {operation}: la bonne réponse est {expected}."
+        return self._fill_deep_layers(result, layers, fallback, deferred)
+
     def _build_success_explanation(
         self,
         exercise: Dict[str, Any],
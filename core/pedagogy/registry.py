@@ -0,0 +1,52 @@
+"""
+Registre processus des moteurs pédagogiques partagés
+Phase 6.1.4 - MathCopain v6.4
+
+ErrorAnalyzer et TransformativeFeedback ne gardent aucun état par élève:
+une seule instance par processus suffit pour toutes les sessions Streamlit.
+L'état de session (user_id, historique, temps de réponse) est passé
+explicitement à chaque appel de process_exercise_response.
+"""
+
+import threading
+from typing import Optional
+
+from .error_analyzer import ErrorAnalyzer
+from .feedback_engine import TransformativeFeedback
+
+
+_lock = threading.Lock()
+_error_analyzer: Optional[ErrorAnalyzer] = None
+_feedback_engine: Optional[TransformativeFeedback] = None
+
+
+def get_error_analyzer() -> ErrorAnalyzer:
+    """Retourne l'ErrorAnalyzer partagé (créé au premier appel)"""
+    global _error_analyzer
+    if _error_analyzer is None:
+        with _lock:
+            if _error_analyzer is None:
+                _error_analyzer = ErrorAnalyzer()
+    return _error_analyzer
+
+
+def get_feedback_engine() -> TransformativeFeedback:
+    """Retourne le TransformativeFeedback partagé (créé au premier appel)"""
+    global _feedback_engine
+    if _feedback_engine is None:
+        analyzer = get_error_analyzer()
+        with _lock:
+            if _feedback_engine is None:
+                _feedback_engine = TransformativeFeedback(error_analyzer=analyzer)
+    return _feedback_engine
+
+
+def reset_shared_instances() -> None:
+    """Oublie les instances partagées (tests, rechargement de taxonomie)"""
+    global _error_analyzer, _feedback_engine
+    with _lock:
+        engine = _feedback_engine
+        _error_analyzer = None
+        _feedback_engine = None
+    if engine is not None:
+        engine.shutdown(wait=False)
@@ -0,0 +1,360 @@
+"""
+TaxonomySnapshot - Taxonomie d'erreurs pré-compilée
+Phase 6.1 - MathCopain v6.4
+
+Valide error_taxonomy.json une seule fois et écrit un snapshot JSON
+contenant le catalogue et l'index par (domaine, niveau), ce dernier sous
+forme de positions dans le catalogue. Au chargement, le snapshot n'est ni
+revalidé ni ré-évalué (scores atteignables); les chaînes sont internées
+(les doublons ne sont stockés qu'une fois). JSON plutôt que pickle: un
+fichier déposé à la place du snapshot ne peut pas exécuter de code.
+
+Le snapshot est réutilisé tant que le mtime/la taille du JSON ne changent pas;
+sinon le hash SHA-256 du JSON décide s'il faut recompiler. Une fois chargée,
+la taxonomie est gardée en mémoire pour le processus (un stat() par analyseur).
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+# Version du format de snapshot (incrémenter si les structures changent)
+SNAPSHOT_FORMAT_VERSION = 2
+
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+# Seuil minimum de score pour retenir un candidat
+MATCH_THRESHOLD = 0.3
+
+# Bonus de score (cf. ErrorAnalyzer._calculate_match_score)
+AGE_BONUS = 0.3
+PATTERN_BONUS = 0.4
+MAX_DIFFERENCE_BONUS = 0.3
+
+# Cache processus: chemin du JSON -> taxonomie compilée (partagée en lecture seule)
+_loaded_taxonomies: Dict[Tuple[Path, Path], "CompiledTaxonomy"] = {}
+_loaded_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class IndexedError:
+    """Entrée de taxonomie pré-extraite pour le scoring rapide"""
+    category: str
+    domain: str
+    error_def: Dict[str, Any]
+    pattern: str  # pattern en minuscules
+    confidence: float
+    ages: FrozenSet[str]
+    is_calculation: bool
+
+
+@dataclass
+class CompiledTaxonomy:
+    """Taxonomie validée et indexée, prête à l'emploi"""
+    catalog: Dict[str, Any]
+    errors_by_id: Dict[str, IndexedError]
+    domain_index: Dict[str, List[IndexedError]]
+    candidate_index: Dict[Tuple[str, Optional[str]], List[Tuple[IndexedError, float]]]
+    entries: List[IndexedError] = field(default_factory=list)  # ordre du catalogue
+    source_mtime_ns: int = 0
+    source_size: int = 0
+    source_sha256: str = ""
+    format_version: int = field(default=SNAPSHOT_FORMAT_VERSION)
+
+
+def default_snapshot_path(taxonomy_path: Path) -> Path:
+    """Chemin du snapshot associé à un fichier de taxonomie"""
+    taxonomy_path = Path(taxonomy_path)
+    return taxonomy_path.with_name(taxonomy_path.stem + SNAPSHOT_SUFFIX)
+
+
+def validate_catalog(catalog: Any) -> None:
+    """
+    Valide la structure du catalogue
+
+    Raises:
+        ValueError: Si la structure est invalide
+    """
+    if not isinstance(catalog, dict) or "error_categories" not in catalog:
+        raise ValueError("Format de catalogue invalide: 'error_categories' manquant")
+
+    seen_ids = set()
+    for category_name, category_data in catalog["error_categories"].items():
+        if not isinstance(category_data, dict):
+            raise ValueError(f"Catégorie invalide: {category_name}")
+
+        for domain, errors_list in category_data.get("errors", {}).items():
+            if not isinstance(errors_list, list):
+                raise ValueError(f"Liste d'erreurs invalide: {category_name}/{domain}")
+
+            for error_def in errors_list:
+                error_id = error_def.get("id")
+                if error_id is None:
+                    continue
+                if error_id in seen_ids:
+                    raise ValueError(f"ID d'erreur dupliqué: {error_id}")
+                seen_ids.add(error_id)
+
+                confidence = error_def.get("detection_confidence", 0.5)
+                if not 0.0 <= confidence <= 1.0:
+                    raise ValueError(f"detection_confidence hors [0, 1]: {error_id}")
+
+
+def _intern_strings(value: Any) -> Any:
+    """Interne récursivement toutes les chaînes (clés et valeurs)"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return {sys.intern(k) if isinstance(k, str) else k: _intern_strings(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_intern_strings(v) for v in value]
+    return value
+
+
+def _reachable_candidates(
+    entries: List[IndexedError],
+    age: Optional[str]
+) -> List[Tuple[IndexedError, float]]:
+    """Filtre les entrées dont le score maximal atteignable dépasse le seuil"""
+    candidates = []
+    for entry in entries:
+        age_bonus = AGE_BONUS if age in entry.ages else 0.0
+        best_score = (age_bonus + PATTERN_BONUS + MAX_DIFFERENCE_BONUS) * entry.confidence
+        if best_score > MATCH_THRESHOLD:
+            candidates.append((entry, age_bonus))
+    return candidates
+
+
+def _index_entries(catalog: Dict[str, Any]) -> List[IndexedError]:
+    """Entrées pré-extraites, dans l'ordre du catalogue"""
+    entries = []
+    # Parcours catégorie par catégorie: l'ordre des listes par domaine
+    # reproduit le départage du scan linéaire d'origine
+    for category_name, category_data in catalog["error_categories"].items():
+        for domain, errors_list in category_data.get("errors", {}).items():
+            for error_def in errors_list:
+                entries.append(IndexedError(
+                    category=category_name,
+                    domain=domain,
+                    error_def=error_def,
+                    pattern=sys.intern(error_def.get("pattern", "").lower()),
+                    confidence=error_def.get("detection_confidence", 0.5),
+                    ages=frozenset(error_def.get("common_ages", [])),
+                    is_calculation=error_def.get("id", "").startswith("CALC")
+                ))
+    return entries
+
+
+def _assemble(
+    catalog: Dict[str, Any],
+    entries: List[IndexedError],
+    candidate_index: Dict[Tuple[str, Optional[str]], List[Tuple[IndexedError, float]]]
+) -> CompiledTaxonomy:
+    """Table ID → entrée et index par domaine à partir des entrées"""
+    errors_by_id: Dict[str, IndexedError] = {}
+    domain_index: Dict[str, List[IndexedError]] = {}
+    for entry in entries:
+        domain_index.setdefault(entry.domain, []).append(entry)
+        if "id" in entry.error_def:
+            errors_by_id[entry.error_def["id"]] = entry
+
+    return CompiledTaxonomy(
+        catalog=catalog,
+        errors_by_id=errors_by_id,
+        domain_index=domain_index,
+        candidate_index=candidate_index,
+        entries=entries
+    )
+
+
+def build_compiled_taxonomy(catalog: Dict[str, Any]) -> CompiledTaxonomy:
+    """
+    Construit les index à partir d'un catalogue déjà validé
+
+    - domain_index: domaine -> entrées pré-extraites (ordre du catalogue)
+    - candidate_index: (domaine, niveau) -> [(entrée, bonus_âge)], limité
+      aux entrées capables de dépasser MATCH_THRESHOLD pour ce niveau;
+      la clé (domaine, None) sert aux niveaux absents des common_ages
+    """
+    catalog = _intern_strings(catalog)
+    compiled = _assemble(catalog, _index_entries(catalog), {})
+
+    ages_seen = set()
+    for entry in compiled.entries:
+        ages_seen.update(entry.ages)
+
+    for domain, entries in compiled.domain_index.items():
+        compiled.candidate_index[(domain, None)] = _reachable_candidates(entries, None)
+        for age in ages_seen:
+            compiled.candidate_index[(domain, age)] = _reachable_candidates(entries, age)
+    return compiled
+
+
+def compile_taxonomy(
+    taxonomy_path: Path,
+    snapshot_path: Optional[Path] = None
+) -> CompiledTaxonomy:
+    """
+    Parse, valide et indexe le JSON puis écrit le snapshot
+
+    Raises:
+        FileNotFoundError: Si le fichier n'existe pas
+        json.JSONDecodeError: Si le JSON est invalide
+        ValueError: Si la structure est invalide
+    """
+    taxonomy_path = Path(taxonomy_path)
+    raw = taxonomy_path.read_bytes()
+    stat = taxonomy_path.stat()
+
+    catalog = json.loads(raw.decode('utf-8'))
+    validate_catalog(catalog)
+
+    compiled = build_compiled_taxonomy(catalog)
+    compiled.source_mtime_ns = stat.st_mtime_ns
+    compiled.source_size = stat.st_size
+    compiled.source_sha256 = hashlib.sha256(raw).hexdigest()
+
+    _write_snapshot(compiled, snapshot_path or default_snapshot_path(taxonomy_path))
+    return compiled
+
+
+def _write_snapshot(compiled: CompiledTaxonomy, snapshot_path: Path) -> bool:
+    """Écrit le snapshot de façon atomique (fichier temporaire + rename)"""
+    positions = {id(entry): i for i, entry in enumerate(compiled.entries)}
+    data = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "source": {
+            "mtime_ns": compiled.source_mtime_ns,
+            "size": compiled.source_size,
+            "sha256": compiled.source_sha256,
+        },
+        "catalog": compiled.catalog,
+        "candidate_index": [
+            [domain, age, [[positions[id(entry)], age_bonus] for entry, age_bonus in candidates]]
+            for (domain, age), candidates in compiled.candidate_index.items()
+        ],
+    }
+
+    snapshot_path = Path(snapshot_path)
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(
+            dir=snapshot_path.parent,
+            prefix=snapshot_path.name,
+            suffix=".tmp"
+        )
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, snapshot_path)
+        return True
+    except OSError:
+        # Répertoire en lecture seule: le snapshot reste en mémoire uniquement
+        if temp_path is not None and os.path.exists(temp_path):
+            os.unlink(temp_path)
+        return False
+
+
+def _read_snapshot(snapshot_path: Path) -> Optional[CompiledTaxonomy]:
+    """
+    Lit un snapshot existant, None s'il est absent, illisible ou d'un
+    autre format. Pas de revalidation: le snapshot a été écrit après
+    validate_catalog()
+    """
+    try:
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data["format_version"] != SNAPSHOT_FORMAT_VERSION:
+            return None
+
+        catalog = _intern_strings(data["catalog"])
+        entries = _index_entries(catalog)
+        candidate_index = {
+            (domain, age): [(entries[position], age_bonus) for position, age_bonus in candidates]
+            for domain, age, candidates in data["candidate_index"]
+        }
+        compiled = _assemble(catalog, entries, candidate_index)
+        compiled.source_mtime_ns = data["source"]["mtime_ns"]
+        compiled.source_size = data["source"]["size"]
+        compiled.source_sha256 = data["source"]["sha256"]
+    except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError):
+        return None
+    return compiled
+
+
+def load_compiled_taxonomy(
+    taxonomy_path: Path,
+    snapshot_path: Optional[Path] = None
+) -> CompiledTaxonomy:
+    """
+    Charge la taxonomie compilée, en recompilant seulement si nécessaire
+
+    0. déjà chargée dans ce processus et JSON inchangé -> objet en mémoire
+    1. mtime et taille identiques au snapshot -> snapshot utilisé tel quel
+    2. mtime changé mais même SHA-256 -> snapshot ré-horodaté
+    3. sinon -> recompilation complète et réécriture du snapshot
+
+    La taxonomie retournée est partagée entre analyseurs: ne pas la modifier.
+
+    Raises:
+        FileNotFoundError: Si le fichier de taxonomie n'existe pas
+    """
+    taxonomy_path = Path(taxonomy_path)
+    if not taxonomy_path.exists():
+        raise FileNotFoundError(
+            f"Catalogue d'erreurs non trouvé: {taxonomy_path}"
+        )
+
+    snapshot_path = Path(snapshot_path or default_snapshot_path(taxonomy_path))
+    stat = taxonomy_path.stat()
+    cache_key = (taxonomy_path.resolve(), snapshot_path.resolve())
+
+    # Déjà chargée dans ce processus et JSON inchangé: un simple stat()
+    compiled = _loaded_taxonomies.get(cache_key)
+    if compiled is not None and _matches_stat(compiled, stat):
+        return compiled
+
+    with _loaded_lock:
+        compiled = _load_or_compile(taxonomy_path, snapshot_path, stat)
+        _loaded_taxonomies[cache_key] = compiled
+    return compiled
+
+
+def _matches_stat(compiled: CompiledTaxonomy, stat: os.stat_result) -> bool:
+    """Vrai si le snapshot correspond au mtime et à la taille du JSON"""
+    return (compiled.source_mtime_ns == stat.st_mtime_ns
+            and compiled.source_size == stat.st_size)
+
+
+def _load_or_compile(
+    taxonomy_path: Path,
+    snapshot_path: Path,
+    stat: os.stat_result
+) -> CompiledTaxonomy:
+    """Lit le snapshot sur disque s'il est à jour, sinon recompile"""
+    compiled = _read_snapshot(snapshot_path)
+
+    if compiled is not None:
+        if _matches_stat(compiled, stat):
+            return compiled
+
+        sha256 = hashlib.sha256(taxonomy_path.read_bytes()).hexdigest()
+        if compiled.source_sha256 == sha256:
+            compiled.source_mtime_ns = stat.st_mtime_ns
+            compiled.source_size = stat.st_size
+            _write_snapshot(compiled, snapshot_path)
+            return compiled
+
+    return compile_taxonomy(taxonomy_path, snapshot_path)
+
+
+def clear_loaded_taxonomies() -> None:
+    """Vide le cache processus (tests, rechargement forcé)"""
+    with _loaded_lock:
+        _loaded_taxonomies.clear()
@@ -0,0 +1,194 @@
+"""
+Profile Store - Profils élèves en un fichier par élève (mode JSON)
+Remplace la réécriture complète de utilisateurs.json à chaque sauvegarde
+
+Chaque profil est un petit fichier JSON compact, remplacé atomiquement
+(fichier temporaire puis renommage): sauvegarder un élève coûte la taille
+de son profil, pas celle de toute l'école. Les fichiers sont répartis
+dans 256 sous-répertoires selon l'empreinte du nom. Un index léger
+(index.json) liste les élèves; il n'est réécrit qu'à l'ajout d'un élève
+et peut être reconstruit depuis les fichiers.
+
+Disposition:
+    <racine>/index.json             {"version": 1, "profils": {nom: "3f/3f9a….json"}}
+    <racine>/3f/3f9a….json          {"nom": nom, "profil": {...}}
+
+Exemple:
+    stockage = StockageProfils("./data/profils")
+    stockage.ecrire("alice", profil)
+    stockage.lire("alice")
+    migrer_fichier("utilisateurs.json", "./data/profils")
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+PROFILE_STORE_VERSION = 1
+
+INDEX = "index.json"
+
+
+def ecrire_atomique(chemin: Union[str, Path], contenu: str) -> None:
+    """Remplace le fichier d'un bloc: un lecteur voit l'ancien ou le nouveau contenu"""
+    chemin = Path(chemin)
+    temp_fd, temp_path = tempfile.mkstemp(dir=chemin.parent, prefix=f".{chemin.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
+            f.write(contenu)
+        os.replace(temp_path, chemin)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _compact(donnees: Any) -> str:
+    return json.dumps(donnees, ensure_ascii=False, separators=(",", ":"))
+
+
+class StockageProfils:
+    """Un fichier par profil + index des noms"""
+
+    def __init__(self, racine: Union[str, Path]):
+        self.racine = Path(racine)
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, str]] = None
+
+    def chemin_relatif(self, nom: str) -> str:
+        """Fichier du profil, relatif à la racine (empreinte du nom)"""
+        empreinte = hashlib.blake2b(nom.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{empreinte[:2]}/{empreinte}.json"
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _charger_index(self) -> Dict[str, str]:
+        if self._index is None:
+            try:
+                with open(self.racine / INDEX, "r", encoding="utf-8") as f:
+                    self._index = dict(json.load(f)["profils"])
+            except FileNotFoundError:
+                self._index = {}
+            except (ValueError, KeyError, TypeError):
+                self._index = self._scanner()
+        return self._index
+
+    def _ecrire_index(self) -> None:
+        ecrire_atomique(
+            self.racine / INDEX,
+            _compact({"version": PROFILE_STORE_VERSION, "profils": self._index})
+        )
+
+    def _scanner(self) -> Dict[str, str]:
+        """Index depuis les fichiers de profils (index absent ou illisible)"""
+        index = {}
+        for chemin in sorted(self.racine.glob("*/*.json")):
+            try:
+                with open(chemin, "r", encoding="utf-8") as f:
+                    nom = json.load(f)["nom"]
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            index[nom] = chemin.relative_to(self.racine).as_posix()
+        return index
+
+    def reconstruire_index(self) -> int:
+        """Reconstruit index.json depuis les fichiers. Returns: nombre de profils"""
+        with self._lock:
+            self._index = self._scanner()
+            self.racine.mkdir(parents=True, exist_ok=True)
+            self._ecrire_index()
+            return len(self._index)
+
+    def existe(self) -> bool:
+        """True si le stockage contient un index"""
+        return (self.racine / INDEX).exists()
+
+    # ------------------------------------------------------------------
+    # Lecture / écriture
+    # ------------------------------------------------------------------
+
+    def noms(self) -> List[str]:
+        with self._lock:
+            return list(self._charger_index())
+
+    def lire(self, nom: str) -> Optional[Dict[str, Any]]:
+        """Profil de l'élève, None si absent ou illisible"""
+        with self._lock:
+            relatif = self._charger_index().get(nom)
+        if relatif is None:
+            return None
+        try:
+            with open(self.racine / relatif, "r", encoding="utf-8") as f:
+                return json.load(f)["profil"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def lire_tout(self) -> Dict[str, Dict[str, Any]]:
+        profils = {}
+        for nom in self.noms():
+            profil = self.lire(nom)
+            if profil is not None:
+                profils[nom] = profil
+        return profils
+
+    def ecrire(self, nom: str, profil: Dict[str, Any]) -> None:
+        """
+        Écrit un profil (remplacement atomique de son seul fichier)
+
+        Raises:
+            OSError: Si l'écriture échoue
+            TypeError, ValueError: Si le profil n'est pas sérialisable
+        """
+        contenu = _compact({"nom": nom, "profil": profil})
+        relatif = self.chemin_relatif(nom)
+        chemin = self.racine / relatif
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        ecrire_atomique(chemin, contenu)
+
+        with self._lock:
+            index = self._charger_index()
+            if index.get(nom) != relatif:
+                index[nom] = relatif
+                self._ecrire_index()
+
+    def ecrire_plusieurs(self, profils: Dict[str, Dict[str, Any]]) -> int:
+        """Écrit plusieurs profils, index réécrit une seule fois. Returns: nombre écrit"""
+        nouveaux = {}
+        for nom, profil in profils.items():
+            relatif = self.chemin_relatif(nom)
+            chemin = self.racine / relatif
+            chemin.parent.mkdir(parents=True, exist_ok=True)
+            ecrire_atomique(chemin, _compact({"nom": nom, "profil": profil}))
+            nouveaux[nom] = relatif
+
+        with self._lock:
+            index = self._charger_index()
+            if not self.existe() or any(index.get(nom) != relatif for nom, relatif in nouveaux.items()):
+                index.update(nouveaux)
+                self.racine.mkdir(parents=True, exist_ok=True)
+                self._ecrire_index()
+        return len(nouveaux)
+
+
+def migrer_fichier(source: Union[str, Path], racine: Union[str, Path]) -> int:
+    """
+    Convertit un utilisateurs.json monolithique en stockage par élève
+    (le fichier source n'est pas modifié)
+
+    Returns:
+        Nombre de profils migrés
+
+    Raises:
+        ValueError: Si la source n'est pas un objet JSON {nom: profil}
+    """
+    with open(source, "r", encoding="utf-8") as f:
+        donnees = json.load(f)
+    if not isinstance(donnees, dict):
+        raise ValueError(f"{source}: objet JSON {{nom: profil}} attendu")
+    return StockageProfils(racine).ecrire_plusieurs(donnees)
@@ -0,0 +1,256 @@
+"""
+Render Cache - Cache des rendus SVG/HTML adressé par contenu
+Remplace st.cache_data pour les fonctions de dessin: utilisable hors
+Streamlit (exports, tests), borné en mémoire, avec un niveau disque
+optionnel pour que le cache chaud survive aux redémarrages.
+
+La clé est la forme canonique (tuple hashable) de:
+- la fonction (module, nom, empreinte du bytecode: une modification du
+  dessin invalide ses anciennes entrées disque)
+- ses paramètres liés à la signature (défauts appliqués, dict triés)
+Sur disque, chaque rendu est un fichier nommé par l'empreinte blake2b
+de cette clé.
+
+Exemple:
+    @rendu_cache
+    def dessiner_angle_svg(mesure_degres: int, size: int = 300) -> str:
+        ...
+
+    dessiner_angle_svg(45)                 # calculé
+    dessiner_angle_svg(45, size=300)       # même clé: en cache
+    get_render_cache().stats()             # {'hits': 1, 'misses': 1, ...}
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+
+from .cache import LRUCache
+
+
+# Nombre de rendus gardés en mémoire (0 désactive le cache)
+RENDER_CACHE_SIZE = int(os.getenv('RENDER_CACHE_SIZE', '1024'))
+
+# Répertoire du niveau disque (vide: désactivé)
+RENDER_CACHE_DIR = os.getenv('RENDER_CACHE_DIR', '')
+
+
+def canonique(valeur: Any) -> Hashable:
+    """
+    Forme canonique hashable de paramètres de dessin
+
+    Tuples et listes sont équivalents, les dict sont triés par clé, les
+    scalaires numpy sont convertis; 5, 5.0 et True restent distincts.
+
+    Raises:
+        TypeError: Si une valeur n'a pas de forme canonique
+    """
+    cls = type(valeur)
+    if cls is str or cls is int or valeur is None:
+        return valeur
+    if cls is float or cls is bool:
+        return (cls.__name__, valeur)
+    if cls is tuple or cls is list:
+        return tuple([canonique(v) for v in valeur])
+    if cls is dict:
+        return ('dict', tuple(sorted([(k, canonique(v)) for k, v in valeur.items()])))
+    if isinstance(valeur, np.generic):
+        return canonique(valeur.item())
+    if isinstance(valeur, (set, frozenset)):
+        return ('set', tuple(sorted((canonique(v) for v in valeur), key=repr)))
+    raise TypeError(f"Paramètre non canonisable: {cls.__name__}")
+
+
+def empreinte_rendu(*parts: Any) -> Optional[str]:
+    """
+    Empreinte (hex, 128 bits) de la forme canonique de paramètres
+
+    Sert de nom de fichier au niveau disque. Retourne None si un
+    paramètre n'a pas de forme canonique.
+    """
+    try:
+        texte = repr(canonique(parts))
+    except TypeError:
+        return None
+    return hashlib.blake2b(texte.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class RenderCache:
+    """
+    Cache LRU mémoire + niveau disque optionnel (un fichier par rendu)
+
+    Le disque n'est lu qu'en cas d'absence en mémoire; les écritures sont
+    atomiques (fichier temporaire puis os.replace). Toute erreur disque
+    est ignorée: le rendu est alors simplement recalculé.
+    """
+
+    def __init__(self, maxsize: int = RENDER_CACHE_SIZE, disk_dir: Optional[Path] = None):
+        """
+        Args:
+            maxsize: Nombre de rendus en mémoire
+            disk_dir: Répertoire du niveau disque (None: mémoire seule)
+        """
+        self.memoire = LRUCache(maxsize=maxsize)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_writes = 0
+
+    def _chemin(self, key: Hashable) -> Path:
+        digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+        return self.disk_dir / digest[:2] / f"{digest}.txt"
+
+    def _lire_disque(self, key: Hashable) -> Optional[str]:
+        try:
+            rendu = self._chemin(key).read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            with self._lock:
+                self.disk_misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        return rendu
+
+    def _ecrire_disque(self, key: Hashable, rendu: str) -> None:
+        path = self._chemin(key)
+        temp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=path.stem, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(rendu)
+            os.replace(temp_path, path)
+        except OSError:
+            if temp_path and os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return
+        with self._lock:
+            self.disk_writes += 1
+
+    def get_or_render(self, key: Optional[Hashable], rendre: Callable[[], str]) -> str:
+        """Rendu en cache (mémoire, puis disque), sinon calculé et stocké"""
+        if key is None:
+            return rendre()
+
+        rendu = self.memoire.get(key)
+        if rendu is not None:
+            return rendu
+
+        if self.disk_dir is not None:
+            rendu = self._lire_disque(key)
+        if rendu is None:
+            rendu = rendre()
+            if self.disk_dir is not None:
+                self._ecrire_disque(key, rendu)
+        self.memoire.put(key, rendu)
+        return rendu
+
+    def clear(self, disk: bool = False) -> None:
+        """Vide la mémoire (et le disque si demandé); compteurs remis à zéro"""
+        self.memoire.clear()
+        with self._lock:
+            self.disk_hits = 0
+            self.disk_misses = 0
+            self.disk_writes = 0
+        if disk and self.disk_dir is not None:
+            for path in self.disk_dir.glob("*/*.txt"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Statistiques pour monitoring (hit_rate global: mémoire + disque)"""
+        stats = self.memoire.stats()
+        with self._lock:
+            disk_hits, disk_misses, disk_writes = self.disk_hits, self.disk_misses, self.disk_writes
+        lookups = stats['hits'] + stats['misses']
+        stats.update({
+            'disk_dir': str(self.disk_dir) if self.disk_dir else None,
+            'disk_hits': disk_hits,
+            'disk_misses': disk_misses,
+            'disk_writes': disk_writes,
+            'memory_hit_rate': stats['hit_rate'],
+            'hit_rate': (stats['hits'] + disk_hits) / lookups if lookups else 0.0
+        })
+        return stats
+
+
+_MANQUANT = object()
+
+
+def rendu_cache(fonction: Callable[..., str]) -> Callable[..., str]:
+    """
+    Décorateur: met en cache les rendus de `fonction` dans le cache partagé
+
+    Réservé aux fonctions à paramètres positionnels ou nommés simples
+    (pas de *args/**kwargs). La fonction d'origine reste accessible via
+    __wrapped__.
+    """
+    parametres = list(inspect.signature(fonction).parameters.values())
+    if any(p.kind not in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parametres):
+        raise TypeError(f"{fonction.__qualname__}: *args/**kwargs non supportés")
+    noms = tuple(p.name for p in parametres)
+    positions = {nom: i for i, nom in enumerate(noms)}
+    defauts = {p.name: p.default for p in parametres if p.default is not p.empty}
+    code = fonction.__code__
+    identite = (
+        fonction.__module__,
+        fonction.__qualname__,
+        hashlib.blake2b(code.co_code + repr(code.co_consts).encode('utf-8'), digest_size=8).hexdigest()
+    )
+
+    @functools.wraps(fonction)
+    def wrapper(*args: Any, **kwargs: Any) -> str:
+        if kwargs or len(args) != len(noms):
+            valeurs = args + tuple([
+                kwargs.get(nom, defauts.get(nom, _MANQUANT)) for nom in noms[len(args):]
+            ])
+            if (len(args) > len(noms) or any(v is _MANQUANT for v in valeurs)
+                    or any(positions.get(nom, -1) < len(args) for nom in kwargs)):
+                return fonction(*args, **kwargs)  # appel invalide: TypeError d'origine
+        else:
+            valeurs = args
+        try:
+            key = (identite, canonique(valeurs))
+        except TypeError:
+            return fonction(*args, **kwargs)
+        return get_render_cache().get_or_render(key, lambda: fonction(*args, **kwargs))
+
+    return wrapper
+
+
+# =============== CACHE PARTAGÉ ===============
+
+_render_lock = threading.Lock()
+_render_cache: Optional[RenderCache] = None
+
+
+def get_render_cache() -> RenderCache:
+    """Retourne le cache de rendus partagé par processus (créé au premier appel)"""
+    global _render_cache
+    if _render_cache is None:
+        with _render_lock:
+            if _render_cache is None:
+                _render_cache = RenderCache(RENDER_CACHE_SIZE, RENDER_CACHE_DIR or None)
+    return _render_cache
+
+
+def reset_render_cache(cache: Optional[RenderCache] = None) -> None:
+    """Remplace (ou oublie) le cache partagé (tests, configuration)"""
+    global _render_cache
+    with _render_lock:
+        _render_cache = cache
+
+
+def get_render_stats() -> Dict[str, Any]:
+    """Statistiques du cache de rendus partagé"""
+    return get_render_cache().stats()
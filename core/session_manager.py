@@ -3,10 +3,14 @@ Session Manager - Gestion centralisée de l'état de session Streamlit
 Extrait de app.py pour isolation et testabilité
 """
 
+import random
+
 import streamlit as st
 from datetime import date, datetime
 from typing import Dict, Any, Optional
 
+from .exercise_generator import rng_session
+
 
 class SessionManager:
     """
@@ -79,6 +83,12 @@ class SessionManager:
         """Retourne dict avec current et max streak."""
         return self.state.get('streak', {'current': 0, 'max': 0})
 
+    def get_rng(self) -> random.Random:
+        """Retourne le générateur aléatoire de la session (créé au besoin)."""
+        if self.state.get('rng') is None:
+            self.state['rng'] = rng_session()
+        return self.state['rng']
+
     def get_stats_par_niveau(self) -> Dict[str, Dict[str, int]]:
         """Retourne stats par niveau."""
         return self.state.get('stats_par_niveau', {})
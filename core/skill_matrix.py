@@ -0,0 +1,167 @@
+"""
+Skill Matrix - Compétences de toute une classe (ou école) en un calcul
+Pour les vues enseignant et les traitements de nuit
+
+Les historiques sont fournis à plat, un élément par exercice (tableaux
+NumPy de même longueur): indice élève, code du type (indice dans
+SKILL_TYPES), réussite, difficulté et instant en secondes. Le résultat
+est une matrice élèves × types.
+
+Même formule que AdaptiveSystem.get_skill_levels, dans le même ordre
+d'opérations: les 20 derniers résultats de chaque (élève, type) sont
+rangés dans une grille (élèves·types × 20) puis la récurrence avance
+d'une colonne à la fois pour tous les couples en même temps (20 pas
+vectorisés au lieu d'une boucle Python par exercice). Les poids
+0.5 ** (jours / decay_days) sont calculés une fois par âge distinct.
+
+Exemple:
+    tableaux = historiques_en_tableaux([profil['exercise_history'] for profil in classe])
+    niveaux = matrice_competences(*tableaux, n_eleves=len(classe))
+    niveaux.shape  # (len(classe), len(SKILL_TYPES))
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .adaptive_system import SKILL_TYPES
+from .skill_state import FENETRE_COMPETENCE, Moment, microsecondes
+
+JOUR_S = 86400
+
+
+def secondes(moment: Moment = None) -> float:
+    """Instant en secondes, sur la même échelle que skill_state.microsecondes()"""
+    return microsecondes(moment) / 1_000_000
+
+
+def historiques_en_tableaux(
+    historiques: Sequence[List[Dict[str, Any]]],
+    types: Sequence[str] = SKILL_TYPES
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Historiques de profils → tableaux à plat pour matrice_competences()
+
+    Les exercices d'un type absent de `types` sont ignorés.
+
+    Returns:
+        (eleves, types, correct, difficulte, instants)
+    """
+    codes = {exercise_type: i for i, exercise_type in enumerate(types)}
+    maintenant = microsecondes()
+    eleves, codes_type, correct, difficulte, instants = [], [], [], [], []
+    for eleve, historique in enumerate(historiques):
+        for ex in historique:
+            code = codes.get(ex.get('type'))
+            if code is None:
+                continue
+            eleves.append(eleve)
+            codes_type.append(code)
+            correct.append(bool(ex.get('correct')))
+            difficulte.append(ex.get('difficulty', 3))
+            timestamp = ex.get('timestamp')
+            instants.append(microsecondes(timestamp) if timestamp else maintenant)
+    return (
+        np.asarray(eleves, dtype=np.int64),
+        np.asarray(codes_type, dtype=np.int64),
+        np.asarray(correct, dtype=bool),
+        np.asarray(difficulte, dtype=np.float64),
+        np.asarray(instants, dtype=np.int64) / 1_000_000,
+    )
+
+
+def matrice_competences(
+    eleves: np.ndarray,
+    types: np.ndarray,
+    correct: np.ndarray,
+    difficulte: np.ndarray,
+    instants: np.ndarray,
+    n_eleves: Optional[int] = None,
+    n_types: int = len(SKILL_TYPES),
+    maintenant: Optional[float] = None,
+    decay_days: float = 7,
+    fenetre: int = FENETRE_COMPETENCE
+) -> np.ndarray:
+    """
+    Compétences (0-1, non arrondies) de tous les élèves pour tous les types
+
+    Pour chaque élève, les exercices sont pris dans l'ordre des tableaux
+    (ordre de l'historique), comme get_skill_levels. Les historiques sont
+    supposés déjà bornés (100 derniers exercices par élève).
+
+    Args:
+        eleves: Indice de l'élève (0 ≤ e < n_eleves)
+        types: Code du type d'exercice (0 ≤ t < n_types)
+        correct: Réussite
+        difficulte: Difficulté 1-10
+        instants: Instant de l'exercice en secondes (cf. secondes())
+        n_eleves: Nombre de lignes (défaut: max(eleves) + 1)
+        n_types: Nombre de colonnes
+        maintenant: Instant du calcul en secondes (défaut: secondes())
+        decay_days: Demi-vie des résultats, en jours
+        fenetre: Résultats pris en compte par (élève, type)
+
+    Returns:
+        Matrice float64 (n_eleves, n_types), 0 si type jamais pratiqué
+
+    Raises:
+        ValueError: Si les tableaux n'ont pas la même longueur ou si un
+            indice sort de la matrice
+    """
+    eleves = np.asarray(eleves, dtype=np.int64)
+    types = np.asarray(types, dtype=np.int64)
+    correct = np.asarray(correct, dtype=bool)
+    difficulte = np.asarray(difficulte, dtype=np.float64)
+    instants = np.asarray(instants, dtype=np.float64)
+
+    n = len(eleves)
+    if not (len(types) == len(correct) == len(difficulte) == len(instants) == n):
+        raise ValueError("Les tableaux doivent avoir la même longueur")
+    if n_eleves is None:
+        n_eleves = int(eleves.max()) + 1 if n else 0
+    niveaux = np.zeros((n_eleves, n_types))
+    if n == 0:
+        return niveaux
+    if eleves.min() < 0 or eleves.max() >= n_eleves or types.min() < 0 or types.max() >= n_types:
+        raise ValueError("Indice d'élève ou de type hors de la matrice")
+    if maintenant is None:
+        maintenant = secondes()
+
+    # Regroupement par (élève, type), ordre d'origine conservé dans chaque groupe
+    cellules = eleves * n_types + types
+    ordre = np.argsort(cellules, kind='stable')
+    groupes, debuts, tailles = np.unique(cellules[ordre], return_index=True, return_counts=True)
+
+    # Seuls les `fenetre` derniers de chaque groupe: colonne 0 = le plus ancien
+    rang = np.arange(n) - np.repeat(debuts, tailles)
+    colonne = rang - np.repeat(np.maximum(tailles - fenetre, 0), tailles)
+    garde = colonne >= 0
+    lignes = np.repeat(np.arange(len(groupes)), tailles)[garde]
+    colonne = colonne[garde]
+    selection = ordre[garde]
+
+    # Poids temporels: un calcul Python par âge distinct (mêmes valeurs que la boucle)
+    jours = np.floor_divide(maintenant - instants[selection], JOUR_S).astype(np.int64)
+    ages, inverse = np.unique(jours, return_inverse=True)
+    poids_ages = np.array([0.5 ** (int(age) / decay_days) for age in ages])
+
+    # Cases vides: poids 0 → skill + 0.0, inchangée
+    poids = np.zeros((len(groupes), fenetre))
+    facteurs = np.zeros((len(groupes), fenetre))
+    succes = np.ones((len(groupes), fenetre), dtype=bool)
+    poids[lignes, colonne] = poids_ages[inverse.ravel()]
+    facteurs[lignes, colonne] = difficulte[selection] / 10
+    succes[lignes, colonne] = correct[selection]
+
+    skill = np.zeros(len(groupes))
+    for k in range(fenetre):
+        weight = poids[:, k]
+        skill = np.where(
+            succes[:, k],
+            skill + (0.15 * facteurs[:, k] * weight * (1 - skill)),
+            skill - (0.08 * weight * skill)
+        )
+        np.clip(skill, 0.0, 1.0, out=skill)
+
+    niveaux.ravel()[groupes] = skill
+    return niveaux
@@ -0,0 +1,191 @@
+"""
+Skill State - État incrémental des compétences d'un élève
+Remplace le re-scan complet de l'historique à chaque recommandation
+
+Pour chaque type d'exercice, l'état garde les FENETRE_COMPETENCE derniers
+résultats sous forme compacte [rang, instant en µs, correct, difficulté]
+et la dernière compétence calculée avec son intervalle de validité.
+
+- enregistrer(): O(1), aucune date à analyser
+- niveau(): la décroissance temporelle est appliquée à la lecture; la
+  valeur en cache reste exacte tant qu'aucun résultat ne change d'âge
+  (en jours entiers) et qu'aucun n'est sorti de l'historique
+
+La formule est celle d'AdaptiveSystem.get_skill_levels (mêmes poids,
+même ordre de calcul): les deux donnent des résultats identiques.
+
+L'état vit dans le profil (profil['skill_state']) sous une forme JSON:
+il est sauvegardé avec lui, sans étape supplémentaire.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Nombre de résultats pris en compte par type (cf. get_skill_levels)
+FENETRE_COMPETENCE = 20
+
+# Taille de l'historique conservé dans le profil (cf. SkillTracker)
+HISTORIQUE_MAX = 100
+
+SKILL_STATE_VERSION = 1
+
+JOUR_US = 86_400_000_000
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECONDE = timedelta(microseconds=1)
+
+Moment = Union[datetime, str, None]
+
+
+def microsecondes(moment: Moment = None) -> int:
+    """
+    Instant en µs depuis 1970 (datetime naïf, sans fuseau ni heure d'été)
+
+    Les différences sont exactement celles des datetime d'origine: les
+    âges en jours sont identiques à (maintenant - instant).days.
+    """
+    if moment is None:
+        moment = datetime.now()
+    elif isinstance(moment, str):
+        moment = datetime.fromisoformat(moment)
+    return (moment - _EPOCH) // _MICROSECONDE
+
+
+class EtatCompetences:
+    """
+    Vue sur le dict profil['skill_state'] (modifié sur place)
+
+    Exemple:
+        etat = etat_competences(profil)
+        etat.enregistrer("addition", True, difficulty=3)
+        etat.niveau("addition")     # 0.045
+    """
+
+    def __init__(
+        self,
+        donnees: Optional[Dict[str, Any]] = None,
+        decay_days: float = 7,
+        fenetre: int = FENETRE_COMPETENCE,
+        historique_max: int = HISTORIQUE_MAX
+    ):
+        """
+        Args:
+            donnees: Dict persistant (créé si None)
+            decay_days: Demi-vie des résultats, en jours
+            fenetre: Résultats pris en compte par type
+            historique_max: Résultats conservés tous types confondus
+        """
+        self.donnees = donnees if donnees is not None else {}
+        self.donnees.setdefault('version', SKILL_STATE_VERSION)
+        self.donnees.setdefault('rang', 0)
+        self.donnees.setdefault('types', {})
+        self.decay_days = decay_days
+        self.fenetre = fenetre
+        self.historique_max = historique_max
+
+        # Cache calculé avec une autre demi-vie: invalide
+        if self.donnees.get('decay_days') != decay_days:
+            self.donnees['decay_days'] = decay_days
+            for etat in self.donnees['types'].values():
+                etat['cache'] = None
+
+    @classmethod
+    def depuis_historique(
+        cls,
+        exercise_history: Iterable[Dict[str, Any]],
+        donnees: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> "EtatCompetences":
+        """Reconstruit l'état à partir d'un historique existant (migration)"""
+        if donnees is not None:
+            donnees.clear()
+        etat = cls(donnees, **kwargs)
+        for ex in exercise_history:
+            etat.enregistrer(
+                ex.get('type'), ex.get('correct'), ex.get('difficulty', 3), ex.get('timestamp')
+            )
+        return etat
+
+    def enregistrer(self, exercise_type: str, correct: bool, difficulty: int = 3, moment: Moment = None) -> None:
+        """Ajoute un résultat (O(1))"""
+        rang = self.donnees['rang'] + 1
+        self.donnees['rang'] = rang
+        etat = self.donnees['types'].setdefault(exercise_type, {'resultats': [], 'cache': None})
+        resultats = etat['resultats']
+        resultats.append([rang, microsecondes(moment), bool(correct), difficulty])
+        if len(resultats) > self.fenetre:
+            del resultats[0]
+        etat['cache'] = None
+
+    def niveau(self, exercise_type: str, maintenant: Moment = None) -> float:
+        """
+        Compétence actuelle (0-1, non arrondie), 0 si jamais pratiqué
+
+        Recalculée (au plus FENETRE_COMPETENCE résultats) seulement si le
+        cache n'est plus valide.
+        """
+        return self._niveau(exercise_type, microsecondes(maintenant))
+
+    def niveaux(self, exercise_types: List[str], maintenant: Moment = None) -> Dict[str, float]:
+        """Compétences arrondies à 2 décimales, comme get_skill_levels"""
+        maintenant_us = microsecondes(maintenant)
+        niveaux = {}
+        for exercise_type in exercise_types:
+            skill = self._niveau(exercise_type, maintenant_us)
+            niveaux[exercise_type] = round(skill, 2) if skill else 0
+        return niveaux
+
+    def _niveau(self, exercise_type: str, maintenant_us: int) -> float:
+        etat = self.donnees['types'].get(exercise_type)
+        if not etat:
+            return 0
+
+        # Résultats sortis de l'historique du profil
+        resultats = etat['resultats']
+        limite = self.donnees['rang'] - self.historique_max
+        if resultats and resultats[0][0] <= limite:
+            while resultats and resultats[0][0] <= limite:
+                del resultats[0]
+            etat['cache'] = None
+        if not resultats:
+            return 0
+
+        cache = etat['cache']
+        if cache is not None and cache[1] <= maintenant_us < cache[2]:
+            return cache[0]
+
+        skill = 0
+        debut, fin = float('-inf'), float('inf')
+        for _, instant_us, correct, difficulty in resultats:
+            days_ago = (maintenant_us - instant_us) // JOUR_US
+            weight = 0.5 ** (days_ago / self.decay_days)  # Décroissance exponentielle
+
+            if correct:
+                difficulty_factor = difficulty / 10
+                skill += (0.15 * difficulty_factor * weight * (1 - skill))
+            else:
+                skill -= (0.08 * weight * skill)
+            skill = max(0.0, min(1.0, skill))
+
+            # Intervalle pendant lequel l'âge de ce résultat ne change pas
+            debut = max(debut, instant_us + days_ago * JOUR_US)
+            fin = min(fin, instant_us + (days_ago + 1) * JOUR_US)
+
+        etat['cache'] = [skill, debut, fin]
+        return skill
+
+
+def etat_competences(profil: Dict[str, Any], decay_days: float = 7) -> EtatCompetences:
+    """
+    État des compétences du profil, reconstruit depuis l'historique si
+    absent (profils antérieurs) ou d'une autre version
+    """
+    donnees = profil.get('skill_state')
+    if not isinstance(donnees, dict) or donnees.get('version') != SKILL_STATE_VERSION:
+        from .exercise_history import historique_exercices
+
+        donnees = {}
+        profil['skill_state'] = donnees
+        return EtatCompetences.depuis_historique(
+            historique_exercices(profil), donnees, decay_days=decay_days
+        )
+    return EtatCompetences(donnees, decay_days=decay_days)
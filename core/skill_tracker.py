@@ -6,6 +6,9 @@ from datetime import datetime
 from typing import Dict, List
 import json
 
+from core.exercise_history import historique_exercices
+from core.skill_state import etat_competences
+
 class SkillTracker:
     """
     Gère persistance et mise à jour compétences utilisateur
@@ -35,9 +38,8 @@ class SkillTracker:
 
             }
         
-        # Initialiser historique exercices
-        if 'exercise_history' not in self.profil:
-            self.profil['exercise_history'] = []
+        # Initialiser historique exercices (tampon circulaire, ancien format converti)
+        historique_exercices(self.profil)
     
     def record_exercise(self, exercise_type: str, correct: bool, difficulty: int = 3, time_taken: float = None):
         """
@@ -55,20 +57,13 @@ class SkillTracker:
             if correct:
                 self.profil['stats_par_type'][exercise_type]['correct'] += 1
         
-        # Ajouter à l'historique
-        exercise_record = {
-            'type': exercise_type,
-            'correct': correct,
-            'difficulty': difficulty,
-            'timestamp': datetime.now().isoformat(),
-            'time_taken': time_taken
-        }
-        
-        self.profil['exercise_history'].append(exercise_record)
+        # État des compétences (reconstruit depuis l'historique si absent)
+        etat = etat_competences(self.profil)
         
-        # Garder seulement 100 derniers (économie mémoire)
-        if len(self.profil['exercise_history']) > 100:
-            self.profil['exercise_history'] = self.profil['exercise_history'][-100:]
+        # Ajouter à l'historique (100 derniers dans le profil, les plus anciens archivés dans HISTORY_ARCHIVE_DIR)
+        now = datetime.now()
+        historique_exercices(self.profil).ajouter(exercise_type, correct, difficulty, now, time_taken)
+        etat.enregistrer(exercise_type, correct, difficulty, now)
     
     def get_success_rate_by_type(self) -> Dict[str, float]:
         """
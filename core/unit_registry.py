@@ -0,0 +1,200 @@
+"""
+Unit Registry - Unités de mesure et facteurs de conversion exacts
+Longueurs, masses, capacités et durées (CE1-CM2)
+
+Chaque unité est définie une fois par son facteur (Fraction) vers l'unité
+de base de sa grandeur. À l'import, une matrice de facteurs est construite
+par grandeur: conversion, vérification d'une réponse et étapes
+d'explication sont ensuite de simples lectures de table, en arithmétique
+exacte (pas d'erreur d'arrondi du type 0.1 + 0.2).
+
+Exemple:
+    convertir(250, "cm", "m")                        # Fraction(5, 2)
+    nombre(convertir(250, "cm", "m"))                # 2.5
+    verifier_conversion(2.5, 250, "cm", "m")         # True
+    etape_conversion("cm", "m")                      # Etape(grande=m, petite=cm, rapport=100, ...)
+"""
+
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Dict, Tuple, Union
+
+Nombre = Union[int, float, Fraction]
+
+# Tolérance par défaut: réponse arrondie au pas de saisie (0,1) acceptée
+TOLERANCE_CONVERSION = Fraction(1, 20)
+
+
+@dataclass(frozen=True)
+class Unite:
+    """Unité de mesure: facteur exact vers l'unité de base de sa grandeur"""
+    symbole: str
+    grandeur: str
+    facteur: Fraction
+    nom: str = ""          # forme écrite dans « 1 tonne = 1000 kg » (défaut: symbole)
+    pluriel: str = ""      # forme écrite dans « de kg à tonnes » (défaut: symbole)
+
+    @property
+    def libelle(self) -> str:
+        return self.nom or self.symbole
+
+    @property
+    def libelle_pluriel(self) -> str:
+        return self.pluriel or self.symbole
+
+
+UNITES = (
+    # Longueurs (base: m)
+    Unite("mm", "longueur", Fraction(1, 1000)),
+    Unite("cm", "longueur", Fraction(1, 100)),
+    Unite("dm", "longueur", Fraction(1, 10)),
+    Unite("m", "longueur", Fraction(1)),
+    Unite("km", "longueur", Fraction(1000)),
+    # Masses (base: g)
+    Unite("g", "masse", Fraction(1)),
+    Unite("kg", "masse", Fraction(1000)),
+    Unite("t", "masse", Fraction(1000000), nom="tonne", pluriel="tonnes"),
+    # Capacités (base: L)
+    Unite("mL", "capacite", Fraction(1, 1000)),
+    Unite("cL", "capacite", Fraction(1, 100)),
+    Unite("dL", "capacite", Fraction(1, 10)),
+    Unite("L", "capacite", Fraction(1)),
+    # Durées (base: s)
+    Unite("s", "duree", Fraction(1)),
+    Unite("min", "duree", Fraction(60)),
+    Unite("h", "duree", Fraction(3600)),
+)
+
+
+@dataclass(frozen=True)
+class MatriceConversion:
+    """
+    Facteurs de conversion d'une grandeur
+
+    facteurs[i][j]: par combien multiplier une valeur en unites[i]
+    pour l'obtenir en unites[j]
+    """
+    grandeur: str
+    unites: Tuple[str, ...]
+    facteurs: Tuple[Tuple[Fraction, ...], ...]
+
+
+@dataclass(frozen=True)
+class Etape:
+    """Relation à énoncer pour expliquer une conversion"""
+    grande: Unite          # « 1 grande = rapport petite »
+    petite: Unite
+    rapport: int
+    multiplier: bool       # True: on multiplie par rapport, sinon on divise
+
+
+def _construire_matrices() -> Dict[str, MatriceConversion]:
+    grandeurs: Dict[str, list] = {}
+    for unite in UNITES:
+        grandeurs.setdefault(unite.grandeur, []).append(unite)
+    return {
+        grandeur: MatriceConversion(
+            grandeur=grandeur,
+            unites=tuple(u.symbole for u in unites),
+            facteurs=tuple(tuple(depart.facteur / arrivee.facteur for arrivee in unites) for depart in unites)
+        )
+        for grandeur, unites in grandeurs.items()
+    }
+
+
+MATRICES = _construire_matrices()
+
+_UNITES_PAR_SYMBOLE = {unite.symbole: unite for unite in UNITES}
+_FACTEURS: Dict[Tuple[str, str], Fraction] = {
+    (depart, arrivee): matrice.facteurs[i][j]
+    for matrice in MATRICES.values()
+    for i, depart in enumerate(matrice.unites)
+    for j, arrivee in enumerate(matrice.unites)
+}
+
+
+def _etape(depart: Unite, arrivee: Unite) -> Etape:
+    facteur = depart.facteur / arrivee.facteur
+    if facteur >= 1:
+        return Etape(grande=depart, petite=arrivee, rapport=int(facteur), multiplier=True)
+    return Etape(grande=arrivee, petite=depart, rapport=int(1 / facteur), multiplier=False)
+
+
+_ETAPES: Dict[Tuple[str, str], Etape] = {
+    (depart, arrivee): _etape(_UNITES_PAR_SYMBOLE[depart], _UNITES_PAR_SYMBOLE[arrivee])
+    for depart, arrivee in _FACTEURS
+}
+
+
+def get_unite(symbole: str) -> Unite:
+    """
+    Raises:
+        ValueError: Si l'unité est inconnue
+    """
+    try:
+        return _UNITES_PAR_SYMBOLE[symbole]
+    except KeyError:
+        raise ValueError(f"Unité inconnue: {symbole}") from None
+
+
+def facteur(depart: str, arrivee: str) -> Fraction:
+    """
+    Facteur exact de depart vers arrivee (1 km → m: 1000)
+
+    Raises:
+        ValueError: Si une unité est inconnue ou les grandeurs différentes
+    """
+    try:
+        return _FACTEURS[(depart, arrivee)]
+    except KeyError:
+        get_unite(depart)
+        get_unite(arrivee)
+        raise ValueError(f"Conversion impossible: {depart} → {arrivee}") from None
+
+
+def exact(valeur: Nombre) -> Fraction:
+    """Valeur exacte: un float vaut son écriture décimale (0.1 → 1/10)"""
+    if isinstance(valeur, float):
+        return Fraction(repr(valeur))
+    return Fraction(valeur)
+
+
+def nombre(valeur: Fraction) -> Union[int, float]:
+    """Fraction → int si entière, sinon float (pour l'affichage et les exercices)"""
+    if valeur.denominator == 1:
+        return valeur.numerator
+    return float(valeur)
+
+
+def convertir(valeur: Nombre, depart: str, arrivee: str) -> Fraction:
+    """Convertit exactement une valeur (250 cm → m: Fraction(5, 2))"""
+    return exact(valeur) * facteur(depart, arrivee)
+
+
+def verifier_reponse(reponse: Nombre, attendu: Nombre, tolerance: Nombre = 0) -> bool:
+    """Réponse correcte si |reponse - attendu| <= tolerance (comparaison exacte)"""
+    return abs(exact(reponse) - exact(attendu)) <= exact(tolerance)
+
+
+def verifier_conversion(
+    reponse: Nombre,
+    valeur_depart: Nombre,
+    depart: str,
+    arrivee: str,
+    tolerance: Nombre = TOLERANCE_CONVERSION
+) -> bool:
+    """Vérifie la réponse d'un élève à « Convertis valeur_depart depart en arrivee »"""
+    return verifier_reponse(reponse, convertir(valeur_depart, depart, arrivee), tolerance)
+
+
+def etape_conversion(depart: str, arrivee: str) -> Etape:
+    """
+    Relation à énoncer (« 1 m = 100 cm ») et sens de l'opération
+
+    Raises:
+        ValueError: Si une unité est inconnue ou les grandeurs différentes
+    """
+    etape = _ETAPES.get((depart, arrivee))
+    if etape is None:
+        facteur(depart, arrivee)  # ValueError explicite
+    return etape
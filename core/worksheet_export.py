@@ -0,0 +1,360 @@
+"""
+Worksheet Export - Fiches d'exercices imprimables en flux (CSV / HTML)
+Pour les enseignants: packs de plusieurs centaines d'exercices par
+classe, avec corrigé.
+
+Les exercices sont produits un par un (générateurs Python) et écrits
+au fil de l'eau: la mémoire ne dépend pas de la taille du pack. Les 4
+opérations de base passent par generer_batch (lots de EXPORT_CHUNK_SIZE).
+Le corrigé HTML est mis en tampon dans un fichier temporaire
+(SpooledTemporaryFile) puis recopié à la fin du document.
+
+Les illustrations (formes, angles, pièces et billets) sont rendues par
+les fonctions de dessin des modules *_utils, mises en cache par
+core.render_cache (un rendu par jeu de paramètres).
+
+Exemple:
+    with open("fiche.html", "w", encoding="utf-8") as f:
+        stats = exporter_html(f, ["addition", "perimetre"], "CE2", n=500)
+    stats  # {'exercices': 500, 'secondes': ..., 'exercices_par_seconde': ...}
+"""
+
+import csv
+import html
+import itertools
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, TextIO
+
+import numpy as np
+
+from . import exercise_generator
+
+
+# Taille des lots generer_batch pour les 4 opérations de base
+EXPORT_CHUNK_SIZE = 256
+
+# Corrigé HTML gardé en mémoire jusqu'à cette taille, puis sur disque
+CORRIGE_SPOOL_BYTES = 1 << 20
+
+COLONNES_CSV = ("numero", "type", "niveau", "question", "reponse")
+
+@dataclass(frozen=True)
+class LigneFiche:
+    """Un exercice de la fiche, prêt à écrire"""
+    numero: int
+    kind: str
+    niveau: str
+    question: str
+    reponse: str
+    illustration: Optional[str] = None
+    illustration_reponse: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class TypeFiche:
+    """Comment produire et présenter un type d'exercice"""
+    flux: Callable[[str], Iterator[Dict[str, Any]]]
+    reponse: Callable[[Dict[str, Any]], str]
+    illustration: Optional[Callable[[Dict[str, Any]], str]] = None
+    illustration_reponse: Optional[Callable[[Dict[str, Any]], str]] = None
+
+
+# =============== ILLUSTRATIONS ===============
+# Les fonctions de dessin sont mises en cache par core.render_cache
+
+_NOMS_FORMES = {"carre": "Carré", "rectangle": "Rectangle", "triangle": "Triangle"}
+
+
+def _illustration_forme(exercice: Dict[str, Any]) -> str:
+    from geometrie_utils import dessiner_forme_svg
+
+    return dessiner_forme_svg(_NOMS_FORMES[exercice['type']], exercice['dimensions'], 200)
+
+
+def _illustration_angle(exercice: Dict[str, Any]) -> str:
+    from geometrie_utils import dessiner_angle_svg
+
+    return dessiner_angle_svg(exercice['angle']['mesure'], 200)
+
+
+def _illustration_pieces(exercice: Dict[str, Any]) -> str:
+    from monnaie_utils import dessiner_pieces_monnaie
+
+    return dessiner_pieces_monnaie(exercice['composition'])
+
+
+# =============== RÉPONSES ===============
+
+def _reponse_generique(exercice: Dict[str, Any]) -> str:
+    """Réponse lisible: texte fourni, sinon valeur (+ reste, + unité)"""
+    if 'reponse_texte' in exercice:
+        return exercice['reponse_texte']
+    reponse = exercice['reponse']
+    if isinstance(reponse, float) and reponse.is_integer():
+        reponse = int(reponse)
+    texte = str(reponse)
+    if exercice.get('reste'):
+        texte += f" reste {exercice['reste']}"
+    unite = exercice.get('unite_arrivee') or exercice.get('unite')
+    return f"{texte} {unite}" if unite else texte
+
+
+def _reponse_composition(exercice: Dict[str, Any]) -> str:
+    return ", ".join(f"{quantite} × {nom}" for _, nom, quantite in exercice['composition'])
+
+
+# =============== TYPES D'EXERCICES ===============
+
+def _flux_batch(kind: str) -> Callable[[str], Iterator[Dict[str, Any]]]:
+    """Exercices tirés par lots vectorisés (generer_batch)"""
+    def flux(niveau: str) -> Iterator[Dict[str, Any]]:
+        rng = np.random.default_rng()
+        while True:
+            yield from exercise_generator.generer_batch(kind, niveau, EXPORT_CHUNK_SIZE, rng=rng)
+    return flux
+
+
+def _flux_unitaire(
+    generer: Callable[[str], Optional[Dict[str, Any]]]
+) -> Callable[[str], Iterator[Optional[Dict[str, Any]]]]:
+    """
+    Exercices tirés un par un par un générateur generer_x(niveau)
+
+    Un générateur sans exercice pour le niveau renvoie None: le premier
+    tirage est alors transmis tel quel (iter_fiche le refuse), les
+    suivants sont ignorés.
+    """
+    def flux(niveau: str) -> Iterator[Optional[Dict[str, Any]]]:
+        yield generer(niveau)
+        while True:
+            exercice = generer(niveau)
+            if exercice is not None:
+                yield exercice
+    return flux
+
+
+@lru_cache(maxsize=1)
+def types_fiche() -> Dict[str, TypeFiche]:
+    """
+    Types d'exercices exportables
+
+    Les modules de domaine sont importés ici pour que `core` reste
+    importable sans eux (cf. exercise_pool.default_generators).
+    """
+    import decimaux_utils
+    import geometrie_utils
+    import mesures_utils
+    import monnaie_utils
+    import proportionnalite_utils
+
+    types = {
+        kind: TypeFiche(_flux_batch(kind), _reponse_generique)
+        for kind in ("addition", "soustraction", "tables", "division")
+    }
+    types["probleme"] = TypeFiche(
+        _flux_unitaire(exercise_generator.generer_probleme), _reponse_generique
+    )
+
+    domain_generators = {
+        decimaux_utils: (
+            "comparaison_decimaux", "addition_decimaux", "soustraction_decimaux",
+            "multiplication_par_10_100", "fraction_vers_decimal"
+        ),
+        mesures_utils: (
+            "conversion_longueur", "conversion_masse", "conversion_capacite", "probleme_duree"
+        ),
+        monnaie_utils: ("calcul_rendu", "probleme_realiste"),
+        proportionnalite_utils: ("pourcentage_simple", "echelle", "vitesse"),
+    }
+    for module, kinds in domain_generators.items():
+        for kind in kinds:
+            types[kind] = TypeFiche(
+                _flux_unitaire(getattr(module, f"generer_{kind}")), _reponse_generique
+            )
+
+    types["composition_monnaie"] = TypeFiche(
+        _flux_unitaire(monnaie_utils.generer_composition_monnaie),
+        _reponse_composition,
+        illustration_reponse=_illustration_pieces
+    )
+    for kind in ("perimetre", "aire"):
+        types[kind] = TypeFiche(
+            _flux_unitaire(getattr(geometrie_utils, f"generer_{kind}")),
+            _reponse_generique,
+            illustration=_illustration_forme
+        )
+    types["angle"] = TypeFiche(
+        _flux_unitaire(geometrie_utils.generer_angle),
+        _reponse_generique,
+        illustration=_illustration_angle
+    )
+    return types
+
+
+def iter_fiche(kinds: Sequence[str], niveau: str, n: int) -> Iterator[LigneFiche]:
+    """
+    Produit n exercices, types en alternance, un à la fois
+
+    Les paramètres sont vérifiés dès l'appel (un exercice tiré par type),
+    avant que le premier exercice ne soit demandé.
+
+    Raises:
+        ValueError: Si un type est inconnu ou sans exercice à ce niveau,
+            la liste vide ou n négatif
+    """
+    types = types_fiche()
+    inconnus = [kind for kind in kinds if kind not in types]
+    if inconnus:
+        raise ValueError(f"Types d'exercice inconnus: {', '.join(inconnus)}")
+    if not kinds:
+        raise ValueError("Au moins un type d'exercice est requis")
+    if n < 0:
+        raise ValueError("n doit être >= 0")
+
+    flux: Dict[str, Iterator[Dict[str, Any]]] = {}
+    indisponibles = []
+    for kind in kinds:
+        if kind in flux:
+            continue
+        flux_kind = types[kind].flux(niveau)
+        premier = next(flux_kind)
+        if premier is None:
+            indisponibles.append(kind)
+        flux[kind] = itertools.chain([premier], flux_kind)
+    if indisponibles:
+        raise ValueError(f"Types d'exercice indisponibles en {niveau}: {', '.join(indisponibles)}")
+
+    return _lignes(types, flux, kinds, niveau, n)
+
+
+def _lignes(
+    types: Dict[str, TypeFiche],
+    flux: Dict[str, Iterator[Dict[str, Any]]],
+    kinds: Sequence[str],
+    niveau: str,
+    n: int
+) -> Iterator[LigneFiche]:
+    """Lignes de la fiche, paramètres déjà vérifiés par iter_fiche()"""
+    for i in range(n):
+        kind = kinds[i % len(kinds)]
+        type_fiche = types[kind]
+        exercice = next(flux[kind])
+        yield LigneFiche(
+            numero=i + 1,
+            kind=kind,
+            niveau=niveau,
+            question=exercice['question'],
+            reponse=type_fiche.reponse(exercice),
+            illustration=type_fiche.illustration(exercice) if type_fiche.illustration else None,
+            illustration_reponse=(
+                type_fiche.illustration_reponse(exercice) if type_fiche.illustration_reponse else None
+            )
+        )
+
+
+# =============== EXPORTS ===============
+
+def _stats(exercices: int, debut: float) -> Dict[str, float]:
+    secondes = time.perf_counter() - debut
+    return {
+        'exercices': exercices,
+        'secondes': secondes,
+        'exercices_par_seconde': exercices / secondes if secondes > 0 else 0.0
+    }
+
+
+def exporter_csv(sortie: TextIO, kinds: Sequence[str], niveau: str, n: int) -> Dict[str, float]:
+    """
+    Écrit la fiche en CSV (une ligne par exercice, réponse incluse)
+
+    Les illustrations ne sont pas exportées en CSV.
+
+    Returns:
+        {'exercices', 'secondes', 'exercices_par_seconde'}
+    """
+    debut = time.perf_counter()
+    lignes = iter_fiche(kinds, niveau, n)
+    writer = csv.writer(sortie)
+    writer.writerow(COLONNES_CSV)
+    count = 0
+    for ligne in lignes:
+        writer.writerow((ligne.numero, ligne.kind, ligne.niveau, ligne.question, ligne.reponse))
+        count += 1
+    return _stats(count, debut)
+
+
+_HTML_DEBUT = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>{titre}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+ol {{ columns: 2; column-gap: 3em; }}
+li {{ break-inside: avoid; margin-bottom: 1.2em; }}
+.reponse {{ border-bottom: 1px dotted #999; width: 12em; height: 1.4em; }}
+.corrige {{ break-before: page; }}
+.corrige li {{ margin-bottom: 0.4em; }}
+</style>
+</head>
+<body>
+<h1>{titre}</h1>
+<p>Nom : ______________________ &nbsp; Niveau : {niveau}</p>
+<ol>
+"""
+
+_HTML_CORRIGE = """</ol>
+<section class="corrige">
+<h2>Corrigé</h2>
+<ol>
+"""
+
+_HTML_FIN = """</ol>
+</section>
+</body>
+</html>
+"""
+
+
+def exporter_html(
+    sortie: TextIO,
+    kinds: Sequence[str],
+    niveau: str,
+    n: int,
+    titre: str = "Fiche d'exercices MathCopain"
+) -> Dict[str, float]:
+    """
+    Écrit une fiche HTML imprimable: énoncés (avec illustrations) puis corrigé
+
+    Returns:
+        {'exercices', 'secondes', 'exercices_par_seconde'}
+    """
+    debut = time.perf_counter()
+    lignes = iter_fiche(kinds, niveau, n)
+    sortie.write(_HTML_DEBUT.format(titre=html.escape(titre), niveau=html.escape(niveau)))
+
+    count = 0
+    with tempfile.SpooledTemporaryFile(
+        max_size=CORRIGE_SPOOL_BYTES, mode="w+", encoding="utf-8"
+    ) as corrige:
+        for ligne in lignes:
+            sortie.write(f"<li><p>{html.escape(ligne.question)}</p>")
+            if ligne.illustration:
+                sortie.write(ligne.illustration)
+            sortie.write('<div class="reponse"></div></li>\n')
+
+            corrige.write(f"<li>{html.escape(ligne.reponse)}")
+            if ligne.illustration_reponse:
+                corrige.write(ligne.illustration_reponse)
+            corrige.write("</li>\n")
+            count += 1
+
+        sortie.write(_HTML_CORRIGE)
+        corrige.seek(0)
+        shutil.copyfileobj(corrige, sortie)
+    sortie.write(_HTML_FIN)
+    return _stats(count, debut)
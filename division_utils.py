@@ -4,50 +4,34 @@ Utilitaires pour générer des divisions guidées
 """
 import random
 
-def generer_division_simple(niveau):
+from core.operand_catalog import get_catalogue
+
+# Plages par niveau, bornes incluses (cf. core.operand_catalog)
+# Sans reste: ((quotient_min, quotient_max), (diviseur_min, diviseur_max))
+PLAGES_DIVISION_SIMPLE = {
+    "CE2": ((2, 5), (2, 5)),      # divisions très simples
+    "CM1": ((3, 9), (2, 7)),      # divisions moyennes
+    "CM2": ((5, 12), (3, 9)),     # divisions plus complexes (défaut)
+}
+
+# Avec reste: ((diviseur_min, diviseur_max), (quotient_min, quotient_max))
+PLAGES_DIVISION_RESTE = {
+    "CM1": ((3, 7), (3, 8)),
+    "CM2": ((4, 9), (4, 12)),     # défaut
+}
+
+
+def generer_division_simple(niveau, rng=None):
     """
     Génère une division avec quotient exact (pas de reste)
+    Tirage uniforme parmi toutes les divisions du niveau
     """
-    if niveau == "CE2":
-        # CE2 : divisions très simples
-        quotient = random.randint(2, 5)
-        diviseur = random.randint(2, 5)
-    elif niveau == "CM1":
-        # CM1 : divisions moyennes
-        quotient = random.randint(3, 9)
-        diviseur = random.randint(2, 7)
-    else:  # CM2
-        # CM2 : divisions plus complexes
-        quotient = random.randint(5, 12)
-        diviseur = random.randint(3, 9)
-    
-    dividende = quotient * diviseur
-    
-    return {
-        'dividende': dividende,
-        'diviseur': diviseur,
-        'quotient': quotient,
-        'reste': 0
-    }
+    return get_catalogue("division_simple", niveau).tirer(rng or random)
+
 
-def generer_division_reste(niveau):
+def generer_division_reste(niveau, rng=None):
     """
     Génère une division avec reste
+    Tirage uniforme parmi toutes les divisions du niveau
     """
-    if niveau == "CM1":
-        diviseur = random.randint(3, 7)
-        quotient = random.randint(3, 8)
-        reste = random.randint(1, diviseur - 1)
-    else:  # CM2
-        diviseur = random.randint(4, 9)
-        quotient = random.randint(4, 12)
-        reste = random.randint(1, diviseur - 1)
-    
-    dividende = (quotient * diviseur) + reste
-    
-    return {
-        'dividende': dividende,
-        'diviseur': diviseur,
-        'quotient': quotient,
-        'reste': reste
-    }
\ No newline at end of file
+    return get_catalogue("division_reste", niveau).tirer(rng or random)
@@ -2,7 +2,9 @@ import streamlit as st
 import math
 from typing import Tuple
 
-@st.cache_data
+from core.render_cache import rendu_cache
+
+@rendu_cache
 def dessiner_pizza(denominateur: int, parts_colorees: Tuple[int, ...], size: int = 300) -> str:
     """
     ✅ Génère SVG d'une pizza divisée en parts (CACHÉ)
@@ -98,7 +100,7 @@ def pizza_interactive(denominateur, callback_key="pizza"):
     return selected
 
 
-@st.cache_data
+@rendu_cache
 def afficher_fraction_droite(numerateur: int, denominateur: int, size: int = 400) -> str:
     """
     ✅ Affiche fraction sur droite numérique 0-1 (CACHÉ)
@@ -5,9 +5,10 @@ Exercices de géométrie CE1-CM2
 
 import random
 import math
-import streamlit as st
 from typing import Dict
 
+from core.render_cache import rendu_cache
+
 # ========================================
 # GÉNÉRATEURS D'EXERCICES
 # ========================================
@@ -210,7 +211,7 @@ def generer_angle(niveau):
 # FONCTIONS SVG (Visualisations)
 # ========================================
 
-@st.cache_data
+@rendu_cache
 def dessiner_forme_svg(forme_nom: str, dimensions: Dict, size: int = 300) -> str:
     """
     ✅ Génère SVG d'une forme géométrique (CACHÉ)
@@ -327,7 +328,7 @@ def dessiner_forme_svg(forme_nom: str, dimensions: Dict, size: int = 300) -> str
     return svg
 
 
-@st.cache_data
+@rendu_cache
 def dessiner_angle_svg(mesure_degres: int, size: int = 300) -> str:
     """
     ✅ Dessine un angle avec arc - VERSION SIMPLIFIÉE (CACHÉ)
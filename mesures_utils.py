@@ -4,101 +4,93 @@ Exercices de mesures et conversions CE1-CM2
 """
 
 import random
-import streamlit as st
+from typing import Dict, Optional
+
+from core.unit_registry import convertir, etape_conversion, nombre
+
+# ========================================
+# CONVERSIONS PAR NIVEAU
+# ========================================
+
+# (unité de départ, unité d'arrivée, (valeur min, valeur max)) par niveau
+CONVERSIONS_LONGUEUR = {
+    # cm ↔ m
+    "CE1": [("cm", "m", (100, 500)), ("m", "cm", (1, 10))],
+    # mm ↔ cm ↔ m
+    "CM1": [
+        ("mm", "cm", (50, 500)), ("cm", "mm", (5, 50)),
+        ("cm", "m", (100, 800)), ("m", "cm", (2, 20)),
+    ],
+    # Toutes conversions
+    "CM2": [
+        ("mm", "cm", (50, 500)), ("cm", "mm", (5, 50)),
+        ("cm", "m", (100, 800)), ("m", "cm", (2, 20)),
+        ("m", "km", (1000, 5000)), ("km", "m", (2, 15)),
+    ],
+}
+CONVERSIONS_LONGUEUR["CE2"] = CONVERSIONS_LONGUEUR["CE1"]
+
+CONVERSIONS_MASSE = {
+    # g ↔ kg
+    "CE1": [("g", "kg", (1000, 5000)), ("kg", "g", (2, 10))],
+    # g ↔ kg ↔ tonne
+    "CM1": [
+        ("g", "kg", (1000, 8000)), ("kg", "g", (2, 15)),
+        ("kg", "t", (1000, 5000)), ("t", "kg", (2, 10)),
+    ],
+}
+CONVERSIONS_MASSE["CE2"] = CONVERSIONS_MASSE["CE1"]
+CONVERSIONS_MASSE["CM2"] = CONVERSIONS_MASSE["CM1"]
+
+# mL ↔ cL ↔ L (à partir du CE2)
+CONVERSIONS_CAPACITE = [
+    ("mL", "cL", (50, 500)), ("cL", "mL", (5, 50)),
+    ("cL", "L", (100, 500)), ("L", "cL", (2, 10)),
+    ("mL", "L", (1000, 5000)), ("L", "mL", (2, 10)),
+]
+
+
+def _exercice_conversion(conversions, rng: Optional[random.Random]) -> Dict:
+    """Tire une conversion et calcule la réponse exacte (core.unit_registry)"""
+    rng = rng or random
+    unite_depart, unite_arrivee, (valeur_min, valeur_max) = rng.choice(conversions)
+    valeur_depart = rng.randint(valeur_min, valeur_max)
+
+    return {
+        'valeur_depart': valeur_depart,
+        'unite_depart': unite_depart,
+        'unite_arrivee': unite_arrivee,
+        'reponse': nombre(convertir(valeur_depart, unite_depart, unite_arrivee)),
+        'question': f"Convertis {valeur_depart} {unite_depart} en {unite_arrivee}"
+    }
 
 # ========================================
 # GÉNÉRATEURS D'EXERCICES
 # ========================================
 
-def generer_conversion_longueur(niveau):
+def generer_conversion_longueur(niveau, rng=None):
     """
     Conversions de longueurs
     CE1-CE2 : cm ↔ m
     CM1 : mm ↔ cm ↔ m
     CM2 : mm ↔ cm ↔ m ↔ km
     """
-    
-    if niveau in ["CE1", "CE2"]:
-        # cm ↔ m
-        conversions = [
-            ("cm", "m", 100, random.randint(100, 500)),
-            ("m", "cm", 1/100, random.randint(1, 10))
-        ]
-    elif niveau == "CM1":
-        # mm ↔ cm ↔ m
-        conversions = [
-            ("mm", "cm", 10, random.randint(50, 500)),
-            ("cm", "mm", 1/10, random.randint(5, 50)),
-            ("cm", "m", 100, random.randint(100, 800)),
-            ("m", "cm", 1/100, random.randint(2, 20))
-        ]
-    else:  # CM2
-        # Toutes conversions
-        conversions = [
-            ("mm", "cm", 10, random.randint(50, 500)),
-            ("cm", "mm", 1/10, random.randint(5, 50)),
-            ("cm", "m", 100, random.randint(100, 800)),
-            ("m", "cm", 1/100, random.randint(2, 20)),
-            ("m", "km", 1000, random.randint(1000, 5000)),
-            ("km", "m", 1/1000, random.randint(2, 15))
-        ]
-    
-    unite_depart, unite_arrivee, diviseur, valeur_depart = random.choice(conversions)
-    
-    # Calculer réponse
-    if diviseur < 1:
-        valeur_arrivee = valeur_depart / diviseur
-    else:
-        valeur_arrivee = valeur_depart / diviseur
-    
-    return {
-        'valeur_depart': valeur_depart,
-        'unite_depart': unite_depart,
-        'unite_arrivee': unite_arrivee,
-        'reponse': valeur_arrivee,
-        'diviseur': diviseur,
-        'question': f"Convertis {valeur_depart} {unite_depart} en {unite_arrivee}"
-    }
+    exercice = _exercice_conversion(CONVERSIONS_LONGUEUR.get(niveau, CONVERSIONS_LONGUEUR["CM2"]), rng)
+    # valeur_arrivee = valeur_depart / diviseur
+    exercice['diviseur'] = nombre(1 / convertir(1, exercice['unite_depart'], exercice['unite_arrivee']))
+    return exercice
 
 
-def generer_conversion_masse(niveau):
+def generer_conversion_masse(niveau, rng=None):
     """
     Conversions de masses
     CE2 : g ↔ kg
     CM1-CM2 : g ↔ kg ↔ tonne
     """
-    
-    if niveau in ["CE1", "CE2"]:
-        # g ↔ kg
-        conversions = [
-            ("g", "kg", 1000, random.randint(1000, 5000)),
-            ("kg", "g", 1/1000, random.randint(2, 10))
-        ]
-    else:  # CM1-CM2
-        conversions = [
-            ("g", "kg", 1000, random.randint(1000, 8000)),
-            ("kg", "g", 1/1000, random.randint(2, 15)),
-            ("kg", "t", 1000, random.randint(1000, 5000)),
-            ("t", "kg", 1/1000, random.randint(2, 10))
-        ]
-    
-    unite_depart, unite_arrivee, diviseur, valeur_depart = random.choice(conversions)
-    
-    if diviseur < 1:
-        valeur_arrivee = valeur_depart / diviseur
-    else:
-        valeur_arrivee = valeur_depart / diviseur
-    
-    return {
-        'valeur_depart': valeur_depart,
-        'unite_depart': unite_depart,
-        'unite_arrivee': unite_arrivee,
-        'reponse': valeur_arrivee,
-        'question': f"Convertis {valeur_depart} {unite_depart} en {unite_arrivee}"
-    }
+    return _exercice_conversion(CONVERSIONS_MASSE.get(niveau, CONVERSIONS_MASSE["CM2"]), rng)
 
 
-def generer_conversion_capacite(niveau):
+def generer_conversion_capacite(niveau, rng=None):
     """
     Conversions de capacités
     CE2-CM1-CM2 : mL ↔ cL ↔ L
@@ -107,29 +99,7 @@ def generer_conversion_capacite(niveau):
     if niveau in ["CE1"]:
         return None  # Pas encore
     
-    conversions = [
-        ("mL", "cL", 10, random.randint(50, 500)),
-        ("cL", "mL", 1/10, random.randint(5, 50)),
-        ("cL", "L", 100, random.randint(100, 500)),
-        ("L", "cL", 1/100, random.randint(2, 10)),
-        ("mL", "L", 1000, random.randint(1000, 5000)),
-        ("L", "mL", 1/1000, random.randint(2, 10))
-    ]
-    
-    unite_depart, unite_arrivee, diviseur, valeur_depart = random.choice(conversions)
-    
-    if diviseur < 1:
-        valeur_arrivee = valeur_depart / diviseur
-    else:
-        valeur_arrivee = valeur_depart / diviseur
-    
-    return {
-        'valeur_depart': valeur_depart,
-        'unite_depart': unite_depart,
-        'unite_arrivee': unite_arrivee,
-        'reponse': valeur_arrivee,
-        'question': f"Convertis {valeur_depart} {unite_depart} en {unite_arrivee}"
-    }
+    return _exercice_conversion(CONVERSIONS_CAPACITE, rng)
 
 
 def generer_probleme_duree(niveau):
@@ -209,7 +179,7 @@ def generer_probleme_duree(niveau):
             if random.choice([True, False]):
                 # h → min
                 heures = random.randint(2, 5)
-                minutes = heures * 60
+                minutes = nombre(convertir(heures, "h", "min"))
                 question = f"Convertis {heures} h en minutes"
                 
                 return {
@@ -221,7 +191,7 @@ def generer_probleme_duree(niveau):
             else:
                 # min → h
                 minutes = random.choice([60, 120, 180, 240, 300])
-                heures = minutes / 60
+                heures = nombre(convertir(minutes, "min", "h"))
                 question = f"Convertis {minutes} min en heures"
                 
                 return {
@@ -236,98 +206,25 @@ def generer_probleme_duree(niveau):
 # FONCTIONS UTILITAIRES
 # ========================================
 
-@st.cache_data
 def expliquer_conversion(valeur_depart: float, unite_depart: str, unite_arrivee: str, reponse: float) -> str:
     """
-    ✅ Génère explication pour conversion (CACHÉ)
+    Génère explication pour conversion
+    Relation et opération lues dans core.unit_registry
     """
     
     explication = f"### 💡 Méthode de conversion\n\n"
     
-    # Longueurs
-    if unite_depart == "mm" and unite_arrivee == "cm":
-        explication += f"**1 cm = 10 mm**\n"
-        explication += f"Donc pour passer de mm à cm, on **divise par 10**\n"
-        explication += f"{valeur_depart} mm ÷ 10 = **{reponse} cm**"
-    
-    elif unite_depart == "cm" and unite_arrivee == "mm":
-        explication += f"**1 cm = 10 mm**\n"
-        explication += f"Donc pour passer de cm à mm, on **multiplie par 10**\n"
-        explication += f"{valeur_depart} cm × 10 = **{reponse} mm**"
-    
-    elif unite_depart == "cm" and unite_arrivee == "m":
-        explication += f"**1 m = 100 cm**\n"
-        explication += f"Donc pour passer de cm à m, on **divise par 100**\n"
-        explication += f"{valeur_depart} cm ÷ 100 = **{reponse} m**"
-    
-    elif unite_depart == "m" and unite_arrivee == "cm":
-        explication += f"**1 m = 100 cm**\n"
-        explication += f"Donc pour passer de m à cm, on **multiplie par 100**\n"
-        explication += f"{valeur_depart} m × 100 = **{reponse} cm**"
-    
-    elif unite_depart == "m" and unite_arrivee == "km":
-        explication += f"**1 km = 1000 m**\n"
-        explication += f"Donc pour passer de m à km, on **divise par 1000**\n"
-        explication += f"{valeur_depart} m ÷ 1000 = **{reponse} km**"
-    
-    elif unite_depart == "km" and unite_arrivee == "m":
-        explication += f"**1 km = 1000 m**\n"
-        explication += f"Donc pour passer de km à m, on **multiplie par 1000**\n"
-        explication += f"{valeur_depart} km × 1000 = **{reponse} m**"
-    
-    # Masses
-    elif unite_depart == "g" and unite_arrivee == "kg":
-        explication += f"**1 kg = 1000 g**\n"
-        explication += f"Donc pour passer de g à kg, on **divise par 1000**\n"
-        explication += f"{valeur_depart} g ÷ 1000 = **{reponse} kg**"
-    
-    elif unite_depart == "kg" and unite_arrivee == "g":
-        explication += f"**1 kg = 1000 g**\n"
-        explication += f"Donc pour passer de kg à g, on **multiplie par 1000**\n"
-        explication += f"{valeur_depart} kg × 1000 = **{reponse} g**"
-    
-    elif unite_depart == "kg" and unite_arrivee == "t":
-        explication += f"**1 tonne = 1000 kg**\n"
-        explication += f"Donc pour passer de kg à tonnes, on **divise par 1000**\n"
-        explication += f"{valeur_depart} kg ÷ 1000 = **{reponse} t**"
-    
-    elif unite_depart == "t" and unite_arrivee == "kg":
-        explication += f"**1 tonne = 1000 kg**\n"
-        explication += f"Donc pour passer de tonnes à kg, on **multiplie par 1000**\n"
-        explication += f"{valeur_depart} t × 1000 = **{reponse} kg**"
-    
-    # Capacités
-    elif unite_depart == "mL" and unite_arrivee == "cL":
-        explication += f"**1 cL = 10 mL**\n"
-        explication += f"Donc pour passer de mL à cL, on **divise par 10**\n"
-        explication += f"{valeur_depart} mL ÷ 10 = **{reponse} cL**"
-    
-    elif unite_depart == "cL" and unite_arrivee == "mL":
-        explication += f"**1 cL = 10 mL**\n"
-        explication += f"Donc pour passer de cL à mL, on **multiplie par 10**\n"
-        explication += f"{valeur_depart} cL × 10 = **{reponse} mL**"
-    
-    elif unite_depart == "cL" and unite_arrivee == "L":
-        explication += f"**1 L = 100 cL**\n"
-        explication += f"Donc pour passer de cL à L, on **divise par 100**\n"
-        explication += f"{valeur_depart} cL ÷ 100 = **{reponse} L**"
-    
-    elif unite_depart == "L" and unite_arrivee == "cL":
-        explication += f"**1 L = 100 cL**\n"
-        explication += f"Donc pour passer de L à cL, on **multiplie par 100**\n"
-        explication += f"{valeur_depart} L × 100 = **{reponse} cL**"
-    
-    elif unite_depart == "mL" and unite_arrivee == "L":
-        explication += f"**1 L = 1000 mL**\n"
-        explication += f"Donc pour passer de mL à L, on **divise par 1000**\n"
-        explication += f"{valeur_depart} mL ÷ 1000 = **{reponse} L**"
+    try:
+        etape = etape_conversion(unite_depart, unite_arrivee)
+    except ValueError:
+        explication += f"Conversion : {valeur_depart} {unite_depart} = **{reponse} {unite_arrivee}**"
+        return explication
     
-    elif unite_depart == "L" and unite_arrivee == "mL":
-        explication += f"**1 L = 1000 mL**\n"
-        explication += f"Donc pour passer de L à mL, on **multiplie par 1000**\n"
-        explication += f"{valeur_depart} L × 1000 = **{reponse} mL**"
+    depart, arrivee = (etape.grande, etape.petite) if etape.multiplier else (etape.petite, etape.grande)
+    operation, symbole = ("multiplie", "×") if etape.multiplier else ("divise", "÷")
     
-    else:
-        explication += f"Conversion : {valeur_depart} {unite_depart} = **{reponse} {unite_arrivee}**"
+    explication += f"**1 {etape.grande.libelle} = {etape.rapport} {etape.petite.symbole}**\n"
+    explication += f"Donc pour passer de {depart.libelle_pluriel} à {arrivee.libelle_pluriel}, on **{operation} par {etape.rapport}**\n"
+    explication += f"{valeur_depart} {unite_depart} {symbole} {etape.rapport} = **{reponse} {unite_arrivee}**"
     
-    return explication
\ No newline at end of file
+    return explication
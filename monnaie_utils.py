@@ -6,7 +6,15 @@ SANS DÉCIMAUX - utilise euros et centimes séparés
 
 import random
 import streamlit as st
-from typing import Dict, List, Tuple
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.operand_catalog import get_catalogue
+from core.render_cache import rendu_cache
 
 # ========================================
 # DONNÉES DE BASE
@@ -86,9 +94,15 @@ def calculer_pieces_optimales(montant_centimes: int) -> List[Tuple[int, str, int
     """
     Calcule le nombre optimal de pièces/billets pour un montant
 
+    Lecture directe dans la table de programmation dynamique jusqu'à
+    MONTANT_MAX_TABLE, algorithme glouton au-delà (optimal pour l'euro).
+
     Returns:
         Liste de tuples (valeur_centimes, nom, quantité)
     """
+    if 0 <= montant_centimes <= MONTANT_MAX_TABLE:
+        return table_pieces().composition(montant_centimes)
+
     resultat = []
     reste = montant_centimes
 
@@ -101,53 +115,208 @@ def calculer_pieces_optimales(montant_centimes: int) -> List[Tuple[int, str, int
     return resultat
 
 # ========================================
-# GÉNÉRATEURS D'EXERCICES
+# TABLE DE RENDU OPTIMAL
 # ========================================
 
-def generer_calcul_rendu(niveau: str) -> Dict:
+# Montant maximal couvert par la table: rendu sur un billet de 50€ (CM2)
+MONTANT_MAX_TABLE = 5000
+
+
+# Terme d'une décomposition codé sur un octet: indice × 16 + quantité
+_BASE_QUANTITE = 16
+_TERMES = [
+    (valeur, nom, quantite) for valeur, nom in PIECES_BILLETS for quantite in range(_BASE_QUANTITE)
+]
+
+
+@dataclass(frozen=True)
+class TablePieces:
     """
-    Exercice : Calculer combien rendre
+    Décompositions minimales de 0 à MONTANT_MAX_TABLE centimes
+
+    nb_min[i, m]: nombre minimal de pièces/billets pour m centimes en
+    n'utilisant que PIECES_BILLETS[i:] (int16, 12 × 5001)
+    codes[debuts[m]:debuts[m + 1]]: termes non nuls de la décomposition
+    minimale de m, un octet chacun (indice × 16 + quantité)
     """
-    # Choisir contexte selon niveau
-    articles = CONTEXTES_ACHATS.get(niveau, CONTEXTES_ACHATS["CE2"])
-    article, (prix_min, prix_max) = random.choice(articles)
+    nb_min: np.ndarray
+    codes: bytes
+    debuts: array
+
+    def composition(self, montant_centimes: int) -> List[Tuple[int, str, int]]:
+        """Décomposition minimale [(valeur, nom, quantité), ...]"""
+        return [
+            _TERMES[code]
+            for code in self.codes[self.debuts[montant_centimes]:self.debuts[montant_centimes + 1]]
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return self.nb_min.nbytes + len(self.codes) + self.debuts.itemsize * len(self.debuts)
+
 
-    # Générer prix (en centimes)
+@lru_cache(maxsize=1)
+def table_pieces() -> TablePieces:
+    """
+    Construit la table (une fois par processus, quelques millisecondes)
+
+    Pour chaque suffixe de PIECES_BILLETS (de la plus petite pièce à la
+    plus grande), avec c la valeur ajoutée et m = r + q·c:
+        nb_min[i, r + q·c] = min sur j ≤ q de (nb_min[i+1, r + j·c] + q - j)
+    soit, par classe de reste r, un minimum cumulé vectorisé.
+    """
+    valeurs = [valeur for valeur, _ in PIECES_BILLETS]
+    taille = MONTANT_MAX_TABLE + 1
+    infini = np.iinfo(np.int16).max // 2
+
+    nb_min = np.empty((len(valeurs) + 1, taille), dtype=np.int16)
+    nb_min[-1] = infini
+    nb_min[-1, 0] = 0
+    for i in range(len(valeurs) - 1, -1, -1):
+        valeur = valeurs[i]
+        lignes = -(-taille // valeur)
+        precedent = np.full(lignes * valeur, infini, dtype=np.int32)
+        precedent[:taille] = nb_min[i + 1]
+        q = np.arange(lignes, dtype=np.int32)[:, None]
+        courant = np.minimum.accumulate(precedent.reshape(lignes, valeur) - q, axis=0) + q
+        nb_min[i] = np.minimum(courant.reshape(-1)[:taille], infini)
+    nb_min = nb_min[:-1]
+    nb_min.flags.writeable = False
+
+    # Décomposition: la plus grande pièce compatible avec le minimum
+    minimum = nb_min[0].tolist()
+    quantites = [[0] * len(valeurs)]
+    for montant in range(1, taille):
+        for i, valeur in enumerate(valeurs):
+            if valeur <= montant and minimum[montant - valeur] + 1 == minimum[montant]:
+                ligne = list(quantites[montant - valeur])
+                ligne[i] += 1
+                quantites.append(ligne)
+                break
+
+    codes = bytearray()
+    debuts = array('I', [0])
+    for ligne in quantites:
+        for i, quantite in enumerate(ligne):
+            if quantite:
+                if quantite >= _BASE_QUANTITE:
+                    # Invariant du codage sur un octet (PIECES_BILLETS modifié?)
+                    raise RuntimeError(f"Quantité {quantite} non codable (max {_BASE_QUANTITE - 1})")
+                codes.append(i * _BASE_QUANTITE + quantite)
+        debuts.append(len(codes))
+
+    return TablePieces(nb_min=nb_min, codes=bytes(codes), debuts=debuts)
+
+
+def decompositions(montant_centimes: int, max_pieces: int) -> Iterator[List[Tuple[int, str, int]]]:
+    """
+    Toutes les façons de composer un montant avec au plus max_pieces
+    pièces/billets (plus grandes valeurs d'abord, la décomposition
+    minimale en premier)
+
+    Les branches qui ne peuvent pas aboutir sont coupées grâce à
+    nb_min: aucun parcours inutile.
+
+    Raises:
+        ValueError: Si le montant dépasse la table ou max_pieces < 0
+    """
+    if not 0 <= montant_centimes <= MONTANT_MAX_TABLE:
+        raise ValueError(f"Montant hors table: 0 à {MONTANT_MAX_TABLE} centimes")
+    if max_pieces < 0:
+        raise ValueError("max_pieces doit être >= 0")
+
+    nb_min = table_pieces().nb_min
+    composition: List[Tuple[int, str, int]] = []
+
+    def explorer(i: int, reste: int, restantes: int) -> Iterator[List[Tuple[int, str, int]]]:
+        if reste == 0:
+            yield list(composition)
+            return
+        if i == len(PIECES_BILLETS) or nb_min[i, reste] > restantes:
+            return
+        valeur, nom = PIECES_BILLETS[i]
+        for quantite in range(min(reste // valeur, restantes), -1, -1):
+            if quantite:
+                composition.append((valeur, nom, quantite))
+            yield from explorer(i + 1, reste - quantite * valeur, restantes - quantite)
+            if quantite:
+                composition.pop()
+
+    yield from explorer(0, montant_centimes, max_pieces)
+
+# ========================================
+# GÉNÉRATEURS D'EXERCICES
+# ========================================
+
+def prix_rendu(niveau: str, plage_prix: Tuple[int, int]) -> List[int]:
+    """Prix possibles (centimes) d'un article pour l'exercice de rendu"""
+    prix_min, prix_max = plage_prix
     if niveau == "CE1":
         # CE1 : Euros entiers uniquement (1€, 2€, 3€)
-        prix = random.randint(1, 3) * 100
-    elif niveau == "CE2":
+        return [euros * 100 for euros in range(1, 4)]
+    if niveau == "CE2":
         # CE2 : Introduction des centimes (10, 20, 50 centimes)
-        euros = random.randint(1, 5)
-        centimes = random.choice([0, 10, 20, 50])
-        prix = euros * 100 + centimes
-    elif niveau == "CM1":
+        return [euros * 100 + centimes for euros in range(1, 6) for centimes in (0, 10, 20, 50)]
+    if niveau == "CM1":
         # CM1 : Tous les multiples de 10 centimes
-        euros = random.randint(prix_min // 100, prix_max // 100)
-        centimes = random.choice([0, 10, 20, 30, 40, 50, 60, 70, 80, 90])
-        prix = euros * 100 + centimes
-    else:  # CM2
-        # CM2 : N'importe quel montant
-        prix = random.randint(prix_min, prix_max)
+        return [
+            euros * 100 + centimes
+            for euros in range(prix_min // 100, prix_max // 100 + 1)
+            for centimes in range(0, 100, 10)
+        ]
+    # CM2 : N'importe quel montant
+    return list(range(prix_min, prix_max + 1))
 
-    # Choisir billet pour payer (arrondi supérieur)
-    euros_prix = (prix + 99) // 100  # Arrondi supérieur
+
+def billets_rendu(niveau: str, prix: int) -> List[int]:
+    """Billets (euros) avec lesquels on peut payer le prix"""
+    # Arrondi supérieur
+    euros_prix = (prix + 99) // 100
 
     if niveau == "CE1":
         # CE1 : Billets simples (5€, 10€)
-        billets_possibles = [5, 10]
-        billet_paye = next(b for b in billets_possibles if b >= euros_prix)
-    elif niveau == "CE2":
-        billets_possibles = [5, 10, 20]
-        billet_paye = next(b for b in billets_possibles if b >= euros_prix)
-    elif niveau == "CM1":
-        billets_possibles = [5, 10, 20, 50]
-        billet_paye = next((b for b in billets_possibles if b >= euros_prix), 50)
-    else:  # CM2
-        billets_possibles = [5, 10, 20, 50]
-        billet_paye = random.choice([b for b in billets_possibles if b >= euros_prix])
+        return [next(b for b in (5, 10) if b >= euros_prix)]
+    if niveau == "CE2":
+        return [next(b for b in (5, 10, 20) if b >= euros_prix)]
+    if niveau == "CM1":
+        return [next((b for b in (5, 10, 20, 50) if b >= euros_prix), 50)]
+    # CM2 : n'importe quel billet suffisant
+    return [b for b in (5, 10, 20, 50) if b >= euros_prix]
+
+
+def montants_composition(niveau: str) -> List[int]:
+    """Montants (centimes) à composer en pièces et billets"""
+    if niveau == "CE1":
+        # CE1 : Euros entiers uniquement (1€, 2€, 3€, 5€)
+        return [100, 200, 300, 500]
+    if niveau == "CE2":
+        # CE2 : Introduction des centimes (10, 20, 50c)
+        return [
+            100, 200, 300, 500,  # 1€, 2€, 3€, 5€
+            110, 120, 150,       # 1.10€, 1.20€, 1.50€
+            210, 220, 250,       # 2.10€, 2.20€, 2.50€
+        ]
+    if niveau == "CM1":
+        # CM1 : Montants moyens (multiples de 10c)
+        return list(range(50, 1001, 10))
+    # CM2 : Montants variés
+    return list(range(20, 2001))
+
 
-    montant_paye = billet_paye * 100
+def generer_calcul_rendu(niveau: str, rng: Optional[random.Random] = None) -> Dict:
+    """
+    Exercice : Calculer combien rendre
+    Article uniforme (strate du catalogue), puis prix uniforme pour cet
+    article, puis billet uniforme parmi ceux qui suffisent
+    """
+    rng = rng or random
+    catalogue = get_catalogue("calcul_rendu", niveau)
+    tirage = catalogue.tirer(rng, strate=rng.randrange(catalogue.nb_strates))
+    articles = CONTEXTES_ACHATS.get(niveau, CONTEXTES_ACHATS["CE2"])
+    article = articles[tirage['article']][0]
+    prix = tirage['prix']
+
+    montant_paye = rng.choice(billets_rendu(niveau, prix)) * 100
     rendu = montant_paye - prix
 
     return {
@@ -161,29 +330,11 @@ def generer_calcul_rendu(niveau: str) -> Dict:
         'question': f"Tu achètes un(e) {article} à {centimes_vers_euros_texte(prix)}. Tu payes avec {centimes_vers_euros_texte(montant_paye)}. Combien te rend-on ?"
     }
 
-def generer_composition_monnaie(niveau: str) -> Dict:
+def generer_composition_monnaie(niveau: str, rng: Optional[random.Random] = None) -> Dict:
     """
     Exercice : Donner la composition en pièces/billets
     """
-    # Montant à composer
-    if niveau == "CE1":
-        # CE1 : Euros entiers uniquement (1€, 2€, 3€, 5€)
-        montant = random.choice([100, 200, 300, 500])
-    elif niveau == "CE2":
-        # CE2 : Introduction des centimes (10, 20, 50c)
-        montant = random.choice([
-            100, 200, 300, 500,  # 1€, 2€, 3€, 5€
-            110, 120, 150,       # 1.10€, 1.20€, 1.50€
-            210, 220, 250,       # 2.10€, 2.20€, 2.50€
-        ])
-    elif niveau == "CM1":
-        # CM1 : Montants moyens (multiples de 10c)
-        montant = random.randint(50, 1000)
-        montant = (montant // 10) * 10  # Arrondi à 10 centimes
-    else:  # CM2
-        # CM2 : Montants variés
-        montant = random.randint(20, 2000)
-
+    montant = get_catalogue("composition_monnaie", niveau).tirer(rng or random)['montant']
     composition = calculer_pieces_optimales(montant)
 
     return {
@@ -264,7 +415,7 @@ def generer_probleme_realiste(niveau: str) -> Dict:
 # FONCTIONS VISUELLES
 # ========================================
 
-@st.cache_data
+@rendu_cache
 def dessiner_pieces_monnaie(composition: List[Tuple[int, str, int]]) -> str:
     """
     Génère HTML pour afficher visuellement les pièces et billets
@@ -6,6 +6,9 @@ Exercices de proportionnalité CM1-CM2
 import random
 import streamlit as st
 
+from core.operand_catalog import get_catalogue
+from core.unit_registry import convertir, nombre
+
 # ========================================
 # GÉNÉRATEURS D'EXERCICES
 # ========================================
@@ -120,35 +123,37 @@ def generer_regle_de_trois(niveau):
     }
 
 
-def generer_pourcentage_simple(niveau):
+# Nombres de base par pourcentage (cf. core.operand_catalog)
+NOMBRES_POURCENTAGE = {
+    10: list(range(20, 201)),
+    25: [20, 40, 60, 80, 100, 120, 160, 200],
+    50: list(range(20, 201)),
+    75: [20, 40, 60, 80, 100, 120, 160, 200],
+}
+
+CONTEXTES_POURCENTAGE = [
+    "Une réduction de {pourcent}% sur {nombre} €",
+    "{pourcent}% de {nombre} élèves",
+    "{pourcent}% d'un gâteau de {nombre} g",
+    "Une augmentation de {pourcent}% sur {nombre} €",
+]
+NB_CONTEXTES_POURCENTAGE = len(CONTEXTES_POURCENTAGE)
+
+
+def generer_pourcentage_simple(niveau, rng=None):
     """
     Calculs de pourcentages simples
     CM2 uniquement : 10%, 25%, 50%, 75%
+    Pourcentage équiprobable, puis tirage uniforme dans sa strate
     """
-    
-    pourcentages = [10, 25, 50, 75]
-    pourcent = random.choice(pourcentages)
-    
-    # Nombre de base
-    if pourcent == 10:
-        nombre = random.randint(20, 200)
-    elif pourcent == 25:
-        nombre = random.choice([20, 40, 60, 80, 100, 120, 160, 200])
-    elif pourcent == 50:
-        nombre = random.randint(20, 200)
-    else:  # 75%
-        nombre = random.choice([20, 40, 60, 80, 100, 120, 160, 200])
+    rng = rng or random
+    catalogue = get_catalogue("pourcentage_simple")
+    tirage = catalogue.tirer(rng, strate=rng.randrange(catalogue.nb_strates))
+    pourcent, nombre = tirage['pourcentage'], tirage['nombre']
     
     resultat = (nombre * pourcent) / 100
     
-    contextes = [
-        f"Une réduction de {pourcent}% sur {nombre} €",
-        f"{pourcent}% de {nombre} élèves",
-        f"{pourcent}% d'un gâteau de {nombre} g",
-        f"Une augmentation de {pourcent}% sur {nombre} €"
-    ]
-    
-    contexte = random.choice(contextes)
+    contexte = CONTEXTES_POURCENTAGE[tirage['contexte']].format(pourcent=pourcent, nombre=nombre)
     
     return {
         'contexte': contexte,
@@ -159,33 +164,36 @@ def generer_pourcentage_simple(niveau):
     }
 
 
-def generer_echelle(niveau):
+ECHELLES = [
+    (1, 10, "1 cm représente 10 cm"),
+    (1, 100, "1 cm représente 1 m"),
+    (1, 1000, "1 cm représente 10 m"),
+    (1, 10000, "1 cm représente 100 m")
+]
+
+# Distances sur le plan (cm)
+DISTANCES_PLAN = range(2, 13)
+
+
+def generer_echelle(niveau, rng=None):
     """
     Problèmes d'échelles
     CM2 uniquement
     """
     
-    echelles = [
-        (1, 10, "1 cm représente 10 cm"),
-        (1, 100, "1 cm représente 1 m"),
-        (1, 1000, "1 cm représente 10 m"),
-        (1, 10000, "1 cm représente 100 m")
-    ]
-    
-    echelle_num, echelle_denom, description = random.choice(echelles)
+    tirage = get_catalogue("echelle").tirer(rng or random)
+    echelle_num, echelle_denom, description = ECHELLES[tirage['echelle']]
     
     # Distance sur le plan
-    distance_plan = random.randint(2, 12)
+    distance_plan = tirage['distance_plan']
     distance_reelle = distance_plan * echelle_denom
     
-    # Choisir sens de la question
-    if random.choice([True, False]):
+    # Sens de la question
+    if tirage['sens'] == 0:
         # Plan → Réalité
         question = f"Sur un plan à l'échelle 1/{echelle_denom}, une distance mesure {distance_plan} cm. Quelle est la distance réelle ?"
-        reponse = distance_reelle
-        unite_reponse = "cm" if echelle_denom <= 100 else "m"
-        if echelle_denom >= 100:
-            reponse = reponse / 100  # Convertir en mètres
+        unite_reponse = "cm" if echelle_denom < 100 else "m"
+        reponse = nombre(convertir(distance_reelle, "cm", unite_reponse))
     else:
         # Réalité → Plan
         question = f"Sur un plan à l'échelle 1/{echelle_denom}, quelle longueur représente {distance_reelle} cm réels ?"
@@ -201,37 +209,39 @@ def generer_echelle(niveau):
     }
 
 
-def generer_vitesse(niveau):
+# Vitesses réalistes
+VITESSES = [
+    (60, "voiture en ville"),
+    (90, "voiture sur route"),
+    (20, "vélo"),
+    (5, "marche à pied"),
+    (30, "trottinette")
+]
+
+# Durées de trajet (heures)
+DUREES_TRAJET = range(1, 5)
+
+
+def generer_vitesse(niveau, rng=None):
     """
     Problèmes vitesse/distance/temps
     CM2 uniquement
     """
     
-    # Vitesses réalistes
-    vitesses = [
-        (60, "voiture en ville"),
-        (90, "voiture sur route"),
-        (20, "vélo"),
-        (5, "marche à pied"),
-        (30, "trottinette")
-    ]
-    
-    vitesse, contexte = random.choice(vitesses)
-    
-    # Choisir type de question
-    type_q = random.choice(['distance', 'temps'])
+    tirage = get_catalogue("vitesse").tirer(rng or random)
+    vitesse, contexte = VITESSES[tirage['vitesse']]
+    temps = tirage['temps']
+    distance = vitesse * temps
     
-    if type_q == 'distance':
+    if tirage['type'] == 0:
         # Calculer distance
-        temps = random.randint(1, 4)  # heures
-        distance = vitesse * temps
+        type_q = 'distance'
         question = f"Une {contexte} roule à {vitesse} km/h pendant {temps} heure{'s' if temps > 1 else ''}. Quelle distance parcourt-elle ?"
         reponse = distance
         unite = "km"
     else:
         # Calculer temps
-        temps = random.randint(1, 4)
-        distance = vitesse * temps
+        type_q = 'temps'
         question = f"Une {contexte} parcourt {distance} km à {vitesse} km/h. Combien de temps met-elle ?"
         reponse = temps
         unite = "h"
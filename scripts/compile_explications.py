@@ -0,0 +1,60 @@
+"""
+Script pour pré-calculer les explications pédagogiques
+Énumère toutes les questions que les générateurs peuvent produire
+(addition, soustraction, tables, division) et écrit la table compressée
+data/explications.table.json.gz, chargée au démarrage de l'application.
+
+Par défaut CE1 à CM1: la soustraction CM2 représente à elle seule
+~200 000 questions; ces explications restent calculées à la demande
+(cache LRU). Utiliser --niveaux CE1 CE2 CM1 CM2 pour tout inclure.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.exercise_generator import (  # noqa: E402
+    EXPLICATIONS_TABLE_PATH,
+    charger_table_explications,
+    construire_table_explications,
+    ecrire_table_explications,
+)
+
+
+def main():
+    """Point d'entrée principal"""
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--niveaux", nargs="+", default=["CE1", "CE2", "CM1"],
+                        help="Niveaux couverts (défaut: CE1 CE2 CM1)")
+    parser.add_argument("--output", type=Path, default=EXPLICATIONS_TABLE_PATH,
+                        help="Fichier de sortie")
+    args = parser.parse_args()
+
+    print(f"📚 Pré-calcul des explications: {', '.join(args.niveaux)}")
+    start = time.perf_counter()
+    table = construire_table_explications(args.niveaux)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    path = ecrire_table_explications(table, args.output)
+
+    start = time.perf_counter()
+    loaded = charger_table_explications(path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    par_type = {}
+    for exercice_type, _, _ in table:
+        par_type[exercice_type] = par_type.get(exercice_type, 0) + 1
+
+    print(f"💾 Table écrite: {path} ({path.stat().st_size} octets)")
+    print(f"📊 Explications: {loaded} "
+          f"({', '.join(f'{k}: {v}' for k, v in sorted(par_type.items()))})")
+    print(f"⏱️  Calcul: {build_ms:.0f} ms | Chargement: {load_ms:.1f} ms")
+    print("\n🎉 Pré-calcul terminé avec succès!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Script pour pré-compiler error_taxonomy.json en snapshot JSON
+Valide la taxonomie une fois et écrit data/error_taxonomy.snapshot.json
+(catalogue et index des candidats par domaine et niveau)
+
+ErrorAnalyzer recompile automatiquement le snapshot si le JSON change;
+ce script permet de le générer à l'avance (déploiement, CI).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.pedagogy.taxonomy_snapshot import (  # noqa: E402
+    compile_taxonomy,
+    default_snapshot_path,
+    load_compiled_taxonomy,
+)
+
+
+def main():
+    """Point d'entrée principal"""
+
+    project_root = Path(__file__).parent.parent
+    taxonomy_path = project_root / "data" / "error_taxonomy.json"
+    snapshot_path = default_snapshot_path(taxonomy_path)
+
+    print(f"📂 Compilation de {taxonomy_path}")
+    start = time.perf_counter()
+    compiled = compile_taxonomy(taxonomy_path, snapshot_path)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    load_compiled_taxonomy(taxonomy_path, snapshot_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    print(f"💾 Snapshot écrit: {snapshot_path} ({snapshot_path.stat().st_size} octets)")
+    print(f"📊 Erreurs indexées: {len(compiled.errors_by_id)}")
+    print(f"📊 Domaines: {', '.join(sorted(compiled.domain_index))}")
+    print(f"🔑 SHA-256 source: {compiled.source_sha256[:16]}…")
+    print(f"⏱️  Compilation: {compile_ms:.2f} ms | Chargement snapshot: {load_ms:.2f} ms")
+    print("\n🎉 Compilation terminée avec succès!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Script pour exporter une fiche d'exercices imprimable
+Produit un pack de N exercices (CSV ou HTML avec corrigé) en flux:
+la mémoire reste constante quel que soit N.
+
+Exemples:
+    python scripts/export_fiches.py --niveau CE2 --types addition tables --n 500 -o fiche.html
+    python scripts/export_fiches.py --niveau CM1 --format csv --n 5000 -o pack.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.render_cache import get_render_stats  # noqa: E402
+from core.worksheet_export import (  # noqa: E402
+    exporter_csv,
+    exporter_html,
+    types_fiche,
+)
+
+
+def main():
+    """Point d'entrée principal"""
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--niveau", default="CE2", choices=["CE1", "CE2", "CM1", "CM2"],
+                        help="Niveau des exercices (défaut: CE2)")
+    parser.add_argument("--types", nargs="+",
+                        default=["addition", "soustraction", "tables", "division"],
+                        help=f"Types d'exercices parmi: {', '.join(types_fiche())}")
+    parser.add_argument("--n", type=int, default=100, help="Nombre d'exercices (défaut: 100)")
+    parser.add_argument("--format", choices=["csv", "html"], default="html",
+                        help="Format de sortie (défaut: html)")
+    parser.add_argument("--titre", default="Fiche d'exercices MathCopain",
+                        help="Titre de la fiche HTML")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="Fichier de sortie")
+    args = parser.parse_args()
+
+    print(f"📝 Export {args.format.upper()}: {args.n} exercices {args.niveau} "
+          f"({', '.join(args.types)})")
+
+    newline = "" if args.format == "csv" else None
+    with open(args.output, "w", encoding="utf-8", newline=newline) as sortie:
+        try:
+            if args.format == "csv":
+                stats = exporter_csv(sortie, args.types, args.niveau, args.n)
+            else:
+                stats = exporter_html(sortie, args.types, args.niveau, args.n, titre=args.titre)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+    rendus = get_render_stats()
+    print(f"💾 Fichier écrit: {args.output} ({args.output.stat().st_size} octets)")
+    print(f"⏱️  {stats['secondes']:.2f} s | {stats['exercices_par_seconde']:.0f} exercices/s")
+    print(f"🖼️  Illustrations: {rendus['misses'] - rendus['disk_hits']} rendues, "
+          f"{rendus['hits'] + rendus['disk_hits']} en cache")
+    print("\n🎉 Export terminé avec succès!")
+
+
+if __name__ == "__main__":
+    main()
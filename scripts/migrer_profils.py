@@ -0,0 +1,71 @@
+"""
+Script de migration: utilisateurs.json → un fichier par élève
+Convertit le fichier monolithique du mode JSON vers le stockage de
+core.profile_store, puis vérifie que chaque profil se relit à l'identique.
+Le fichier source n'est pas modifié.
+
+Après migration, définir USER_STORE_DIR (fichier .env) sur le répertoire
+de destination.
+
+Exemples:
+    python scripts/migrer_profils.py
+    python scripts/migrer_profils.py --source utilisateurs.json --dest ./data/profils
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.profile_store import StockageProfils, migrer_fichier  # noqa: E402
+
+
+def main():
+    """Point d'entrée principal"""
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", type=Path, default=Path("utilisateurs.json"),
+                        help="Fichier monolithique (défaut: utilisateurs.json)")
+    parser.add_argument("--dest", type=Path, default=Path("data/profils"),
+                        help="Répertoire du stockage par élève (défaut: data/profils)")
+    parser.add_argument("--force", action="store_true",
+                        help="Écrire même si la destination contient déjà un index")
+    args = parser.parse_args()
+
+    if not args.source.exists():
+        print(f"❌ Fichier introuvable: {args.source}")
+        return 1
+
+    stockage = StockageProfils(args.dest)
+    if stockage.existe() and not args.force:
+        print(f"⚠️  {args.dest} contient déjà des profils ({len(stockage.noms())}), utiliser --force")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        n = migrer_fichier(args.source, args.dest)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    duree = time.perf_counter() - start
+
+    # Vérification: relecture depuis un stockage neuf
+    with open(args.source, "r", encoding="utf-8") as f:
+        source = json.load(f)
+    relus = StockageProfils(args.dest).lire_tout()
+    differents = [nom for nom, profil in source.items() if relus.get(nom) != profil]
+
+    print(f"📦 {n} profils migrés vers {args.dest} en {duree:.2f} s")
+    if differents:
+        print(f"❌ {len(differents)} profils relus différemment: {', '.join(differents[:10])}")
+        return 1
+    print("✅ Relecture identique")
+    print(f"👉 Définir USER_STORE_DIR={args.dest} pour utiliser ce stockage")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 import pytest
 import os
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Add parent directory to path so we can import modules
@@ -38,3 +39,29 @@ def cleanup_json_files(tmp_path):
     """Cleanup JSON files after test."""
     yield tmp_path
     # Cleanup code here if needed
+
+
+@pytest.fixture(autouse=True)
+def archive_historique_temporaire(tmp_path, monkeypatch):
+    """Archives d'historique d'exercices écrites dans un répertoire temporaire."""
+    monkeypatch.setattr("core.exercise_history.HISTORY_ARCHIVE_DIR", str(tmp_path / "historique"))
+    return tmp_path / "historique"
+
+
+@pytest.fixture
+def horloge(monkeypatch, request):
+    """
+    Fige datetime.now() pour get_skill_levels (référence) et l'état des
+    compétences, à l'instant MAINTENANT du module de test (horloge.instant
+    pour avancer)
+    """
+    class Horloge(datetime):
+        instant = request.module.MAINTENANT
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.instant
+
+    monkeypatch.setattr("core.adaptive_system.datetime", Horloge)
+    monkeypatch.setattr("core.skill_state.datetime", Horloge)
+    return Horloge
@@ -0,0 +1,111 @@
+"""
+Tests pour le cache LRU borné (core/cache.py)
+"""
+
+import threading
+import pytest
+
+from core.cache import LRUCache, make_key
+
+
+class TestLRUCache:
+    """Comportement LRU et statistiques"""
+
+    def test_get_put(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("b", 0) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_get_or_compute_calls_once(self):
+        cache = LRUCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 42
+
+        assert cache.get_or_compute("k", compute) == 42
+        assert cache.get_or_compute("k", compute) == 42
+        assert len(calls) == 1
+
+    def test_cached_none_is_a_hit(self):
+        cache = LRUCache()
+        cache.get_or_compute("k", lambda: None)
+        cache.get_or_compute("k", lambda: 1 / 0)
+        assert cache.stats()["hits"] == 1
+
+    def test_stats(self):
+        cache = LRUCache(maxsize=10)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("a", lambda: 1)
+        cache.get_or_compute("a", lambda: 1)
+
+        stats = cache.stats()
+        assert stats["size"] == 1
+        assert stats["maxsize"] == 10
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+    def test_clear_resets_counters(self):
+        cache = LRUCache()
+        cache.get_or_compute("a", lambda: 1)
+        cache.clear()
+        assert cache.stats() == {
+            'size': 0, 'maxsize': 1024, 'hits': 0, 'misses': 0,
+            'evictions': 0, 'hit_rate': 0.0
+        }
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(maxsize=0)
+        cache.put("a", 1)
+        assert len(cache) == 0
+
+    def test_negative_size_rejected(self):
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=-1)
+
+    def test_thread_safety(self):
+        cache = LRUCache(maxsize=50)
+
+        def worker(offset):
+            for i in range(500):
+                cache.get_or_compute((offset + i) % 80, lambda: i)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = cache.stats()
+        assert stats["size"] <= 50
+        assert stats["hits"] + stats["misses"] == 8 * 500
+
+
+class TestMakeKey:
+    """Construction des clés"""
+
+    def test_type_distinguishes_keys(self):
+        assert make_key(65) != make_key(65.0)
+        assert make_key(65) != make_key("65")
+
+    def test_equal_parts_equal_keys(self):
+        assert make_key("addition", 65, None) == make_key("addition", 65, None)
+
+    def test_unhashable_returns_none(self):
+        assert make_key("a", [1, 2]) is None
@@ -16,6 +16,7 @@ from core.pedagogy.error_analyzer import (
     ErrorAnalyzer,
     ErrorAnalysisResult
 )
+from core.pedagogy.taxonomy_snapshot import default_snapshot_path
 
 
 # ============================================================================
@@ -136,6 +137,7 @@ def temp_taxonomy_file(sample_taxonomy):
 
     # Cleanup
     Path(temp_path).unlink(missing_ok=True)
+    default_snapshot_path(Path(temp_path)).unlink(missing_ok=True)
 
 
 @pytest.fixture
@@ -471,6 +473,47 @@ class TestIdentifyMisconceptionReal:
         assert result is not None
 
 
+class TestIdentifyMisconceptionsBulk:
+    """Tests de la résolution groupée par IDs"""
+
+    def test_errors_by_id_index(self, real_analyzer):
+        """Index ID -> définition et catégorie"""
+        entry = real_analyzer.errors_by_id["ADD_CONC_003"]
+        assert entry.category == "Conceptual"
+        assert real_analyzer._find_error_by_id("ADD_CONC_003") is entry.error_def
+
+    def test_bulk_matches_single_lookup(self, real_analyzer):
+        """Même résultat que identify_misconception, catégorie en plus"""
+        ids = ["ADD_CONC_001", "SUB_CONC_001", "CALC_001"]
+        resolved = real_analyzer.identify_misconceptions(ids)
+
+        assert list(resolved) == ids
+        for error_id in ids:
+            single = real_analyzer.identify_misconception("Conceptual", error_id)
+            details = dict(resolved[error_id])
+            category = details.pop("category")
+            assert details == single
+            assert category == real_analyzer.errors_by_id[error_id].category
+
+    def test_bulk_deduplicates(self, analyzer):
+        """Les doublons sont résolus une seule fois"""
+        resolved = analyzer.identify_misconceptions(
+            ["ADD_CONC_001", "ADD_CONC_001", "MULT_CONC_001"]
+        )
+        assert list(resolved) == ["ADD_CONC_001", "MULT_CONC_001"]
+
+    def test_bulk_unknown_and_category_ids(self, analyzer):
+        """IDs inconnus et noms de catégorie"""
+        resolved = analyzer.identify_misconceptions(["Procedural", "UNKNOWN"])
+
+        assert resolved["Procedural"]["category"] == "Procedural"
+        assert resolved["UNKNOWN"]["category"] is None
+        assert resolved["UNKNOWN"]["misconception"] == "Erreur non identifiée"
+
+    def test_bulk_empty(self, analyzer):
+        assert analyzer.identify_misconceptions([]) == {}
+
+
 # ============================================================================
 # TESTS ROOT_CAUSE_ANALYSIS
 # ============================================================================
@@ -970,6 +1013,236 @@ class TestIntegration:
         assert domain_sum == stats["total_errors"]
 
 
+# ============================================================================
+# TESTS INDEX (DOMAINE, NIVEAU)
+# ============================================================================
+
+class TestCandidateIndex:
+    """Tests de l'index de candidats construit au chargement"""
+
+    def test_domain_index_covers_catalog(self, real_analyzer):
+        """Toutes les erreurs du catalogue sont indexées"""
+        indexed = sum(len(entries) for entries in real_analyzer.domain_index.values())
+        assert indexed == real_analyzer.get_statistics()["total_errors"]
+
+    def test_entries_pre_extracted(self, analyzer):
+        """Pattern en minuscules et confiance pré-extraits"""
+        entry = analyzer.domain_index["addition"][0]
+        assert entry.pattern == entry.error_def["pattern"].lower()
+        assert entry.confidence == entry.error_def["detection_confidence"]
+        assert "CE1" in entry.ages
+
+    def test_candidate_index_age_bonus(self, analyzer):
+        """Le bonus d'âge est pré-calculé par (domaine, niveau)"""
+        candidates = analyzer.candidate_index[("addition", "CE1")]
+        assert all(bonus == 0.3 for _, bonus in candidates)
+
+    def test_unknown_difficulty_uses_domain_fallback(self, analyzer):
+        """Un niveau inconnu utilise la liste sans bonus d'âge"""
+        candidates = analyzer._get_candidates("addition", "6e")
+        assert candidates == analyzer.candidate_index[("addition", None)]
+
+    def test_index_matches_linear_scan(self, real_analyzer):
+        """Le scoring indexé donne le même résultat que le scan complet"""
+        cases = [
+            ("addition", "27 + 48", "CE1", 65, 75),
+            ("addition", "7 + 8", "CM2", 14, 15),
+            ("subtraction", "52 - 27", "CE2", 35, 25),
+            ("multiplication", "7 × 8", "CE2", 54, 56),
+            ("division", "42 ÷ 6", "CM1", 6, 7),
+            ("fractions", "1/2 + 1/3", "CM1", "2/5", "5/6"),
+            ("geometrie", "périmètre", "CM2", 12, 36),
+            ("unknown", "?", "CE1", 1, 2),
+        ]
+
+        for ex_type, operation, difficulty, response, expected in cases:
+            exercise = {"type": ex_type, "operation": operation, "difficulty": difficulty}
+
+            resp_val = real_analyzer._parse_number(response)
+            exp_val = real_analyzer._parse_number(expected)
+            difference = abs(resp_val - exp_val)
+            domain = real_analyzer._map_exercise_type_to_domain(ex_type)
+            match = real_analyzer._match_candidates(ex_type, exercise, difficulty, difference)
+
+            best = None
+            for category, data in real_analyzer.error_catalog["error_categories"].items():
+                for error_def in data["errors"].get(domain, []):
+                    score = real_analyzer._calculate_match_score(
+                        error_def, exercise, response, expected, difference
+                    )
+                    if score > 0.3 and (best is None or score > best[1]):
+                        best = (error_def["id"], score)
+
+            if best is None:
+                assert match is None
+            else:
+                assert match["error"]["id"] == best[0]
+                assert match["score"] == pytest.approx(best[1])
+
+
+# ============================================================================
+# TESTS ANALYSE PAR LOT
+# ============================================================================
+
+class TestAnalyzeBatch:
+    """Tests de analyze_batch"""
+
+    @pytest.fixture
+    def batch(self):
+        exercises = [
+            {"type": "addition", "operation": "27 + 48", "difficulty": "CE1"},
+            {"type": "addition", "operation": "27 + 48", "difficulty": "CE1"},
+            {"type": "subtraction", "operation": "52 - 27", "difficulty": "CE2"},
+            {"type": "multiplication", "operation": "7 × 8", "difficulty": "CM1",
+             "context": "additionne au lieu de multiplier"},
+            {"type": "fractions", "operation": "1/2 + 1/3", "difficulty": "CM2"},
+            {"type": "geometrie", "operation": "périmètre", "difficulty": "6e"},
+            {"type": "addition", "operation": "5 + 3", "difficulty": "CE1"},
+            {"type": "division", "operation": "42 ÷ 7", "difficulty": "CM1"},
+        ]
+        responses = [65, 999, "35", 54, "2/5", "abc", None, 5]
+        expected = [75, 75, 25, 56, "5/6", 36, 8, 6]
+        return exercises, responses, expected
+
+    def test_batch_matches_single_analysis(self, real_analyzer, batch):
+        """Même résultat que analyze_error_type, dans l'ordre d'entrée"""
+        exercises, responses, expected = batch
+        results = real_analyzer.analyze_batch(exercises, responses, expected)
+
+        assert len(results) == len(exercises)
+        for result, exercise, response, exp in zip(results, exercises, responses, expected):
+            single = real_analyzer.analyze_error_type(exercise, response, exp)
+            assert result.to_dict() == single.to_dict()
+
+    def test_batch_random_equivalence(self, real_analyzer):
+        """Équivalence sur un lot aléatoire mélangeant domaines et niveaux"""
+        import random
+        rng = random.Random(7)
+        operators = {"addition": "+", "subtraction": "-", "multiplication": "×", "division": "÷"}
+        exercises, responses, expected = [], [], []
+        for _ in range(300):
+            ex_type = rng.choice(list(operators) + ["fractions", "mesures"])
+            a, b = rng.randint(1, 60), rng.randint(1, 12)
+            op = operators.get(ex_type, "+")
+            exp = {"+": a + b, "-": a - b, "×": a * b, "÷": a // b}[op]
+            exercises.append({
+                "type": ex_type,
+                "operation": f"{a} {op} {b}",
+                "difficulty": rng.choice(["CE1", "CE2", "CM1", "CM2"])
+            })
+            responses.append(rng.choice([exp + rng.randint(-15, 15), str(exp + 1), "?"]))
+            expected.append(exp)
+
+        results = real_analyzer.analyze_batch(exercises, responses, expected)
+        for result, exercise, response, exp in zip(results, exercises, responses, expected):
+            assert result.to_dict() == real_analyzer.analyze_error_type(exercise, response, exp).to_dict()
+
+    def test_batch_empty(self, analyzer):
+        assert analyzer.analyze_batch([], [], []) == []
+
+    def test_batch_length_mismatch(self, analyzer):
+        with pytest.raises(ValueError):
+            analyzer.analyze_batch([{"type": "addition"}], [1, 2], [3])
+
+    def test_batch_write_back(self, real_analyzer, batch):
+        """error_type écrit en une seule requête groupée"""
+        exercises, responses, expected = batch
+        session = MagicMock()
+        ids = list(range(100, 100 + len(exercises)))
+
+        results = real_analyzer.analyze_batch(
+            exercises, responses, expected, response_ids=ids, session=session
+        )
+
+        session.execute.assert_called_once()
+        rows = session.execute.call_args[0][1]
+        assert [row["id"] for row in rows] == ids
+        assert [row["error_type"] for row in rows] == [r.error_id for r in results]
+
+    def test_batch_without_ids_does_not_write(self, real_analyzer, batch):
+        exercises, responses, expected = batch
+        session = MagicMock()
+        real_analyzer.analyze_batch(exercises, responses, expected, session=session)
+        session.execute.assert_not_called()
+
+
+class TestAnalysisCache:
+    """Tests des caches LRU d'analyses et de feedbacks"""
+
+    EXERCISE = {"type": "addition", "operation": "27 + 48", "difficulty": "CE1"}
+
+    def test_repeated_analysis_hits_cache(self, real_analyzer):
+        real_analyzer.clear_caches()
+        first = real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        second = real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+
+        stats = real_analyzer.get_cache_stats()["analysis"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert second.to_dict() == first.to_dict()
+
+    def test_cached_result_is_a_copy(self, real_analyzer):
+        """Modifier un résultat ne corrompt pas le cache"""
+        first = real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        first.root_cause = "modifié"
+        second = real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        assert second.root_cause is None
+
+    def test_response_type_is_part_of_key(self, real_analyzer):
+        real_analyzer.clear_caches()
+        real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        real_analyzer.analyze_error_type(self.EXERCISE, "65", 75)
+        assert real_analyzer.get_cache_stats()["analysis"]["misses"] == 2
+
+    def test_unhashable_inputs_bypass_cache(self, real_analyzer):
+        real_analyzer.clear_caches()
+        result = real_analyzer.analyze_error_type(self.EXERCISE, [65], 75)
+        assert result.error_id is not None
+        assert real_analyzer.get_cache_stats()["analysis"]["size"] == 0
+
+    def test_cache_size_bounded(self, temp_taxonomy_file):
+        analyzer = ErrorAnalyzer(taxonomy_path=str(temp_taxonomy_file), cache_size=2)
+        for response in (1, 2, 3, 4):
+            analyzer.analyze_error_type(self.EXERCISE, response, 75)
+
+        stats = analyzer.get_cache_stats()["analysis"]
+        assert stats["size"] == 2
+        assert stats["evictions"] == 2
+
+    def test_cache_disabled(self, temp_taxonomy_file):
+        analyzer = ErrorAnalyzer(taxonomy_path=str(temp_taxonomy_file), cache_size=0)
+        analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        assert analyzer.get_cache_stats()["analysis"]["size"] == 0
+
+    def test_feedback_cached_and_still_varied(self, real_analyzer):
+        """Les variantes rendues sont en cache, le tirage reste aléatoire"""
+        real_analyzer.clear_caches()
+        analysis = real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        templates = analysis.feedback_templates
+
+        feedbacks = {
+            real_analyzer.generate_personalized_feedback(analysis, student_name="Léa")
+            for _ in range(50)
+        }
+
+        stats = real_analyzer.get_cache_stats()["feedback"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 49
+        assert all(f.startswith("Léa, ") for f in feedbacks)
+        assert len(feedbacks) <= max(len(templates), 1)
+
+    def test_feedback_key_includes_student_name(self, real_analyzer):
+        analysis = real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        assert real_analyzer.generate_personalized_feedback(analysis, student_name="Léa").startswith("Léa, ")
+        assert real_analyzer.generate_personalized_feedback(analysis, student_name="Tom").startswith("Tom, ")
+
+    def test_feedback_unhashable_context(self, real_analyzer):
+        analysis = real_analyzer.analyze_error_type(self.EXERCISE, 65, 75)
+        feedback = real_analyzer.generate_personalized_feedback(analysis, context={"liste": [1, 2]})
+        assert isinstance(feedback, str)
+
+
 # ============================================================================
 # TESTS PERFORMANCE
 # ============================================================================
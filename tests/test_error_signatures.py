@@ -0,0 +1,131 @@
+"""
+Tests pour les signatures de réponses fausses
+Phase 6.1 - MathCopain v6.4
+"""
+
+import pytest
+
+from core.pedagogy.error_signatures import (
+    compute_signatures,
+    match_signature,
+    parse_operation,
+)
+from core.pedagogy.error_analyzer import ErrorAnalyzer
+
+
+@pytest.fixture(scope="module")
+def real_analyzer():
+    return ErrorAnalyzer()
+
+
+class TestParseOperation:
+    """Extraction des opérandes"""
+
+    @pytest.mark.parametrize("operation,expected", [
+        ("27 + 48", (27, '+', 48)),
+        ("52-27", (52, '-', 27)),
+        ("7 × 8", (7, '×', 8)),
+        ("7 x 8", (7, '×', 8)),
+        ("42 ÷ 6", (42, '÷', 6)),
+        ("42 : 6", (42, '÷', 6)),
+        ("27 + 48 = ?", (27, '+', 48)),
+    ])
+    def test_valid_operations(self, operation, expected):
+        assert parse_operation(operation) == expected
+
+    @pytest.mark.parametrize("operation", ["", "1/2 + 1/3", "2,5 + 1,75", "périmètre", None])
+    def test_unsupported_operations(self, operation):
+        assert parse_operation(operation) is None
+
+
+class TestSignatures:
+    """Réponses produites par chaque misconception"""
+
+    @pytest.mark.parametrize("operation,answer,error_id", [
+        ("27 + 48", 65, "ADD_CONC_003"),    # retenue ignorée
+        ("7 + 8", 56, "ADD_CONC_002"),      # multiplie au lieu d'additionner
+        ("34 + 28", 512, "ADD_CONC_004"),   # colonnes juxtaposées
+        ("57 + 68", 135, "ADD_PROC_003"),   # retenue comptée deux fois
+        ("200 + 30", 500, "ADD_CONC_005"),  # position ignorée
+        ("234 + 56", 794, "ADD_PROC_002"),  # mauvais alignement
+        ("27 + 48", 57, "CALC_003"),        # chiffres inversés
+        ("7 + 8", 14, "CALC_001"),          # écart de 1
+        ("52 - 27", 35, "SUB_CONC_001"),    # petit du grand
+        ("41 - 28", 23, "SUB_PROC_002"),    # emprunt sans diminuer
+        ("10 - 3", 13, "SUB_CONC_003"),     # addition au lieu de soustraction
+        ("15 - 0", 14, "SUB_CONC_004"),     # -0 modifie le nombre
+        ("4 × 3", 7, "MULT_CONC_001"),      # addition au lieu de multiplication
+        ("5 × 0", 5, "MULT_CONC_002"),      # ×0 rend le nombre
+        ("7 × 8", 6, "MULT_PROC_002"),      # retenue oubliée
+        ("23 × 45", 207, "MULT_PROC_001"),  # décalage oublié
+        ("7 × 8", 63, "MULT_PROC_003"),     # table voisine
+        ("12 ÷ 3", 9, "DIV_CONC_004"),      # soustraction au lieu de division
+        ("12 ÷ 3", 0.25, "DIV_CONC_001"),   # diviseur/dividende inversés
+        ("42 ÷ 7", 5, "DIV_PROC_001"),      # quotient mal estimé
+        ("8 ÷ 1", 4, "DIV_CONC_005"),       # ÷1 change le nombre
+    ])
+    def test_known_misconceptions(self, operation, answer, error_id):
+        assert match_signature(operation, answer) == error_id
+
+    def test_correct_answer_never_signed(self):
+        for operation, correct in [("27 + 48", 75), ("52 - 27", 25), ("7 × 8", 56), ("42 ÷ 7", 6)]:
+            assert match_signature(operation, correct) is None
+
+    def test_float_and_int_answers_equivalent(self):
+        assert match_signature("27 + 48", 65.0) == match_signature("27 + 48", 65)
+
+    def test_unrelated_answer(self):
+        assert match_signature("27 + 48", 999) is None
+        assert match_signature("27 + 48", None) is None
+
+    def test_specific_signature_wins_over_generic(self):
+        # 65 = 75 - 10 (CALC_001) mais la retenue ignorée est prioritaire
+        assert compute_signatures(27, '+', 48)[65] == "ADD_CONC_003"
+
+    def test_memoized_per_operation(self):
+        compute_signatures.cache_clear()
+        first = compute_signatures(27, '+', 48)
+        assert compute_signatures(27, '+', 48) is first
+        assert compute_signatures.cache_info().hits == 1
+
+    def test_signatures_read_only(self):
+        with pytest.raises(TypeError):
+            compute_signatures(27, '+', 48)[1] = "X"
+
+    def test_signature_ids_exist_in_taxonomy(self, real_analyzer):
+        operations = [(27, '+', 48), (34, '+', 28), (234, '+', 56), (200, '+', 30),
+                      (52, '-', 27), (15, '-', 0), (7, '×', 8), (23, '×', 45),
+                      (5, '×', 0), (13, '÷', 4), (8, '÷', 1)]
+        for operation in operations:
+            for error_id in compute_signatures(*operation).values():
+                assert error_id in real_analyzer.errors_by_id
+
+
+class TestAnalyzerIntegration:
+    """ErrorAnalyzer classe les réponses par signature"""
+
+    def test_ignored_carry(self, real_analyzer):
+        result = real_analyzer.analyze_error_type(
+            {"type": "addition", "operation": "27 + 48", "difficulty": "CE1"}, 65, 75
+        )
+        assert result.error_id == "ADD_CONC_003"
+        assert result.error_type == "Conceptual"
+        assert result.confidence == 0.95
+
+    def test_string_response(self, real_analyzer):
+        result = real_analyzer.analyze_error_type(
+            {"type": "multiplication", "operation": "7 × 8", "difficulty": "CE2"}, "15", 56
+        )
+        assert result.error_id == "MULT_CONC_001"
+
+    def test_no_signature_falls_back(self, real_analyzer):
+        result = real_analyzer.analyze_error_type(
+            {"type": "addition", "operation": "27 + 48", "difficulty": "CE1"}, 999, 75
+        )
+        assert result.error_id != "ADD_CONC_003"
+
+    def test_zero_difference_not_signed(self, real_analyzer):
+        result = real_analyzer.analyze_error_type(
+            {"type": "addition", "operation": "27 + 48", "difficulty": "CE1"}, 75, 75
+        )
+        assert result.error_id is not None
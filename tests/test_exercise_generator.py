@@ -3,19 +3,51 @@ Tests pour core/exercise_generator.py
 Tests basiques du générateur d'exercices
 """
 
+import gzip
+import pickle
+import random
+import re
+from datetime import date
+from pathlib import Path
+
+import numpy as np
 import pytest
 from core.exercise_generator import (
     generer_addition,
     generer_soustraction,
     generer_tables,
     generer_division,
+    generer_batch,
+    generer_daily_challenge,
+    generer_memory_emoji,
+    rng_session,
+    rng_du_jour,
+    DAILY_CHALLENGES,
+    ExerciceBatch,
     generer_probleme,
     generer_droite_numerique,
     calculer_score_droite,
-    generer_explication
+    generer_explication,
+    get_explication_stats,
+    vider_cache_explications,
+    espace_explications,
+    construire_table_explications,
+    ecrire_table_explications,
+    charger_table_explications,
+    decharger_table_explications
 )
 
 
+class _Charge:
+    """Objet dont la désérialisation pickle crée un fichier"""
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+
+    def __reduce__(self):
+        return (Path.touch, (self.chemin,))
+
+
 class TestGenererAddition:
     """Tests de génération d'additions."""
 
@@ -158,6 +190,190 @@ class TestGenererDivision:
                 assert 0 <= reste < diviseur
 
 
+class TestGenererBatch:
+    """Tests de generer_batch (génération vectorisée par lots)."""
+
+    SCALAIRES = {
+        "addition": generer_addition,
+        "soustraction": generer_soustraction,
+        "tables": generer_tables,
+        "division": generer_division,
+    }
+
+    N = 20000
+
+    @staticmethod
+    def _colonnes(exercices):
+        """Colonnes (a, b, reponse, reste) depuis une liste de dicts."""
+        a, b, reponses, restes = [], [], [], []
+        for exercice in exercices:
+            x, y = map(int, re.findall(r"\d+", exercice['question']))
+            a.append(x)
+            b.append(y)
+            reponses.append(exercice['reponse'])
+            restes.append(exercice.get('reste', -1))
+        return [np.array(c) for c in (a, b, reponses, restes)]
+
+    @staticmethod
+    def _variation_totale(x, y, bins=10):
+        """Distance en variation totale entre deux histogrammes."""
+        edges = np.histogram_bin_edges(np.concatenate([x, y]), bins=bins)
+        hx = np.histogram(x, bins=edges)[0] / len(x)
+        hy = np.histogram(y, bins=edges)[0] / len(y)
+        return 0.5 * np.abs(hx - hy).sum()
+
+    def test_retourne_batch_colonnes(self):
+        batch = generer_batch("addition", "CE2", 50, rng=0)
+        assert isinstance(batch, ExerciceBatch)
+        assert len(batch) == 50
+        assert isinstance(batch.a, np.ndarray)
+        assert np.array_equal(batch.reponses, batch.a + batch.b)
+        assert batch.restes is None
+
+    def test_dicts_format_scalaire(self):
+        """batch[i] a le même format que les générateurs unitaires."""
+        batch = generer_batch("division", "CM1", 10, rng=1)
+        exercice = batch[3]
+        assert set(exercice) == {'question', 'reponse', 'reste'}
+        assert '÷' in exercice['question']
+        assert type(exercice['reponse']) is int
+        assert len(list(batch)) == 10
+
+    def test_slice_retourne_sous_lot(self):
+        batch = generer_batch("soustraction", "CM2", 100, rng=2)
+        sous_lot = batch[10:20]
+        assert isinstance(sous_lot, ExerciceBatch)
+        assert len(sous_lot) == 10
+        assert sous_lot[0] == batch[10]
+
+    def test_reproductible_avec_graine(self):
+        b1 = generer_batch("tables", "CM1", 100, rng=np.random.default_rng(7))
+        b2 = generer_batch("tables", "CM1", 100, rng=np.random.default_rng(7))
+        assert list(b1) == list(b2)
+
+    def test_division_ce1_fallback_tables(self):
+        batch = generer_batch("division", "CE1", 20, rng=3)
+        assert all('×' in ex['question'] and 'reste' not in ex for ex in batch)
+
+    def test_multiplication_alias_tables(self):
+        assert generer_batch("multiplication", "CE2", 5, rng=4).symbole == "×"
+
+    def test_division_euclidienne(self):
+        batch = generer_batch("division", "CM2", 5000, rng=5)
+        assert np.array_equal(batch.a, batch.reponses * batch.b + batch.restes)
+        assert np.all((batch.restes >= 0) & (batch.restes < batch.b))
+
+    def test_lot_vide(self):
+        assert len(generer_batch("addition", "CE1", 0)) == 0
+
+    def test_type_inconnu(self):
+        with pytest.raises(ValueError):
+            generer_batch("geometrie", "CE1", 5)
+
+    def test_n_negatif(self):
+        with pytest.raises(ValueError):
+            generer_batch("addition", "CE1", -1)
+
+    @pytest.mark.parametrize("kind", ["addition", "soustraction", "tables", "division"])
+    @pytest.mark.parametrize("niveau", ["CE1", "CE2", "CM1", "CM2"])
+    def test_distributions_identiques_aux_scalaires(self, kind, niveau):
+        """Mêmes supports et mêmes distributions que le générateur unitaire."""
+        random.seed(f"{kind}-{niveau}")
+        try:
+            scalaires = [self.SCALAIRES[kind](niveau) for _ in range(self.N)]
+        finally:
+            random.seed()
+        batch = list(generer_batch(kind, niveau, self.N, rng=np.random.default_rng(11)))
+
+        colonnes_s, colonnes_b = self._colonnes(scalaires), self._colonnes(batch)
+
+        # Mêmes bornes pour les opérandes (les queues des réponses sont trop rares)
+        for col_s, col_b in zip(colonnes_s[:2], colonnes_b[:2]):
+            assert col_s.min() == col_b.min()
+            assert col_s.max() == col_b.max()
+
+        for col_s, col_b in zip(colonnes_s, colonnes_b):
+            assert abs(col_s.mean() - col_b.mean()) <= 0.02 * max(1.0, abs(col_s.mean()))
+            assert self._variation_totale(col_s, col_b) < 0.04
+
+        # Proportion de divisions avec reste (CM1: 30%, CM2: 50%)
+        assert abs(np.mean(colonnes_s[3] > 0) - np.mean(colonnes_b[3] > 0)) < 0.02
+
+    @pytest.mark.parametrize("kind", ["addition", "tables"])
+    def test_support_joint_identique(self, kind):
+        """Petits supports: exactement les mêmes questions possibles."""
+        random.seed(kind)
+        try:
+            scalaires = {self.SCALAIRES[kind]("CE1")['question'] for _ in range(self.N)}
+        finally:
+            random.seed()
+        batch = {ex['question'] for ex in generer_batch(kind, "CE1", self.N, rng=12)}
+        assert scalaires == batch
+
+
+class TestRngInjectable:
+    """Générateurs aléatoires injectables (par session, par jour)."""
+
+    GENERATEURS = [
+        generer_addition, generer_soustraction, generer_tables,
+        generer_division, generer_probleme, generer_droite_numerique,
+    ]
+
+    @pytest.mark.parametrize("generateur", GENERATEURS)
+    @pytest.mark.parametrize("niveau", ["CE1", "CM2"])
+    def test_rejeu_avec_meme_graine(self, generateur, niveau):
+        """Deux sessions de même graine produisent la même séquence."""
+        rng1, rng2 = rng_session(123), rng_session(123)
+        serie1 = [generateur(niveau, rng=rng1) for _ in range(20)]
+        serie2 = [generateur(niveau, rng=rng2) for _ in range(20)]
+        assert serie1 == serie2
+
+    def test_etat_global_intact(self):
+        """Un rng de session ne consomme pas l'état global de random."""
+        random.seed(99)
+        attendu = random.random()
+        random.seed(99)
+        generer_division("CM2", rng=rng_session(1))
+        generer_memory_emoji("CM1", rng=rng_session(1))
+        assert random.random() == attendu
+
+    def test_memory_emoji_reproductible(self):
+        cartes1 = generer_memory_emoji("CE2", rng=rng_session(5))['cards']
+        cartes2 = generer_memory_emoji("CE2", rng=rng_session(5))['cards']
+        assert cartes1 == cartes2
+
+    def test_rng_du_jour_deterministe(self):
+        jour = date(2025, 11, 15)
+        assert rng_du_jour(jour).random() == rng_du_jour(jour).random()
+
+
+class TestDailyChallenge:
+    """Défi du jour: même défi pour tous, calculé une fois par jour."""
+
+    def test_meme_defi_que_l_ancien_tirage_global(self):
+        """Le défi est identique à l'ancien random.seed(jour) + choice."""
+        for jour in (date(2025, 11, 15), date(2026, 1, 1), date(2026, 3, 8)):
+            ancien = random.Random(str(jour)).choice(list(DAILY_CHALLENGES))
+            assert generer_daily_challenge(jour) == ancien
+
+    def test_ne_reseed_pas_le_random_global(self):
+        random.seed(7)
+        attendu = [random.random() for _ in range(3)]
+        random.seed(7)
+        generer_daily_challenge(date(2025, 12, 24))
+        assert [random.random() for _ in range(3)] == attendu
+
+    def test_copie_modifiable(self):
+        """Modifier le défi retourné n'altère pas le cache."""
+        jour = date(2025, 10, 1)
+        defi = generer_daily_challenge(jour)
+        defi['text'] = "modifié"
+        assert generer_daily_challenge(jour)['text'] != "modifié"
+
+    def test_aujourd_hui_par_defaut(self):
+        assert generer_daily_challenge() == generer_daily_challenge(date.today())
+
+
 class TestGenererProbleme:
     """Tests de génération de problèmes."""
 
@@ -270,3 +486,78 @@ class TestGenererExplication:
         assert isinstance(explication, str)
         assert len(explication) > 0
         assert "Regarde bien" in explication or "réessaye" in explication
+
+
+@pytest.fixture
+def explications_vierges():
+    """Cache et table d'explications vides pendant le test"""
+    vider_cache_explications()
+    decharger_table_explications()
+    yield
+    vider_cache_explications()
+    decharger_table_explications()
+
+
+@pytest.mark.usefixtures("explications_vierges")
+class TestExplicationCache:
+    """Mémoïsation et table pré-calculée des explications."""
+
+    def test_question_normalisee(self):
+        """Les espacements différents partagent la même entrée."""
+        premiere = generer_explication("addition", "15 + 27", 40, 42)
+        seconde = generer_explication("addition", "15+27", 41, 42)
+        assert premiere == seconde
+        stats = get_explication_stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+    def test_reponse_correcte_dans_la_cle(self):
+        """Une réponse correcte différente n'est pas servie depuis le cache."""
+        entier = generer_explication("multiplication", "7 × 6", 40, 42)
+        flottant = generer_explication("multiplication", "7 × 6", 40, 42.0)
+        assert "**42**" in entier
+        assert "**42.0**" in flottant
+
+    def test_question_hors_format(self):
+        """Une question non normalisable est expliquée sans cache."""
+        explication = generer_explication("addition", "-5 + 3", 0, -2)
+        assert "**-2**" in explication
+        assert get_explication_stats()['size'] == 0
+
+    def test_espace_fini(self):
+        """L'espace énuméré couvre les questions générées."""
+        espace = set(espace_explications(["CE2"]))
+        for _ in range(50):
+            a, b = map(int, generer_addition("CE2")['question'].split(" + "))
+            assert ("addition", a, b) in espace
+            ex = generer_division("CE2")
+            dividende, diviseur = map(int, ex['question'].split(" ÷ "))
+            assert ("division", dividende, diviseur) in espace
+
+    def test_table_hors_ligne(self, tmp_path):
+        """La table écrite puis rechargée sert les explications."""
+        table = construire_table_explications(["CE1"])
+        path = ecrire_table_explications(table, tmp_path / "explications.json.gz")
+        attendu = generer_explication("soustraction", "15 - 8", 0, 7)
+        vider_cache_explications()
+
+        assert charger_table_explications(path) == len(table)
+        assert generer_explication("soustraction", "15 - 8", 0, 7) == attendu
+        stats = get_explication_stats()
+        assert stats['table_size'] == len(table)
+        assert stats['hits'] + stats['misses'] == 0
+
+    def test_table_absente(self, tmp_path):
+        """Une table absente est ignorée."""
+        assert charger_table_explications(tmp_path / "absente.json.gz") == 0
+        assert generer_explication("addition", "5 + 3", 7, 8)
+
+    def test_table_pickle_ignoree(self, tmp_path):
+        """Un pickle à la place de la table n'est jamais désérialisé."""
+        marqueur = tmp_path / "execute"
+        path = tmp_path / "explications.json.gz"
+        with gzip.open(path, 'wb') as f:
+            pickle.dump(_Charge(marqueur), f)
+
+        assert charger_table_explications(path) == 0
+        assert not marqueur.exists()
@@ -0,0 +1,240 @@
+"""
+Tests pour core/exercise_history.py
+Historique d'exercices compact (tampon circulaire)
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.adaptive_system import AdaptiveSystem
+from core.exercise_history import (
+    ArchiveHistorique,
+    HistoriqueExercices,
+    historique_exercices,
+    profil_serialisable,
+)
+from core.skill_tracker import SkillTracker
+
+DEBUT = datetime(2026, 3, 15, 14, 30, 12, 345678)
+
+
+def liste_dicts(n, debut=DEBUT):
+    types = ['addition', 'soustraction', 'fractions']
+    return [
+        {
+            'type': types[i % 3],
+            'correct': i % 4 != 0,
+            'difficulty': 1 + i % 10,
+            'timestamp': (debut + timedelta(minutes=i)).isoformat(),
+            'time_taken': None if i % 5 == 0 else i * 1.5,
+        }
+        for i in range(n)
+    ]
+
+
+class TestTamponCirculaire:
+    """ajouter(), capacité, vues"""
+
+    def test_lecture_comme_une_liste(self):
+        enregistrements = liste_dicts(30)
+        historique = HistoriqueExercices.depuis(enregistrements)
+        assert len(historique) == 30
+        assert list(historique) == enregistrements
+        assert historique[0] == enregistrements[0]
+        assert historique[-1] == enregistrements[-1]
+        assert historique[-10:] == enregistrements[-10:]
+        with pytest.raises(IndexError):
+            historique[30]
+
+    def test_capacite(self):
+        enregistrements = liste_dicts(250)
+        historique = HistoriqueExercices.depuis(enregistrements)
+        assert len(historique) == 100
+        assert historique == enregistrements[-100:]
+
+    def test_vues_sans_copie(self):
+        historique = HistoriqueExercices(capacite=8)
+        for i in range(13):
+            historique.ajouter('addition', i % 2 == 0, i, DEBUT)
+        colonnes = historique.colonnes()
+        assert colonnes.difficulty.tolist() == list(range(5, 13))
+        assert np.shares_memory(colonnes.difficulty, historique.colonnes().difficulty)
+        assert not colonnes.correct.flags.writeable
+
+    def test_timestamp_et_temps(self):
+        historique = HistoriqueExercices()
+        historique.ajouter('division', True, 3, DEBUT.replace(microsecond=0))
+        historique.ajouter('division', False, 3, DEBUT, time_taken=45.5)
+        assert historique[0]['timestamp'] == DEBUT.replace(microsecond=0).isoformat()
+        assert historique[0]['time_taken'] is None
+        assert historique[1]['time_taken'] == 45.5
+
+    def test_derniers_par_type(self):
+        enregistrements = liste_dicts(60)
+        historique = HistoriqueExercices.depuis(enregistrements)
+        attendu = [ex for ex in enregistrements if ex['type'] == 'fractions'][-10:]
+        assert historique.derniers(10, 'fractions') == attendu
+        assert historique.derniers(10, 'monnaie') == []
+        assert historique.derniers(5) == enregistrements[-5:]
+
+
+class TestSerialisation:
+    """to_dict() / depuis()"""
+
+    def test_aller_retour_json(self):
+        historique = HistoriqueExercices.depuis(liste_dicts(130))
+        recharge = HistoriqueExercices.depuis(json.loads(json.dumps(historique.to_dict())))
+        assert recharge == historique
+        recharge.ajouter('monnaie', True, 4, DEBUT)
+        assert recharge[-1]['type'] == 'monnaie'
+        assert len(recharge) == 100
+
+    def test_plus_compact(self):
+        enregistrements = liste_dicts(100)
+        compact = json.dumps(HistoriqueExercices.depuis(enregistrements).to_dict())
+        assert len(compact) < len(json.dumps(enregistrements)) / 3
+
+    def test_format_inconnu(self):
+        with pytest.raises(ValueError):
+            HistoriqueExercices.depuis({'format': 'autre'})
+
+    def test_profil(self):
+        profil = {'exercise_history': liste_dicts(3)}
+        historique = historique_exercices(profil)
+        assert profil['exercise_history'] is historique
+        assert historique_exercices(profil) is historique
+
+        donnees = profil_serialisable(profil)
+        assert donnees is not profil
+        assert isinstance(donnees['exercise_history'], dict)
+        assert historique_exercices(json.loads(json.dumps(donnees))) == historique
+
+    def test_profil_deja_serialisable(self):
+        profil = {'exercise_history': []}
+        assert profil_serialisable(profil) is profil
+
+
+class TestIntegration:
+    """SkillTracker et AdaptiveSystem sur l'historique compact"""
+
+    def test_skill_tracker_convertit_l_ancien_format(self):
+        profil = {'exercise_history': liste_dicts(5)}
+        tracker = SkillTracker(profil)
+        tracker.record_exercise('addition', True, difficulty=3)
+        assert isinstance(profil['exercise_history'], HistoriqueExercices)
+        assert len(profil['exercise_history']) == 6
+
+    def test_analyze_performance(self):
+        enregistrements = liste_dicts(60)
+        historique = HistoriqueExercices.depuis(enregistrements)
+        adaptive = AdaptiveSystem()
+        for exercise_type in (None, 'addition', 'monnaie'):
+            assert (adaptive.analyze_performance(historique, exercise_type)
+                    == adaptive.analyze_performance(enregistrements, exercise_type))
+
+
+class TestArchive:
+    """Exercices au-delà de la fenêtre récente: journal en ajout seul"""
+
+    def test_debordement_archive(self, tmp_path):
+        archive = ArchiveHistorique(tmp_path / "eleve.jsonl")
+        enregistrements = liste_dicts(250)
+        historique = HistoriqueExercices.depuis(enregistrements, archive=archive)
+        assert len(historique) == 100
+        assert list(archive) == enregistrements[:150]
+        assert list(historique.tout()) == enregistrements
+
+    def test_lecture_inverse(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("core.exercise_history._BLOC_LECTURE", 64)
+        archive = ArchiveHistorique(tmp_path / "eleve.jsonl")
+        enregistrements = liste_dicts(40)
+        for ex in enregistrements:
+            archive.ajouter(ex)
+        assert list(archive.inverse()) == enregistrements[::-1]
+
+    def test_ligne_tronquee_ignoree(self, tmp_path):
+        archive = ArchiveHistorique(tmp_path / "eleve.jsonl")
+        archive.ajouter(liste_dicts(1)[0])
+        with open(archive.chemin, 'a', encoding='utf-8') as f:
+            f.write('{"type": "addi')
+        assert len(list(archive)) == 1
+        assert len(list(archive.inverse())) == 1
+
+    def test_archive_absente(self, tmp_path):
+        archive = ArchiveHistorique(tmp_path / "absent.jsonl")
+        assert list(archive) == []
+        assert list(archive.inverse()) == []
+
+    def test_derniers_complete_depuis_l_archive(self, tmp_path):
+        archive = ArchiveHistorique(tmp_path / "eleve.jsonl")
+        enregistrements = liste_dicts(130)
+        enregistrements[5]['type'] = enregistrements[7]['type'] = 'monnaie'
+        historique = HistoriqueExercices.depuis(enregistrements, archive=archive)
+        assert historique.derniers(10, 'monnaie') == [enregistrements[5], enregistrements[7]]
+        attendu = [ex for ex in enregistrements if ex['type'] == 'addition'][-40:]
+        assert historique.derniers(40, 'addition') == attendu
+        assert historique.derniers(120) == enregistrements[-120:]
+
+    def test_profil(self, archive_historique_temporaire):
+        profil = {}
+        tracker = SkillTracker(profil)
+        for i in range(120):
+            tracker.record_exercise('addition', i % 2 == 0, difficulty=3)
+        assert len(profil['exercise_history']) == 100
+        chemin = archive_historique_temporaire / f"{profil['history_archive']}.jsonl"
+        assert len(chemin.read_text(encoding='utf-8').splitlines()) == 20
+
+        # Rechargé depuis la sauvegarde: même archive
+        recharge = json.loads(json.dumps(profil_serialisable(profil)))
+        assert len(list(historique_exercices(recharge).tout())) == 120
+
+    def test_session_non_sauvegardee(self, archive_historique_temporaire):
+        """Profil rechargé depuis une sauvegarde antérieure: rien n'est réarchivé"""
+        profil = {'exercise_history': liste_dicts(100)}
+        historique_exercices(profil)
+        sauvegarde = json.dumps(profil_serialisable(profil))
+
+        # Session perdue: 5 exercices archivés, profil jamais sauvegardé
+        perdus = liste_dicts(5, debut=DEBUT + timedelta(days=1))
+        for ex in perdus:
+            historique_exercices(profil).ajouter(
+                ex['type'], ex['correct'], ex['difficulty'], ex['timestamp'], ex['time_taken'])
+
+        recharge = json.loads(sauvegarde)
+        nouveaux = liste_dicts(8, debut=DEBUT + timedelta(days=2))
+        historique = historique_exercices(recharge)
+        for ex in nouveaux:
+            historique.ajouter(ex['type'], ex['correct'], ex['difficulty'], ex['timestamp'], ex['time_taken'])
+
+        attendu = liste_dicts(100) + nouveaux
+        assert list(historique.tout()) == attendu
+        assert list(historique.archive) == attendu[:8]
+
+        # Et encore après une sauvegarde normale
+        recharge = json.loads(json.dumps(profil_serialisable(recharge)))
+        historique = historique_exercices(recharge)
+        historique.ajouter('addition', True)
+        assert list(historique.tout())[:-1] == attendu
+
+    def test_archive_sans_numeros(self, tmp_path):
+        """Archive écrite avant la numérotation: complétée normalement"""
+        archive = ArchiveHistorique(tmp_path / "eleve.jsonl")
+        enregistrements = liste_dicts(130)
+        for ex in enregistrements[:20]:
+            archive.ajouter(ex)
+        compact = HistoriqueExercices.depuis(enregistrements[20:120]).to_dict()
+        del compact['sequence']
+        historique = HistoriqueExercices.depuis(compact, archive=archive)
+        for ex in enregistrements[120:]:
+            historique.ajouter(ex['type'], ex['correct'], ex['difficulty'], ex['timestamp'], ex['time_taken'])
+        assert list(historique.tout()) == enregistrements
+
+    def test_archivage_desactive(self, tmp_path):
+        profil = {'exercise_history': liste_dicts(150)}
+        historique = historique_exercices(profil, archive_dir='')
+        assert historique.archive is None
+        assert 'history_archive' not in profil
+        assert list(historique.tout()) == liste_dicts(150)[-100:]
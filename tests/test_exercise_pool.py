@@ -0,0 +1,216 @@
+"""
+Tests pour core/exercise_pool.py
+Pools d'exercices pré-générés par (type, niveau)
+"""
+
+import threading
+
+import pytest
+
+from core import exercise_pool
+from core.exercise_pool import ExercisePool, batch_from_scalar, default_generators
+
+
+def compteur():
+    """Générateur par lots déterministe: exercices numérotés"""
+    state = {"next": 0, "calls": 0}
+
+    def generate(niveau, n):
+        state["calls"] += 1
+        start = state["next"]
+        state["next"] += n
+        return [{"question": f"{niveau}-{i}", "reponse": i} for i in range(start, start + n)]
+
+    return generate, state
+
+
+@pytest.fixture
+def pool():
+    generate, _ = compteur()
+    pool = ExercisePool({"addition": generate}, pool_size=10, refill_threshold=3, autostart=False)
+    yield pool
+    pool.stop(timeout=1)
+
+
+class TestPop:
+    """pop(): O(1) depuis le pool, génération synchrone si vide"""
+
+    def test_pool_vide_underrun(self, pool):
+        exercice = pool.pop("addition", "CE1")
+        assert exercice == {"question": "CE1-0", "reponse": 0}
+        assert pool.stats()["underruns"] == 1
+        assert pool.stats()["hits"] == 0
+
+    def test_prefill_puis_hits(self, pool):
+        pool.prefill("addition", "CE2")
+        assert pool.size("addition", "CE2") == 10
+
+        questions = [pool.pop("addition", "CE2")["question"] for _ in range(5)]
+        assert questions == [f"CE2-{i}" for i in range(5)]
+        assert pool.stats()["hits"] == 5
+        assert pool.size("addition", "CE2") == 5
+
+    def test_pools_separes_par_niveau(self, pool):
+        pool.prefill("addition", "CE1")
+        assert pool.size("addition", "CM2") == 0
+        assert pool.pop("addition", "CM2")["question"].startswith("CM2")
+
+    def test_type_inconnu(self, pool):
+        with pytest.raises(ValueError):
+            pool.pop("geometrie", "CE1")
+
+    def test_exercices_jamais_partages(self, pool):
+        pool.prefill("addition", "CE1")
+        premier = pool.pop("addition", "CE1")
+        second = pool.pop("addition", "CE1")
+        assert premier is not second
+
+
+class TestRemplissage:
+    """Thread de fond et seuils"""
+
+    def test_refill_sous_le_seuil(self):
+        generate, state = compteur()
+        pool = ExercisePool({"addition": generate}, pool_size=10, refill_threshold=3)
+        try:
+            pool.prefill("addition", "CE1")
+            for _ in range(7):
+                pool.pop("addition", "CE1")
+
+            assert pool.join(timeout=5)
+            assert pool.size("addition", "CE1") == 10
+            assert pool.stats()["pools"]["addition/CE1"]["refills"] == 2
+        finally:
+            pool.stop(timeout=1)
+
+    def test_pas_de_refill_au_dessus_du_seuil(self, pool):
+        pool.prefill("addition", "CE1")
+        pool.pop("addition", "CE1")
+        assert pool._pending == set()
+
+    def test_warm_remplit_en_arriere_plan(self):
+        generate, _ = compteur()
+        pool = ExercisePool({"addition": generate, "tables": generate}, pool_size=4, refill_threshold=1)
+        try:
+            pool.warm(["CE1", "CE2"])
+            assert pool.join(timeout=5)
+            for kind in ("addition", "tables"):
+                for niveau in ("CE1", "CE2"):
+                    assert pool.size(kind, niveau) == 4
+        finally:
+            pool.stop(timeout=1)
+
+    def test_generateur_defaillant_ne_tue_pas_le_thread(self):
+        def broken(niveau, n):
+            raise RuntimeError("boom")
+
+        generate, _ = compteur()
+        pool = ExercisePool({"broken": broken, "addition": generate}, pool_size=4, refill_threshold=1)
+        try:
+            pool.warm(["CE1"])
+            assert pool.join(timeout=5)
+            assert pool.stats()["pools"]["broken/CE1"]["errors"] == 1
+            assert pool.size("addition", "CE1") == 4
+            with pytest.raises(RuntimeError):
+                pool.pop("broken", "CE1")
+        finally:
+            pool.stop(timeout=1)
+
+    def test_register_vide_les_pools(self, pool):
+        pool.prefill("addition", "CE1")
+        pool.register("addition", lambda niveau, n: [{"question": "nouveau"}] * n)
+        assert pool.size("addition", "CE1") == 0
+        assert pool.pop("addition", "CE1") == {"question": "nouveau"}
+
+    def test_pops_concurrents(self):
+        generate, _ = compteur()
+        pool = ExercisePool({"addition": generate}, pool_size=50, refill_threshold=10)
+        results = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(200):
+                ex = pool.pop("addition", "CE1")
+                with lock:
+                    results.append(ex["reponse"])
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            pool.stop(timeout=1)
+
+        # Chaque exercice n'est servi qu'une fois
+        assert len(results) == 800
+        assert len(set(results)) == 800
+        stats = pool.stats()
+        assert stats["hits"] + stats["underruns"] == 800
+
+
+class TestConfiguration:
+    """Tailles et métriques"""
+
+    def test_seuil_invalide(self):
+        with pytest.raises(ValueError):
+            ExercisePool({}, pool_size=5, refill_threshold=5, autostart=False)
+
+    def test_taille_invalide(self):
+        with pytest.raises(ValueError):
+            ExercisePool({}, pool_size=0, refill_threshold=0, autostart=False)
+
+    def test_stats_taux_underrun(self, pool):
+        pool.pop("addition", "CE1")
+        pool.prefill("addition", "CE1")
+        pool.pop("addition", "CE1")
+        stats = pool.stats()
+        assert stats["underrun_rate"] == 0.5
+        assert stats["pool_size"] == 10
+        assert stats["pools"]["addition/CE1"]["generated"] == 10
+
+
+class TestGenerateursParDefaut:
+    """Générateurs enregistrés par défaut"""
+
+    def test_types_disponibles(self):
+        generators = default_generators()
+        for kind in ("addition", "soustraction", "tables", "division",
+                     "addition_decimaux", "conversion_longueur", "calcul_rendu", "echelle"):
+            assert kind in generators
+
+    @pytest.mark.parametrize("kind", ["addition", "division", "calcul_rendu", "conversion_masse"])
+    def test_lots_au_format_scalaire(self, kind):
+        exercices = list(default_generators()[kind]("CM1", 5))
+        assert len(exercices) == 5
+        assert all("question" in ex for ex in exercices)
+
+    def test_batch_from_scalar_ignore_les_tirages_en_erreur(self):
+        calls = {"n": 0}
+
+        def flaky(niveau):
+            calls["n"] += 1
+            if calls["n"] % 2:
+                raise KeyError("x")
+            return {"question": niveau}
+
+        assert len(batch_from_scalar(flaky)("CE1", 10)) == 5
+
+    def test_batch_from_scalar_propage_si_aucun_exercice(self):
+        def broken(niveau):
+            raise KeyError("x")
+
+        with pytest.raises(KeyError):
+            batch_from_scalar(broken)("CE1", 1)
+
+
+class TestPoolPartage:
+    """get_exercise_pool(): une instance par processus"""
+
+    def test_meme_instance(self):
+        exercise_pool.reset_exercise_pool()
+        try:
+            assert exercise_pool.get_exercise_pool() is exercise_pool.get_exercise_pool()
+        finally:
+            exercise_pool.reset_exercise_pool()
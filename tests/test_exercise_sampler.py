@@ -0,0 +1,224 @@
+"""
+Tests pour core/exercise_sampler.py
+Tirage sans répétition récente par élève
+"""
+
+import random
+import sys
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from core import exercise_sampler
+from core.exercise_sampler import (
+    ExerciseSampler,
+    FiltreRecence,
+    empreinte,
+    espace_operandes,
+)
+
+
+class TestEspacesOperandes:
+    """Espaces énumérés: index → exercice"""
+
+    @pytest.mark.parametrize("kind", ["addition", "soustraction", "tables", "division"])
+    @pytest.mark.parametrize("niveau", ["CE1", "CE2", "CM1", "CM2"])
+    def test_questions_distinctes(self, kind, niveau):
+        for _, espace in espace_operandes(kind, niveau):
+            questions = {espace.exercice(i)['question'] for i in range(min(len(espace), 5000))}
+            assert len(questions) == min(len(espace), 5000)
+
+    def test_taille_addition(self):
+        (probabilite, espace), = espace_operandes("addition", "CE1")
+        assert probabilite == 1.0
+        assert len(espace) == 100
+        assert espace.exercice(0) == {'question': "1 + 1", 'reponse': 2}
+        assert espace.exercice(99) == {'question': "10 + 10", 'reponse': 20}
+
+    def test_division_reste_exhaustive(self):
+        _, (_, espace) = espace_operandes("division", "CM1")
+        attendu = {
+            (q * d + r, d) for d in range(3, 8) for q in range(3, 10) for r in range(1, d)
+        }
+        obtenu = set()
+        for i in range(len(espace)):
+            ex = espace.exercice(i)
+            dividende, diviseur = map(int, ex['question'].split(" ÷ "))
+            assert ex['reponse'] * diviseur + ex['reste'] == dividende
+            assert 1 <= ex['reste'] < diviseur
+            obtenu.add((dividende, diviseur))
+        assert obtenu == attendu
+        assert len(espace) == len(attendu)
+
+    def test_division_proportions(self):
+        branches = espace_operandes("division", "CM1")
+        assert [p for p, _ in branches] == pytest.approx([0.7, 0.3])
+
+    def test_division_ce1_tables(self):
+        (_, espace), = espace_operandes("division", "CE1")
+        assert espace.symbole == "×"
+
+    def test_type_inconnu(self):
+        with pytest.raises(ValueError):
+            espace_operandes("geometrie", "CE1")
+
+
+class TestFiltreRecence:
+    """Fenêtre des K dernières empreintes"""
+
+    def test_fenetre_glissante(self):
+        filtre = FiltreRecence(3)
+        for valeur in (1, 2, 3, 4):
+            filtre.ajouter(valeur)
+        assert 1 not in filtre
+        assert all(v in filtre for v in (2, 3, 4))
+        assert len(filtre) == 3
+
+    def test_doublon_dans_la_fenetre(self):
+        filtre = FiltreRecence(2)
+        filtre.ajouter(7)
+        filtre.ajouter(7)
+        filtre.ajouter(8)
+        assert 7 in filtre
+
+    def test_empreinte_stable(self):
+        assert empreinte("7 × 8") == empreinte("7 × 8")
+        assert empreinte("7 × 8") != empreinte("8 × 7")
+        assert 0 <= empreinte("7 × 8") < 2 ** 64
+
+
+@contextmanager
+def bascule_frequente():
+    """Changements de thread très fréquents: rend les courses visibles"""
+    intervalle = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        yield
+    finally:
+        sys.setswitchinterval(intervalle)
+
+
+class TestTirage:
+    """ExerciseSampler.tirer()"""
+
+    def test_aucune_repetition_dans_la_fenetre(self):
+        sampler = ExerciseSampler(recence=20)
+        rng = random.Random(3)
+        questions = [sampler.tirer("alice", "tables", "CE1", rng=rng)['question'] for _ in range(400)]
+        for i, question in enumerate(questions):
+            assert question not in questions[max(0, i - 20):i]
+
+    def test_eleves_independants(self):
+        sampler = ExerciseSampler(recence=5)
+        sampler.tirer("alice", "addition", "CE1", rng=random.Random(1))
+        sampler.tirer("bob", "addition", "CE1", rng=random.Random(1))
+        assert len(sampler.filtre("alice")) == 1
+        assert len(sampler.filtre("bob")) == 1
+
+    def test_espace_plus_petit_que_la_fenetre(self):
+        """Répétition inévitable: le tirage termine quand même"""
+        sampler = ExerciseSampler(recence=100)
+        rng = random.Random(0)
+        questions = [sampler.tirer("alice", "division", "CE2", rng=rng)['question'] for _ in range(64)]
+        assert len(set(questions[:32])) == 32
+        assert len(questions) == 64
+
+    def test_format_identique_au_generateur(self):
+        sampler = ExerciseSampler()
+        ex = sampler.tirer("alice", "division", "CM2", rng=random.Random(5))
+        assert set(ex) == {'question', 'reponse', 'reste'}
+
+    def test_nombre_d_eleves_borne(self):
+        sampler = ExerciseSampler(recence=5, max_eleves=3)
+        for user in ("a", "b", "c", "d"):
+            sampler.tirer(user, "addition", "CE1")
+        assert sampler.stats()['eleves'] == 3
+
+    def test_recence_invalide(self):
+        with pytest.raises(ValueError):
+            ExerciseSampler(recence=-1)
+
+    def test_tirages_concurrents(self):
+        sampler = ExerciseSampler(recence=10)
+        erreurs = []
+
+        def worker(user):
+            rng = random.Random(user)
+            try:
+                for _ in range(300):
+                    sampler.tirer(user, "tables", "CE2", rng=rng)
+            except Exception as e:  # pragma: no cover - remonté par l'assertion
+                erreurs.append(e)
+
+        threads = [threading.Thread(target=worker, args=(f"eleve{i}",)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert erreurs == []
+        assert sampler.stats()['eleves'] == 8
+
+    def test_compteurs_concurrents(self):
+        """Aucun rejet ni sondage perdu entre sessions concurrentes"""
+        def tirages(sampler, user):
+            rng = random.Random(0)
+            for _ in range(200):
+                sampler.tirer(user, "division", "CE2", rng=rng)
+
+        seul = ExerciseSampler(recence=100)
+        tirages(seul, "eleve")
+        assert seul.rejets > 0 and seul.sondages > 0
+
+        sampler = ExerciseSampler(recence=100)
+        threads = [threading.Thread(target=tirages, args=(sampler, f"eleve{i}")) for i in range(8)]
+        with bascule_frequente():
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert sampler.rejets == 8 * seul.rejets
+        assert sampler.sondages == 8 * seul.sondages
+
+    def test_meme_eleve_concurrent(self):
+        """Deux sessions du même élève ne tirent pas la même question"""
+        sampler = ExerciseSampler(recence=10)
+        filtre = sampler.filtre("alice")
+        rendez_vous = threading.Barrier(2, timeout=0.2)
+        ajouter = filtre.ajouter
+
+        def ajouter_synchronise(cle):
+            # Course forcée entre le test « déjà vu » et l'ajout
+            try:
+                rendez_vous.wait()
+            except threading.BrokenBarrierError:
+                pass
+            ajouter(cle)
+
+        filtre.ajouter = ajouter_synchronise
+        questions = []
+
+        def worker():
+            questions.append(sampler.tirer("alice", "tables", "CE2", rng=random.Random(7))['question'])
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(set(questions)) == 2
+        assert len(filtre) == 2
+
+
+class TestSamplerPartage:
+    """get_exercise_sampler(): une instance par processus"""
+
+    def test_meme_instance(self):
+        exercise_sampler.reset_exercise_sampler()
+        try:
+            assert exercise_sampler.get_exercise_sampler() is exercise_sampler.get_exercise_sampler()
+        finally:
+            exercise_sampler.reset_exercise_sampler()
@@ -1119,6 +1119,148 @@ class TestFeedbackGeneratorAlias:
         assert hasattr(generator, 'process_exercise_response')
 
 
+# ============================================================================
+# TESTS - Mode différé (deux phases)
+# ============================================================================
+
+class TestDeferredFeedback:
+    """Tests du mode deferred=True: couche immédiate puis couches 2-4"""
+
+    @pytest.fixture
+    def engine(self):
+        engine = TransformativeFeedback(max_workers=2)
+        yield engine
+        engine.shutdown()
+
+    def test_failure_layers_filled(self, engine, sample_addition_exercise):
+        result = engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "user_1", deferred=True
+        )
+
+        assert result.immediate.startswith("❌")
+        assert result.encouragement
+        assert result.wait(timeout=5)
+        assert result.pending is False
+        assert result.explanation
+        assert result.strategy
+        assert result.remediation is not None
+
+    def test_success_layers_filled(self, engine, sample_addition_exercise):
+        result = engine.process_exercise_response(
+            sample_addition_exercise, 42, 42, "user_1", deferred=True
+        )
+
+        assert result.immediate.startswith("✅")
+        assert result.wait(timeout=5)
+        assert result.explanation
+        assert result.strategy
+        assert result.remediation is None
+
+    def test_returns_before_deep_layers(self, engine, sample_addition_exercise):
+        """Le verdict est retourné sans attendre les couches lentes"""
+        import threading
+        release = threading.Event()
+        original = engine._build_alternative_strategy
+
+        def slow_strategy(*args):
+            release.wait(timeout=5)
+            return original(*args)
+
+        engine._build_alternative_strategy = slow_strategy
+        result = engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "user_1", deferred=True
+        )
+
+        assert result.pending is True
+        assert result.immediate
+        assert result.wait(timeout=0.01) is False
+
+        release.set()
+        assert result.wait(timeout=5)
+        assert result.strategy
+
+    def test_same_layers_as_synchronous(self, engine, sample_addition_exercise):
+        sync = engine.process_exercise_response(sample_addition_exercise, 32, 42, "u")
+        deferred = engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "u", deferred=True
+        )
+        deferred.wait(timeout=5)
+
+        assert deferred.remediation == sync.remediation
+        assert deferred.next_action == sync.next_action
+        assert deferred.confidence == sync.confidence
+
+    def test_failing_layer_uses_fallback(self, engine, sample_addition_exercise):
+        def broken(*args):
+            raise RuntimeError("boom")
+
+        engine._build_error_explanation = broken
+        result = engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "u", deferred=True
+        )
+
+        assert result.wait(timeout=5)
+        assert result.pending is False
+        assert "42" in result.explanation
+
+    def test_after_shutdown_runs_synchronously(self, engine, sample_addition_exercise):
+        engine.process_exercise_response(sample_addition_exercise, 32, 42, "u", deferred=True)
+        engine._get_executor().shutdown()
+
+        result = engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "u", deferred=True
+        )
+        assert result.pending is False
+        assert result.explanation
+
+    def test_synchronous_result_is_complete(self, engine, sample_addition_exercise):
+        result = engine.process_exercise_response(sample_addition_exercise, 32, 42, "u")
+        assert result.pending is False
+        assert result.wait() is True
+
+    def test_to_dict_excludes_internal_event(self, engine, sample_addition_exercise):
+        result = engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "u", deferred=True
+        )
+        result.wait(timeout=5)
+        d = result.to_dict()
+        assert "_done" not in d
+        json.dumps(d, default=str)
+
+
+class TestLayerTimings:
+    """Instrumentation: durée de chaque couche en millisecondes"""
+
+    def test_failure_timings(self, feedback_engine, sample_addition_exercise):
+        result = feedback_engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "u"
+        )
+        assert set(result.layer_timings) == {
+            "check", "analysis", "immediate", "encouragement", "next_action",
+            "explanation", "strategy", "remediation"
+        }
+        assert all(ms >= 0 for ms in result.layer_timings.values())
+
+    def test_success_timings(self, feedback_engine, sample_addition_exercise):
+        result = feedback_engine.process_exercise_response(
+            sample_addition_exercise, 42, 42, "u"
+        )
+        assert set(result.layer_timings) == {
+            "check", "immediate", "encouragement", "next_action",
+            "explanation", "strategy"
+        }
+
+    def test_deferred_timings_completed_in_background(
+        self, feedback_engine, sample_addition_exercise
+    ):
+        result = feedback_engine.process_exercise_response(
+            sample_addition_exercise, 32, 42, "u", deferred=True
+        )
+        result.wait(timeout=5)
+        feedback_engine.shutdown()
+        assert "remediation" in result.layer_timings
+
+
 # ============================================================================
 # TESTS - Performance et Robustesse
 # ============================================================================
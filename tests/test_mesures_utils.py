@@ -1,4 +1,6 @@
 """Tests pour les utilitaires de mesures et conversions."""
+import random
+
 import pytest
 from mesures_utils import (
     generer_conversion_longueur,
@@ -7,6 +9,7 @@ from mesures_utils import (
     generer_probleme_duree,
     expliquer_conversion
 )
+from core.unit_registry import convertir, exact
 
 
 class TestConversionLongueur:
@@ -236,6 +239,39 @@ class TestCoherenceGlobale:
         assert len(set(valeurs_depart)) > 1  # Au moins 2 valeurs différentes
 
 
+class TestConversionsExactes:
+    """Réponses calculées par core.unit_registry."""
+
+    @pytest.mark.parametrize("generer", [
+        generer_conversion_longueur, generer_conversion_masse, generer_conversion_capacite
+    ])
+    @pytest.mark.parametrize("niveau", ["CE2", "CM1", "CM2"])
+    def test_reponse_exacte(self, generer, niveau):
+        rng = random.Random(7)
+        for _ in range(50):
+            conversion = generer(niveau, rng=rng)
+            attendu = convertir(conversion['valeur_depart'], conversion['unite_depart'], conversion['unite_arrivee'])
+            assert exact(conversion['reponse']) == attendu
+
+    def test_reponse_entiere(self):
+        """Vers une unité plus petite: un entier (600, pas 600.0000000000001)."""
+        rng = random.Random(3)
+        for _ in range(50):
+            conversion = generer_conversion_longueur("CM2", rng=rng)
+            if convertir(1, conversion['unite_depart'], conversion['unite_arrivee']) > 1:
+                assert isinstance(conversion['reponse'], int)
+
+    def test_diviseur(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            conversion = generer_conversion_longueur("CM2", rng=rng)
+            assert conversion['reponse'] == pytest.approx(conversion['valeur_depart'] / conversion['diviseur'])
+
+    def test_rng_reproductible(self):
+        assert generer_conversion_masse("CM1", rng=random.Random(1)) == \
+            generer_conversion_masse("CM1", rng=random.Random(1))
+
+
 class TestExpliquerConversion:
     """Tests d'explication pour conversions d'unités."""
 
@@ -305,3 +341,14 @@ class TestExpliquerConversion:
         assert isinstance(explication, str)
         # Devrait mentionner le résultat
         assert "2" in explication
+
+    def test_explication_tonnes(self):
+        """Relation écrite avec le nom de l'unité (tonne)."""
+        explication = expliquer_conversion(3000, "kg", "t", 3)
+        assert "**1 tonne = 1000 kg**" in explication
+        assert "de kg à tonnes" in explication
+        assert "3000 kg ÷ 1000 = **3 t**" in explication
+
+    def test_explication_unites_incompatibles(self):
+        explication = expliquer_conversion(3, "kg", "m", 3)
+        assert "Conversion : 3 kg = **3 m**" in explication
@@ -1,12 +1,17 @@
 """Tests pour les utilitaires de monnaie."""
 import pytest
+import monnaie_utils
 from monnaie_utils import (
     centimes_vers_euros_texte,
+    billets_rendu,
     calculer_pieces_optimales,
     generer_calcul_rendu,
     generer_composition_monnaie,
     generer_probleme_realiste,
     expliquer_calcul_rendu,
+    decompositions,
+    table_pieces,
+    MONTANT_MAX_TABLE,
     PIECES_BILLETS
 )
 
@@ -147,6 +152,84 @@ class TestGenererCompositionMonnaie:
         assert total == exercice['montant_centimes']
 
 
+class TestTablePieces:
+    """Tests de la table de rendu optimal (programmation dynamique)."""
+
+    def test_identique_au_glouton(self):
+        """Pour l'euro, la table donne la décomposition gloutonne."""
+        for montant in range(MONTANT_MAX_TABLE + 1):
+            attendu = []
+            reste = montant
+            for valeur, nom in PIECES_BILLETS:
+                if reste >= valeur:
+                    attendu.append((valeur, nom, reste // valeur))
+                    reste %= valeur
+            assert calculer_pieces_optimales(montant) == attendu
+
+    def test_minimum_par_suffixe(self):
+        """nb_min[i] est le minimum avec PIECES_BILLETS[i:] (force brute)."""
+        nb_min = table_pieces().nb_min
+        valeurs = [p[0] for p in PIECES_BILLETS]
+        for i in range(len(valeurs)):
+            minimum = [0] + [None] * 300
+            for montant in range(1, 301):
+                minimum[montant] = min(
+                    minimum[montant - v] + 1 for v in valeurs[i:] if v <= montant
+                )
+            assert nb_min[i, :301].tolist() == minimum
+
+    def test_table_compacte_et_lecture_seule(self):
+        table = table_pieces()
+        assert table.nbytes < 200_000
+        assert len(table.debuts) == MONTANT_MAX_TABLE + 2
+        with pytest.raises(ValueError):
+            table.nb_min[0, 0] = 1
+
+    def test_couvre_les_catalogues(self):
+        """Tous les montants des exercices CE1-CM2 sont dans la table."""
+        from core.operand_catalog import get_catalogue
+        for niveau in ["CE1", "CE2", "CM1", "CM2"]:
+            for prix in get_catalogue("calcul_rendu", niveau).colonnes['prix']:
+                assert max(billets_rendu(niveau, int(prix))) * 100 - prix <= MONTANT_MAX_TABLE
+            assert get_catalogue("composition_monnaie", niveau).colonnes['montant'].max() <= MONTANT_MAX_TABLE
+
+    def test_au_dela_de_la_table(self):
+        pieces = calculer_pieces_optimales(MONTANT_MAX_TABLE * 3 + 7)
+        assert sum(p[0] * p[2] for p in pieces) == MONTANT_MAX_TABLE * 3 + 7
+
+    def test_quantite_non_codable(self, monkeypatch):
+        """Table trop grande pour le codage sur un octet: erreur explicite."""
+        monkeypatch.setattr(monnaie_utils, "MONTANT_MAX_TABLE", 100_000)
+        with pytest.raises(RuntimeError, match="non codable"):
+            table_pieces.__wrapped__()
+
+
+class TestDecompositions:
+    """Tests de l'énumération des décompositions avec au plus k pièces."""
+
+    def test_toutes_les_facons_de_faire_un_euro(self):
+        """Nombre classique: 4563 façons de faire 1€ avec les pièces."""
+        assert sum(1 for _ in decompositions(100, 100)) == 4563
+
+    def test_limite_de_pieces(self):
+        resultats = list(decompositions(250, 3))
+        assert resultats[0] == calculer_pieces_optimales(250)
+        assert len({tuple(r) for r in resultats}) == len(resultats)
+        for composition in resultats:
+            assert sum(v * q for v, _, q in composition) == 250
+            assert sum(q for _, _, q in composition) <= 3
+
+    def test_limite_trop_basse(self):
+        assert list(decompositions(399, 3)) == []
+        assert list(decompositions(0, 0)) == [[]]
+
+    def test_hors_table(self):
+        with pytest.raises(ValueError):
+            next(decompositions(MONTANT_MAX_TABLE + 1, 5))
+        with pytest.raises(ValueError):
+            next(decompositions(100, -1))
+
+
 class TestConstantesPiecesBillets:
     """Tests des constantes de pièces et billets."""
 
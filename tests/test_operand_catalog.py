@@ -0,0 +1,205 @@
+"""
+Tests pour core/operand_catalog.py
+Espaces d'opérandes énumérés par générateur et niveau
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from core import operand_catalog
+from core.operand_catalog import (
+    CATALOGUES,
+    construire_catalogue,
+    construire_catalogues,
+    get_catalogue,
+    stats_catalogues,
+)
+from division_utils import generer_division_reste, generer_division_simple
+from monnaie_utils import (
+    CONTEXTES_ACHATS,
+    billets_rendu,
+    generer_calcul_rendu,
+    generer_composition_monnaie,
+    prix_rendu,
+)
+from proportionnalite_utils import generer_echelle, generer_pourcentage_simple, generer_vitesse
+
+
+@pytest.fixture
+def catalogues_vierges():
+    operand_catalog.reset_catalogues()
+    yield
+    operand_catalog.reset_catalogues()
+
+
+class TestConstruireCatalogue:
+    """Colonnes compactes et strates contiguës"""
+
+    def test_strates_triees(self):
+        catalogue = construire_catalogue(
+            "test", "CE1", ("a", "b"),
+            [(3, 300), (1, 100), (2, 200), (4, 400)],
+            lambda ligne: ligne[0] % 2
+        )
+        assert catalogue.effectifs() == [2, 2]
+        pairs = [catalogue.ligne(i)['a'] for i in range(*catalogue.plage(0))]
+        assert sorted(pairs) == [2, 4]
+
+    def test_colonnes_compactes_lecture_seule(self):
+        catalogue = construire_catalogue(
+            "test", None, ("petit", "grand"), [(1, 1000), (2, 70000)], lambda ligne: 0
+        )
+        assert catalogue.colonnes['petit'].dtype == np.int8
+        assert catalogue.colonnes['grand'].dtype == np.int32
+        assert catalogue.nbytes == 2 * 1 + 2 * 4
+        with pytest.raises(ValueError):
+            catalogue.colonnes['petit'][0] = 5
+
+    def test_tirer_dans_une_strate(self):
+        catalogue = construire_catalogue(
+            "test", None, ("x",), [(i,) for i in range(10)], lambda ligne: int(ligne[0] >= 7)
+        )
+        rng = random.Random(0)
+        assert all(catalogue.tirer(rng, strate=1)['x'] >= 7 for _ in range(50))
+        assert {catalogue.tirer(rng)['x'] for _ in range(500)} == set(range(10))
+
+    def test_tirer_lot_par_strate(self):
+        catalogue = construire_catalogue(
+            "test", None, ("x",), [(i,) for i in range(10)], lambda ligne: int(ligne[0] >= 7)
+        )
+        strates = np.array([0, 1] * 50)
+        lot = catalogue.tirer_lot(np.random.default_rng(1), 100, strates)
+        assert np.all((lot['x'] >= 7) == (strates == 1))
+
+
+class TestCataloguesGenerateurs:
+    """Espaces complets des générateurs"""
+
+    @pytest.mark.parametrize("niveau", ["CE2", "CM1", "CM2"])
+    def test_division_valide(self, niveau):
+        catalogue = get_catalogue("division", niveau)
+        # Colonnes compactes (int8/int16): calculs en int64
+        colonnes = {nom: c.astype(np.int64) for nom, c in catalogue.colonnes.items()}
+        assert np.array_equal(
+            colonnes['dividende'], colonnes['quotient'] * colonnes['diviseur'] + colonnes['reste']
+        )
+        debut, fin = catalogue.plage(0)
+        assert np.all(colonnes['reste'][debut:fin] == 0)
+        assert np.all(colonnes['reste'][fin:] > 0)
+
+    def test_division_effectifs(self):
+        assert get_catalogue("division", "CE2").effectifs() == [32]
+        assert get_catalogue("division", "CM1").effectifs() == [80, 140]
+
+    def test_division_simple_support_historique(self):
+        catalogue = get_catalogue("division_simple", "CM1")
+        paires = {(catalogue.ligne(i)['quotient'], catalogue.ligne(i)['diviseur']) for i in range(len(catalogue))}
+        assert paires == {(q, d) for q in range(3, 10) for d in range(2, 8)}
+
+    def test_division_reste_support_historique(self):
+        catalogue = get_catalogue("division_reste", "CM2")
+        attendu = {(d, q, r) for d in range(4, 10) for q in range(4, 13) for r in range(1, d)}
+        obtenu = {
+            (ligne['diviseur'], ligne['quotient'], ligne['reste'])
+            for ligne in map(catalogue.ligne, range(len(catalogue)))
+        }
+        assert obtenu == attendu
+
+    @pytest.mark.parametrize("niveau", ["CE1", "CE2", "CM1", "CM2"])
+    def test_calcul_rendu_billet_suffisant(self, niveau):
+        catalogue = get_catalogue("calcul_rendu", niveau)
+        assert catalogue.nb_strates == len(CONTEXTES_ACHATS[niveau])
+        for prix in np.unique(catalogue.colonnes['prix']):
+            billets = billets_rendu(niveau, int(prix))
+            assert billets and all(billet * 100 >= prix for billet in billets)
+
+    def test_composition_monnaie(self):
+        assert len(get_catalogue("composition_monnaie", "CM1")) == 96
+        assert len(get_catalogue("composition_monnaie", "CM2")) == 1981
+
+    def test_catalogues_sans_niveau_partages(self):
+        assert get_catalogue("echelle", "CM1") is get_catalogue("echelle", "CM2")
+        assert get_catalogue("pourcentage_simple").effectifs() == [181 * 4, 181 * 4, 8 * 4, 8 * 4]
+
+    def test_generateur_inconnu(self):
+        with pytest.raises(ValueError):
+            get_catalogue("geometrie", "CE1")
+
+
+class TestGenerateursParCatalogue:
+    """Les générateurs de domaine tirent dans leur catalogue"""
+
+    def test_division_utils(self):
+        rng = random.Random(4)
+        for _ in range(50):
+            simple = generer_division_simple("CE2", rng=rng)
+            assert simple['dividende'] == simple['quotient'] * simple['diviseur']
+            assert simple['reste'] == 0
+            reste = generer_division_reste("CM1", rng=rng)
+            assert 1 <= reste['reste'] < reste['diviseur']
+
+    def test_monnaie(self):
+        rng = random.Random(5)
+        for niveau in ("CE1", "CE2", "CM1", "CM2"):
+            ex = generer_calcul_rendu(niveau, rng=rng)
+            assert ex['reponse_centimes'] == ex['paye_centimes'] - ex['prix_centimes']
+            assert generer_composition_monnaie(niveau, rng=rng)['montant_centimes'] > 0
+
+    def test_calcul_rendu_articles_equiprobables(self):
+        """Article d'abord: chaque article 1/5, quel que soit son nombre de prix"""
+        rng = random.Random(7)
+        articles = [nom for nom, _ in CONTEXTES_ACHATS["CM1"]]
+        tirages = [generer_calcul_rendu("CM1", rng=rng)['article'] for _ in range(5000)]
+        for article in articles:
+            assert abs(tirages.count(article) / 5000 - 0.2) < 0.03
+
+    def test_calcul_rendu_billets_cm2(self):
+        """Billet uniforme pour le prix tiré (article, puis prix, puis billet)"""
+        attendu = {}
+        articles = CONTEXTES_ACHATS["CM2"]
+        for _, plage in articles:
+            prix_possibles = prix_rendu("CM2", plage)
+            for prix in prix_possibles:
+                billets = billets_rendu("CM2", prix)
+                for billet in billets:
+                    p = 1 / (len(articles) * len(prix_possibles) * len(billets))
+                    attendu[billet * 100] = attendu.get(billet * 100, 0) + p
+
+        rng = random.Random(8)
+        tirages = [generer_calcul_rendu("CM2", rng=rng)['paye_centimes'] for _ in range(20000)]
+        for paye, p in attendu.items():
+            assert abs(tirages.count(paye) / 20000 - p) < 0.015
+
+    def test_pourcentages_equiprobables(self):
+        rng = random.Random(6)
+        tirages = [generer_pourcentage_simple("CM2", rng=rng)['pourcentage'] for _ in range(4000)]
+        for pourcent in (10, 25, 50, 75):
+            assert abs(tirages.count(pourcent) / 4000 - 0.25) < 0.03
+
+    def test_echelle_et_vitesse(self):
+        rng = random.Random(7)
+        types = {generer_vitesse("CM2", rng=rng)['type'] for _ in range(50)}
+        assert types == {'distance', 'temps'}
+        ex = generer_echelle("CM2", rng=rng)
+        assert ex['echelle'].startswith("1/")
+
+
+@pytest.mark.usefixtures("catalogues_vierges")
+class TestMemoire:
+    """Construction paresseuse et rapport mémoire"""
+
+    def test_construction_paresseuse(self):
+        assert stats_catalogues()['tuples'] == 0
+        get_catalogue("division", "CM2")
+        stats = stats_catalogues()
+        assert list(stats['catalogues']) == ["division/CM2"]
+        assert stats['octets'] == get_catalogue("division", "CM2").nbytes
+
+    def test_construire_tout(self):
+        construire_catalogues()
+        stats = stats_catalogues()
+        par_niveau = sum(4 if CATALOGUES[g][1] else 1 for g in CATALOGUES)
+        assert len(stats['catalogues']) == par_niveau
+        assert stats['octets'] < 1_000_000
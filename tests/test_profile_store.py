@@ -0,0 +1,93 @@
+"""
+Tests pour core/profile_store.py
+Profils élèves en un fichier par élève
+"""
+
+import json
+
+import pytest
+
+from core.profile_store import INDEX, StockageProfils, migrer_fichier
+
+
+@pytest.fixture
+def stockage(tmp_path):
+    return StockageProfils(tmp_path / "profils")
+
+
+class TestStockageProfils:
+    """Lecture / écriture par élève"""
+
+    def test_aller_retour(self, stockage):
+        profil = {"niveau": "CM1", "points": 120, "badges": ["🏆"], "nom affiché": "Élodie"}
+        stockage.ecrire("élodie", profil)
+        assert stockage.lire("élodie") == profil
+        assert StockageProfils(stockage.racine).lire("élodie") == profil
+
+    def test_absent(self, stockage):
+        assert stockage.lire("personne") is None
+        assert stockage.noms() == []
+        assert not stockage.existe()
+
+    def test_un_fichier_par_eleve(self, stockage):
+        for nom in ("alice", "bob"):
+            stockage.ecrire(nom, {"points": 0})
+        fichiers = sorted(p.relative_to(stockage.racine).as_posix() for p in stockage.racine.glob("*/*.json"))
+        assert fichiers == sorted(stockage.chemin_relatif(nom) for nom in ("alice", "bob"))
+
+    def test_sauvegarde_ne_touche_que_le_profil(self, stockage):
+        stockage.ecrire("alice", {"points": 0})
+        stockage.ecrire("bob", {"points": 0})
+        index = stockage.racine / INDEX
+        fichier_bob = stockage.racine / stockage.chemin_relatif("bob")
+        avant = (index.stat().st_mtime_ns, fichier_bob.stat().st_mtime_ns)
+
+        stockage.ecrire("alice", {"points": 10})
+
+        assert (index.stat().st_mtime_ns, fichier_bob.stat().st_mtime_ns) == avant
+        assert stockage.lire("alice") == {"points": 10}
+
+    def test_pas_de_fichier_temporaire(self, stockage):
+        stockage.ecrire("alice", {"points": 1})
+        stockage.ecrire("alice", {"points": 2})
+        assert list(stockage.racine.rglob("*.tmp")) == []
+
+    def test_non_serialisable(self, stockage):
+        stockage.ecrire("alice", {"points": 1})
+        with pytest.raises(TypeError):
+            stockage.ecrire("alice", {"points": object()})
+        assert stockage.lire("alice") == {"points": 1}
+
+    def test_index_reconstruit(self, stockage):
+        stockage.ecrire_plusieurs({"alice": {}, "bob": {}, "charlie": {}})
+        (stockage.racine / INDEX).write_text("{corrompu", encoding="utf-8")
+        assert sorted(StockageProfils(stockage.racine).noms()) == ["alice", "bob", "charlie"]
+
+        (stockage.racine / INDEX).unlink()
+        assert StockageProfils(stockage.racine).reconstruire_index() == 3
+        assert StockageProfils(stockage.racine).lire_tout() == {"alice": {}, "bob": {}, "charlie": {}}
+
+
+class TestMigration:
+    """migrer_fichier(): utilisateurs.json → stockage par élève"""
+
+    def test_migration(self, tmp_path):
+        source = tmp_path / "utilisateurs.json"
+        donnees = {f"eleve_{i}": {"niveau": "CE2", "points": i} for i in range(50)}
+        source.write_text(json.dumps(donnees, indent=2), encoding="utf-8")
+
+        assert migrer_fichier(source, tmp_path / "profils") == 50
+        assert StockageProfils(tmp_path / "profils").lire_tout() == donnees
+        assert json.loads(source.read_text(encoding="utf-8")) == donnees
+
+    def test_fichier_vide(self, tmp_path):
+        source = tmp_path / "utilisateurs.json"
+        source.write_text("{}", encoding="utf-8")
+        assert migrer_fichier(source, tmp_path / "profils") == 0
+        assert StockageProfils(tmp_path / "profils").existe()
+
+    def test_format_invalide(self, tmp_path):
+        source = tmp_path / "utilisateurs.json"
+        source.write_text("[]", encoding="utf-8")
+        with pytest.raises(ValueError):
+            migrer_fichier(source, tmp_path / "profils")
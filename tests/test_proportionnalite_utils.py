@@ -249,6 +249,20 @@ class TestGenererEchelle:
         assert 'échelle' in exercice['question'].lower()
         assert '1/' in exercice['question']
 
+    def test_reponse_dans_l_unite_annoncee(self):
+        """Plan → réalité: la réponse est exprimée dans l'unité indiquée."""
+        import random
+        rng = random.Random(0)
+        for _ in range(100):
+            exercice = generer_echelle("CM2", rng=rng)
+            if exercice['question'].startswith("Sur un plan") and "Quelle est la distance réelle" in exercice['question']:
+                denom = int(exercice['echelle'].split('/')[1])
+                plan = int(exercice['question'].split("mesure ")[1].split(" cm")[0])
+                reel_cm = plan * denom
+                attendu = reel_cm if exercice['unite'] == 'cm' else reel_cm / 100
+                assert exercice['reponse'] == pytest.approx(attendu)
+                assert exercice['unite'] == ('cm' if denom < 100 else 'm')
+
 
 class TestGenererVitesse:
     """Tests de génération vitesse."""
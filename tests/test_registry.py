@@ -0,0 +1,75 @@
+"""
+Tests pour le registre processus des moteurs pédagogiques
+Phase 6.1.4 - MathCopain v6.4
+"""
+
+import threading
+import pytest
+
+from core.pedagogy import registry
+from core.pedagogy.error_analyzer import ErrorAnalyzer
+from core.pedagogy.feedback_engine import TransformativeFeedback
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    registry.reset_shared_instances()
+    yield
+    registry.reset_shared_instances()
+
+
+class TestSharedInstances:
+    """Une seule instance par processus"""
+
+    def test_same_analyzer_returned(self):
+        assert registry.get_error_analyzer() is registry.get_error_analyzer()
+        assert isinstance(registry.get_error_analyzer(), ErrorAnalyzer)
+
+    def test_same_feedback_engine_returned(self):
+        engine = registry.get_feedback_engine()
+        assert isinstance(engine, TransformativeFeedback)
+        assert engine is registry.get_feedback_engine()
+
+    def test_feedback_engine_uses_shared_analyzer(self):
+        engine = registry.get_feedback_engine()
+        assert engine.error_analyzer is registry.get_error_analyzer()
+
+    def test_reset_creates_new_instance(self):
+        first = registry.get_feedback_engine()
+        registry.reset_shared_instances()
+        assert registry.get_feedback_engine() is not first
+
+    def test_concurrent_access_single_instance(self):
+        results = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            results.append(registry.get_feedback_engine())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(engine) for engine in results}) == 1
+
+
+class TestSessionStateExplicit:
+    """L'état de session est passé à chaque appel, jamais stocké"""
+
+    def test_sessions_do_not_leak_state(self):
+        engine = registry.get_feedback_engine()
+        exercise = {"type": "addition", "operation": "7 + 8", "difficulty": "CE1"}
+
+        good = engine.process_exercise_response(
+            exercise, 15, 15, user_id="alice", user_history={"success_rate": 0.9}
+        )
+        bad = engine.process_exercise_response(
+            exercise, 14, 15, user_id="bob", user_history={"success_rate": 0.2}
+        )
+
+        assert good.is_correct and good.next_action == "Niveau suivant"
+        assert not bad.is_correct
+        assert isinstance(engine.immediate_success, tuple)
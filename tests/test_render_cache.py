@@ -0,0 +1,178 @@
+"""
+Tests pour core/render_cache.py
+Cache des rendus SVG/HTML adressé par contenu
+"""
+
+import numpy as np
+import pytest
+
+from core.render_cache import (
+    RenderCache,
+    empreinte_rendu,
+    get_render_cache,
+    get_render_stats,
+    rendu_cache,
+    reset_render_cache,
+)
+
+
+@pytest.fixture
+def cache():
+    """Cache partagé isolé pour chaque test"""
+    cache = RenderCache(maxsize=8)
+    reset_render_cache(cache)
+    yield cache
+    reset_render_cache()
+
+
+class TestEmpreinte:
+    """empreinte_rendu(): clé canonique"""
+
+    def test_dict_trie(self):
+        assert empreinte_rendu({'a': 1, 'b': 2}) == empreinte_rendu({'b': 2, 'a': 1})
+
+    def test_tuple_et_liste(self):
+        assert empreinte_rendu((1, (2, 3))) == empreinte_rendu([1, [2, 3]])
+
+    def test_int_et_float_distincts(self):
+        assert empreinte_rendu(5) != empreinte_rendu(5.0)
+
+    def test_numpy(self):
+        assert empreinte_rendu(np.int64(7)) == empreinte_rendu(7)
+
+    def test_non_serialisable(self):
+        assert empreinte_rendu(object()) is None
+
+
+class TestRenderCache:
+    """RenderCache: mémoire + disque"""
+
+    def test_memoire(self):
+        cache = RenderCache(maxsize=2)
+        appels = []
+        for key in ("a", "a", "b"):
+            cache.get_or_render(key, lambda: appels.append(1) or "<svg/>")
+        assert len(appels) == 2
+        assert cache.stats()['hits'] == 1
+
+    def test_borne(self):
+        cache = RenderCache(maxsize=2)
+        for key in ("a", "b", "c"):
+            cache.get_or_render(key, lambda: key)
+        assert cache.stats()['size'] == 2
+        assert cache.stats()['evictions'] == 1
+
+    def test_disque_survit_au_redemarrage(self, tmp_path):
+        premier = RenderCache(maxsize=4, disk_dir=tmp_path)
+        premier.get_or_render("abcd", lambda: "<svg>é</svg>")
+        assert premier.stats()['disk_writes'] == 1
+
+        second = RenderCache(maxsize=4, disk_dir=tmp_path)
+        rendu = second.get_or_render("abcd", lambda: pytest.fail("doit venir du disque"))
+        assert rendu == "<svg>é</svg>"
+        stats = second.stats()
+        assert stats['disk_hits'] == 1
+        assert stats['hit_rate'] == 1.0
+        assert stats['memory_hit_rate'] == 0.0
+
+    def test_disque_illisible_ignore(self, tmp_path):
+        fichier = tmp_path / "bloque"
+        fichier.write_text("pas un répertoire")
+        cache = RenderCache(maxsize=4, disk_dir=fichier)
+        assert cache.get_or_render("abcd", lambda: "<svg/>") == "<svg/>"
+        assert cache.stats()['disk_writes'] == 0
+
+    def test_clear_disque(self, tmp_path):
+        cache = RenderCache(maxsize=4, disk_dir=tmp_path)
+        cache.get_or_render("abcd", lambda: "<svg/>")
+        cache.clear(disk=True)
+        assert list(tmp_path.glob("*/*.txt")) == []
+        assert cache.stats()['disk_writes'] == 0
+
+    def test_cle_none_non_cachee(self):
+        cache = RenderCache(maxsize=4)
+        cache.get_or_render(None, lambda: "x")
+        assert cache.stats()['size'] == 0
+
+
+class TestDecorateur:
+    """@rendu_cache"""
+
+    def test_defauts_et_mots_cles(self, cache):
+        appels = []
+
+        @rendu_cache
+        def dessiner(mesure, size=300):
+            appels.append((mesure, size))
+            return f"<svg>{mesure}/{size}</svg>"
+
+        assert dessiner(45) == dessiner(45, 300) == dessiner(mesure=45, size=300)
+        dessiner(45, 200)
+        assert appels == [(45, 300), (45, 200)]
+        assert get_render_stats()['hits'] == 2
+
+    def test_fonctions_distinctes(self, cache):
+        @rendu_cache
+        def carre(n):
+            return "carre"
+
+        @rendu_cache
+        def cercle(n):
+            return "cercle"
+
+        assert carre(1) == "carre"
+        assert cercle(1) == "cercle"
+
+    def test_appel_invalide(self, cache):
+        @rendu_cache
+        def dessiner(mesure, size=300):
+            return str(mesure)
+
+        with pytest.raises(TypeError):
+            dessiner(45, taille=200)
+        with pytest.raises(TypeError):
+            dessiner(45, mesure=45)
+        with pytest.raises(TypeError):
+            dessiner()
+        assert get_render_stats()['size'] == 0
+
+    def test_args_variables_refuses(self):
+        with pytest.raises(TypeError):
+            rendu_cache(lambda *parts: "")
+
+    def test_wrapped(self, cache):
+        @rendu_cache
+        def dessiner(n):
+            return str(n)
+
+        assert dessiner.__wrapped__(3) == "3"
+        assert get_render_stats()['misses'] == 0
+
+    def test_instance_partagee(self):
+        reset_render_cache()
+        try:
+            assert get_render_cache() is get_render_cache()
+        finally:
+            reset_render_cache()
+
+
+class TestFonctionsDeDessin:
+    """Fonctions SVG des modules *_utils, hors Streamlit"""
+
+    def test_formes_et_angles(self, cache):
+        from geometrie_utils import dessiner_angle_svg, dessiner_forme_svg
+
+        dimensions = {'longueur': 6, 'largeur': 4}
+        svg = dessiner_forme_svg("Rectangle", dimensions, 300)
+        assert dessiner_forme_svg("Rectangle", dict(reversed(dimensions.items()))) == svg
+        assert dessiner_angle_svg(90) == dessiner_angle_svg(90, 300)
+        assert get_render_stats()['hits'] == 2
+
+    def test_pizza_et_pieces(self, cache):
+        from fractions_utils import dessiner_pizza
+        from monnaie_utils import dessiner_pieces_monnaie
+
+        assert dessiner_pizza(4, (0, 1)) == dessiner_pizza(4, (0, 1), 300)
+        composition = [(200, "2€", 1), (50, "50c", 2)]
+        assert dessiner_pieces_monnaie(composition) == dessiner_pieces_monnaie(tuple(composition))
+        assert get_render_stats()['hits'] == 2
@@ -92,6 +92,14 @@ class TestGetters:
         assert 'current' in streak
         assert 'max' in streak
 
+    def test_get_rng_propre_a_la_session(self, session_manager, mock_session_state):
+        """get_rng() crée un random.Random par session, réutilisé ensuite."""
+        import random
+        rng = session_manager.get_rng()
+        assert isinstance(rng, random.Random)
+        assert session_manager.get_rng() is rng
+        assert mock_session_state['rng'] is rng
+
     def test_get_stats_par_niveau(self, session_manager):
         """get_stats_par_niveau() retourne les stats."""
         stats = session_manager.get_stats_par_niveau()
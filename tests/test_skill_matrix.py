@@ -0,0 +1,83 @@
+"""
+Tests pour core/skill_matrix.py
+Compétences d'une classe entière (équivalence avec get_skill_levels)
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.adaptive_system import SKILL_TYPES, AdaptiveSystem
+from core.skill_matrix import historiques_en_tableaux, matrice_competences, secondes
+
+MAINTENANT = datetime(2026, 3, 15, 14, 30, 12, 345678)
+
+
+def classe_aleatoire(rng, n_eleves):
+    classe = []
+    for _ in range(n_eleves):
+        historique = []
+        for _ in range(rng.randint(0, 100)):
+            instant = MAINTENANT - timedelta(seconds=rng.uniform(-3600, 45 * 86400))
+            historique.append({
+                'type': rng.choice(SKILL_TYPES + ['inconnu']),
+                'correct': rng.random() < 0.65,
+                'difficulty': rng.randint(1, 10),
+                'timestamp': instant.isoformat(),
+            })
+        classe.append(historique)
+    return classe
+
+
+class TestMatriceCompetences:
+    """matrice_competences()"""
+
+    @pytest.mark.parametrize("graine", range(5))
+    def test_equivalence(self, horloge, graine):
+        classe = classe_aleatoire(random.Random(graine), 40)
+        niveaux = matrice_competences(
+            *historiques_en_tableaux(classe), n_eleves=len(classe), maintenant=secondes(MAINTENANT)
+        )
+        adaptive = AdaptiveSystem()
+        for eleve, historique in enumerate(classe):
+            attendu = adaptive.get_skill_levels(historique)
+            obtenu = {t: round(float(niveaux[eleve, j]), 2) for j, t in enumerate(SKILL_TYPES)}
+            assert obtenu == attendu
+
+    def test_fenetre_de_20(self):
+        """Les échecs anciens (au-delà des 20 derniers) sont ignorés"""
+        n = 30
+        correct = np.arange(n) >= 10
+        niveaux = matrice_competences(
+            np.zeros(n), np.zeros(n), correct, np.full(n, 5), np.full(n, 1000.0), maintenant=1000.0
+        )
+        seuls_succes = matrice_competences(
+            np.zeros(20), np.zeros(20), np.ones(20, dtype=bool), np.full(20, 5), np.full(20, 1000.0), maintenant=1000.0
+        )
+        assert niveaux[0, 0] == seuls_succes[0, 0]
+
+    def test_forme_et_cases_vides(self):
+        niveaux = matrice_competences([2], [3], [True], [10], [0.0], n_eleves=5, maintenant=0.0)
+        assert niveaux.shape == (5, len(SKILL_TYPES))
+        assert niveaux[2, 3] == pytest.approx(0.15)
+        assert np.count_nonzero(niveaux) == 1
+
+    def test_vide(self):
+        assert matrice_competences([], [], [], [], [], n_eleves=3).shape == (3, len(SKILL_TYPES))
+
+    def test_decroissance(self):
+        recent = matrice_competences([0], [0], [True], [10], [0.0], maintenant=0.0)
+        ancien = matrice_competences([0], [0], [True], [10], [0.0], maintenant=7 * 86400.0)
+        assert ancien[0, 0] == pytest.approx(recent[0, 0] / 2)
+
+    def test_longueurs_differentes(self):
+        with pytest.raises(ValueError):
+            matrice_competences([0, 1], [0], [True], [3], [0.0])
+
+    def test_indice_hors_matrice(self):
+        with pytest.raises(ValueError):
+            matrice_competences([0], [len(SKILL_TYPES)], [True], [3], [0.0])
+        with pytest.raises(ValueError):
+            matrice_competences([4], [0], [True], [3], [0.0], n_eleves=2)
@@ -0,0 +1,131 @@
+"""
+Tests pour core/skill_state.py
+État incrémental des compétences (équivalence avec get_skill_levels)
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import core.adaptive_system as adaptive_module
+from core.adaptive_system import SKILL_TYPES, AdaptiveSystem
+from core.exercise_history import profil_serialisable
+from core.skill_state import (
+    HISTORIQUE_MAX,
+    EtatCompetences,
+    etat_competences,
+    microsecondes,
+)
+from core.skill_tracker import SkillTracker
+
+MAINTENANT = datetime(2026, 3, 15, 14, 30, 12, 345678)
+
+
+def historique_aleatoire(rng, n, jours=60):
+    historique = []
+    for _ in range(n):
+        instant = MAINTENANT - timedelta(seconds=rng.uniform(0, jours * 86400))
+        historique.append({
+            'type': rng.choice(SKILL_TYPES[:4]),
+            'correct': rng.random() < 0.7,
+            'difficulty': rng.randint(1, 10),
+            'timestamp': instant.isoformat(),
+        })
+    historique.sort(key=lambda ex: ex['timestamp'])
+    return historique
+
+
+class TestEquivalence:
+    """Mêmes niveaux que get_skill_levels(historique)"""
+
+    @pytest.mark.parametrize("graine", range(10))
+    def test_historique_aleatoire(self, horloge, graine):
+        rng = random.Random(graine)
+        historique = historique_aleatoire(rng, rng.randint(1, HISTORIQUE_MAX))
+        etat = EtatCompetences.depuis_historique(historique)
+        attendu = AdaptiveSystem().get_skill_levels(historique)
+        assert etat.niveaux(SKILL_TYPES, MAINTENANT) == attendu
+
+    def test_cache_suit_le_temps(self, horloge):
+        rng = random.Random(42)
+        historique = historique_aleatoire(rng, 80)
+        etat = EtatCompetences.depuis_historique(historique)
+        for heures in (0, 1, 7, 23, 24, 25, 24 * 9 + 5, 24 * 40):
+            horloge.instant = MAINTENANT + timedelta(hours=heures)
+            attendu = AdaptiveSystem().get_skill_levels(historique)
+            assert etat.niveaux(SKILL_TYPES, horloge.instant) == attendu
+
+    def test_via_skill_tracker(self, horloge):
+        """Historique plafonné à 100 et fenêtre de 20 par type"""
+        rng = random.Random(7)
+        profil = {}
+        tracker = SkillTracker(profil)
+        adaptive = AdaptiveSystem()
+        for i in range(250):
+            tracker.record_exercise(rng.choice(SKILL_TYPES[:3]), rng.random() < 0.6, rng.randint(1, 10))
+            if i % 17 == 0:
+                horloge.instant = datetime.now()
+                assert adaptive.get_profile_skill_levels(profil) == adaptive.get_skill_levels(profil['exercise_history'])
+        assert len(profil['exercise_history']) == HISTORIQUE_MAX
+        horloge.instant = datetime.now() + timedelta(days=3)
+        assert (adaptive_module.AdaptiveSystem().get_skill_levels(profil['exercise_history'])
+                == EtatCompetences(profil['skill_state']).niveaux(SKILL_TYPES, horloge.instant))
+
+
+class TestEtatCompetences:
+    """Stockage, cache et migration"""
+
+    def test_jamais_pratique(self):
+        assert EtatCompetences().niveau('addition') == 0
+
+    def test_fenetre_bornee(self):
+        etat = EtatCompetences()
+        for _ in range(50):
+            etat.enregistrer('addition', True, 5, MAINTENANT)
+        assert len(etat.donnees['types']['addition']['resultats']) == 20
+
+    def test_sortie_de_l_historique(self):
+        etat = EtatCompetences()
+        etat.enregistrer('division', True, 10, MAINTENANT)
+        for _ in range(HISTORIQUE_MAX - 1):
+            etat.enregistrer('addition', True, 5, MAINTENANT)
+        assert etat.niveau('division', MAINTENANT) > 0
+        etat.enregistrer('addition', True, 5, MAINTENANT)
+        assert etat.niveau('division', MAINTENANT) == 0
+
+    def test_cache_invalide_par_enregistrement(self):
+        etat = EtatCompetences()
+        etat.enregistrer('addition', True, 5, MAINTENANT)
+        avant = etat.niveau('addition', MAINTENANT)
+        etat.enregistrer('addition', True, 5, MAINTENANT)
+        assert etat.niveau('addition', MAINTENANT) > avant
+
+    def test_json(self):
+        profil = {}
+        etat = etat_competences(profil)
+        etat.enregistrer('addition', True, 5, MAINTENANT - timedelta(days=3))
+        niveau = etat.niveau('addition', MAINTENANT)
+        recharge = json.loads(json.dumps(profil_serialisable(profil)))
+        assert etat_competences(recharge).niveau('addition', MAINTENANT) == niveau
+
+    def test_migration_profil_existant(self, horloge):
+        historique = historique_aleatoire(random.Random(3), 30)
+        profil = {'exercise_history': historique}
+        niveaux = AdaptiveSystem().get_profile_skill_levels(profil)
+        assert 'skill_state' in profil
+        assert niveaux == AdaptiveSystem().get_skill_levels(historique)
+
+    def test_autre_demi_vie(self):
+        etat = EtatCompetences()
+        etat.enregistrer('addition', True, 5, MAINTENANT - timedelta(days=7))
+        lent = etat.niveau('addition', MAINTENANT)
+        rapide = EtatCompetences(etat.donnees, decay_days=1).niveau('addition', MAINTENANT)
+        assert rapide < lent
+
+    def test_microsecondes(self):
+        debut = datetime(2026, 3, 28, 23, 59)
+        fin = datetime(2026, 3, 30, 0, 1)
+        assert (microsecondes(fin) - microsecondes(debut)) // 86_400_000_000 == (fin - debut).days
+        assert microsecondes(debut.isoformat()) == microsecondes(debut)
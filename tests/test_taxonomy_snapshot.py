@@ -0,0 +1,226 @@
+"""
+Tests pour le snapshot pré-compilé de la taxonomie d'erreurs
+Phase 6.1 - MathCopain v6.4
+"""
+
+import json
+import os
+import pickle
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.pedagogy import taxonomy_snapshot
+from core.pedagogy.taxonomy_snapshot import (
+    CompiledTaxonomy,
+    clear_loaded_taxonomies,
+    compile_taxonomy,
+    default_snapshot_path,
+    load_compiled_taxonomy,
+    validate_catalog,
+)
+from core.pedagogy.error_analyzer import ErrorAnalyzer
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def _make_catalog(confidence=0.9):
+    return {
+        "version": "test",
+        "error_categories": {
+            "Conceptual": {
+                "description": "Erreurs conceptuelles",
+                "errors": {
+                    "addition": [
+                        {
+                            "id": "ADD_CONC_001",
+                            "misconception": "Ne comprend pas la retenue",
+                            "pattern": "Ignore la Retenue",
+                            "common_ages": ["CE1"],
+                            "detection_confidence": confidence
+                        }
+                    ]
+                }
+            }
+        }
+    }
+
+
+class _Payload:
+    """Objet dont la désérialisation pickle crée un fichier"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return (Path.touch, (Path(self.path),))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Chaque test part d'un cache processus vide"""
+    clear_loaded_taxonomies()
+    yield
+    clear_loaded_taxonomies()
+
+
+@pytest.fixture
+def taxonomy_file(tmp_path):
+    path = tmp_path / "error_taxonomy.json"
+    path.write_text(json.dumps(_make_catalog()), encoding='utf-8')
+    return path
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+class TestValidation:
+    """Validation de la structure du catalogue"""
+
+    def test_missing_categories(self):
+        with pytest.raises(ValueError, match="error_categories"):
+            validate_catalog({"version": "1.0"})
+
+    def test_duplicate_ids(self):
+        catalog = _make_catalog()
+        errors = catalog["error_categories"]["Conceptual"]["errors"]["addition"]
+        errors.append(dict(errors[0]))
+        with pytest.raises(ValueError, match="dupliqué"):
+            validate_catalog(catalog)
+
+    def test_confidence_out_of_range(self):
+        with pytest.raises(ValueError, match="detection_confidence"):
+            validate_catalog(_make_catalog(confidence=1.5))
+
+    def test_real_taxonomy_is_valid(self):
+        path = Path(__file__).parent.parent / "data" / "error_taxonomy.json"
+        validate_catalog(json.loads(path.read_text(encoding='utf-8')))
+
+
+class TestCompile:
+    """Compilation et contenu du snapshot"""
+
+    def test_compile_writes_snapshot(self, taxonomy_file):
+        compiled = compile_taxonomy(taxonomy_file)
+        assert default_snapshot_path(taxonomy_file).exists()
+        assert compiled.source_size == taxonomy_file.stat().st_size
+        assert len(compiled.source_sha256) == 64
+
+    def test_id_map_and_indexes(self, taxonomy_file):
+        compiled = compile_taxonomy(taxonomy_file)
+        entry = compiled.errors_by_id["ADD_CONC_001"]
+        assert entry.category == "Conceptual"
+        assert entry.pattern == "ignore la retenue"
+        assert compiled.domain_index["addition"] == [entry]
+        assert ("addition", "CE1") in compiled.candidate_index
+        assert ("addition", None) in compiled.candidate_index
+
+    def test_strings_interned(self, taxonomy_file):
+        compiled = compile_taxonomy(taxonomy_file)
+        error_def = compiled.errors_by_id["ADD_CONC_001"].error_def
+        assert error_def["id"] is sys.intern("ADD_CONC_001")
+
+    def test_read_only_directory_falls_back_to_memory(self, taxonomy_file):
+        with patch.object(taxonomy_snapshot.tempfile, "mkstemp", side_effect=OSError):
+            compiled = compile_taxonomy(taxonomy_file)
+        assert isinstance(compiled, CompiledTaxonomy)
+        assert not default_snapshot_path(taxonomy_file).exists()
+
+
+class TestInvalidation:
+    """Réutilisation et invalidation du snapshot"""
+
+    def test_snapshot_reused_without_parsing(self, taxonomy_file):
+        compile_taxonomy(taxonomy_file)
+        clear_loaded_taxonomies()
+
+        with patch.object(taxonomy_snapshot, "validate_catalog") as validate, \
+                patch.object(taxonomy_snapshot, "_reachable_candidates") as reachable:
+            compiled = load_compiled_taxonomy(taxonomy_file)
+        validate.assert_not_called()
+        reachable.assert_not_called()
+        assert "ADD_CONC_001" in compiled.errors_by_id
+
+    def test_snapshot_equivalent_to_compilation(self, tmp_path):
+        """Index relus du snapshot identiques à ceux de la compilation"""
+        path = Path(__file__).parent.parent / "data" / "error_taxonomy.json"
+        snapshot = tmp_path / "error_taxonomy.snapshot.json"
+        compiled = compile_taxonomy(path, snapshot)
+        clear_loaded_taxonomies()
+        loaded = load_compiled_taxonomy(path, snapshot)
+
+        assert loaded is not compiled
+        assert loaded.catalog == compiled.catalog
+        assert loaded.errors_by_id == compiled.errors_by_id
+        assert loaded.domain_index == compiled.domain_index
+        assert loaded.candidate_index == compiled.candidate_index
+
+    def test_snapshot_is_json(self, taxonomy_file):
+        compile_taxonomy(taxonomy_file)
+        data = json.loads(default_snapshot_path(taxonomy_file).read_text(encoding='utf-8'))
+        assert data["format_version"] == taxonomy_snapshot.SNAPSHOT_FORMAT_VERSION
+        assert data["catalog"]["version"] == "test"
+
+    def test_pickle_snapshot_not_executed(self, taxonomy_file, tmp_path):
+        """Un pickle déposé à la place du snapshot n'est jamais désérialisé"""
+        marker = tmp_path / "executed"
+        payload = pickle.dumps(_Payload(str(marker)))
+        default_snapshot_path(taxonomy_file).write_bytes(payload)
+
+        compiled = load_compiled_taxonomy(taxonomy_file)
+        assert not marker.exists()
+        assert "ADD_CONC_001" in compiled.errors_by_id
+
+    def test_process_cache_returns_same_object(self, taxonomy_file):
+        first = load_compiled_taxonomy(taxonomy_file)
+        second = load_compiled_taxonomy(taxonomy_file)
+        assert first is second
+
+    def test_content_change_triggers_recompile(self, taxonomy_file):
+        load_compiled_taxonomy(taxonomy_file)
+
+        catalog = _make_catalog()
+        catalog["error_categories"]["Conceptual"]["errors"]["addition"][0]["id"] = "ADD_CONC_999"
+        taxonomy_file.write_text(json.dumps(catalog), encoding='utf-8')
+        stat = taxonomy_file.stat()
+        os.utime(taxonomy_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        compiled = load_compiled_taxonomy(taxonomy_file)
+        assert "ADD_CONC_999" in compiled.errors_by_id
+        assert "ADD_CONC_001" not in compiled.errors_by_id
+
+    def test_touch_without_change_keeps_snapshot(self, taxonomy_file):
+        first = load_compiled_taxonomy(taxonomy_file)
+        clear_loaded_taxonomies()
+        stat = taxonomy_file.stat()
+        os.utime(taxonomy_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        with patch.object(taxonomy_snapshot, "validate_catalog") as validate:
+            compiled = load_compiled_taxonomy(taxonomy_file)
+        validate.assert_not_called()
+        assert compiled.source_sha256 == first.source_sha256
+        assert compiled.source_mtime_ns == taxonomy_file.stat().st_mtime_ns
+
+    def test_corrupt_snapshot_recompiled(self, taxonomy_file):
+        default_snapshot_path(taxonomy_file).write_bytes(b"{not json")
+        compiled = load_compiled_taxonomy(taxonomy_file)
+        assert "ADD_CONC_001" in compiled.errors_by_id
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_compiled_taxonomy(tmp_path / "absent.json")
+
+
+class TestAnalyzerIntegration:
+    """ErrorAnalyzer utilise le snapshot"""
+
+    def test_analyzer_custom_snapshot_path(self, taxonomy_file, tmp_path):
+        snapshot = tmp_path / "custom.json"
+        analyzer = ErrorAnalyzer(taxonomy_path=str(taxonomy_file), snapshot_path=str(snapshot))
+        assert snapshot.exists()
+        assert analyzer.error_catalog["version"] == "test"
+        assert analyzer.domain_index is analyzer.taxonomy.domain_index
@@ -0,0 +1,122 @@
+"""
+Tests pour core/unit_registry.py
+Registre d'unités et facteurs de conversion exacts
+"""
+
+from fractions import Fraction
+
+import pytest
+
+from core.unit_registry import (
+    MATRICES,
+    TOLERANCE_CONVERSION,
+    UNITES,
+    convertir,
+    etape_conversion,
+    exact,
+    facteur,
+    get_unite,
+    nombre,
+    verifier_conversion,
+    verifier_reponse,
+)
+
+
+class TestMatrices:
+    """Matrices de facteurs par grandeur"""
+
+    def test_grandeurs(self):
+        assert set(MATRICES) == {"longueur", "masse", "capacite", "duree"}
+        assert sum(len(m.unites) for m in MATRICES.values()) == len(UNITES)
+
+    @pytest.mark.parametrize("grandeur", ["longueur", "masse", "capacite", "duree"])
+    def test_coherence(self, grandeur):
+        """Diagonale à 1, inverse exact, transitivité exacte"""
+        facteurs = MATRICES[grandeur].facteurs
+        n = len(facteurs)
+        for i in range(n):
+            assert facteurs[i][i] == 1
+            for j in range(n):
+                assert facteurs[i][j] * facteurs[j][i] == 1
+                for k in range(n):
+                    assert facteurs[i][j] * facteurs[j][k] == facteurs[i][k]
+
+    def test_facteurs_connus(self):
+        assert facteur("km", "m") == 1000
+        assert facteur("cm", "m") == Fraction(1, 100)
+        assert facteur("t", "g") == 1000000
+        assert facteur("mL", "L") == Fraction(1, 1000)
+        assert facteur("h", "min") == 60
+
+    def test_grandeurs_differentes(self):
+        with pytest.raises(ValueError, match="impossible"):
+            facteur("kg", "m")
+
+    def test_unite_inconnue(self):
+        with pytest.raises(ValueError, match="inconnue"):
+            facteur("pouce", "cm")
+        with pytest.raises(ValueError):
+            get_unite("pouce")
+
+
+class TestConversion:
+    """convertir(), exact(), nombre()"""
+
+    def test_exacte(self):
+        assert convertir(250, "cm", "m") == Fraction(5, 2)
+        assert convertir(0.1, "L", "cL") == 10
+        assert convertir(Fraction(1, 3), "h", "min") == 20
+
+    def test_float_decimal(self):
+        assert exact(0.1) == Fraction(1, 10)
+        assert exact(0.1) + exact(0.2) == exact(0.3)
+
+    def test_nombre(self):
+        assert nombre(Fraction(600)) == 600
+        assert isinstance(nombre(Fraction(600)), int)
+        assert nombre(Fraction(473, 100)) == 4.73
+
+
+class TestVerification:
+    """verifier_reponse(), verifier_conversion()"""
+
+    def test_reponse_exacte(self):
+        assert verifier_conversion(4.73, 473, "cm", "m")
+        assert verifier_conversion(1100, 11, "m", "cm")
+
+    def test_tolerance_par_defaut(self):
+        """Réponse arrondie au pas de saisie (0,1) acceptée"""
+        assert verifier_conversion(1.3, 1327, "g", "kg")
+        assert not verifier_conversion(1.4, 1327, "g", "kg")
+        assert TOLERANCE_CONVERSION == Fraction(1, 20)
+
+    def test_tolerance_nulle(self):
+        assert verifier_reponse(0.3, Fraction(3, 10))
+        assert not verifier_reponse(0.30001, Fraction(3, 10))
+
+    def test_tolerance_bornes_incluses(self):
+        assert verifier_reponse(2.5, 2, tolerance=0.5)
+        assert not verifier_reponse(2.51, 2, tolerance=0.5)
+
+
+class TestEtapes:
+    """etape_conversion(): relation à énoncer"""
+
+    def test_vers_unite_plus_grande(self):
+        etape = etape_conversion("cm", "m")
+        assert (etape.grande.symbole, etape.petite.symbole) == ("m", "cm")
+        assert etape.rapport == 100
+        assert not etape.multiplier
+
+    def test_vers_unite_plus_petite(self):
+        etape = etape_conversion("t", "kg")
+        assert etape.grande.libelle == "tonne"
+        assert etape.rapport == 1000
+        assert etape.multiplier
+
+    def test_non_adjacentes(self):
+        assert etape_conversion("mm", "km").rapport == 1000000
+
+    def test_impossible(self):
+        with pytest.raises(ValueError):
+            etape_conversion("g", "L")
@@ -2,9 +2,13 @@
 import pytest
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from unittest.mock import patch, MagicMock, mock_open
+import utilisateur
 from utilisateur import (
+    EcrivainDiffere,
     profil_par_defaut,
     _load_from_disk,
     _save_to_disk,
@@ -17,6 +21,14 @@ from utilisateur import (
 )
 
 
+def _cache_partage(chemin):
+    """Cache partagé, son écrivain redirigé vers `chemin` (attente vidée avant)"""
+    cache = _get_user_cache()
+    cache['writer'].vider(forcer=True)
+    cache['writer'].chemin = str(chemin)
+    return cache
+
+
 class TestProfilParDefaut:
     """Tests du profil par défaut."""
 
@@ -312,7 +324,7 @@ class TestChargerUtilisateur:
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
                 # Réinitialiser le cache
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {}
                 cache['loaded'] = False
 
@@ -329,7 +341,7 @@ class TestChargerUtilisateur:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {}
                 cache['loaded'] = False
 
@@ -346,7 +358,7 @@ class TestChargerUtilisateur:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {}
                 cache['loaded'] = False
 
@@ -374,7 +386,7 @@ class TestSauvegarderUtilisateur:
                 with patch('utilisateur.st.session_state', MagicMock()) as mock_state:
                     mock_state._save_counter = 0
 
-                    cache = _get_user_cache()
+                    cache = _cache_partage(test_file)
                     cache['data'] = {}
                     cache['loaded'] = True
                     cache['dirty'] = False
@@ -395,7 +407,7 @@ class TestSauvegarderUtilisateur:
                 with patch('utilisateur.st.session_state', MagicMock()) as mock_state:
                     mock_state._save_counter = 0
 
-                    cache = _get_user_cache()
+                    cache = _cache_partage(test_file)
                     cache['data'] = {}
                     cache['loaded'] = True
                     cache['dirty'] = False
@@ -404,33 +416,43 @@ class TestSauvegarderUtilisateur:
 
                     assert cache['dirty'] is True
 
-    def test_sauvegarder_flush_apres_5_modifications(self, tmp_path):
-        """Le cache est sauvegardé sur disque après 5 modifications."""
+    def test_sauvegarder_flush_apres_5_profils(self, tmp_path):
+        """Le fichier est écrit en arrière-plan dès 5 profils modifiés."""
         test_file = tmp_path / "users.json"
 
-        # Créer un objet simple pour session_state
-        class MockSessionState:
-            def __init__(self):
-                self._save_counter = 4
-            def __contains__(self, key):
-                return hasattr(self, key)
-
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
-            with patch('streamlit.cache_resource', lambda: lambda f: f):
-                with patch('utilisateur.st.session_state', MockSessionState()):
-                    cache = _get_user_cache()
-                    cache['data'] = {}
-                    cache['loaded'] = True
-                    cache['dirty'] = True
+            cache = _cache_partage(test_file)
+            cache['data'] = {}
+            cache['loaded'] = True
+            cache['dirty'] = False
 
-                    # 5ème sauvegarde devrait déclencher flush
-                    sauvegarder_utilisateur("charlie", {"niveau": "CM1"})
+            for i in range(5):
+                sauvegarder_utilisateur(f"eleve_{i}", {"niveau": "CM1"})
 
-                    # Vérifier que le fichier a été créé
-                    assert test_file.exists()
+            # Écriture faite par le thread, sans attendre le délai
+            for _ in range(500):
+                if not cache['dirty']:
+                    break
+                time.sleep(0.01)
 
-                    # Vérifier dirty reset
-                    assert cache['dirty'] is False
+            assert cache['dirty'] is False
+            with open(test_file, 'r', encoding='utf-8') as f:
+                assert len(json.load(f)) == 5
+
+    def test_sauvegarder_sans_ecriture_immediate(self, tmp_path):
+        """Une sauvegarde isolée ne touche pas au disque dans la requête."""
+        test_file = tmp_path / "users.json"
+
+        with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
+            cache = _cache_partage(test_file)
+            cache['data'] = {}
+            cache['loaded'] = True
+
+            with patch('utilisateur._save_to_disk') as save:
+                sauvegarder_utilisateur("alice", {"niveau": "CM1"})
+                save.assert_not_called()
+            assert cache['writer'].en_attente() == 1
+            cache['writer'].vider()
 
     def test_sauvegarder_charge_cache_si_non_loaded(self, tmp_path):
         """Si cache non chargé, il est chargé avant sauvegarde."""
@@ -445,7 +467,7 @@ class TestSauvegarderUtilisateur:
                 with patch('utilisateur.st.session_state', MagicMock()) as mock_state:
                     mock_state._save_counter = 0
 
-                    cache = _get_user_cache()
+                    cache = _cache_partage(test_file)
                     cache['data'] = {}
                     cache['loaded'] = False  # Non chargé
 
@@ -468,7 +490,7 @@ class TestObtenirTousEleves:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {}
                 cache['loaded'] = False
 
@@ -489,7 +511,7 @@ class TestObtenirTousEleves:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {}
                 cache['loaded'] = False
 
@@ -502,7 +524,7 @@ class TestObtenirTousEleves:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {"alice": {}, "bob": {}}
                 cache['loaded'] = True  # Déjà chargé
 
@@ -519,7 +541,7 @@ class TestForceSave:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {"alice": {"niveau": "CM1", "points": 100}}
                 cache['dirty'] = True
 
@@ -542,7 +564,7 @@ class TestForceSave:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {"alice": {"niveau": "CM1"}}
                 cache['dirty'] = False
 
@@ -561,7 +583,7 @@ class TestForceSave:
 
         with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
             with patch('streamlit.cache_resource', lambda: lambda f: f):
-                cache = _get_user_cache()
+                cache = _cache_partage(test_file)
                 cache['data'] = {
                     "bob": {"niveau": "CE2", "points": 50},
                     "alice": {"niveau": "CM1", "points": 100}
@@ -593,7 +615,7 @@ class TestCacheIntegration:
                 with patch('utilisateur.st.session_state', MagicMock()) as mock_state:
                     mock_state._save_counter = 0
 
-                    cache = _get_user_cache()
+                    cache = _cache_partage(test_file)
                     cache['data'] = {}
                     cache['loaded'] = False
 
@@ -627,7 +649,7 @@ class TestCacheIntegration:
                 with patch('utilisateur.st.session_state', MagicMock()) as mock_state:
                     mock_state._save_counter = 0
 
-                    cache = _get_user_cache()
+                    cache = _cache_partage(test_file)
                     cache['data'] = {}
                     cache['loaded'] = True
 
@@ -641,3 +663,164 @@ class TestCacheIntegration:
                     # Vérifier via obtenir_tous_eleves
                     eleves = obtenir_tous_eleves()
                     assert "alice" in eleves
+
+
+class TestEcrivainDiffere:
+    """Tests de l'écriture différée de utilisateurs.json."""
+
+    def _cache(self):
+        return {"data": {}, "loaded": True, "dirty": False}
+
+    def test_regroupe_les_modifications(self, tmp_path):
+        """Plusieurs sauvegardes d'un même profil → une seule écriture."""
+        test_file = tmp_path / "users.json"
+        cache = self._cache()
+        ecrivain = EcrivainDiffere(cache, delai=0.05, seuil=100, chemin=str(test_file))
+
+        for points in range(20):
+            cache['data']['alice'] = {"points": points}
+            cache['dirty'] = True
+            ecrivain.signaler('alice')
+
+        for _ in range(500):
+            if not cache['dirty']:
+                break
+            time.sleep(0.01)
+        ecrivain.arreter()
+
+        assert ecrivain.ecritures == 1
+        with open(test_file, 'r', encoding='utf-8') as f:
+            assert json.load(f) == {"alice": {"points": 19}}
+
+    def test_arreter_ecrit_les_modifications(self, tmp_path):
+        """arreter() (atexit) écrit ce qui est en attente."""
+        test_file = tmp_path / "users.json"
+        cache = self._cache()
+        ecrivain = EcrivainDiffere(cache, delai=3600, seuil=100, chemin=str(test_file))
+
+        cache['data']['bob'] = {"niveau": "CE2"}
+        cache['dirty'] = True
+        ecrivain.signaler('bob')
+        ecrivain.arreter()
+
+        assert cache['dirty'] is False
+        assert ecrivain.en_attente() == 0
+        with open(test_file, 'r', encoding='utf-8') as f:
+            assert json.load(f) == {"bob": {"niveau": "CE2"}}
+
+    def test_echec_reessaye(self, tmp_path):
+        """Écriture impossible: les profils restent en attente."""
+        cache = self._cache()
+        ecrivain = EcrivainDiffere(cache, delai=3600, seuil=100, chemin=str(tmp_path / "absent" / "users.json"))
+
+        cache['data']['bob'] = {"niveau": "CE2"}
+        cache['dirty'] = True
+        ecrivain.signaler('bob')
+        assert ecrivain.vider() is False
+
+        assert cache['dirty'] is True
+        assert ecrivain.en_attente() == 1
+        (tmp_path / "absent").mkdir()
+        ecrivain.signaler('bob')
+        ecrivain.arreter()
+        assert (tmp_path / "absent" / "users.json").exists()
+
+    def test_echec_ecriture_forcee(self, tmp_path):
+        """force_save() sans profil signalé: un échec garde le cache dirty."""
+        cache = {"data": {"alice": {}}, "loaded": True, "dirty": True}
+        ecrivain = EcrivainDiffere(cache, delai=3600, seuil=100, chemin=str(tmp_path / "absent" / "users.json"))
+
+        assert ecrivain.vider(forcer=True) is False
+        assert cache['dirty'] is True
+        assert ecrivain.ecritures == 0
+        assert ecrivain.en_attente() == 1
+
+        (tmp_path / "absent").mkdir()
+        assert ecrivain.vider(forcer=True) is True
+        assert cache['dirty'] is False
+
+    def test_ecriture_atomique(self, tmp_path):
+        """Pas de fichier temporaire laissé, ancien contenu remplacé d'un bloc."""
+        test_file = tmp_path / "users.json"
+        test_file.write_text('{"ancien": {}}', encoding='utf-8')
+
+        assert _save_to_disk({"nouveau": {"points": 1}}, str(test_file))
+
+        assert json.loads(test_file.read_text(encoding='utf-8')) == {"nouveau": {"points": 1}}
+        assert [p.name for p in tmp_path.iterdir()] == ["users.json"]
+
+    def test_thread_unique(self, tmp_path):
+        """Un seul thread d'écriture, démarré à la première modification."""
+        cache = self._cache()
+        ecrivain = EcrivainDiffere(cache, delai=3600, seuil=100, chemin=str(tmp_path / "users.json"))
+        avant = threading.active_count()
+
+        with patch('utilisateur.atexit.register') as register:
+            for nom in ("alice", "bob", "charlie"):
+                ecrivain.signaler(nom)
+        assert threading.active_count() == avant + 1
+        register.assert_not_called()
+        ecrivain.arreter()
+
+    def test_chemin_fixe_a_la_creation(self, tmp_path):
+        """Le fichier est celui donné au constructeur, pas FICHIER_UTILISATEURS au moment de l'écriture."""
+        test_file = tmp_path / "users.json"
+        cache = self._cache()
+        ecrivain = EcrivainDiffere(cache, delai=3600, seuil=100, chemin=str(test_file))
+
+        with patch('utilisateur.FICHIER_UTILISATEURS', str(tmp_path / "autre.json")):
+            cache['data']['bob'] = {"niveau": "CE2"}
+            ecrivain.signaler('bob')
+            ecrivain.vider(forcer=True)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["users.json"]
+
+    def test_arret_du_processus(self, tmp_path, monkeypatch):
+        """Le hook atexit du module vide l'écrivain du cache partagé."""
+        assert utilisateur._ecrivain is _get_user_cache()['writer']
+
+        cache = self._cache()
+        ecrivain = EcrivainDiffere(cache, delai=3600, seuil=100, chemin=str(tmp_path / "users.json"))
+        monkeypatch.setattr(utilisateur, '_ecrivain', ecrivain)
+        cache['data']['alice'] = {"niveau": "CM1"}
+        ecrivain.signaler('alice')
+        utilisateur._arreter_ecrivain()
+
+        assert ecrivain.en_attente() == 0
+        assert (tmp_path / "users.json").exists()
+
+
+class TestStockageParEleve:
+    """Mode JSON avec USER_STORE_DIR: un fichier par élève."""
+
+    def test_seuls_les_profils_modifies_sont_ecrits(self, tmp_path):
+        """L'écriture ne touche que les profils signalés."""
+        racine = tmp_path / "profils"
+        cache = {"data": {}, "loaded": True, "dirty": False}
+        ecrivain = EcrivainDiffere(cache, delai=3600, seuil=100)
+
+        with patch('utilisateur.USER_STORE_DIR', str(racine)):
+            cache['data'] = {"alice": {"points": 1}, "bob": {"points": 2}}
+            cache['dirty'] = True
+            ecrivain.signaler('alice')
+            ecrivain.arreter()
+
+            assert _load_from_disk() == {"alice": {"points": 1}}
+
+    def test_workflow_complet(self, tmp_path):
+        """charger → modifier → sauvegarder → force_save, dans le stockage par élève."""
+        racine = tmp_path / "profils"
+        test_file = tmp_path / "utilisateurs.json"
+
+        with patch('utilisateur.FICHIER_UTILISATEURS', str(test_file)):
+            cache = _cache_partage(test_file)
+            cache['data'] = {}
+            cache['loaded'] = False
+
+            with patch('utilisateur.USER_STORE_DIR', str(racine)):
+                assert charger_utilisateur("alice") is None
+                sauvegarder_utilisateur("alice", {"niveau": "CM1", "points": 150})
+                force_save()
+
+                assert _load_from_disk() == {"alice": {"niveau": "CM1", "points": 150}}
+                assert obtenir_tous_eleves() == ["alice"]
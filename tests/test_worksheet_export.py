@@ -0,0 +1,152 @@
+"""
+Tests pour core/worksheet_export.py
+Export en flux des fiches d'exercices (CSV / HTML)
+"""
+
+import csv
+import io
+
+import pytest
+
+from core import worksheet_export
+from core.render_cache import RenderCache, get_render_stats, reset_render_cache
+from core.worksheet_export import (
+    COLONNES_CSV,
+    exporter_csv,
+    exporter_html,
+    iter_fiche,
+    types_fiche,
+)
+
+
+class TestIterFiche:
+    """iter_fiche(): production un exercice à la fois"""
+
+    def test_alternance_des_types(self):
+        lignes = list(iter_fiche(["addition", "tables", "perimetre"], "CE2", 7))
+        assert [ligne.kind for ligne in lignes] == [
+            "addition", "tables", "perimetre", "addition", "tables", "perimetre", "addition"
+        ]
+        assert [ligne.numero for ligne in lignes] == list(range(1, 8))
+
+    def test_tous_les_types(self):
+        kinds = list(types_fiche())
+        for ligne in iter_fiche(kinds, "CM1", 2 * len(kinds)):
+            assert ligne.question
+            assert ligne.reponse
+
+    def test_illustrations(self):
+        perimetre, composition = iter_fiche(["perimetre", "composition_monnaie"], "CE2", 2)
+        assert "<svg" in perimetre.illustration
+        assert perimetre.illustration_reponse is None
+        assert composition.illustration is None
+        assert composition.illustration_reponse.startswith("<div")
+
+    def test_reponse_division_avec_reste(self):
+        for ligne in iter_fiche(["division"], "CM2", 50):
+            quotient = int(ligne.reponse.split()[0])
+            dividende, diviseur = map(int, ligne.question.split(" ÷ "))
+            assert quotient == dividende // diviseur
+
+    def test_type_inconnu(self):
+        with pytest.raises(ValueError, match="geometrie"):
+            list(iter_fiche(["addition", "geometrie"], "CE1", 1))
+
+    def test_liste_vide(self):
+        with pytest.raises(ValueError):
+            list(iter_fiche([], "CE1", 1))
+
+    def test_n_negatif(self):
+        with pytest.raises(ValueError):
+            list(iter_fiche(["addition"], "CE1", -1))
+
+    def test_type_indisponible_au_niveau(self):
+        """Générateur sans exercice pour le niveau: refusé dès l'appel"""
+        with pytest.raises(ValueError, match="conversion_capacite"):
+            iter_fiche(["addition", "conversion_capacite"], "CE1", 30)
+        assert len(list(iter_fiche(["conversion_capacite"], "CE2", 3))) == 3
+
+    def test_tirage_vide_ignore(self):
+        """Un None isolé en cours de flux est sauté"""
+        tirages = iter([{'question': "a"}, None, {'question': "b"}])
+        flux = worksheet_export._flux_unitaire(lambda niveau: next(tirages))("CE1")
+        assert [next(flux)['question'], next(flux)['question']] == ["a", "b"]
+
+
+class TestExportCSV:
+    """exporter_csv()"""
+
+    def test_entete_et_lignes(self):
+        sortie = io.StringIO()
+        stats = exporter_csv(sortie, ["addition", "conversion_longueur"], "CE2", 600)
+        lignes = list(csv.reader(io.StringIO(sortie.getvalue())))
+        assert tuple(lignes[0]) == COLONNES_CSV
+        assert len(lignes) == 601
+        assert stats['exercices'] == 600
+        assert lignes[1][1] == "addition"
+        assert lignes[2][1] == "conversion_longueur"
+
+    def test_reponse_addition(self):
+        sortie = io.StringIO()
+        exporter_csv(sortie, ["addition"], "CE1", 20)
+        for _, _, _, question, reponse in list(csv.reader(io.StringIO(sortie.getvalue())))[1:]:
+            a, b = map(int, question.split(" + "))
+            assert int(reponse) == a + b
+
+    def test_n_zero(self):
+        sortie = io.StringIO()
+        stats = exporter_csv(sortie, ["tables"], "CE1", 0)
+        assert stats['exercices'] == 0
+        assert sortie.getvalue().strip() == ",".join(COLONNES_CSV)
+
+
+class TestExportHTML:
+    """exporter_html()"""
+
+    def test_corrige_apres_les_enonces(self):
+        sortie = io.StringIO()
+        stats = exporter_html(sortie, ["addition", "aire"], "CE2", 40)
+        document = sortie.getvalue()
+        assert stats['exercices'] == 40
+        enonces, corrige = document.split("<h2>Corrigé</h2>")
+        assert enonces.count('<div class="reponse">') == 40
+        assert corrige.count("<li>") == 40
+        assert enonces.count("<svg") == 20
+        assert document.rstrip().endswith("</html>")
+
+    def test_echappement(self):
+        sortie = io.StringIO()
+        exporter_html(sortie, ["comparaison_decimaux"], "CM1", 5, titre="Fiche <CM1> & co")
+        document = sortie.getvalue()
+        assert "Fiche &lt;CM1&gt; &amp; co" in document
+        enonces = document.split("<h2>Corrigé</h2>")[0]
+        assert "<li><p>" in enonces
+
+    def test_type_indisponible(self):
+        """Rien n'est écrit si un type n'existe pas au niveau"""
+        sortie = io.StringIO()
+        with pytest.raises(ValueError, match="CE1"):
+            exporter_html(sortie, ["conversion_capacite"], "CE1", 30)
+        assert sortie.getvalue() == ""
+
+    def test_corrige_sur_disque(self, monkeypatch):
+        """Corrigé plus gros que le tampon mémoire: recopié intégralement"""
+        monkeypatch.setattr(worksheet_export, "CORRIGE_SPOOL_BYTES", 64)
+        sortie = io.StringIO()
+        exporter_html(sortie, ["tables"], "CE1", 300)
+        corrige = sortie.getvalue().split("<h2>Corrigé</h2>")[1]
+        assert corrige.count("<li>") == 300
+
+
+class TestIllustrationsEnCache:
+    """Illustrations rendues une fois par jeu de paramètres (core.render_cache)"""
+
+    def test_rendus_reutilises(self):
+        reset_render_cache(RenderCache(maxsize=1024))
+        try:
+            exporter_html(io.StringIO(), ["angle"], "CE2", 200)
+            stats = get_render_stats()
+            assert stats['misses'] < 200
+            assert stats['hits'] + stats['misses'] == 200
+        finally:
+            reset_render_cache()
@@ -7,8 +7,14 @@ Extracted from app.py during Phase 2 refactoring
 import streamlit as st
 from datetime import date
 from core import SkillTracker, exercise_generator
+from core.exercise_pool import get_exercise_pool
+from core.exercise_sampler import get_exercise_sampler
+from core.pedagogy.registry import get_feedback_engine
 from utilisateur import auto_save_profil
 
+# Attente maximale des couches différées du feedback (secondes)
+FEEDBACK_WAIT_SECONDS = 2.0
+
 # Helper functions needed by callbacks
 def maj_streak(correct):
     if correct:
@@ -44,24 +50,33 @@ def verifier_badges(points, badges_actuels):
 # Removed duplicate definition to avoid conflicts
 
 # =============== EXERCICE RAPIDE SECTION ===============
+def tirer_exercice_base(kind):
+    """Exercice de base (addition, soustraction, tables, division) sans répétition récente"""
+    return get_exercise_sampler().tirer(
+        st.session_state.get('utilisateur', 'student_default'),
+        kind,
+        st.session_state.niveau,
+        rng=st.session_state.get('rng')
+    )
+
 # Callbacks pour éliminer st.rerun()
 def _callback_exercice_addition():
-    st.session_state.exercice_courant = exercise_generator.generer_addition(st.session_state.niveau)
+    st.session_state.exercice_courant = tirer_exercice_base("addition")
     st.session_state.show_feedback = False
     st.session_state.exercise_start_time = __import__('time').time()  # Track start time
 
 def _callback_exercice_soustraction():
-    st.session_state.exercice_courant = exercise_generator.generer_soustraction(st.session_state.niveau)
+    st.session_state.exercice_courant = tirer_exercice_base("soustraction")
     st.session_state.show_feedback = False
     st.session_state.exercise_start_time = __import__('time').time()
 
 def _callback_exercice_tables():
-    st.session_state.exercice_courant = exercise_generator.generer_tables(st.session_state.niveau)
+    st.session_state.exercice_courant = tirer_exercice_base("tables")
     st.session_state.show_feedback = False
     st.session_state.exercise_start_time = __import__('time').time()
 
 def _callback_exercice_division():
-    st.session_state.exercice_courant = exercise_generator.generer_division(st.session_state.niveau)
+    st.session_state.exercice_courant = tirer_exercice_base("division")
     st.session_state.show_feedback = False
     st.session_state.exercise_start_time = __import__('time').time()
 
@@ -127,8 +142,9 @@ def _callback_validation_exercice():
         except:
             pass
 
-    # Generate transformative feedback
-    feedback_engine = st.session_state.feedback_engine
+    # Generate transformative feedback (moteur partagé, état de session passé explicitement)
+    # Mode différé: verdict immédiat, explication/stratégie/remédiation en arrière-plan
+    feedback_engine = get_feedback_engine()
     user_id = st.session_state.get('utilisateur', 'student_default')
 
     transformative_feedback = feedback_engine.process_exercise_response(
@@ -137,7 +153,8 @@ def _callback_validation_exercice():
         expected=ex['reponse'],
         user_id=user_id,
         user_history=user_history,
-        time_taken_seconds=time_taken
+        time_taken_seconds=time_taken,
+        deferred=True
     )
 
     # Enregistrer dans système adaptatif
@@ -174,25 +191,25 @@ def _callback_reessayer_exercice():
     """Callback pour réessayer un exercice similaire"""
     exercice_type = st.session_state.get('dernier_exercice_type', 'autre')
     if exercice_type == "addition":
-        st.session_state.exercice_courant = exercise_generator.generer_addition(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("addition")
     elif exercice_type == "soustraction":
-        st.session_state.exercice_courant = exercise_generator.generer_soustraction(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("soustraction")
     elif exercice_type == "multiplication":
-        st.session_state.exercice_courant = exercise_generator.generer_tables(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("tables")
     elif exercice_type == "division":
-        st.session_state.exercice_courant = exercise_generator.generer_division(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("division")
     st.session_state.show_feedback = False
 
 def _callback_exercice_suivant():
     """Callback pour passer à l'exercice suivant"""
     if "+" in st.session_state.dernier_exercice.get('question', ''):
-        st.session_state.exercice_courant = exercise_generator.generer_addition(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("addition")
     elif "-" in st.session_state.dernier_exercice.get('question', ''):
-        st.session_state.exercice_courant = exercise_generator.generer_soustraction(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("soustraction")
     elif "÷" in st.session_state.dernier_exercice.get('question', ''):
-        st.session_state.exercice_courant = exercise_generator.generer_division(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("division")
     else:
-        st.session_state.exercice_courant = exercise_generator.generer_tables(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("tables")
     st.session_state.show_feedback = False
 
 def render_transformative_feedback():
@@ -230,6 +247,11 @@ def render_transformative_feedback():
 
     st.markdown("---")
 
+    # ✅ Couches 2-4 calculées en arrière-plan: le verdict est déjà affiché
+    if feedback.pending:
+        with st.spinner("Préparation de l'explication..."):
+            feedback.wait(timeout=FEEDBACK_WAIT_SECONDS)
+
     # Container for feedback layers
     with st.container(border=True):
         # Layer 2: Explanation
@@ -342,12 +364,12 @@ def exercice_rapide_section():
 # Callbacks pour jeux
 def _callback_jeu_droite():
     st.session_state.jeu_type = 'droite'
-    st.session_state.exercice_courant = exercise_generator.generer_droite_numerique(st.session_state.niveau)
+    st.session_state.exercice_courant = get_exercise_pool().pop("droite_numerique", st.session_state.niveau)
     st.session_state.show_feedback = False
 
 def _callback_jeu_memory():
     st.session_state.jeu_type = 'memory'
-    st.session_state.jeu_memory = exercise_generator.generer_memory_emoji(st.session_state.niveau)
+    st.session_state.jeu_memory = exercise_generator.generer_memory_emoji(st.session_state.niveau, rng=st.session_state.get('rng'))
     st.session_state.memory_first_flip = None
     st.session_state.memory_second_flip = None
     st.session_state.memory_incorrect_pair = None
@@ -379,11 +401,11 @@ def _callback_validation_droite():
     auto_save_profil(score > 0)
 
 def _callback_suivant_droite():
-    st.session_state.exercice_courant = exercise_generator.generer_droite_numerique(st.session_state.niveau)
+    st.session_state.exercice_courant = get_exercise_pool().pop("droite_numerique", st.session_state.niveau)
     st.session_state.show_feedback = False
 
 def _callback_nouvelle_partie_memory():
-    st.session_state.jeu_memory = exercise_generator.generer_memory_emoji(st.session_state.niveau)
+    st.session_state.jeu_memory = exercise_generator.generer_memory_emoji(st.session_state.niveau, rng=st.session_state.get('rng'))
     st.session_state.memory_first_flip = None
     st.session_state.memory_second_flip = None
     st.session_state.memory_incorrect_pair = None
@@ -493,7 +515,7 @@ def defi_section():
     st.write("💡 Résous des problèmes du monde réel.")
     
     if st.button("🚀 Commencer Défi", use_container_width=True, key="btn_start_defi"):
-        st.session_state.exercice_courant = exercise_generator.generer_probleme(st.session_state.niveau)
+        st.session_state.exercice_courant = get_exercise_pool().pop("probleme", st.session_state.niveau)
         st.session_state.show_feedback = False
         st.rerun()
     
@@ -558,7 +580,7 @@ def defi_section():
                 st.write(f"**Réponse :** {st.session_state.dernier_exercice['reponse']}")
             with col2:
                 if st.button("➡️ SUIVANT", use_container_width=True, key="btn_next_defi"):
-                    st.session_state.exercice_courant = exercise_generator.generer_probleme(st.session_state.niveau)
+                    st.session_state.exercice_courant = get_exercise_pool().pop("probleme", st.session_state.niveau)
                     st.session_state.show_feedback = False
                     st.rerun()
 
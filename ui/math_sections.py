@@ -8,11 +8,12 @@ import streamlit as st
 import random
 from datetime import date
 from core import SkillTracker, AdaptiveSystem
+from core.exercise_pool import get_exercise_pool
+from ui.exercise_sections import tirer_exercice_base
 from utilisateur import sauvegarder_utilisateur, auto_save_profil
 # Import specific utilities as needed by each section
 
 from fractions_utils import pizza_interactive, afficher_fraction_droite, dessiner_pizza
-from monnaie_utils import generer_calcul_rendu, generer_composition_monnaie, generer_probleme_realiste
 
 def fractions_section():
     """
@@ -377,12 +378,6 @@ def decimaux_section():
     Section Nombres Décimaux - CM1-CM2
     """
     from decimaux_utils import (
-        generer_droite_decimale,
-        generer_comparaison_decimaux,
-        generer_addition_decimaux,
-        generer_soustraction_decimaux,
-        generer_multiplication_par_10_100,
-        generer_fraction_vers_decimal,
         calculer_score_decimal,
         expliquer_comparaison_decimaux,
         expliquer_addition_decimaux
@@ -414,7 +409,7 @@ def decimaux_section():
         # Initialiser
         if 'dec_droite' not in st.session_state or st.session_state.get('dec_reset', False):
             st.session_state.dec_droite = {
-                'exercice': generer_droite_decimale(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("droite_decimale", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.dec_reset = False
@@ -489,7 +484,7 @@ def decimaux_section():
         # Initialiser
         if 'dec_comparer' not in st.session_state or st.session_state.get('dec_reset', False):
             st.session_state.dec_comparer = {
-                'exercice': generer_comparaison_decimaux(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("comparaison_decimaux", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.dec_reset = False
@@ -562,7 +557,7 @@ def decimaux_section():
         # Initialiser
         if 'dec_addition' not in st.session_state or st.session_state.get('dec_reset', False):
             st.session_state.dec_addition = {
-                'exercice': generer_addition_decimaux(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("addition_decimaux", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.dec_reset = False
@@ -627,7 +622,7 @@ def decimaux_section():
         # Initialiser
         if 'dec_soustraction' not in st.session_state or st.session_state.get('dec_reset', False):
             st.session_state.dec_soustraction = {
-                'exercice': generer_soustraction_decimaux(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("soustraction_decimaux", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.dec_reset = False
@@ -690,7 +685,7 @@ def decimaux_section():
         # Initialiser
         if 'dec_mult10' not in st.session_state or st.session_state.get('dec_reset', False):
             st.session_state.dec_mult10 = {
-                'exercice': generer_multiplication_par_10_100(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("multiplication_par_10_100", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.dec_reset = False
@@ -761,7 +756,7 @@ def decimaux_section():
         # Initialiser
         if 'dec_fraction' not in st.session_state or st.session_state.get('dec_reset', False):
             st.session_state.dec_fraction = {
-                'exercice': generer_fraction_vers_decimal(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("fraction_vers_decimal", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.dec_reset = False
@@ -838,11 +833,6 @@ def proportionnalite_section():
     Section Proportionnalité - CM1-CM2
     """
     from proportionnalite_utils import (
-        generer_tableau_proportionnalite,
-        generer_regle_de_trois,
-        generer_pourcentage_simple,
-        generer_echelle,
-        generer_vitesse,
         expliquer_regle_de_trois,
         expliquer_pourcentage
     )
@@ -873,7 +863,7 @@ def proportionnalite_section():
         # Initialiser
         if 'prop_tableau' not in st.session_state or st.session_state.get('prop_reset', False):
             st.session_state.prop_tableau = {
-                'exercice': generer_tableau_proportionnalite(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("tableau_proportionnalite", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.prop_reset = False
@@ -963,7 +953,7 @@ def proportionnalite_section():
         # Initialiser
         if 'prop_regle3' not in st.session_state or st.session_state.get('prop_reset', False):
             st.session_state.prop_regle3 = {
-                'exercice': generer_regle_de_trois(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("regle_de_trois", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.prop_reset = False
@@ -1028,7 +1018,7 @@ def proportionnalite_section():
         # Initialiser
         if 'prop_pourcent' not in st.session_state or st.session_state.get('prop_reset', False):
             st.session_state.prop_pourcent = {
-                'exercice': generer_pourcentage_simple(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("pourcentage_simple", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.prop_reset = False
@@ -1096,7 +1086,7 @@ def proportionnalite_section():
         # Initialiser
         if 'prop_echelle' not in st.session_state or st.session_state.get('prop_reset', False):
             st.session_state.prop_echelle = {
-                'exercice': generer_echelle(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("echelle", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.prop_reset = False
@@ -1163,7 +1153,7 @@ def proportionnalite_section():
         # Initialiser
         if 'prop_vitesse' not in st.session_state or st.session_state.get('prop_reset', False):
             st.session_state.prop_vitesse = {
-                'exercice': generer_vitesse(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("vitesse", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.prop_reset = False
@@ -1553,13 +1543,8 @@ def mesures_section():
     """
     Section Mesures et Conversions - CE1-CM2
     """
-    from mesures_utils import (
-        generer_conversion_longueur,
-        generer_conversion_masse,
-        generer_conversion_capacite,
-        generer_probleme_duree,
-        expliquer_conversion
-    )
+    from mesures_utils import expliquer_conversion
+    from core.unit_registry import verifier_conversion
     
     st.markdown('<div class="categorie-header">📏 Mesures et Conversions</div>', unsafe_allow_html=True)
     
@@ -1586,7 +1571,7 @@ def mesures_section():
         # Initialiser
         if 'mes_longueur' not in st.session_state or st.session_state.get('mes_reset', False):
             st.session_state.mes_longueur = {
-                'exercice': generer_conversion_longueur(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("conversion_longueur", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.mes_reset = False
@@ -1623,7 +1608,7 @@ def mesures_section():
                 st.write("")
                 st.write("")
                 if st.button("✅ Vérifier", key="mes_verify", use_container_width=True):
-                    correct = (abs(reponse - ex['reponse']) < 0.1)
+                    correct = verifier_conversion(reponse, ex['valeur_depart'], ex['unite_depart'], ex['unite_arrivee'])
                     
                     st.session_state.mes_longueur['correct'] = correct
                     st.session_state.mes_longueur['feedback_affiche'] = True
@@ -1651,7 +1636,7 @@ def mesures_section():
         # Initialiser
         if 'mes_masse' not in st.session_state or st.session_state.get('mes_reset', False):
             st.session_state.mes_masse = {
-                'exercice': generer_conversion_masse(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("conversion_masse", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.mes_reset = False
@@ -1688,7 +1673,7 @@ def mesures_section():
                 st.write("")
                 st.write("")
                 if st.button("✅ Vérifier", key="mes_verify", use_container_width=True):
-                    correct = (abs(reponse - ex['reponse']) < 0.1)
+                    correct = verifier_conversion(reponse, ex['valeur_depart'], ex['unite_depart'], ex['unite_arrivee'])
                     
                     st.session_state.mes_masse['correct'] = correct
                     st.session_state.mes_masse['feedback_affiche'] = True
@@ -1715,7 +1700,7 @@ def mesures_section():
         
         # Initialiser
         if 'mes_capacite' not in st.session_state or st.session_state.get('mes_reset', False):
-            exercice_gen = generer_conversion_capacite(st.session_state.niveau)
+            exercice_gen = get_exercise_pool().pop("conversion_capacite", st.session_state.niveau)
             if exercice_gen is None:
                 st.info("📚 Les capacités commencent au CE2 !")
                 return
@@ -1758,7 +1743,7 @@ def mesures_section():
                 st.write("")
                 st.write("")
                 if st.button("✅ Vérifier", key="mes_verify", use_container_width=True):
-                    correct = (abs(reponse - ex['reponse']) < 0.1)
+                    correct = verifier_conversion(reponse, ex['valeur_depart'], ex['unite_depart'], ex['unite_arrivee'])
                     
                     st.session_state.mes_capacite['correct'] = correct
                     st.session_state.mes_capacite['feedback_affiche'] = True
@@ -1786,7 +1771,7 @@ def mesures_section():
         # Initialiser
         if 'mes_duree' not in st.session_state or st.session_state.get('mes_reset', False):
             st.session_state.mes_duree = {
-                'exercice': generer_probleme_duree(st.session_state.niveau),
+                'exercice': get_exercise_pool().pop("probleme_duree", st.session_state.niveau),
                 'feedback_affiche': False
             }
             st.session_state.mes_reset = False
@@ -1898,7 +1883,7 @@ def monnaie_section():
 
         # Générer ou récupérer exercice
         if 'monnaie_exercice' not in st.session_state or st.session_state.get('monnaie_nouveau', False):
-            st.session_state.monnaie_exercice = generer_calcul_rendu(niveau)
+            st.session_state.monnaie_exercice = get_exercise_pool().pop("calcul_rendu", niveau)
             st.session_state.monnaie_feedback = False
             st.session_state.monnaie_nouveau = False
 
@@ -1968,7 +1953,7 @@ def monnaie_section():
 
         # Générer ou récupérer exercice
         if 'monnaie_compo_ex' not in st.session_state or st.session_state.get('monnaie_compo_nouveau', False):
-            st.session_state.monnaie_compo_ex = generer_composition_monnaie(niveau)
+            st.session_state.monnaie_compo_ex = get_exercise_pool().pop("composition_monnaie", niveau)
             st.session_state.monnaie_compo_feedback = False
             st.session_state.monnaie_compo_nouveau = False
 
@@ -2092,7 +2077,7 @@ def monnaie_section():
 
         # Générer ou récupérer exercice
         if 'monnaie_pb_ex' not in st.session_state or st.session_state.get('monnaie_pb_nouveau', False):
-            st.session_state.monnaie_pb_ex = generer_probleme_realiste(niveau)
+            st.session_state.monnaie_pb_ex = get_exercise_pool().pop("probleme_realiste", niveau)
             st.session_state.monnaie_pb_feedback = False
             st.session_state.monnaie_pb_nouveau = False
 
@@ -3605,17 +3590,17 @@ def lancer_exercice_recommande(recommended_type):
     
     # 2. Générer le nouvel exercice
     if recommended_type == "addition":
-        st.session_state.exercice_courant = exercise_generator.generer_addition(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("addition")
     elif recommended_type == "soustraction":
-        st.session_state.exercice_courant = exercise_generator.generer_soustraction(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("soustraction")
     elif recommended_type == "multiplication":
-        st.session_state.exercice_courant = exercise_generator.generer_tables(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("tables")
     elif recommended_type == "division":
-        st.session_state.exercice_courant = exercise_generator.generer_division(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("division")
     elif recommended_type == "probleme":
-        st.session_state.exercice_courant = exercise_generator.generer_probleme(st.session_state.niveau)
+        st.session_state.exercice_courant = get_exercise_pool().pop("probleme", st.session_state.niveau)
     else: # Fallback
-        st.session_state.exercice_courant = exercise_generator.generer_addition(st.session_state.niveau)
+        st.session_state.exercice_courant = tirer_exercice_base("addition")
     
     # 3. Réinitialiser le feedback pour le nouvel exercice
     st.session_state.show_feedback = False
@@ -3649,7 +3634,7 @@ def dashboard_statistiques():
     tracker = SkillTracker(profil)
     
     # Calculer compétences
-    skill_levels = adaptive.get_skill_levels(profil.get('exercise_history', []))
+    skill_levels = adaptive.get_profile_skill_levels(profil)
     
     # Afficher profil
     st.subheader("Mon Profil d'Apprentissage")
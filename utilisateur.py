@@ -3,11 +3,19 @@ User Profile Management for MathCopain
 Handles user data storage with Supabase (primary) and JSON file (fallback).
 """
 
+import atexit
 import json
 import os
+import shutil
+import tempfile
+import threading
+import time
 import streamlit as st
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
+
+from core.exercise_history import profil_serialisable
+from core.profile_store import StockageProfils
 
 # Import Supabase client
 from core.supabase_client import (
@@ -20,6 +28,15 @@ from core.supabase_client import (
 
 FICHIER_UTILISATEURS = "utilisateurs.json"
 
+# Mode JSON: un fichier par élève dans ce répertoire ('' = FICHIER_UTILISATEURS)
+# Conversion: python scripts/migrer_profils.py
+USER_STORE_DIR = os.getenv('USER_STORE_DIR', '')
+
+# Écriture différée (mode JSON): délai max avant écriture d'un profil modifié,
+# et nombre de profils modifiés qui déclenche l'écriture sans attendre
+USER_STORE_FLUSH_SECONDS = float(os.getenv('USER_STORE_FLUSH_SECONDS', '2'))
+USER_STORE_FLUSH_PROFILES = int(os.getenv('USER_STORE_FLUSH_PROFILES', '5'))
+
 
 # =============================================================================
 # STORAGE MODE DETECTION
@@ -41,17 +58,151 @@ def get_storage_mode() -> str:
 # JSON FILE OPERATIONS (Fallback)
 # =============================================================================
 
+_stockages: Dict[str, StockageProfils] = {}
+
+
+def _stockage() -> Optional[StockageProfils]:
+    """Stockage un fichier par élève (USER_STORE_DIR), None: fichier unique"""
+    if not USER_STORE_DIR:
+        return None
+    stockage = _stockages.get(USER_STORE_DIR)
+    if stockage is None:
+        stockage = _stockages.setdefault(USER_STORE_DIR, StockageProfils(USER_STORE_DIR))
+    return stockage
+
+
+class EcrivainDiffere:
+    """
+    Thread d'écriture des profils (un par processus)
+
+    Les requêtes signalent les profils modifiés sans toucher au disque.
+    Le thread regroupe ces modifications et les écrit (atomiquement)
+    quand la plus ancienne a USER_STORE_FLUSH_SECONDS ou que
+    USER_STORE_FLUSH_PROFILES profils distincts sont en attente: seuls
+    les profils modifiés avec USER_STORE_DIR, sinon tout le fichier
+    `chemin`. vider() écrit tout de suite (déconnexion, arrêt du
+    processus).
+    """
+
+    def __init__(self, cache: Dict, delai: float = None, seuil: int = None, chemin: Optional[str] = None):
+        self.cache = cache
+        self.chemin = FICHIER_UTILISATEURS if chemin is None else chemin
+        self.delai = USER_STORE_FLUSH_SECONDS if delai is None else delai
+        self.seuil = USER_STORE_FLUSH_PROFILES if seuil is None else seuil
+        self.ecritures = 0
+        self._modifies: Set[str] = set()
+        self._depuis: Optional[float] = None     # time.monotonic() de la plus ancienne
+        self._cond = threading.Condition()
+        self._ecriture = threading.Lock()         # une seule écriture à la fois
+        self._thread: Optional[threading.Thread] = None
+        self._arret = False
+
+    def signaler(self, nom: str):
+        """Profil modifié dans cache["data"] (aucune E/S)"""
+        with self._cond:
+            self._modifies.add(nom)
+            if self._depuis is None:
+                self._depuis = time.monotonic()
+            if self._thread is None and not self._arret:
+                self._thread = threading.Thread(target=self._boucle, name="ecrivain-utilisateurs", daemon=True)
+                self._thread.start()
+            if len(self._modifies) >= self.seuil:
+                self._cond.notify()
+
+    def en_attente(self) -> int:
+        """Nombre de profils modifiés pas encore écrits"""
+        with self._cond:
+            return len(self._modifies)
+
+    def vider(self, forcer: bool = False) -> bool:
+        """
+        Écrit maintenant les profils en attente (avec forcer: aussi si
+        seul cache["dirty"] est positionné). Returns: True si écrit
+        """
+        with self._ecriture:
+            with self._cond:
+                if not self._modifies and not (forcer and self.cache["dirty"]):
+                    return False
+                noms, self._modifies = self._modifies, set()
+                self._depuis = None
+                chemin = self.chemin
+
+            stockage = _stockage()
+            if stockage is not None:
+                echecs = _save_profiles(stockage, self.cache["data"], noms or set(self.cache["data"]))
+                ok = not echecs
+            else:
+                ok = _save_to_disk(self.cache["data"], chemin)
+                # Écriture forcée sans profil signalé: tous restent à écrire
+                echecs = set() if ok else noms or set(self.cache["data"])
+
+            with self._cond:
+                if echecs:
+                    # Nouvel essai au prochain passage
+                    self._modifies |= echecs
+                    if self._depuis is None:
+                        self._depuis = time.monotonic()
+                self.cache["dirty"] = bool(self._modifies) or not ok
+            if ok:
+                self.ecritures += 1
+            return ok
+
+    def arreter(self):
+        """Arrête le thread après une dernière écriture (arrêt du processus)"""
+        with self._cond:
+            self._arret = True
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.vider()
+
+    def _boucle(self):
+        while True:
+            with self._cond:
+                while not self._arret:
+                    if self._modifies:
+                        attente = self._depuis + self.delai - time.monotonic()
+                        if attente <= 0 or len(self._modifies) >= self.seuil:
+                            break
+                        self._cond.wait(attente)
+                    else:
+                        self._cond.wait()
+                if self._arret:
+                    return
+            self.vider()
+
+
+# Écrivain du cache partagé (le dernier créé), vidé à l'arrêt du processus
+_ecrivain: Optional[EcrivainDiffere] = None
+
+
+def _arreter_ecrivain():
+    if _ecrivain is not None:
+        _ecrivain.arreter()
+
+
+atexit.register(_arreter_ecrivain)
+
+
 @st.cache_resource
 def _get_user_cache() -> Dict:
     """
     Cache singleton partagé entre toutes les sessions
     Persiste tant que le serveur Streamlit tourne
+    Son EcrivainDiffere écrit le fichier en arrière-plan
     """
-    return {"data": {}, "loaded": False, "dirty": False}
+    global _ecrivain
+    cache = {"data": {}, "loaded": False, "dirty": False}
+    cache["writer"] = _ecrivain = EcrivainDiffere(cache, chemin=FICHIER_UTILISATEURS)
+    return cache
 
 
 def _load_from_disk() -> Dict:
-    """Charge fichier JSON depuis disque"""
+    """Charge fichier JSON depuis disque (ou les fichiers par élève)"""
+    stockage = _stockage()
+    if stockage is not None:
+        return stockage.lire_tout()
+
     if not os.path.exists(FICHIER_UTILISATEURS):
         return {}
 
@@ -62,13 +213,62 @@ def _load_from_disk() -> Dict:
         return {}
 
 
-def _save_to_disk(data: Dict):
-    """Sauvegarde cache vers fichier JSON"""
+def _save_profiles(stockage: StockageProfils, data: Dict, noms: Set[str]) -> Set[str]:
+    """
+    Écrit seulement les profils `noms` (un fichier chacun)
+    Returns: noms non écrits
+    """
+    echecs = set()
+    for nom in noms:
+        if nom not in data:
+            continue
+        for essai in range(3):
+            try:
+                stockage.ecrire(nom, data[nom])
+                break
+            except RuntimeError:
+                # Profil modifié pendant l'encodage (autre session): réencodé
+                if essai == 2:
+                    echecs.add(nom)
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Erreur sauvegarde {nom} : {e}")
+                echecs.add(nom)
+                break
+    return echecs
+
+
+def _save_to_disk(data: Dict, chemin: Optional[str] = None) -> bool:
+    """
+    Sauvegarde cache vers fichier JSON
+    Écriture atomique: fichier temporaire puis renommage (cf. DataManager.save_json)
+    """
+    chemin = chemin or FICHIER_UTILISATEURS
+    temp_path = None
     try:
-        with open(FICHIER_UTILISATEURS, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except IOError as e:
+        # Sérialisé d'abord: un profil modifié pendant l'encodage (autre session)
+        # est réencodé plutôt que d'écrire un fichier incomplet
+        for essai in range(3):
+            try:
+                contenu = json.dumps(data, ensure_ascii=False, indent=2)
+                break
+            except RuntimeError:
+                if essai == 2:
+                    raise
+
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(chemin)),
+            prefix=f".{os.path.basename(chemin)}.",
+            suffix=".tmp"
+        )
+        with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
+            f.write(contenu)
+        shutil.move(temp_path, chemin)
+        return True
+    except (IOError, OSError, RuntimeError, TypeError, ValueError) as e:
         print(f"Erreur sauvegarde : {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
 
 
 # =============================================================================
@@ -123,6 +323,9 @@ def sauvegarder_utilisateur(nom: str, data: Dict):
     storage_mode = get_storage_mode()
     nom_lower = nom.lower().strip()
 
+    # Historique compact (HistoriqueExercices) → forme JSON
+    data = profil_serialisable(data)
+
     if storage_mode == 'supabase':
         # Save to Supabase
         supabase_save_user_profile(nom_lower, data)
@@ -145,16 +348,8 @@ def sauvegarder_utilisateur(nom: str, data: Dict):
     cache["data"][nom_lower] = data
     cache["dirty"] = True
 
-    if '_save_counter' not in st.session_state:
-        st.session_state._save_counter = 0
-
-    st.session_state._save_counter += 1
-
-    # Flush to disk every 5 modifications
-    if st.session_state._save_counter >= 5:
-        _save_to_disk(cache["data"])
-        cache["dirty"] = False
-        st.session_state._save_counter = 0
+    # Écriture sur disque en arrière-plan (EcrivainDiffere)
+    cache["writer"].signaler(nom_lower)
 
 
 def obtenir_tous_eleves() -> list:
@@ -197,11 +392,7 @@ def force_save():
         # Supabase saves immediately, nothing to do
         return
 
-    cache = _get_user_cache()
-
-    if cache["dirty"]:
-        _save_to_disk(cache["data"])
-        cache["dirty"] = False
+    _get_user_cache()["writer"].vider(forcer=True)
 
 
 def profil_par_defaut():